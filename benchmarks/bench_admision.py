@@ -0,0 +1,145 @@
+"""
+Benchmark: control de admisión bajo sobrecarga (src.utils.admision).
+
+Levanta la app (perfil producción, SQLite en archivo) en un servidor WSGI
+con un hilo por petición y la bombardea con C clientes concurrentes,
+repartidos en procesos aparte para no competir por el GIL del servidor, que
+mezclan altas (POST /tasks) y lecturas (GET /usuarios/mialias=<alias>,
+sin caché), sin límites y con límites por carril. Reporta rendimiento,
+latencia p50/p99 de las respuestas exitosas y cuántas se descartaron (503).
+
+Uso:
+    python benchmarks/bench_admision.py [--clientes 64] [--procesos 4] [--segundos 5]
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from src import data_handler as dh  # noqa: E402
+from src import db  # noqa: E402
+from src.config import PERFILES  # noqa: E402
+from src.controller import app  # noqa: E402
+from src.repositorios import crear_repositorio  # noqa: E402
+from src.utils.admision import ControlAdmision  # noqa: E402
+
+ALTA = json.dumps({"nombre": "T", "descripcion": ".", "usuario": "eva", "rol": "infra"}).encode()
+
+
+def cliente(base, fin, latencias, descartes, k):
+    n = 0
+    while time.perf_counter() < fin:
+        n += 1
+        if (n + k) % 4 == 0:
+            peticion = urllib.request.Request(f"{base}/tasks", data=ALTA, method="POST")
+        else:
+            peticion = urllib.request.Request(f"{base}/usuarios/mialias=eva?limit=20")
+        inicio = time.perf_counter()
+        try:
+            with urllib.request.urlopen(peticion, timeout=30) as resp:
+                resp.read()
+            latencias.append(time.perf_counter() - inicio)
+        except urllib.error.HTTPError as e:
+            if e.code != 503:
+                raise
+            descartes.append(time.perf_counter() - inicio)
+            time.sleep(0.01)
+
+
+def proceso(base, segundos, n_hilos, salida):
+    """Un proceso de clientes: n_hilos hilos hasta agotar el tiempo."""
+    latencias, descartes = [], []
+    fin = time.perf_counter() + segundos
+    hilos = [
+        threading.Thread(target=cliente, args=(base, fin, latencias, descartes, k))
+        for k in range(n_hilos)
+    ]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    salida.put((latencias, descartes))
+
+
+def ronda(clientes, procesos, segundos):
+    servidor = make_server("127.0.0.1", 0, app, threaded=True)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    base = f"http://127.0.0.1:{servidor.server_port}"
+    salida = multiprocessing.Queue()
+    hijos = [
+        multiprocessing.Process(
+            target=proceso, args=(base, segundos, clientes // procesos, salida)
+        )
+        for _ in range(procesos)
+    ]
+    for p in hijos:
+        p.start()
+    latencias, descartes = [], []
+    for _ in hijos:
+        lat, desc = salida.get()
+        latencias += lat
+        descartes += desc
+    for p in hijos:
+        p.join()
+    servidor.shutdown()
+
+    latencias.sort()
+    return {
+        "ok_por_s": round(len(latencias) / segundos, 1),
+        "p50_ms": round(statistics.median(latencias) * 1000, 1),
+        "p99_ms": round(latencias[int(len(latencias) * 0.99)] * 1000, 1),
+        "descartadas": len(descartes),
+        "descarte_p50_ms": round(statistics.median(descartes) * 1000, 1) if descartes else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clientes", type=int, default=64)
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # sin una línea por petición
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app.config.from_object(PERFILES["produccion"])
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/admision.db"
+        app.extensions["repositorio"] = crear_repositorio("sql")
+        app.extensions["cache_respuestas"].max_entradas = 0
+        with app.app_context():
+            db.create_all()
+            dh.crear_usuario("eva", "Eva")
+
+        resultados = {"sin_limites": ronda(args.clientes, args.procesos, args.segundos)}
+        app.config.update(
+            ADMISION_LECTURAS=4, ADMISION_ESCRITURAS=1,
+            ADMISION_COLA_LECTURAS=4, ADMISION_COLA_ESCRITURAS=2,
+            ADMISION_ESPERA_LECTURAS=0.05, ADMISION_ESPERA_ESCRITURAS=0.1,
+        )
+        ControlAdmision(app)
+        resultados["con_limites"] = ronda(args.clientes, args.procesos, args.segundos)
+        resultados["con_limites"]["carriles"] = app.extensions["admision"].estadisticas()
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: lecturas calientes antes y después de `flask archivar`, sobre N
+tareas sintéticas de las que el 90 % están FINALIZADAS (sin fecha: cuentan
+como antiguas). Mide la cola de listas, la primera página de un usuario
+(todas y sólo NUEVA), una tarea archivada (GET /tasks/<id> cae al archivo),
+la exportación completa, el propio archivado y el tamaño del archivo
+SQLite de las tablas activas (dbstat).
+
+Uso:
+    python benchmarks/bench_archivo.py [--tareas 100000 1000000] [--repeticiones 5]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import create_app, db  # noqa: E402
+from src import data_handler as dh  # noqa: E402
+from src.models.asignacion import Asignacion  # noqa: E402
+from src.models.dependencia import dependencia  # noqa: E402
+from src.models.enums import EstadoEnum, RolEnum  # noqa: E402
+from src.models.tarea import Tarea  # noqa: E402
+from src.models.usuario import Usuario  # noqa: E402
+
+CHUNK = 50_000
+USUARIOS = 100
+
+
+def poblar(n_tareas, semilla=7):
+    """Las primeras 90 % FINALIZADAS (dependen de finalizadas); el resto, no."""
+    rnd = random.Random(semilla)
+    corte = n_tareas * 9 // 10
+    conn = db.session.connection()
+    conn.execute(
+        Usuario.__table__.insert(),
+        [{"alias": f"u{i}", "nombre": f"U{i}"} for i in range(USUARIOS)],
+    )
+    for base in range(1, n_tareas + 1, CHUNK):
+        ids = range(base, min(base + CHUNK, n_tareas + 1))
+        conn.execute(Tarea.__table__.insert(), [
+            {"id": i, "nombre": f"Tarea {i}", "descripcion": "Descripción de prueba",
+             "estado": EstadoEnum.FINALIZADA if i <= corte else EstadoEnum.NUEVA}
+            for i in ids
+        ])
+        conn.execute(Asignacion.__table__.insert(), [
+            {"usuario_alias": f"u{i % USUARIOS}", "tarea_id": i, "rol": RolEnum.INFRA}
+            for i in ids
+        ])
+        conn.execute(dependencia.insert(), [
+            {"tarea_id": i, "depende_de_id": rnd.randrange(1, min(i, corte + 1))}
+            for i in ids if i > 1
+        ])
+    db.session.commit()
+    dh.recalcular_dependencias_pendientes()
+
+
+def medir(fn, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        db.session.remove()
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return {"media_ms": round(statistics.mean(tiempos), 2), "min_ms": round(min(tiempos), 2)}
+
+
+def tam_activas_mb():
+    filas = db.session.execute(
+        "SELECT SUM(pgsize) FROM dbstat WHERE name IN "
+        "('tarea', 'asignacion', 'dependencia') OR name LIKE 'ix_%' OR name LIKE 'sqlite_autoindex_%'"
+    ).scalar()
+    return round((filas or 0) / 2**20, 1)
+
+
+def lecturas(repeticiones):
+    return {
+        "listas_100": medir(lambda: dh.tareas_listas(100), repeticiones),
+        "usuario_pagina": medir(lambda: dh.tareas_de_usuario("u7", limite=100), repeticiones),
+        "usuario_nuevas": medir(
+            lambda: dh.tareas_de_usuario("u7", limite=100, estado="NUEVA"), repeticiones
+        ),
+        "tarea_antigua": medir(lambda: dh.obtener_tarea(7), repeticiones),
+        "exportar": medir(lambda: sum(1 for _ in dh.exportar()), 1),
+    }
+
+
+def correr(n_tareas, repeticiones, tmp):
+    app = create_app("produccion")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/archivo_{n_tareas}.db"
+    resultado = {}
+    with app.app_context():
+        db.create_all()
+        poblar(n_tareas)
+        resultado["activas_mb_antes"] = tam_activas_mb()
+        resultado["antes"] = lecturas(repeticiones)
+
+        inicio = time.perf_counter()
+        resultado["movidas"] = dh.archivar(0)
+        resultado["archivar_s"] = round(time.perf_counter() - inicio, 2)
+        db.session.execute("VACUUM")
+
+        resultado["activas_mb_despues"] = tam_activas_mb()
+        resultado["despues"] = lecturas(repeticiones)
+        db.session.remove()
+        db.engine.dispose()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tareas", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados = {n: correr(n, args.repeticiones, tmp) for n in args.tareas}
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Benchmark: app WSGI (src.controller, servidor multihilo de Werkzeug)
+frente a la app ASGI (src.asgi, uvicorn + aiosqlite) con 1, 16 y 128
+clientes concurrentes. Perfil "produccion", caché de respuestas apagada
+para que cada petición llegue a la BD.
+
+Cada servidor corre en un subproceso; el generador de carga es asyncio
+con conexiones HTTP/1.1 keep-alive (una por cliente). Mezcla: 80 %
+GET /tasks/<id>, 10 % GET /usuarios/mialias=<u>?limit=20, 10 % POST /tasks.
+
+Uso:
+    python benchmarks/bench_asgi.py [--segundos 5] [--clientes 1 16 128]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+USUARIOS = 100
+TAREAS = 20_000
+
+
+# ---------- servidores (subproceso) --------------------------------- #
+def _app_flask(bd):
+    from src.controller import app
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{bd}"
+    app.extensions["cache_respuestas"].max_entradas = 0
+    return app
+
+
+def servir(tipo, bd, puerto):
+    if tipo == "wsgi":
+        import logging
+
+        from werkzeug.serving import make_server
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+        make_server("127.0.0.1", puerto, _app_flask(bd), threaded=True).serve_forever()
+    else:
+        import uvicorn
+
+        from src import create_app
+        from src.asgi import AppASGI
+
+        flask_app = create_app()
+        flask_app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{bd}"
+        flask_app.extensions["cache_respuestas"].max_entradas = 0
+        uvicorn.run(AppASGI(flask_app), host="127.0.0.1", port=puerto,
+                    log_level="warning", lifespan="on", access_log=False)
+
+
+def poblar(bd):
+    from src import db
+    from src.data_handler import crear_tareas, crear_usuario
+
+    app = _app_flask(bd)
+    with app.app_context():
+        db.create_all()
+        for u in range(USUARIOS):
+            crear_usuario(f"u{u}", f"U{u}")
+        rnd = random.Random(3)
+        crear_tareas([
+            {"nombre": f"T{i}", "descripcion": ".", "usuario": f"u{rnd.randrange(USUARIOS)}",
+             "rol": "programador"}
+            for i in range(TAREAS)
+        ])
+        db.session.remove()
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _arrancar(tipo, bd):
+    puerto = _puerto_libre()
+    proceso = subprocess.Popen(
+        [sys.executable, __file__, "--servir", tipo, "--bd", bd, "--puerto", str(puerto)],
+        env={**os.environ, "APP_PERFIL": "produccion"},
+    )
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", puerto), timeout=0.1).close()
+            return proceso, puerto
+        except OSError:
+            time.sleep(0.05)
+    proceso.kill()
+    raise RuntimeError(f"El servidor {tipo} no arrancó")
+
+
+# ---------- generador de carga -------------------------------------- #
+def _peticion(rnd):
+    r = rnd.random()
+    if r < 0.8:
+        return "GET", f"/tasks/{rnd.randrange(1, TAREAS + 1)}", None
+    if r < 0.9:
+        return "GET", f"/usuarios/mialias=u{rnd.randrange(USUARIOS)}?limit=20", None
+    cuerpo = {"nombre": "N", "descripcion": ".", "usuario": f"u{rnd.randrange(USUARIOS)}",
+              "rol": "pruebas"}
+    return "POST", "/tasks", json.dumps(cuerpo).encode()
+
+
+async def _cliente(puerto, fin, semilla, latencias, errores):
+    rnd = random.Random(semilla)
+    lector = escritor = None
+    while time.perf_counter() < fin:
+        if escritor is None:
+            lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        metodo, ruta, cuerpo = _peticion(rnd)
+        cabeceras = f"{metodo} {ruta} HTTP/1.1\r\nHost: bench\r\n"
+        if cuerpo is not None:
+            cabeceras += f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n"
+        inicio = time.perf_counter()
+        try:
+            escritor.write(cabeceras.encode() + b"\r\n" + (cuerpo or b""))
+            estado = await lector.readline()
+            if not estado.strip():  # el servidor cerró la conexión keep-alive
+                raise ConnectionResetError
+            largo, troceado, cerrar = 0, False, estado.startswith(b"HTTP/1.0")
+            while True:
+                linea = (await lector.readline()).strip()
+                if not linea:
+                    break
+                nombre, _, valor = linea.decode().lower().partition(":")
+                valor = valor.strip()
+                if nombre == "content-length":
+                    largo = int(valor)
+                elif nombre == "transfer-encoding":
+                    troceado = valor == "chunked"
+                elif nombre == "connection":
+                    cerrar = valor == "close"
+            if troceado:
+                while (trozo := int((await lector.readline()).strip(), 16)):
+                    await lector.readexactly(trozo + 2)
+                await lector.readline()
+            else:
+                await lector.readexactly(largo)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            errores[0] += 1
+            escritor.close()
+            escritor = None
+            continue
+        latencias.append(time.perf_counter() - inicio)
+        if int(estado.split()[1]) >= 500:
+            errores[0] += 1
+        if cerrar:
+            escritor.close()
+            escritor = None
+    if escritor is not None:
+        escritor.close()
+
+
+async def _carga(puerto, clientes, segundos):
+    latencias, errores = [], [0]
+    inicio = time.perf_counter()
+    fin = inicio + segundos
+    await asyncio.gather(*(
+        _cliente(puerto, fin, k, latencias, errores) for k in range(clientes)
+    ))
+    total = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "rps": round(len(latencias) / total, 1),
+        "p50_ms": round(latencias[len(latencias) // 2] * 1000, 2),
+        "p99_ms": round(latencias[int(len(latencias) * 0.99) - 1] * 1000, 2),
+        "errores": errores[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--clientes", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--servir", choices=["wsgi", "asgi"])
+    parser.add_argument("--bd")
+    parser.add_argument("--puerto", type=int)
+    args = parser.parse_args()
+
+    if args.servir:
+        servir(args.servir, args.bd, args.puerto)
+        return
+
+    os.environ["APP_PERFIL"] = "produccion"
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for tipo in ("wsgi", "asgi"):
+            bd = f"{tmp}/{tipo}.db"
+            poblar(bd)
+            proceso, puerto = _arrancar(tipo, bd)
+            try:
+                resultados[tipo] = {
+                    str(n): asyncio.run(_carga(puerto, n, args.segundos))
+                    for n in args.clientes
+                }
+            finally:
+                proceso.terminate()
+                proceso.wait()
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
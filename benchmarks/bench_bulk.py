@@ -0,0 +1,67 @@
+"""
+Benchmark: N × POST /tasks frente a un único POST /tasks/bulk.
+
+Uso:
+    python benchmarks/bench_bulk.py [N]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import db  # noqa: E402
+from src.controller import app  # noqa: E402
+
+
+def _preparar(tmp, nombre):
+    app.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp}/{nombre}.db")
+    db.create_all()
+    cliente = app.test_client()
+    cliente.post("/usuarios", json={"contacto": "eva", "nombre": "Eva"})
+    return cliente
+
+
+def _tarea(i):
+    return {"nombre": f"T{i}", "descripcion": ".", "usuario": "eva", "rol": "programador"}
+
+
+def uno_a_uno(cliente, n):
+    inicio = time.perf_counter()
+    for i in range(n):
+        assert cliente.post("/tasks", json=_tarea(i)).status_code == 201
+    return time.perf_counter() - inicio
+
+
+def masivo(cliente, n):
+    inicio = time.perf_counter()
+    resp = cliente.post("/tasks/bulk", data=json.dumps([_tarea(i) for i in range(n)]),
+                        content_type="application/json")
+    assert resp.status_code == 201
+    return time.perf_counter() - inicio
+
+
+def main(n):
+    with tempfile.TemporaryDirectory() as tmp, app.app_context():
+        resultados = {}
+        for nombre, fn in (("uno_a_uno", uno_a_uno), ("bulk", masivo)):
+            cliente = _preparar(tmp, nombre)
+            segundos = fn(cliente, n)
+            resultados[nombre] = {
+                "segundos": round(segundos, 3),
+                "tareas_por_segundo": round(n / segundos, 1),
+            }
+            db.session.remove()
+        resultados["aceleracion"] = round(
+            resultados["uno_a_uno"]["segundos"] / resultados["bulk"]["segundos"], 1
+        )
+        print(json.dumps({"n": n, **resultados}, indent=2))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
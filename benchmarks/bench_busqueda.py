@@ -0,0 +1,147 @@
+"""
+Benchmark: GET /tasks/search (índice FTS5, capa de servicio) frente a un
+recorrido con LIKE '%palabra%' sobre nombre/descripcion, con 100k y 1M
+tareas sintéticas. El vocabulario sigue una distribución tipo Zipf, así que
+se mide con términos frecuentes, intermedios y raros, y con dos palabras.
+El costo del ranking (bm25) crece con las coincidencias; el LIKE con
+ORDER BY id LIMIT se corta en las primeras, pero no ordena por relevancia.
+
+Uso:
+    python benchmarks/bench_busqueda.py [--tareas 100000 1000000] [--repeticiones 200]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import text  # noqa: E402
+
+from src import create_app, db  # noqa: E402
+from src import data_handler as dh  # noqa: E402
+from src.models.asignacion import Asignacion  # noqa: E402
+from src.models.enums import RolEnum  # noqa: E402
+from src.models.tarea import Tarea  # noqa: E402
+from src.models.usuario import Usuario  # noqa: E402
+
+CHUNK = 50_000
+VOCABULARIO = 20_000
+LIMITE = 20
+SILABAS = ("ba", "ce", "di", "fo", "gu", "la", "me", "ni", "po", "ru", "sa", "te", "vi", "zo")
+
+
+def _vocabulario(rnd):
+    palabras = set()
+    while len(palabras) < VOCABULARIO:
+        palabras.add("".join(rnd.choice(SILABAS) for _ in range(rnd.randint(2, 4))))
+    return sorted(palabras, key=lambda p: rnd.random())
+
+
+def poblar(n_tareas, palabras, semilla=7):
+    rnd = random.Random(semilla)
+    pesos = [1 / (k + 1) for k in range(len(palabras))]  # Zipf: la k-ésima, 1/k
+    roles = list(RolEnum)
+    conn = db.session.connection()
+    conn.execute(Usuario.__table__.insert(), [{"alias": "u", "nombre": "U"}])
+    for base in range(1, n_tareas + 1, CHUNK):
+        ids = range(base, min(base + CHUNK, n_tareas + 1))
+        texto = iter(rnd.choices(palabras, pesos, k=len(ids) * 15))
+        conn.execute(Tarea.__table__.insert(), [
+            {
+                "id": i,
+                "nombre": " ".join(next(texto) for _ in range(3)),
+                "descripcion": " ".join(next(texto) for _ in range(12)),
+            }
+            for i in ids
+        ])
+        conn.execute(Asignacion.__table__.insert(), [
+            {"usuario_alias": "u", "tarea_id": i, "rol": rnd.choice(roles)} for i in ids
+        ])
+    db.session.commit()
+
+
+def medir(fn, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return {
+        "media_ms": round(statistics.mean(tiempos), 2),
+        "p95_ms": round(tiempos[max(int(len(tiempos) * 0.95) - 1, 0)], 2),
+    }
+
+
+def busqueda_like(terminos):
+    condicion = " AND ".join(
+        f"(nombre LIKE :t{k} OR descripcion LIKE :t{k})" for k in range(len(terminos))
+    )
+    sql = text(f"SELECT id, nombre, estado FROM tarea WHERE {condicion} ORDER BY id LIMIT {LIMITE}")
+    params = {f"t{k}": f"%{t}%" for k, t in enumerate(terminos)}
+
+    def fn():
+        db.session.execute(sql, params).fetchall()
+    return fn
+
+
+def busqueda_fts(terminos):
+    q = " ".join(terminos)
+
+    def fn():
+        dh.buscar_tareas(q, limite=LIMITE)
+    return fn
+
+
+def correr(n_tareas, repeticiones, tmp):
+    app = create_app("produccion")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/busqueda_{n_tareas}.db"
+    palabras = _vocabulario(random.Random(3))
+    consultas = {
+        "frecuente": [palabras[0]],
+        "intermedio": [palabras[200]],
+        "raro": [palabras[-1]],
+        "dos_palabras": [palabras[10], palabras[50]],
+    }
+    resultado = {}
+    with app.app_context():
+        db.create_all()
+        inicio = time.perf_counter()
+        poblar(n_tareas, palabras)
+        resultado["carga_s"] = round(time.perf_counter() - inicio, 1)
+        for nombre, terminos in consultas.items():
+            # El LIKE recorre la tabla entera cuando hay pocas coincidencias
+            resultado[nombre] = {
+                "coincidencias": db.session.execute(
+                    text("SELECT count(*) FROM tarea_fts WHERE tarea_fts MATCH :q"),
+                    {"q": " ".join(f'"{t}"*' for t in terminos)},
+                ).scalar(),
+                "fts": medir(busqueda_fts(terminos), repeticiones),
+                "like": medir(busqueda_like(terminos), max(3, repeticiones // 20)),
+            }
+        db.session.remove()
+        db.engine.dispose()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tareas", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados = {n: correr(n, args.repeticiones, tmp) for n in args.tareas}
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Prueba de estrés multihilo: lecturas/escrituras separadas y reintento ante
+el lock de SQLite (src.utils.conexiones, data_handler._reintentable).
+
+Perfil producción (WAL) sobre un archivo temporal. En cada uno de P
+procesos (workers que comparten la base), E hilos escriben (crear_tarea y
+cambio de estado) y L hilos leen como peticiones GET (la lista completa de
+tareas de un usuario, una lectura larga) durante S s, en dos escenarios:
+
+    antes    motor único, sin reintentos (REINTENTO_PLAZO = 0)
+    despues  CONEXIONES_SEPARADAS + reintentos
+
+Con --busy-ms 0 (por defecto) SQLite no espera el lock: "database is
+locked" sale en el acto, como en una base sin busy_timeout. Reporta
+operaciones por segundo y tasa de error de cada lado.
+
+Uso:
+    python benchmarks/bench_conexiones.py [--procesos 2] [--escritores 8] [--lectores 4]
+                                          [--segundos 5] [--busy-ms 0]
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import create_app, db  # noqa: E402
+from src import data_handler as dh  # noqa: E402
+from src.config import Config  # noqa: E402
+
+PREVIAS = 2000  # tareas de eva antes de empezar (lectura larga)
+
+
+def escritor(app, fin, cuenta, k):
+    with app.app_context():
+        while time.perf_counter() < fin:
+            try:
+                tid = dh.crear_tarea(f"T{k}", ".", f"u{k}", "infra")["id"]
+                dh.cambiar_estado(tid, "EN_PROGRESO")
+                cuenta["escrituras"] += 2
+            except Exception as e:  # noqa: BLE001
+                cuenta[f"error_escritura:{type(e).__name__}"] += 1
+        db.session.remove()
+
+
+def lector(app, fin, cuenta):
+    with app.test_request_context("/usuarios/mialias=eva", method="GET"):
+        app.preprocess_request()
+        while time.perf_counter() < fin:
+            try:
+                dh.tareas_de_usuario("eva")
+                cuenta["lecturas"] += 1
+            except Exception as e:  # noqa: BLE001
+                cuenta[f"error_lectura:{type(e).__name__}"] += 1
+        app.do_teardown_request()
+
+
+def crear(separadas, args, tmp):
+    Config.CONEXIONES_SEPARADAS = separadas
+    app = create_app("produccion")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/{separadas}.db"
+    app.config["SQLITE_PRAGMAS"] = {**app.config["SQLITE_PRAGMAS"], "busy_timeout": args.busy_ms}
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **app.config["SQLALCHEMY_ENGINE_OPTIONS"],
+        "connect_args": {"check_same_thread": False, "timeout": args.busy_ms / 1000},
+    }
+    if not separadas:
+        app.config["REINTENTO_PLAZO"] = 0
+    return app
+
+
+def worker(separadas, args, tmp, fin, salida):
+    """Un proceso: sus hilos escritores y lectores hasta `fin`."""
+    app = crear(separadas, args, tmp)
+    cuenta: Counter = Counter()
+    hilos = [threading.Thread(target=escritor, args=(app, fin, cuenta, k))
+             for k in range(args.escritores)]
+    hilos += [threading.Thread(target=lector, args=(app, fin, cuenta))
+              for _ in range(args.lectores)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    salida.put(dict(cuenta))
+
+
+def escenario(separadas, args, tmp):
+    app = crear(separadas, args, tmp)
+    with app.app_context():
+        db.create_all()
+        for k in range(args.escritores):
+            dh.crear_usuario(f"u{k}", f"U{k}")
+        dh.crear_usuario("eva", "Eva")
+        dh.crear_tareas([
+            {"nombre": f"P{i}", "descripcion": ".", "usuario": "eva", "rol": "infra"}
+            for i in range(PREVIAS)
+        ])
+        db.session.remove()
+        db.engine.dispose()  # sin conexiones abiertas al hacer fork
+
+    salida = multiprocessing.Queue()
+    fin = time.perf_counter() + args.segundos
+    procesos = [
+        multiprocessing.Process(target=worker, args=(separadas, args, tmp, fin, salida))
+        for _ in range(args.procesos)
+    ]
+    for p in procesos:
+        p.start()
+    cuenta: Counter = Counter()
+    for _ in procesos:
+        cuenta.update(salida.get())
+    for p in procesos:
+        p.join()
+
+    errores_e = sum(n for c, n in cuenta.items() if c.startswith("error_escritura"))
+    errores_l = sum(n for c, n in cuenta.items() if c.startswith("error_lectura"))
+    return {
+        "escrituras_por_s": round(cuenta["escrituras"] / args.segundos, 1),
+        "error_escritura_pct": round(
+            100 * errores_e / max(1, errores_e + cuenta["escrituras"]), 2
+        ),
+        "lecturas_por_s": round(cuenta["lecturas"] / args.segundos, 1),
+        "error_lectura_pct": round(100 * errores_l / max(1, errores_l + cuenta["lecturas"]), 2),
+        "errores": {c: n for c, n in cuenta.items() if c.startswith("error")},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--procesos", type=int, default=2)
+    parser.add_argument("--escritores", type=int, default=8)
+    parser.add_argument("--lectores", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--busy-ms", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados = {
+            "antes": escenario(False, args, tmp),
+            "despues": escenario(True, args, tmp),
+        }
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: detalle de tareas con relaciones (src.data_handler.detalle_tareas).
+
+Por el test client de Flask sobre SQLite, con un grafo en capas (cada
+tarea depende de `--grado` tareas de la capa anterior). Una "página" de
+`--pagina` tareas se arma de dos formas:
+
+  por_tarea  → GET /tasks/<id> + /upstream?depth=1 + /downstream?depth=1
+               por cada tarea (lo que hacía la UI)
+  en_lote    → un solo GET /tasks?ids=…&include=asignaciones,dependencias,
+               referenciada_por
+
+Reporta ms por página, peticiones HTTP y sentencias SQL (Server-Timing).
+La caché de respuestas se vacía antes de cada página.
+
+Uso:
+    python benchmarks/bench_detalle.py [--tareas 2000] [--pagina 50] [--grado 3]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import data_handler as dh  # noqa: E402
+from src import db  # noqa: E402
+from src.controller import app  # noqa: E402
+from src.repositorios import crear_repositorio  # noqa: E402
+
+CAPA = 100  # tareas por capa del grafo
+
+
+def poblar(n, grado):
+    dh.crear_usuario("eva", "Eva")
+    ids = [r["id"] for r in dh.crear_tareas([
+        {"nombre": f"T{i}", "descripcion": ".", "usuario": "eva", "rol": "infra"}
+        for i in range(n)
+    ])]
+    rnd = random.Random(0)
+    aristas = [
+        {"tarea_id": t, "dependencytaskid": d, "accion": "adicionar"}
+        for k, t in enumerate(ids) if k >= CAPA
+        for d in rnd.sample(ids[(k // CAPA - 1) * CAPA:(k // CAPA) * CAPA], grado)
+    ]
+    dh.gestionar_dependencias(aristas)
+    return ids
+
+
+def pedir(client, url):
+    resp = client.get(url)
+    assert resp.status_code == 200, resp.get_json()
+    return int(re.search(r'desc="(\d+) queries"', resp.headers["Server-Timing"]).group(1))
+
+
+def pagina_por_tarea(client, ids):
+    sentencias = 0
+    for t in ids:
+        for sufijo in ("", "/upstream?depth=1", "/downstream?depth=1"):
+            sentencias += pedir(client, f"/tasks/{t}{sufijo}")
+    return 3 * len(ids), sentencias
+
+
+def pagina_en_lote(client, ids):
+    incluir = "asignaciones,dependencias,referenciada_por"
+    return 1, pedir(client, f"/tasks?ids={','.join(map(str, ids))}&include={incluir}")
+
+
+def medir(client, paginas, armar):
+    inicio = time.perf_counter()
+    peticiones = sentencias = 0
+    for ids in paginas:
+        app.extensions["cache_respuestas"].limpiar()
+        p, s = armar(client, ids)
+        peticiones += p
+        sentencias += s
+    return {
+        "ms_por_pagina": round((time.perf_counter() - inicio) / len(paginas) * 1e3, 2),
+        "peticiones_por_pagina": peticiones // len(paginas),
+        "sentencias_por_pagina": round(sentencias / len(paginas), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tareas", type=int, default=2000)
+    parser.add_argument("--pagina", type=int, default=50)
+    parser.add_argument("--grado", type=int, default=3)
+    parser.add_argument("--rondas", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/detalle.db"
+        app.config["METRICAS_ACTIVAS"] = True
+        app.extensions["repositorio"] = crear_repositorio("sql")
+        with app.app_context():
+            db.create_all()
+            ids = poblar(args.tareas, args.grado)
+        client = app.test_client()
+        rnd = random.Random(1)
+        paginas = [
+            sorted(rnd.sample(ids[CAPA:], args.pagina)) for _ in range(args.rondas)
+        ]
+        pagina_en_lote(client, paginas[0])  # calentamiento
+
+        resultados = {
+            "tareas": args.tareas,
+            "pagina": args.pagina,
+            "por_tarea": medir(client, paginas, pagina_por_tarea),
+            "en_lote": medir(client, paginas, pagina_en_lote),
+        }
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
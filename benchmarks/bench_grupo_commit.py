@@ -0,0 +1,112 @@
+"""
+Benchmark: escrituras concurrentes con y sin group commit (GRUPO_COMMIT).
+
+N hilos llaman a la capa de servicio a la vez: crear_usuario y
+cambiar_estado (NUEVA ↔ EN_PROGRESO sobre una tarea propia). Se mide
+ops/s, latencia p50/p99 y errores (p. ej. "database is locked"), en los
+perfiles "desarrollo" (journal clásico, fsync por commit) y "produccion"
+(WAL, synchronous=NORMAL).
+
+Uso:
+    python benchmarks/bench_grupo_commit.py [--hilos 16] [--ops 100]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import data_handler as dh  # noqa: E402
+from src import db  # noqa: E402
+from src.config import PERFILES  # noqa: E402
+from src.controller import app  # noqa: E402
+from src.repositorios import crear_repositorio  # noqa: E402
+from src.utils.cola_escritura import ColaEscritura  # noqa: E402
+
+
+def _trabajador(k, n_ops, tarea_id, latencias, errores):
+    estados = ("EN_PROGRESO", "NUEVA")
+    with app.app_context():
+        for i in range(n_ops):
+            inicio = time.perf_counter()
+            try:
+                if i % 2:
+                    dh.cambiar_estado(tarea_id, estados[(i // 2) % 2])
+                else:
+                    dh.crear_usuario(f"w{k}_{i}", "W")
+            except Exception:
+                errores.append(1)
+                continue
+            latencias.append(time.perf_counter() - inicio)
+        db.session.remove()
+
+
+def correr(perfil, grupo, n_hilos, n_ops, tmp):
+    app.config.from_object(PERFILES[perfil])
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/{perfil}_{grupo}.db"
+    app.extensions["repositorio"] = crear_repositorio("sql")
+    app.extensions["cache_respuestas"].max_entradas = 0
+    with app.app_context():
+        db.create_all()
+        dh.crear_usuario("dueño", "D")
+        tareas = [
+            dh.crear_tarea(f"T{k}", ".", "dueño", "infra")["id"] for k in range(n_hilos)
+        ]
+        cola = ColaEscritura(app, PERFILES[perfil].GRUPO_COMMIT_LOTE,
+                             PERFILES[perfil].GRUPO_COMMIT_ESPERA) if grupo else None
+
+        latencias, errores = [], []
+        hilos = [
+            threading.Thread(target=_trabajador, args=(k, n_ops, tareas[k], latencias, errores))
+            for k in range(n_hilos)
+        ]
+        inicio = time.perf_counter()
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        total = time.perf_counter() - inicio
+
+        resultado = {
+            "ops_s": round(len(latencias) / total, 1),
+            "p50_ms": 0.0, "p99_ms": 0.0,
+            "errores": len(errores),
+        }
+        if latencias:
+            latencias.sort()
+            resultado["p50_ms"] = round(latencias[len(latencias) // 2] * 1000, 2)
+            resultado["p99_ms"] = round(latencias[int(len(latencias) * 0.99) - 1] * 1000, 2)
+        if cola is not None:
+            cola.cerrar()
+            del app.extensions["cola_escritura"]
+            resultado["ops_por_lote"] = round(cola.operaciones / cola.lotes, 1)
+        db.session.remove()
+        db.engine.dispose()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hilos", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=100, help="operaciones por hilo")
+    args = parser.parse_args()
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for perfil in ("desarrollo", "produccion"):
+            resultados[perfil] = {
+                "sin_grupo": correr(perfil, False, args.hilos, args.ops, tmp),
+                "grupo_commit": correr(perfil, True, args.hilos, args.ops, tmp),
+            }
+    print(json.dumps({"hilos": args.hilos, **resultados}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
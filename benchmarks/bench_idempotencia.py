@@ -0,0 +1,83 @@
+"""
+Benchmark: POST /tasks con Idempotency-Key (src.utils.idempotencia).
+
+Por el test client de Flask sobre SQLite: altas sin clave, altas con clave
+nueva (reserva + guardado de la respuesta), reintentos con clave ya usada
+(la respuesta guardada, sin capa de servicio) y lo mismo con la tabla
+`idempotencia` (IDEMPOTENCIA_SQL). Reporta µs por petición y cuántas
+tareas quedaron creadas.
+
+Uso:
+    python benchmarks/bench_idempotencia.py [--peticiones 2000]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import data_handler as dh  # noqa: E402
+from src import db  # noqa: E402
+from src.config import PERFILES  # noqa: E402
+from src.controller import app  # noqa: E402
+from src.repositorios import crear_repositorio  # noqa: E402
+from src.utils.idempotencia import AlmacenIdempotencia  # noqa: E402
+
+CUERPO = json.dumps({"nombre": "T", "descripcion": ".", "usuario": "eva", "rol": "infra"})
+
+
+def ronda(client, claves):
+    """µs por POST /tasks, una petición por clave (None = sin cabecera)."""
+    inicio = time.perf_counter()
+    for clave in claves:
+        cabeceras = {"Idempotency-Key": clave} if clave else {}
+        resp = client.post("/tasks", data=CUERPO, content_type="application/json",
+                           headers=cabeceras)
+        assert resp.status_code == 201
+    return round((time.perf_counter() - inicio) / len(claves) * 1e6, 1)
+
+
+def medir(client, n, prefijo):
+    claves = [f"{prefijo}-{k}" for k in range(n)]
+    return {
+        "sin_clave_us": ronda(client, [None] * n),
+        "clave_nueva_us": ronda(client, claves),
+        "reintento_us": ronda(client, claves),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peticiones", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app.config.from_object(PERFILES["produccion"])
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/idempotencia.db"
+        app.extensions["repositorio"] = crear_repositorio("sql")
+        with app.app_context():
+            db.create_all()
+            dh.crear_usuario("eva", "Eva")
+        client = app.test_client()
+        ronda(client, [None] * (args.peticiones // 10))  # calentamiento
+
+        resultados = {"en_proceso": medir(client, args.peticiones, "mem")}
+        app.extensions["idempotencia"] = AlmacenIdempotencia(persistir=True)
+        resultados["con_tabla"] = medir(client, args.peticiones, "sql")
+        with app.app_context():
+            resultados["tareas_creadas"] = db.session.execute(
+                "SELECT COUNT(*) FROM tarea"
+            ).scalar()
+            db.session.remove()
+            db.engine.dispose()
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: sobrecarga del perfilado por petición (src.utils.perfilado).
+
+Peticiones GET /tasks/<id> (caché desactivada: cada una llega a SQLite) y
+GET /usuarios/mialias=<alias> por el test client de Flask, sin perfilador
+(como queda sin PERFILADO_DIRECTORIO) y con él a distintas tasas de
+muestreo, alternando las tasas en cada ronda para que el ruido de la
+máquina las afecte por igual. Reporta µs por petición, la sobrecarga
+respecto de la base, cuántos perfiles se volcaron y el costo aislado de
+los hooks en una petición sin perfil.
+
+Uso:
+    python benchmarks/bench_perfilado.py [--peticiones 2000] [--muestreo 0 0.01 0.1 1]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import data_handler as dh  # noqa: E402
+from src import db  # noqa: E402
+from src.config import PERFILES  # noqa: E402
+from src.controller import app  # noqa: E402
+from src.repositorios import crear_repositorio  # noqa: E402
+from src.utils.perfilado import Perfilador  # noqa: E402
+
+RONDAS = 5
+
+
+def ronda(client, urls, n):
+    """µs por petición en n peticiones."""
+    inicio = time.perf_counter()
+    for k in range(n):
+        resp = client.get(urls[k % len(urls)])
+        assert resp.status_code == 200
+    return (time.perf_counter() - inicio) / n * 1e6
+
+
+def costo_hooks(perfilador, n=100_000):
+    """µs de before + after_request cuando la petición no se perfila."""
+    with app.test_request_context("/tasks/1"):
+        respuesta = app.response_class("")
+        inicio = time.perf_counter()
+        for _ in range(n):
+            perfilador._iniciar_peticion()
+            perfilador._cerrar_peticion(respuesta)
+        return round((time.perf_counter() - inicio) / n * 1e6, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peticiones", type=int, default=2000)
+    parser.add_argument("--muestreo", type=float, nargs="+", default=[0.0, 0.01, 0.1, 1.0])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app.config.from_object(PERFILES["produccion"])
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/perfilado.db"
+        app.extensions["repositorio"] = crear_repositorio("sql")
+        app.extensions["cache_respuestas"].max_entradas = 0
+        with app.app_context():
+            db.create_all()
+            dh.crear_usuario("eva", "Eva")
+            ids = [dh.crear_tarea(f"T{k}", ".", "eva", "infra")["id"] for k in range(50)]
+        urls = [f"/tasks/{i}" for i in ids] + ["/usuarios/mialias=eva"]
+        client = app.test_client()
+
+        ronda(client, urls, args.peticiones // 10)  # calentamiento
+        base = statistics.median(ronda(client, urls, args.peticiones) for _ in range(RONDAS))
+        resultados = {"sin_perfilador_us": round(base, 1)}
+
+        app.config["PERFILADO_DIRECTORIO"] = f"{tmp}/perfiles"
+        perfilador = Perfilador(app)
+        resultados["hooks_sin_perfil_us"] = costo_hooks(perfilador)
+        tiempos = {tasa: [] for tasa in args.muestreo}
+        perfiles = dict.fromkeys(args.muestreo, 0)
+        for _ in range(RONDAS):
+            for tasa in args.muestreo:
+                app.config["PERFILADO_MUESTREO"] = tasa
+                previas = perfilador.capturas
+                tiempos[tasa].append(ronda(client, urls, args.peticiones))
+                perfiles[tasa] += perfilador.capturas - previas
+        for tasa in args.muestreo:
+            us = statistics.median(tiempos[tasa])
+            resultados[f"muestreo_{tasa}"] = {
+                "us": round(us, 1),
+                "sobrecarga_pct": round((us - base) / base * 100, 1),
+                "perfiles": perfiles[tasa],
+            }
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: GET /schedule y GET /tasks/<id>/critical-path (capa de servicio)
+sobre DAGs sintéticos de N tareas (cada una depende de hasta 3 de las 1000
+anteriores, 5 % sin estimar). Separa la lectura (una consulta) del cálculo
+(planificar, O(V + E)) y lo compara con recorrer Tarea.dependencias por el
+ORM (una consulta perezosa por tarea).
+
+Uso:
+    python benchmarks/bench_planificacion.py [--tareas 10000 100000] [--repeticiones 5]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import create_app, db  # noqa: E402
+from src import data_handler as dh  # noqa: E402
+from src.grafo import planificar  # noqa: E402
+from src.models.asignacion import Asignacion  # noqa: E402
+from src.models.dependencia import dependencia  # noqa: E402
+from src.models.enums import RolEnum  # noqa: E402
+from src.models.tarea import Tarea  # noqa: E402
+from src.models.usuario import Usuario  # noqa: E402
+from src.repositorios import repositorio  # noqa: E402
+
+CHUNK = 50_000
+VENTANA = 1000
+
+
+def poblar(n_tareas, semilla=7):
+    rnd = random.Random(semilla)
+    conn = db.session.connection()
+    conn.execute(Usuario.__table__.insert(), [{"alias": "u", "nombre": "U"}])
+    for base in range(1, n_tareas + 1, CHUNK):
+        ids = range(base, min(base + CHUNK, n_tareas + 1))
+        conn.execute(Tarea.__table__.insert(), [
+            {"id": i, "nombre": f"T{i}", "descripcion": ".",
+             "duracion": None if rnd.random() < 0.05 else rnd.randint(1, 10)}
+            for i in ids
+        ])
+        conn.execute(Asignacion.__table__.insert(), [
+            {"usuario_alias": "u", "tarea_id": i, "rol": RolEnum.INFRA} for i in ids
+        ])
+        aristas = {
+            (i, rnd.randint(max(1, i - VENTANA), i - 1))
+            for i in ids if i > 1 for _ in range(rnd.randint(0, 3))
+        }
+        if aristas:
+            conn.execute(dependencia.insert(), [
+                {"tarea_id": t, "depende_de_id": d} for t, d in aristas
+            ])
+    db.session.commit()
+
+
+def medir(fn, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        db.session.remove()  # cada medición con una sesión nueva
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return {"media_ms": round(statistics.mean(tiempos), 1), "min_ms": round(min(tiempos), 1)}
+
+
+def fin_por_orm(tarea_id):
+    """Fin temprano recorriendo tarea.dependencias (lazy load por tarea)."""
+    memo = {}
+    pila = [db.session.get(Tarea, tarea_id)]
+    while pila:
+        tarea = pila[-1]
+        faltan = [d for d in tarea.dependencias if d.id not in memo]
+        if faltan:
+            pila.extend(faltan)
+            continue
+        pila.pop()
+        inicio = max((memo[d.id] for d in tarea.dependencias), default=0)
+        memo[tarea.id] = inicio + (tarea.duracion or 0)
+    return memo[tarea_id]
+
+
+def correr(n_tareas, repeticiones, tmp):
+    app = create_app("produccion")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/plan_{n_tareas}.db"
+    resultado = {}
+    with app.app_context():
+        db.create_all()
+        poblar(n_tareas)
+        resultado["aristas"] = db.session.query(dependencia).count()
+
+        filas = repositorio().grafo_planificacion()
+        plan, duraciones, _ = dh._plan(filas)
+        aristas = [(t, d) for t, _, _, d in filas if d is not None]
+        ultima = max(plan.temprano, key=lambda t: plan.temprano[t] + duraciones[t])
+        mitad = n_tareas // 2
+        resultado["ancestros_mitad"] = len(dh.camino_critico(mitad)["tareas"])
+
+        resultado["leer_grafo"] = medir(lambda: repositorio().grafo_planificacion(), repeticiones)
+        resultado["planificar"] = medir(lambda: planificar(duraciones, aristas), repeticiones)
+        resultado["cronograma"] = medir(dh.cronograma, repeticiones)
+        resultado["camino_critico_final"] = medir(lambda: dh.camino_critico(ultima), repeticiones)
+        resultado["camino_critico_mitad"] = medir(lambda: dh.camino_critico(mitad), repeticiones)
+        resultado["orm_fin_final"] = medir(lambda: fin_por_orm(ultima), 1)
+        assert fin_por_orm(ultima) == dh.camino_critico(ultima)["duracion_total"]
+
+        db.session.remove()
+        db.engine.dispose()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tareas", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados = {n: correr(n, args.repeticiones, tmp) for n in args.tareas}
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: throughput de la capa de servicio con cada repositorio
+(SQLite "desarrollo", SQLite "produccion" y "memoria").
+
+Mide operaciones/s llamando a src.data_handler directamente (sin HTTP) y
+una mezcla por HTTP con el test client de Flask, sobre la misma carga.
+
+Uso:
+    python benchmarks/bench_repositorio.py [--tareas 2000] [--usuarios 50]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import data_handler as dh  # noqa: E402
+from src import db  # noqa: E402
+from src.config import PERFILES  # noqa: E402
+from src.controller import app  # noqa: E402
+from src.repositorios import crear_repositorio  # noqa: E402
+
+
+def _medir(resultados, nombre, n, fn):
+    inicio = time.perf_counter()
+    fn()
+    segundos = time.perf_counter() - inicio
+    resultados[nombre] = round(n / segundos, 1)
+
+
+def servicio(n_tareas, n_usuarios, semilla=7):
+    """ops/s por operación de data_handler."""
+    rnd = random.Random(semilla)
+    aliases = [f"u{i}" for i in range(n_usuarios)]
+    r = {}
+
+    _medir(r, "crear_usuario", n_usuarios,
+           lambda: [dh.crear_usuario(a, a.upper()) for a in aliases])
+    ids = []
+    _medir(r, "crear_tarea", n_tareas, lambda: ids.extend(
+        dh.crear_tarea(f"T{i}", ".", rnd.choice(aliases), "programador")["id"]
+        for i in range(n_tareas)
+    ))
+    aristas = [(ids[i], ids[rnd.randrange(i)]) for i in range(1, n_tareas)]
+    _medir(r, "gestionar_dependencia", len(aristas),
+           lambda: [dh.gestionar_dependencia(t, d, "adicionar") for t, d in aristas])
+    _medir(r, "gestionar_usuario_en_tarea", n_tareas, lambda: [
+        dh.gestionar_usuario_en_tarea(t, rnd.choice(aliases), "pruebas", "adicionar")
+        for t in ids
+    ])
+    _medir(r, "cambiar_estado", n_tareas,
+           lambda: [dh.cambiar_estado(t, "EN_PROGRESO") for t in ids])
+    _medir(r, "obtener_tarea", n_tareas, lambda: [dh.obtener_tarea(t) for t in ids])
+    _medir(r, "tareas_de_usuario", n_usuarios,
+           lambda: [dh.tareas_de_usuario(a, limite=100) for a in aliases])
+    _medir(r, "clausura", 200, lambda: [
+        dh.clausura(rnd.choice(ids), "upstream", 3) for _ in range(200)
+    ])
+    _medir(r, "tareas_listas", 200, lambda: [dh.tareas_listas(100) for _ in range(200)])
+    return r
+
+
+def http(n_tareas, n_usuarios):
+    """ops/s de una mezcla escritura/lectura por HTTP (test client, sin caché)."""
+    cliente = app.test_client()
+    aliases = [f"h{i}" for i in range(n_usuarios)]
+    for a in aliases:
+        cliente.post("/usuarios", json={"contacto": a, "nombre": a})
+
+    inicio = time.perf_counter()
+    ids = []
+    for i in range(n_tareas):
+        alias = aliases[i % n_usuarios]
+        ids.append(cliente.post("/tasks", json={
+            "nombre": f"H{i}", "descripcion": ".", "usuario": alias, "rol": "infra",
+        }).get_json()["id"])
+        if i:
+            cliente.post(f"/tasks/{ids[-1]}/dependencies",
+                         json={"dependencytaskid": ids[-2], "accion": "adicionar"})
+        cliente.post(f"/tasks/{ids[-1]}", json={"estado": "EN_PROGRESO"})
+        cliente.get(f"/tasks/{ids[-1]}")
+        cliente.get(f"/usuarios/mialias={alias}?limit=50")
+    return round(5 * n_tareas / (time.perf_counter() - inicio), 1)
+
+
+def correr(perfil, n_tareas, n_usuarios, tmp):
+    # Las rutas viven en src.controller.app: se reconfigura esa app por perfil
+    app.config.from_object(PERFILES[perfil])
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/{perfil}.db"
+    app.extensions["repositorio"] = crear_repositorio(app.config["REPOSITORIO"])
+    app.extensions["cache_respuestas"].max_entradas = 0  # medir el repositorio, no la caché
+    with app.app_context():
+        db.create_all()
+        resultado = {
+            "servicio_ops_s": servicio(n_tareas, n_usuarios),
+            "http_ops_s": http(n_tareas, n_usuarios),
+        }
+        db.session.remove()
+        db.engine.dispose()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tareas", type=int, default=2000)
+    parser.add_argument("--usuarios", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados = {
+            p: correr(p, args.tareas, args.usuarios, tmp)
+            for p in ("desarrollo", "produccion", "memoria")
+        }
+    print(json.dumps({"tareas": args.tareas, **resultados}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
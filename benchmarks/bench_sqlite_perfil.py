@@ -0,0 +1,146 @@
+"""
+Benchmark: esquema/perfil anterior (sin índices secundarios, SQLite por
+defecto) frente al perfil "produccion" con índices secundarios, sobre un
+conjunto sintético.
+
+Uso:
+    python benchmarks/bench_sqlite_perfil.py [--tareas 1000000] [--repeticiones 2000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import text  # noqa: E402
+
+from src import create_app, db  # noqa: E402
+from src.models.asignacion import Asignacion  # noqa: E402
+from src.models.dependencia import dependencia  # noqa: E402
+from src.models.enums import EstadoEnum, RolEnum  # noqa: E402
+from src.models.tarea import Tarea  # noqa: E402
+from src.models.usuario import Usuario  # noqa: E402
+
+INDICES_NUEVOS = ("ix_asignacion_tarea_id", "ix_dependencia_depende_de_id", "ix_tarea_estado")
+CHUNK = 50_000
+
+
+def poblar(n_tareas, semilla=7):
+    rnd = random.Random(semilla)
+    conn = db.session.connection()
+    conn.execute(
+        Usuario.__table__.insert(),
+        [{"alias": f"u{i}", "nombre": f"U{i}"} for i in range(1000)],
+    )
+    estados = list(EstadoEnum)
+    roles = list(RolEnum)
+    for base in range(1, n_tareas + 1, CHUNK):
+        ids = range(base, min(base + CHUNK, n_tareas + 1))
+        conn.execute(
+            Tarea.__table__.insert(),
+            [
+                {"id": i, "nombre": f"T{i}", "descripcion": ".", "estado": rnd.choice(estados)}
+                for i in ids
+            ],
+        )
+        conn.execute(
+            Asignacion.__table__.insert(),
+            [
+                {"usuario_alias": f"u{rnd.randrange(1000)}", "tarea_id": i, "rol": rnd.choice(roles)}
+                for i in ids
+            ],
+        )
+        conn.execute(
+            dependencia.insert(),
+            [{"tarea_id": i, "depende_de_id": rnd.randrange(1, i)} for i in ids if i > 1],
+        )
+    db.session.commit()
+
+
+def medir(fn, repeticiones):
+    tiempos = []
+    for k in range(repeticiones):
+        inicio = time.perf_counter()
+        fn(k)
+        tiempos.append((time.perf_counter() - inicio) * 1e6)
+    tiempos.sort()
+    return {
+        "media_us": round(statistics.mean(tiempos), 1),
+        "p95_us": round(tiempos[int(len(tiempos) * 0.95) - 1], 1),
+    }
+
+
+def escenarios(n_tareas, repeticiones):
+    rnd = random.Random(11)
+    ids = [rnd.randrange(1, n_tareas + 1) for _ in range(repeticiones)]
+    motor = db.engine
+
+    def lectura(sql):
+        def fn(k):
+            with motor.connect() as conn:
+                conn.execute(text(sql), {"id": ids[k]}).fetchall()
+        return fn
+
+    def escritura(k):
+        with motor.begin() as conn:
+            conn.execute(
+                text("UPDATE tarea SET descripcion = :d WHERE id = :id"),
+                {"d": f"v{k}", "id": ids[k]},
+            )
+
+    def conteo(k):
+        with motor.connect() as conn:
+            conn.execute(text("SELECT count(*) FROM tarea WHERE estado = 'EN_PROGRESO'")).scalar()
+
+    return {
+        "usuarios_de_tarea": medir(
+            lectura("SELECT usuario_alias, rol FROM asignacion WHERE tarea_id = :id"), repeticiones
+        ),
+        "dependientes_de_tarea": medir(
+            lectura("SELECT tarea_id FROM dependencia WHERE depende_de_id = :id"), repeticiones
+        ),
+        "conteo_por_estado": medir(conteo, max(5, repeticiones // 100)),
+        "commit_unitario": medir(escritura, max(50, repeticiones // 4)),
+    }
+
+
+def correr(perfil, indices, n_tareas, repeticiones, tmp):
+    app = create_app(perfil)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/{perfil}.db"
+    with app.app_context():
+        db.create_all()
+        if not indices:
+            for nombre in INDICES_NUEVOS:
+                db.session.execute(text(f"DROP INDEX {nombre}"))
+            db.session.commit()
+        inicio = time.perf_counter()
+        poblar(n_tareas)
+        carga = time.perf_counter() - inicio
+        resultado = {"carga_s": round(carga, 1), **escenarios(n_tareas, repeticiones)}
+        db.session.remove()
+        db.engine.dispose()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tareas", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        antes = correr("desarrollo", False, args.tareas, args.repeticiones, tmp)
+        despues = correr("produccion", True, args.tareas, args.repeticiones, tmp)
+    print(json.dumps({"tareas": args.tareas, "antes": antes, "despues": despues}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
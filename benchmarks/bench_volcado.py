@@ -0,0 +1,128 @@
+"""
+Benchmark: GET /export y POST /import (capa de servicio, sin HTTP) sobre
+N tareas sintéticas con asignaciones y dependencias. Mide tiempo, tamaño
+del volcado (plano y gzip) y el pico de memoria Python (tracemalloc, en
+una segunda pasada para no distorsionar el tiempo) de cada fase, para
+comprobar que no crece con N.
+
+Uso:
+    python benchmarks/bench_volcado.py [--tareas 100000 1000000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import create_app, db  # noqa: E402
+from src import data_handler as dh  # noqa: E402
+from src.models.asignacion import Asignacion  # noqa: E402
+from src.models.dependencia import dependencia  # noqa: E402
+from src.models.enums import EstadoEnum, RolEnum  # noqa: E402
+from src.models.tarea import Tarea  # noqa: E402
+from src.models.usuario import Usuario  # noqa: E402
+from src.utils.volcado import comprimir, en_trozos, leer_lineas  # noqa: E402
+
+CHUNK = 50_000
+
+
+def poblar(n_tareas, semilla=7):
+    rnd = random.Random(semilla)
+    conn = db.session.connection()
+    conn.execute(
+        Usuario.__table__.insert(),
+        [{"alias": f"u{i}", "nombre": f"U{i}"} for i in range(1000)],
+    )
+    for base in range(1, n_tareas + 1, CHUNK):
+        ids = range(base, min(base + CHUNK, n_tareas + 1))
+        conn.execute(Tarea.__table__.insert(), [
+            {"id": i, "nombre": f"Tarea {i}", "descripcion": "Descripción de prueba",
+             "estado": rnd.choice(list(EstadoEnum))}
+            for i in ids
+        ])
+        conn.execute(Asignacion.__table__.insert(), [
+            {"usuario_alias": f"u{rnd.randrange(1000)}", "tarea_id": i,
+             "rol": rnd.choice(list(RolEnum))}
+            for i in ids
+        ])
+        # Sólo hacia ids menores: acíclico
+        conn.execute(dependencia.insert(), [
+            {"tarea_id": i, "depende_de_id": rnd.randrange(1, i)} for i in ids if i > 1
+        ])
+    db.session.commit()
+
+
+def fase(fn):
+    """fn(pasada) dos veces: la primera cronometrada, la segunda con tracemalloc."""
+    inicio = time.perf_counter()
+    resultado = fn(0)
+    segundos = time.perf_counter() - inicio
+    tracemalloc.start()
+    fn(1)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, {"s": round(segundos, 2), "pico_mb": round(pico / 2**20, 1)}
+
+
+def correr(n_tareas, tmp):
+    origen = create_app("produccion")
+    origen.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/origen_{n_tareas}.db"
+    archivo = Path(tmp) / f"volcado_{n_tareas}.ndjson.gz"
+    resultado = {}
+    with origen.app_context():
+        db.create_all()
+        poblar(n_tareas)
+
+        def exportar(comprimido, pasada):
+            destino = archivo if comprimido else archivo.with_suffix("")
+            trozos = en_trozos(dh.exportar())
+            with open(destino, "wb") as salida:
+                for trozo in comprimir(trozos) if comprimido else trozos:
+                    salida.write(trozo)
+            return destino.stat().st_size
+
+        tam, resultado["exportar"] = fase(lambda p: exportar(False, p))
+        resultado["exportar"]["mb"] = round(tam / 2**20, 1)
+        tam, resultado["exportar_gzip"] = fase(lambda p: exportar(True, p))
+        resultado["exportar_gzip"]["mb"] = round(tam / 2**20, 1)
+        db.session.remove()
+        db.engine.dispose()
+
+    def importar(pasada):
+        # Cada pasada en una base vacía nueva
+        destino = create_app("produccion")
+        destino.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/destino_{n_tareas}_{pasada}.db"
+        with destino.app_context():
+            db.create_all()
+            with open(archivo, "rb") as entrada:
+                conteos = dh.importar(leer_lineas(entrada, comprimido=True))
+            db.session.remove()
+            db.engine.dispose()
+        return conteos
+
+    conteos, resultado["importar_gzip"] = fase(importar)
+    filas = sum(conteos.values())
+    resultado["importar_gzip"]["filas_s"] = round(filas / resultado["importar_gzip"]["s"])
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tareas", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados = {n: correr(n, tmp) for n in args.tareas}
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+Pruebas de carga reproducibles de la API y de la capa de servicio.
+
+- generador: usuarios, tareas, asignaciones y un DAG de dependencias con
+  forma configurable (profundidad, fan-in, fan-out), a partir de una semilla.
+- escenarios: una operación por ruta de src.controller y por función de
+  src.data_handler, repetible sobre los mismos datos.
+- transportes: test client de Flask, servidor WSGI real o llamada directa.
+- informe: rendimiento y p50/p95/p99 por escenario; comparación con una
+  base guardada que marca las regresiones.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.carga --guardar-base          # primera vez: guarda la base
+    python -m benchmarks.carga                         # compara; sale con 1 si empeoró
+    python -m benchmarks.carga --transportes wsgi --concurrencia 8 --escenarios obtener_tarea
+"""
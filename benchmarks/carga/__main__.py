@@ -0,0 +1,76 @@
+"""
+python -m benchmarks.carga [--transportes prueba,wsgi,servicio] [--escenarios a,b]
+    [--iteraciones 200] [--concurrencia 1] [--semilla 0] [--perfil desarrollo]
+    [--base benchmarks/carga/base.json] [--guardar-base] [--tolerancia 0.25]
+
+Imprime el resultado como JSON. Si hay una base con la misma configuración
+la compara y sale con 1 cuando encuentra regresiones.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.carga.generador import Forma  # noqa: E402
+from benchmarks.carga.informe import comparar  # noqa: E402
+from benchmarks.carga.suite import correr  # noqa: E402
+from benchmarks.carga.transportes import TRANSPORTES  # noqa: E402
+
+BASE = Path(__file__).resolve().parent / "base.json"
+
+
+def _lista(valor):
+    return [v.strip() for v in valor.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.carga")
+    parser.add_argument("--transportes", type=_lista, default=list(TRANSPORTES))
+    parser.add_argument("--escenarios", type=_lista, default=None,
+                        help="Sólo estos escenarios (por nombre, separados por coma).")
+    parser.add_argument("--iteraciones", type=int, default=200)
+    parser.add_argument("--calentamiento", type=int, default=10)
+    parser.add_argument("--concurrencia", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--perfil", default="desarrollo")
+    parser.add_argument("--base", type=Path, default=BASE)
+    parser.add_argument("--guardar-base", action="store_true",
+                        help="Guarda este resultado como la base (no compara).")
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    por_defecto = Forma()
+    for campo in ("usuarios", "profundidad", "ancho", "fan_in", "fan_out", "alcance"):
+        parser.add_argument(f"--{campo.replace('_', '-')}", type=int,
+                            default=getattr(por_defecto, campo))
+    args = parser.parse_args()
+
+    from src.config import PERFILES
+    from src.controller import app
+
+    app.config.from_object(PERFILES[args.perfil])
+    forma = Forma(
+        usuarios=args.usuarios, profundidad=args.profundidad, ancho=args.ancho,
+        fan_in=args.fan_in, fan_out=args.fan_out, alcance=args.alcance,
+    )
+    resultado = correr(
+        app, args.transportes, forma, args.semilla, args.iteraciones,
+        args.calentamiento, args.concurrencia, args.perfil, args.escenarios,
+    )
+
+    if args.guardar_base:
+        args.base.write_text(json.dumps(resultado, indent=2) + "\n")
+    elif args.base.exists():
+        resultado["comparacion"] = comparar(
+            resultado, json.loads(args.base.read_text()), args.tolerancia
+        )
+    print(json.dumps(resultado, indent=2))
+    if resultado.get("comparacion", {}).get("regresiones"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
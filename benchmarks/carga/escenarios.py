@@ -0,0 +1,290 @@
+"""
+Escenarios: una operación repetible por ruta de src.controller y, cuando
+existe, la función equivalente de src.data_handler.
+
+Cada escenario se llama con k = 0, 1, 2…; `peticion(k)` arma la petición
+HTTP y `servicio(k)` llama a la capa de servicio. Las escrituras son
+reversibles para poder repetirse sin agotar los datos: los cambios de
+estado alternan NUEVA ↔ EN_PROGRESO y las asignaciones/aristas se agregan
+y se quitan por turnos, cada escenario sobre su propio grupo de tareas.
+
+Fuera de la lista: GET /changes/stream (dura lo que la conexión) y
+POST /import (exige una base vacía).
+"""
+
+from dataclasses import dataclass
+from itertools import product
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from benchmarks.carga.generador import PALABRAS, ROLES, Datos
+
+LOTE = 10  # cambios / aristas por petición en los escenarios de lote
+INCLUIR = "asignaciones,dependencias,referenciada_por"
+
+
+class Peticion(NamedTuple):
+    metodo: str
+    ruta: str
+    cuerpo: Any = None  # se manda como JSON
+    esperado: Tuple[int, ...] = (200,)
+
+
+@dataclass
+class Escenario:
+    nombre: str
+    peticion: Optional[Callable[[int], Peticion]]  # None: sólo capa de servicio
+    servicio: Optional[Callable[[int], Any]]  # None: la ruta no tiene equivalente
+    escritura: bool = False
+    factor: float = 1.0  # fracción de las iteraciones (los más pesados, menos)
+
+
+class Contexto:
+    """Ids reales de los datos cargados y grupos disjuntos para las escrituras."""
+
+    def __init__(self, datos: Datos, ids: Sequence[int]) -> None:
+        self.ids = list(ids)
+        self.aliases = [a for a, _ in datos.usuarios]
+        self.capas = [[self.ids[r] for r in capa] for capa in datos.capas]
+        primeras = self.capas[0]
+        mitad = len(primeras) // 2
+        self.estados_uno, self.estados_lote = primeras[:mitad], primeras[mitad:]
+
+        # Asignaciones que la tarea todavía no tiene
+        asignadas = {
+            self.ids[t["ref"]]: {(a["usuario"], a["rol"]) for a in t["asignaciones"]}
+            for t in datos.tareas
+        }
+        self.asignaciones = [
+            (t, next(p for p in product(self.aliases[:2], ROLES) if p not in asignadas[t]))
+            for t in self.capas[-1]
+        ]
+
+        # Aristas nuevas capa ≥ 2 → capa 0: nunca cierran un ciclo
+        existentes = {(self.ids[t], self.ids[d]) for t, d in datos.aristas}
+        libres = [
+            (t, d)
+            for capa in self.capas[2:]
+            for t, d in zip(capa, primeras)
+            if (t, d) not in existentes
+        ]
+        corte = max(LOTE, len(libres) // 2)
+        self.aristas_uno, self.aristas_lote = libres[:corte], libres[corte:]
+
+    def tarea(self, k: int) -> int:
+        return self.ids[(k * 7919) % len(self.ids)]  # recorrido fijo y disperso
+
+    def alias(self, k: int) -> str:
+        return self.aliases[k % len(self.aliases)]
+
+
+def _alternar(grupo: Sequence[int], i: int) -> Tuple[int, str]:
+    """i-ésimo cambio de estado del grupo: cada tarea va y vuelve por turnos."""
+    return grupo[i % len(grupo)], ("EN_PROGRESO" if (i // len(grupo)) % 2 == 0 else "NUEVA")
+
+
+def _accion(k: int) -> str:
+    return "adicionar" if k % 2 == 0 else "remover"
+
+
+def _nueva_tarea(ctx: Contexto, k: int) -> Dict[str, Any]:
+    return {
+        "nombre": f"{PALABRAS[k % len(PALABRAS)]} carga {k}",
+        "descripcion": "Alta del escenario de carga",
+        "usuario": ctx.alias(k),
+        "rol": ROLES[k % len(ROLES)],
+    }
+
+
+def escenarios(ctx: Contexto) -> List[Escenario]:
+    from src import data_handler as dh
+
+    def alta_usuario(k):
+        return f"carga-{k}", f"Carga {k}"
+
+    def crear_tarea(k):
+        t = _nueva_tarea(ctx, k)
+        return dh.crear_tarea(t["nombre"], t["descripcion"], t["usuario"], t["rol"])
+
+    def cambio(k):
+        return _alternar(ctx.estados_uno, k)
+
+    def cambios_lote(k):
+        return [
+            {"id": t, "estado": e}
+            for t, e in (_alternar(ctx.estados_lote, k * LOTE + j) for j in range(LOTE))
+        ]
+
+    def asignacion(k):
+        tarea, (alias, rol) = ctx.asignaciones[(k // 2) % len(ctx.asignaciones)]
+        return tarea, alias, rol, _accion(k)
+
+    def arista(k):
+        tarea, dep = ctx.aristas_uno[(k // 2) % len(ctx.aristas_uno)]
+        return tarea, dep, _accion(k)
+
+    def aristas_lote(k):
+        inicio = (k // 2) * LOTE % max(1, len(ctx.aristas_lote) - LOTE + 1)
+        return [
+            {"tarea_id": t, "dependencytaskid": d, "accion": _accion(k)}
+            for t, d in ctx.aristas_lote[inicio:inicio + LOTE]
+        ]
+
+    def ids_detalle(k):
+        return [ctx.tarea(k + j) for j in range(20)]
+
+    def profunda(k):
+        return ctx.capas[-1][k % len(ctx.capas[-1])]
+
+    def superficial(k):
+        return ctx.capas[0][k % len(ctx.capas[0])]
+
+    def palabra(k):
+        return PALABRAS[k % len(PALABRAS)]
+
+    return [
+        # ---------- escrituras ------------------------------------ #
+        Escenario(
+            "crear_usuario",
+            lambda k: Peticion("POST", "/usuarios",
+                               dict(zip(("contacto", "nombre"), alta_usuario(k))), (201,)),
+            lambda k: dh.crear_usuario(*alta_usuario(k)),
+            escritura=True,
+        ),
+        Escenario(
+            "crear_tarea",
+            lambda k: Peticion("POST", "/tasks", _nueva_tarea(ctx, k), (201,)),
+            crear_tarea,
+            escritura=True,
+        ),
+        Escenario(
+            "crear_tareas_lote",
+            lambda k: Peticion("POST", "/tasks/bulk",
+                               [_nueva_tarea(ctx, k * 20 + j) for j in range(20)], (201,)),
+            lambda k: dh.crear_tareas([_nueva_tarea(ctx, k * 20 + j) for j in range(20)]),
+            escritura=True,
+        ),
+        Escenario(
+            "cambiar_estado",
+            lambda k: Peticion("POST", f"/tasks/{cambio(k)[0]}", {"estado": cambio(k)[1]}),
+            lambda k: dh.cambiar_estado(*cambio(k)),
+            escritura=True,
+        ),
+        Escenario(
+            "cambiar_estados_lote",
+            lambda k: Peticion("POST", "/tasks/estado", cambios_lote(k)),
+            lambda k: dh.cambiar_estados(cambios_lote(k)),
+            escritura=True,
+        ),
+        Escenario(
+            "gestionar_usuario",
+            lambda k: Peticion(
+                "POST", f"/tasks/{asignacion(k)[0]}/users",
+                dict(zip(("usuario", "rol", "accion"), asignacion(k)[1:])),
+            ),
+            lambda k: dh.gestionar_usuario_en_tarea(*asignacion(k)),
+            escritura=True,
+        ),
+        Escenario(
+            "gestionar_dependencia",
+            lambda k: Peticion(
+                "POST", f"/tasks/{arista(k)[0]}/dependencies",
+                {"dependencytaskid": arista(k)[1], "accion": arista(k)[2]},
+            ),
+            lambda k: dh.gestionar_dependencia(*arista(k)),
+            escritura=True,
+        ),
+        Escenario(
+            "gestionar_dependencias_lote",
+            lambda k: Peticion("POST", "/tasks/dependencies", aristas_lote(k)),
+            lambda k: dh.gestionar_dependencias(aristas_lote(k)),
+            escritura=True,
+        ),
+        Escenario(
+            "fijar_duracion",
+            lambda k: Peticion("POST", f"/tasks/{ctx.tarea(k)}/duration", {"duracion": k % 9 + 1}),
+            lambda k: dh.fijar_duracion(ctx.tarea(k), k % 9 + 1),
+            escritura=True,
+        ),
+        # ---------- lecturas -------------------------------------- #
+        Escenario(
+            "obtener_tarea",
+            lambda k: Peticion("GET", f"/tasks/{ctx.tarea(k)}"),
+            lambda k: dh.obtener_tarea(ctx.tarea(k)),
+        ),
+        Escenario(
+            "detalle_tareas",
+            lambda k: Peticion(
+                "GET", f"/tasks?ids={','.join(map(str, ids_detalle(k)))}&include={INCLUIR}"
+            ),
+            lambda k: dh.detalle_tareas(ids_detalle(k), INCLUIR),
+        ),
+        Escenario(
+            "usuario_con_tareas",
+            lambda k: Peticion("GET", f"/usuarios/mialias={ctx.alias(k)}?limit=20"),
+            lambda k: dh.tareas_de_usuario(ctx.alias(k), limite=20),
+        ),
+        Escenario(
+            "tareas_listas",
+            lambda k: Peticion("GET", "/tasks/ready?limit=50"),
+            lambda k: dh.tareas_listas(50),
+        ),
+        Escenario(
+            "upstream",
+            lambda k: Peticion("GET", f"/tasks/{profunda(k)}/upstream?depth=3"),
+            lambda k: dh.clausura(profunda(k), "upstream", 3),
+        ),
+        Escenario(
+            "downstream",
+            lambda k: Peticion("GET", f"/tasks/{superficial(k)}/downstream?depth=3"),
+            lambda k: dh.clausura(superficial(k), "downstream", 3),
+        ),
+        Escenario(
+            "buscar_tareas",
+            lambda k: Peticion("GET", f"/tasks/search?q={palabra(k)}&limit=20"),
+            lambda k: dh.buscar_tareas(palabra(k), limite=20),
+        ),
+        Escenario(
+            "cambios",
+            lambda k: Peticion("GET", "/changes?since=0&limit=100"),
+            lambda k: dh.cambios(0, 100),
+        ),
+        Escenario(
+            "resumen_usuario",
+            lambda k: Peticion("GET", f"/usuarios/{ctx.alias(k)}/resumen"),
+            lambda k: dh.resumen_usuario(ctx.alias(k)),
+        ),
+        Escenario(
+            "ranking_usuarios",
+            lambda k: Peticion("GET", "/usuarios/resumen?limit=10"),
+            lambda k: dh.ranking_usuarios(10),
+        ),
+        Escenario(
+            "camino_critico",
+            lambda k: Peticion("GET", f"/tasks/{profunda(k)}/critical-path"),
+            lambda k: dh.camino_critico(profunda(k)),
+        ),
+        Escenario(
+            "cronograma",
+            lambda k: Peticion("GET", "/schedule"),
+            lambda k: dh.cronograma(),
+            factor=0.2,
+        ),
+        Escenario(
+            "exportar",
+            lambda k: Peticion("GET", "/export"),
+            lambda k: sum(1 for _ in dh.exportar()),
+            factor=0.1,
+        ),
+        Escenario("cache_stats", lambda k: Peticion("GET", "/cache/stats"), None),
+        Escenario("metrics", lambda k: Peticion("GET", "/metrics", esperado=(200, 404)), None),
+        # ---------- sólo capa de servicio (CLI / mantenimiento) ---- #
+        Escenario("verificar_resumen", None, lambda k: dh.verificar_resumen(), factor=0.1),
+        Escenario(
+            "recalcular_pendientes", None,
+            lambda k: dh.recalcular_dependencias_pendientes(), escritura=True, factor=0.1,
+        ),
+        Escenario(
+            "reconstruir_resumen", None,
+            lambda k: dh.reconstruir_resumen(), escritura=True, factor=0.1,
+        ),
+    ]
@@ -0,0 +1,109 @@
+"""
+Datos sintéticos reproducibles: usuarios, tareas, asignaciones y un DAG de
+dependencias por capas.
+
+Con la misma `Forma` y la misma semilla se generan exactamente los mismos
+datos. Las tareas se reparten en `profundidad` capas de `ancho` tareas;
+cada tarea de la capa L > 0 depende de hasta `fan_in` tareas de las
+`alcance` capas anteriores, sin que ninguna tenga más de `fan_out`
+dependientes directas (si no hay candidatas libres, recibe menos).
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from src.models.enums import RolEnum
+
+PALABRAS = (
+    "api", "base", "cache", "cliente", "datos", "despliegue", "error", "informe",
+    "interfaz", "migracion", "modelo", "pago", "permiso", "prueba", "registro",
+    "reporte", "servidor", "sesion", "tablero", "usuario",
+)
+ROLES = tuple(r.value for r in RolEnum)
+
+
+@dataclass(frozen=True)
+class Forma:
+    usuarios: int = 50
+    profundidad: int = 8  # capas del DAG
+    ancho: int = 100  # tareas por capa
+    fan_in: int = 3  # dependencias por tarea (capas > 0)
+    fan_out: int = 6  # dependientes directas como máximo
+    alcance: int = 2  # capas anteriores de las que se eligen dependencias
+    asignaciones_max: int = 3  # (usuario, rol) por tarea: 1..asignaciones_max
+    con_duracion: float = 0.7  # fracción de tareas con duración estimada
+
+    @property
+    def tareas(self) -> int:
+        return self.profundidad * self.ancho
+
+
+@dataclass
+class Datos:
+    forma: Forma
+    semilla: int
+    usuarios: List[Tuple[str, str]] = field(default_factory=list)  # (alias, nombre)
+    # Items de data_handler.crear_tareas, con "ref" = posición y
+    # "dependencias" = refs de items anteriores
+    tareas: List[Dict[str, Any]] = field(default_factory=list)
+    capas: List[List[int]] = field(default_factory=list)  # refs por capa
+
+    @property
+    def aristas(self) -> List[Tuple[int, int]]:
+        """(ref, ref de la que depende)."""
+        return [(t["ref"], d) for t in self.tareas for d in t["dependencias"]]
+
+
+def generar(forma: Forma = Forma(), semilla: int = 0) -> Datos:
+    rnd = random.Random(semilla)
+    datos = Datos(forma, semilla)
+    datos.usuarios = [(f"u{k:04d}", f"Usuario {k}") for k in range(forma.usuarios)]
+    aliases = [a for a, _ in datos.usuarios]
+
+    dependientes: Dict[int, int] = {}
+    for capa in range(forma.profundidad):
+        refs = []
+        for _ in range(forma.ancho):
+            ref = len(datos.tareas)
+            candidatas = [
+                r
+                for anterior in datos.capas[max(0, capa - forma.alcance):capa]
+                for r in anterior
+                if dependientes.get(r, 0) < forma.fan_out
+            ]
+            deps = rnd.sample(candidatas, min(forma.fan_in, len(candidatas)))
+            for d in deps:
+                dependientes[d] = dependientes.get(d, 0) + 1
+            pares = {
+                (rnd.choice(aliases), rnd.choice(ROLES))
+                for _ in range(rnd.randint(1, forma.asignaciones_max))
+            }
+            palabras = rnd.sample(PALABRAS, 3)
+            datos.tareas.append({
+                "ref": ref,
+                "nombre": f"{palabras[0]} {palabras[1]} {ref}",
+                "descripcion": f"Revisar {palabras[2]} de {palabras[0]} (capa {capa})",
+                "asignaciones": [{"usuario": a, "rol": r} for a, r in sorted(pares)],
+                "duracion": rnd.randint(1, 10) if rnd.random() < forma.con_duracion else None,
+                "dependencias": sorted(deps),
+            })
+            refs.append(ref)
+        datos.capas.append(refs)
+    return datos
+
+
+def cargar(datos: Datos) -> List[int]:
+    """
+    Inserta `datos` por la capa de servicio (dentro de un app context) y
+    devuelve el id de cada tarea, indexado por ref.
+    """
+    from src import data_handler as dh
+
+    for alias, nombre in datos.usuarios:
+        dh.crear_usuario(alias, nombre)
+    resultados = dh.crear_tareas(datos.tareas)
+    errores = [r for r in resultados if "id" not in r]
+    if errores:
+        raise RuntimeError(f"La carga falló: {errores[:3]}")
+    return [r["id"] for r in resultados]
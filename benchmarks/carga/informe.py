@@ -0,0 +1,123 @@
+"""
+Medición y comparación con una base guardada.
+
+Por escenario: peticiones, errores, rendimiento (ops/s) y latencia
+p50/p95/p99/máx en ms. `comparar` marca como regresión, respecto de la
+base, un p95 o un p99 que empeoran más de `tolerancia` (y más de PISO_MS,
+para no marcar ruido en operaciones de décimas de ms), un rendimiento que
+cae más de `tolerancia`, o errores donde antes no había.
+"""
+
+import statistics
+import threading
+import time
+from itertools import count
+from typing import Any, Dict, List, Optional
+
+from benchmarks.carga.escenarios import Escenario
+from benchmarks.carga.transportes import Transporte
+
+PISO_MS = 0.5
+# Lo que tiene que coincidir entre una corrida y la base para compararlas
+CLAVES_CONFIG = ("semilla", "forma", "iteraciones", "concurrencia", "perfil", "repositorio")
+
+
+def percentiles(latencias: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/máx en ms (interpolados entre las muestras)."""
+    if len(latencias) < 2:
+        unica = round(latencias[0] * 1e3, 3) if latencias else None
+        return {"p50_ms": unica, "p95_ms": unica, "p99_ms": unica, "max_ms": unica}
+    cortes = statistics.quantiles(latencias, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cortes[49] * 1e3, 3),
+        "p95_ms": round(cortes[94] * 1e3, 3),
+        "p99_ms": round(cortes[98] * 1e3, 3),
+        "max_ms": round(max(latencias) * 1e3, 3),
+    }
+
+
+def medir(
+    transporte: Transporte,
+    escenario: Escenario,
+    iteraciones: int,
+    calentamiento: int = 0,
+    concurrencia: int = 1,
+) -> Dict[str, Any]:
+    """
+    `calentamiento` llamadas sin medir y después `iteraciones` repartidas
+    entre `concurrencia` hilos. Cada llamada recibe un k distinto de un
+    mismo contador, así las escrituras alternadas no se pisan en serie
+    (con varios hilos dos turnos de la misma tarea pueden cruzarse y
+    contar como error).
+    """
+    siguiente = count()
+    for _ in range(calentamiento):
+        transporte.llamar(escenario, next(siguiente))
+
+    restantes = count(iteraciones, -1)
+    latencias: List[List[float]] = [[] for _ in range(concurrencia)]
+    errores = [0] * concurrencia
+
+    def trabajar(h: int) -> None:
+        while next(restantes) > 0:
+            k = next(siguiente)
+            inicio = time.perf_counter()
+            ok = transporte.llamar(escenario, k)
+            latencias[h].append(time.perf_counter() - inicio)
+            errores[h] += not ok
+
+    hilos = [threading.Thread(target=trabajar, args=(h,)) for h in range(concurrencia)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    total = time.perf_counter() - inicio
+
+    todas = [x for lista in latencias for x in lista]
+    return {
+        "peticiones": len(todas),
+        "errores": sum(errores),
+        "ops_s": round(len(todas) / total, 1) if total else None,
+        **percentiles(todas),
+    }
+
+
+def comparar(
+    actual: Dict[str, Any], base: Dict[str, Any], tolerancia: float
+) -> Dict[str, Any]:
+    """Regresiones de `actual` frente a `base` (mismo formato que la salida)."""
+    distintas = [
+        c for c in CLAVES_CONFIG
+        if actual["config"].get(c) != base.get("config", {}).get(c)
+    ]
+    if distintas:
+        return {"aviso": f"Base con otra configuración ({', '.join(distintas)}): sin comparar",
+                "regresiones": []}
+
+    regresiones = []
+    for transporte, escenarios in actual["resultados"].items():
+        for nombre, medida in escenarios.items():
+            anterior: Optional[Dict[str, Any]] = base["resultados"].get(transporte, {}).get(nombre)
+            if anterior is None:
+                continue
+            for metrica in ("p95_ms", "p99_ms"):
+                antes, ahora = anterior[metrica], medida[metrica]
+                if antes and ahora and ahora > antes * (1 + tolerancia) and ahora - antes > PISO_MS:
+                    regresiones.append(_regresion(transporte, nombre, metrica, antes, ahora))
+            antes, ahora = anterior["ops_s"], medida["ops_s"]
+            if antes and ahora and ahora < antes * (1 - tolerancia):
+                regresiones.append(_regresion(transporte, nombre, "ops_s", antes, ahora))
+            if medida["errores"] > anterior["errores"]:
+                regresiones.append(
+                    _regresion(transporte, nombre, "errores", anterior["errores"], medida["errores"])
+                )
+    return {"aviso": None, "regresiones": regresiones}
+
+
+def _regresion(transporte: str, escenario: str, metrica: str, antes, ahora) -> Dict[str, Any]:
+    cambio = round((ahora - antes) / antes * 100, 1) if antes else None
+    return {
+        "transporte": transporte, "escenario": escenario, "metrica": metrica,
+        "base": antes, "actual": ahora, "cambio_pct": cambio,
+    }
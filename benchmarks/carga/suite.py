@@ -0,0 +1,98 @@
+"""
+Corrida completa: por cada transporte, una base nueva con los mismos datos
+generados, y cada escenario medido sobre ella.
+"""
+
+import tempfile
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, Optional
+
+from flask import Flask
+
+from benchmarks.carga.escenarios import Contexto, escenarios
+from benchmarks.carga.generador import Forma, cargar, generar
+from benchmarks.carga.informe import medir
+from benchmarks.carga.transportes import crear_transporte
+
+
+def correr(
+    app: Flask,
+    transportes: Iterable[str],
+    forma: Forma = Forma(),
+    semilla: int = 0,
+    iteraciones: int = 200,
+    calentamiento: int = 10,
+    concurrencia: int = 1,
+    perfil: Optional[str] = None,
+    nombres: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    `app` es la de src.controller (la que tiene las rutas), ya configurada
+    con el perfil a medir (`perfil` sólo lo anota en el resultado). Al
+    terminar se le devuelven la URI de la base y el repositorio que tenía.
+    """
+    from src import db
+    from src.repositorios import crear_repositorio
+
+    repositorio = app.config["REPOSITORIO"]
+    datos = generar(forma, semilla)
+    nombres = set(nombres) if nombres else None
+    resultados: Dict[str, Dict[str, Any]] = {}
+    uri_original = app.config["SQLALCHEMY_DATABASE_URI"]
+    repo_original = app.extensions["repositorio"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            for nombre in transportes:
+                app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/{nombre}.db"
+                app.extensions["repositorio"] = crear_repositorio(repositorio)
+                app.extensions["cache_respuestas"].limpiar()
+                if "idempotencia" in app.extensions:
+                    app.extensions["idempotencia"].limpiar()
+                with app.app_context():
+                    db.create_all()
+                    ctx = Contexto(datos, cargar(datos))
+
+                transporte = crear_transporte(nombre, app)
+                resultados[nombre] = {}
+                try:
+                    for escenario in escenarios(ctx):
+                        if nombres is not None and escenario.nombre not in nombres:
+                            continue
+                        if not transporte.soporta(escenario):
+                            continue
+                        resultados[nombre][escenario.nombre] = medir(
+                            transporte, escenario,
+                            max(5, round(iteraciones * escenario.factor)),
+                            calentamiento, concurrencia,
+                        )
+                finally:
+                    transporte.cerrar()
+                    _soltar_base(app)
+        finally:
+            app.config["SQLALCHEMY_DATABASE_URI"] = uri_original
+            app.extensions["repositorio"] = repo_original
+
+    return {
+        "config": {
+            "semilla": semilla,
+            "forma": asdict(forma),
+            "iteraciones": iteraciones,
+            "concurrencia": concurrencia,
+            "perfil": perfil,
+            "repositorio": repositorio,
+        },
+        "resultados": resultados,
+    }
+
+
+def _soltar_base(app: Flask) -> None:
+    """Cierra las conexiones a la base temporal antes de borrarla."""
+    from src import db
+
+    conexiones = app.extensions.get("conexiones")
+    if conexiones is not None:
+        conexiones.cerrar()
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,112 @@
+"""
+Cómo se ejecuta cada escenario:
+
+  prueba    → test client de Flask (sin red, la app en el mismo hilo)
+  wsgi      → servidor WSGI real (werkzeug, un hilo por petición) en un
+              puerto local, con http.client
+  servicio  → la función de src.data_handler, en un app context
+
+Todos devuelven True si la llamada terminó como se esperaba (status dentro
+de Peticion.esperado; en servicio, sin LookupError/ValueError).
+"""
+
+import http.client
+import json
+import logging
+import threading
+from typing import Optional
+
+from flask import Flask
+from werkzeug.serving import make_server
+
+from benchmarks.carga.escenarios import Escenario, Peticion
+
+TRANSPORTES = ("prueba", "wsgi", "servicio")
+
+
+class Transporte:
+    nombre = ""
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+
+    def soporta(self, escenario: Escenario) -> bool:
+        return escenario.peticion is not None
+
+    def llamar(self, escenario: Escenario, k: int) -> bool:
+        raise NotImplementedError
+
+    def cerrar(self) -> None:
+        pass
+
+
+class ClientePrueba(Transporte):
+    nombre = "prueba"
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        self._local = threading.local()  # un test client por hilo
+
+    def llamar(self, escenario: Escenario, k: int) -> bool:
+        cliente = getattr(self._local, "cliente", None)
+        if cliente is None:
+            cliente = self._local.cliente = self.app.test_client()
+        p: Peticion = escenario.peticion(k)
+        resp = cliente.open(p.ruta, method=p.metodo, json=p.cuerpo)
+        resp.get_data()  # consume también las respuestas en streaming
+        return resp.status_code in p.esperado
+
+
+class ServidorWSGI(Transporte):
+    nombre = "wsgi"
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)  # sin una línea por petición
+        self._servidor = make_server("127.0.0.1", 0, app, threaded=True)
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+
+    def llamar(self, escenario: Escenario, k: int) -> bool:
+        p: Peticion = escenario.peticion(k)
+        cuerpo: Optional[bytes] = None
+        cabeceras = {}
+        if p.cuerpo is not None:
+            cuerpo = json.dumps(p.cuerpo).encode()
+            cabeceras["Content-Type"] = "application/json"
+        # El servidor de werkzeug habla HTTP/1.0: una conexión por petición
+        conexion = http.client.HTTPConnection("127.0.0.1", self._servidor.server_port, timeout=60)
+        try:
+            conexion.request(p.metodo, p.ruta, body=cuerpo, headers=cabeceras)
+            resp = conexion.getresponse()
+            resp.read()
+        finally:
+            conexion.close()
+        return resp.status in p.esperado
+
+    def cerrar(self) -> None:
+        self._servidor.shutdown()
+        self._hilo.join()
+
+
+class Servicio(Transporte):
+    nombre = "servicio"
+
+    def soporta(self, escenario: Escenario) -> bool:
+        return escenario.servicio is not None
+
+    def llamar(self, escenario: Escenario, k: int) -> bool:
+        with self.app.app_context():
+            try:
+                escenario.servicio(k)
+            except (LookupError, ValueError):
+                return False
+        return True
+
+
+def crear_transporte(nombre: str, app: Flask) -> Transporte:
+    clases = {c.nombre: c for c in (ClientePrueba, ServidorWSGI, Servicio)}
+    try:
+        return clases[nombre](app)
+    except KeyError:
+        raise ValueError(f"Transporte desconocido: {nombre} (use {', '.join(TRANSPORTES)})")
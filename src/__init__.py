@@ -3,19 +3,104 @@ Fábrica de la aplicación Flask y configuración de SQLAlchemy.
 Evita import circular: los modelos se importan DENTRO de create_app().
 """
 
+import os
+from functools import partial
+from typing import Optional
+
+import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+
+
+class _SQLAlchemy(SQLAlchemy):
+    """SQLAlchemy de Flask que además aplica `SQLITE_PRAGMAS` al conectar."""
+
+    def apply_driver_hacks(self, app, sa_url, options):
+        sa_url, options = super().apply_driver_hacks(app, sa_url, options)
+        if sa_url.drivername.startswith("sqlite"):
+            options["sqlite_pragmas"] = dict(app.config.get("SQLITE_PRAGMAS") or {})
+        return sa_url, options
+
+    def create_engine(self, sa_url, engine_opts):
+        pragmas = engine_opts.pop("sqlite_pragmas", None)
+        engine = super().create_engine(sa_url, engine_opts)
+        if pragmas:
+            event.listen(engine, "connect", partial(_aplicar_pragmas, pragmas))
+        return engine
+
+    def crear_motor_async(self, app):
+        """
+        Motor asíncrono (aiosqlite) equivalente al de `app`: misma ruta de
+        archivo, opciones de motor y PRAGMA. Lo usa la app ASGI.
+        """
+        from sqlalchemy.engine import make_url
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+        sa_url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+        if sa_url.drivername != "sqlite":
+            raise ValueError("El motor asíncrono sólo admite SQLite (aiosqlite)")
+        sa_url, opciones = self.apply_driver_hacks(app, sa_url, {})
+        opciones.update(app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+        pragmas = opciones.pop("sqlite_pragmas", None)
+        if opciones.get("poolclass") is QueuePool:
+            opciones["poolclass"] = AsyncAdaptedQueuePool
+
+        motor = create_async_engine(sa_url.set(drivername="sqlite+aiosqlite"), **opciones)
+        if pragmas:
+            event.listen(motor.sync_engine, "connect", partial(_aplicar_pragmas, pragmas))
+        return motor
 
-db = SQLAlchemy()  # objeto global reutilizable
+    def crear_motor_lectura(self, app):
+        """
+        Motor de sólo lectura (PRAGMA query_only) sobre el mismo archivo que
+        `app`, con su propio pool de LECTURAS_POOL conexiones. None si la
+        base no es un archivo SQLite (una :memory: sería otra base).
+        """
+        from sqlalchemy.engine import make_url
+        from sqlalchemy.pool import QueuePool
 
+        sa_url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+        if sa_url.drivername != "sqlite" or sa_url.database in (None, "", ":memory:"):
+            return None
+        sa_url, opciones = self.apply_driver_hacks(app, sa_url, {})
+        opciones.update(app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+        opciones.update(
+            poolclass=QueuePool,
+            pool_size=app.config["LECTURAS_POOL"],
+            max_overflow=0,
+            connect_args={**opciones.get("connect_args", {}), "check_same_thread": False},
+        )
+        opciones["sqlite_pragmas"] = {**opciones.get("sqlite_pragmas", {}), "query_only": 1}
+        return self.create_engine(sa_url, opciones)
+
+
+def _aplicar_pragmas(pragmas, dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for nombre, valor in pragmas.items():
+        cursor.execute(f"PRAGMA {nombre}={valor}")
+    cursor.close()
+
+
+db = _SQLAlchemy()  # objeto global reutilizable
+
+
+def create_app(perfil: Optional[str] = None) -> Flask:
+    """
+    Construye y devuelve la aplicación principal.
+    `perfil`: clave de src.config.PERFILES (por defecto $APP_PERFIL o "desarrollo").
+    """
+    from src.config import PERFILES
 
-def create_app() -> Flask:
-    """Construye y devuelve la aplicación principal."""
     app = Flask(__name__)
 
-    # ---------- Config Básica ----------
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///dev.db"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # ---------- Config por perfil ----------
+    perfil = perfil or os.environ.get("APP_PERFIL", "desarrollo")
+    try:
+        app.config.from_object(PERFILES[perfil])
+    except KeyError:
+        raise ValueError(f"Perfil de configuración desconocido: {perfil}")
 
     # Inicializa la BD
     db.init_app(app)
@@ -23,5 +108,130 @@ def create_app() -> Flask:
     # ------ Importa modelos una vez que db está listo ------
     with app.app_context():
         from src.models import usuario, tarea, asignacion, dependencia  # noqa: F401
+        from src.models import grafo_version, evento, resumen_usuario, tarea_fts  # noqa: F401
+        from src.models import archivo, idempotencia  # noqa: F401
+        from src.grafo import IndiceDependencias
+        from src.repositorios import crear_repositorio
+        from src.utils.admision import ControlAdmision
+        from src.utils.cache import CacheRespuestas
+        from src.utils.cola_escritura import ColaEscritura
+        from src.utils.conexiones import ConexionesSeparadas
+        from src.utils.eventos import AvisoEventos
+        from src.utils.idempotencia import AlmacenIdempotencia
+        from src.utils.metricas import Metricas
+        from src.utils.perfilado import Perfilador
+
+    # Persistencia de la capa de servicio (SQL o memoria)
+    app.extensions["repositorio"] = crear_repositorio(app.config["REPOSITORIO"])
+    # Índice en memoria del grafo de dependencias (uno por proceso)
+    app.extensions["indice_dependencias"] = IndiceDependencias()
+    # Caché de respuestas GET serializadas
+    app.extensions["cache_respuestas"] = CacheRespuestas(
+        app.config["CACHE_RESPUESTAS_MAX"], app.config["CACHE_RESPUESTAS_TTL"]
+    )
+    # Respuestas de POST con Idempotency-Key (reintentos de clientes)
+    if app.config["IDEMPOTENCIA_MAX"] > 0:
+        app.extensions["idempotencia"] = AlmacenIdempotencia(
+            app.config["IDEMPOTENCIA_MAX"],
+            app.config["IDEMPOTENCIA_TTL"],
+            app.config["IDEMPOTENCIA_SQL"],
+        )
+    # Despierta a los streams de GET /changes/stream al confirmar eventos
+    app.extensions["aviso_eventos"] = AvisoEventos()
+    # Escritor único con group commit (opcional)
+    if app.config["GRUPO_COMMIT"] and app.config["REPOSITORIO"] == "sql":
+        ColaEscritura(
+            app, app.config["GRUPO_COMMIT_LOTE"], app.config["GRUPO_COMMIT_ESPERA"]
+        )
+    # Motor de sólo lectura para GET y escritor único por proceso
+    if app.config["CONEXIONES_SEPARADAS"] and app.config["REPOSITORIO"] == "sql":
+        ConexionesSeparadas(app)
+    # Sentencias SQL / tiempos por petición
+    if app.config["METRICAS_ACTIVAS"]:
+        Metricas(app)
+    # Límites de concurrencia por carril (lectura/escritura) con descarte
+    if any(app.config[k] is not None for k in ("ADMISION_LECTURAS", "ADMISION_ESCRITURAS")):
+        ControlAdmision(app)
+    # cProfile por petición, bajo demanda (cabecera, muestreo o lentitud)
+    if app.config["PERFILADO_DIRECTORIO"]:
+        Perfilador(app)
+
+    # ------ Comandos CLI ------
+    @app.cli.command("reconstruir-busqueda")
+    def reconstruir_busqueda():
+        """Crea el índice FTS5 de tareas si falta y re-indexa todas las tareas."""
+        from src.models.tarea_fts import crear_indice_busqueda
+
+        with db.engine.begin() as conn:
+            crear_indice_busqueda(conn, reconstruir=True)
+        print("Índice de búsqueda reconstruido")
+
+    @app.cli.command("reconstruir-resumen")
+    def reconstruir_resumen():
+        """Rehace resumen_usuario desde asignacion ⨝ tarea."""
+        from src.data_handler import reconstruir_resumen
+
+        print(f"Claves del resumen: {reconstruir_resumen()}")
+
+    @app.cli.command("verificar-resumen")
+    def verificar_resumen():
+        """Compara resumen_usuario con asignacion ⨝ tarea; sale con 1 si difieren."""
+        from src.data_handler import verificar_resumen
+
+        diferencias = verificar_resumen()
+        for d in diferencias:
+            print(f"{d['alias']} {d['rol']} {d['estado']}: guardado={d['guardado']} real={d['real']}")
+        if diferencias:
+            raise SystemExit(1)
+        print("Resumen coherente")
+
+    @app.cli.command("exportar")
+    @click.argument("archivo", type=click.Path(dir_okay=False, writable=True, allow_dash=True))
+    def exportar_cli(archivo):
+        """Vuelca la base a ARCHIVO como NDJSON (gzip si termina en .gz; - = stdout)."""
+        from src.data_handler import exportar
+        from src.utils.volcado import comprimir, en_trozos
+
+        trozos = en_trozos(exportar())
+        if archivo.endswith(".gz"):
+            trozos = comprimir(trozos)
+        with click.open_file(archivo, "wb") as salida:
+            for trozo in trozos:
+                salida.write(trozo)
+
+    @app.cli.command("importar")
+    @click.argument("archivo", type=click.Path(exists=True, dir_okay=False))
+    def importar_cli(archivo):
+        """Restaura un volcado NDJSON (o .gz) en una base vacía."""
+        from src.data_handler import importar
+        from src.utils.volcado import leer_lineas
+
+        with open(archivo, "rb") as entrada:
+            try:
+                conteos = importar(leer_lineas(entrada, archivo.endswith(".gz")))
+            except ValueError as e:
+                raise click.ClickException(str(e))
+        print(", ".join(f"{tabla}: {n}" for tabla, n in conteos.items()))
+
+    @app.cli.command("recalcular-pendientes")
+    def recalcular_pendientes():
+        """Reconstruye tarea.dependencias_pendientes desde `dependencia`."""
+        from src.data_handler import recalcular_dependencias_pendientes
+
+        corregidas = recalcular_dependencias_pendientes()
+        print(f"Contadores corregidos: {corregidas}")
+
+    @app.cli.command("archivar")
+    @click.option("--dias", type=float, default=None,
+                  help="Antigüedad mínima en días (por defecto ARCHIVO_ANTIGUEDAD).")
+    def archivar_cli(dias):
+        """Mueve al archivo las tareas FINALIZADAS antiguas, con asignaciones y aristas."""
+        from src.data_handler import archivar
+
+        try:
+            movidas = archivar(None if dias is None else dias * 24 * 3600)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        print(", ".join(f"{clave}: {n}" for clave, n in movidas.items()))
 
-    return app
\ No newline at end of file
+    return app
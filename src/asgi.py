@@ -0,0 +1,594 @@
+"""
+Punto de entrada ASGI (asíncrono) de la API REST.
+
+Mismas rutas y semántica de error que src.controller
+(ValueError → 422 · LookupError → 404, cuerpo {"error": ...} vía
+_json_error), pero cada petición es una corrutina: mientras espera a la
+BD (aiosqlite, src.data_handler_async) no retiene ningún hilo.
+
+    APP_PERFIL=produccion uvicorn src.asgi:app
+
+Las rutas se declaran en _RUTAS con las mismas reglas que el controller
+(compiladas a expresiones regulares); no hace falta otro framework. La
+caché de respuestas y las métricas son las extensiones de la app Flask
+que crea create_app().
+"""
+
+import asyncio
+import io
+import json
+import re
+import time
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from flask import Flask, current_app, jsonify
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_etags, quote_etag
+from werkzeug.urls import url_decode
+
+from src import create_app
+from src import data_handler_async as dha
+from src.data_handler import detalle_cacheable
+from src.utils.cache import cache_respuestas, clave_tarea, clave_usuario, etag_version
+from src.utils.idempotencia import almacen_idempotencia, clave_peticion, huella
+from src.utils.metricas import metricas
+from src.utils.volcado import comprimir, en_trozos, leer_lineas
+
+Cuerpo = Union[bytes, AsyncIterator[bytes]]
+
+
+class Peticion:
+    def __init__(self, scope: Dict[str, Any], cuerpo: bytes) -> None:
+        self.metodo: str = scope["method"]
+        self.ruta: str = scope["path"]
+        self.query_string: bytes = scope.get("query_string", b"")
+        self.args: MultiDict = url_decode(self.query_string)
+        self.cabeceras: Dict[str, str] = {
+            k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]
+        }
+        self.cuerpo = cuerpo
+
+    def get_json(self) -> Any:
+        # Como request.get_json(force=True): ignora el Content-Type
+        try:
+            return json.loads(self.cuerpo or b"null")
+        except ValueError:
+            raise _ErrorHTTP(400, "JSON inválido")
+
+    def arg_int(self, nombre: str) -> Optional[int]:
+        # Como request.args.get(nombre, type=int): inválido → None
+        try:
+            return int(self.args[nombre])
+        except (KeyError, ValueError):
+            return None
+
+
+class Respuesta:
+    def __init__(
+        self,
+        cuerpo: Cuerpo = b"",
+        status: int = 200,
+        tipo: Optional[str] = "application/json",
+        cabeceras: Optional[List[Tuple[str, str]]] = None,
+    ) -> None:
+        self.cuerpo = cuerpo
+        self.status = status
+        self.cabeceras = list(cabeceras or [])
+        if tipo is not None:
+            self.cabeceras.append(("content-type", tipo))
+
+
+class _ErrorHTTP(Exception):
+    def __init__(self, codigo: int, mensaje: str) -> None:
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+
+def _json(datos: Any, status: int = 200) -> Respuesta:
+    # jsonify → mismos bytes (y ETags) que la app WSGI
+    return Respuesta(jsonify(datos).get_data(), status)
+
+
+# --------------------------------------------------------------------- #
+# Idempotency-Key: igual que _idempotente en src.controller ----------- #
+# --------------------------------------------------------------------- #
+ESPERA_SONDEO = 0.005  # s entre consultas mientras un duplicado está en curso
+
+
+def _idempotente(fn: Callable[..., Awaitable[Respuesta]]) -> Callable[..., Awaitable[Respuesta]]:
+    """
+    Los duplicados en curso se esperan sondeando el evento (sin ocupar un
+    hilo); con IDEMPOTENCIA_SQL la tabla se consulta en un hilo aparte.
+    """
+    async def envoltura(peticion: Peticion, **params) -> Respuesta:
+        clave = peticion.cabeceras.get("idempotency-key")
+        almacen = almacen_idempotencia()
+        if clave is None or almacen is None:
+            return await fn(peticion, **params)
+        firma = huella(peticion.cuerpo)
+        clave = clave_peticion(peticion.metodo, peticion.ruta, clave)  # ValueError → 422
+        limite = time.monotonic() + current_app.config["IDEMPOTENCIA_ESPERA"]
+        while True:
+            if almacen.persistir:
+                guardada, evento = await asyncio.to_thread(almacen.intentar, clave, firma)
+            else:
+                guardada, evento = almacen.intentar(clave, firma)
+            if evento is None:
+                break
+            while not evento.is_set():
+                if time.monotonic() > limite:
+                    raise _ErrorHTTP(409, "Hay una petición con la misma Idempotency-Key en curso")
+                await asyncio.sleep(ESPERA_SONDEO)
+
+        if guardada is not None:
+            cabeceras = [("idempotent-replayed", "true")]
+            return Respuesta(guardada.cuerpo, guardada.status, guardada.tipo, cabeceras)
+        try:
+            respuesta = await fn(peticion, **params)
+        except (_ErrorHTTP, LookupError, ValueError) as e:
+            respuesta = _respuesta_de_error(e)
+        except BaseException:
+            almacen.soltar(clave)
+            raise
+        args = (clave, firma, respuesta.status, respuesta.cuerpo,
+                dict(respuesta.cabeceras).get("content-type"))
+        if almacen.persistir:
+            await asyncio.to_thread(almacen.completar, *args)
+        else:
+            almacen.completar(*args)
+        return respuesta
+
+    return envoltura
+
+
+# --------------------------------------------------------------------- #
+# 17. POST /usuarios --------------------------------------------------- #
+# --------------------------------------------------------------------- #
+async def api_crear_usuario(peticion: Peticion) -> Respuesta:
+    datos = peticion.get_json()
+    return _json(await dha.crear_usuario(datos["contacto"], datos["nombre"]), 201)
+
+
+# --------------------------------------------------------------------- #
+# 18. GET /usuarios/mialias=<alias> ----------------------------------- #
+# --------------------------------------------------------------------- #
+async def api_usuario_con_tareas(peticion: Peticion, alias: str) -> Respuesta:
+    filtros = {"estado": peticion.args.get("estado"), "rol": peticion.args.get("rol")}
+    if "application/x-ndjson" in peticion.cabeceras.get("accept", ""):
+        filas = await dha.iterar_tareas_de_usuario(alias, **filtros)
+
+        async def lineas():
+            async for fila in filas:
+                yield (json.dumps(fila) + "\n").encode()
+
+        return Respuesta(lineas(), tipo="application/x-ndjson")
+
+    return await _respuesta_cacheada(
+        peticion,
+        clave_usuario(alias),
+        lambda: dha.tareas_de_usuario(
+            alias,
+            cursor=peticion.arg_int("cursor"),
+            limite=peticion.arg_int("limit"),
+            **filtros,
+        ),
+    )
+
+
+# --------------------------------------------------------------------- #
+# 19. POST /tasks · 19b. POST /tasks/bulk ----------------------------- #
+# --------------------------------------------------------------------- #
+async def api_crear_tarea(peticion: Peticion) -> Respuesta:
+    datos = peticion.get_json()
+    nueva = await dha.crear_tarea(
+        datos["nombre"], datos["descripcion"], datos["usuario"], datos["rol"],
+        datos.get("duracion"),
+    )
+    return _json(nueva, 201)
+
+
+async def api_crear_tareas(peticion: Peticion) -> Respuesta:
+    items = peticion.get_json()
+    if not isinstance(items, list):
+        return _json_error("Se esperaba una lista de tareas", 422)
+    resultados = await dha.crear_tareas(items)
+    todas_ok = all("id" in r for r in resultados)
+    return _json({"resultados": resultados}, 201 if todas_ok else 207)
+
+
+# --------------------------------------------------------------------- #
+# 20. POST /tasks/<id> · 20b. POST /tasks/estado ---------------------- #
+# --------------------------------------------------------------------- #
+async def api_cambiar_estado(peticion: Peticion, tarea_id: int) -> Respuesta:
+    nuevo_estado = (peticion.get_json() or {}).get("estado")
+    return _json(await dha.cambiar_estado(tarea_id, nuevo_estado))
+
+
+async def api_cambiar_estados(peticion: Peticion) -> Respuesta:
+    cambios = peticion.get_json()
+    if not isinstance(cambios, list):
+        return _json_error("Se esperaba una lista de cambios (id, estado)", 422)
+    resultados = await dha.cambiar_estados(cambios)
+    todos_ok = all("estado" in r for r in resultados)
+    return _json({"resultados": resultados}, 200 if todos_ok else 207)
+
+
+# --------------------------------------------------------------------- #
+# 21. POST /tasks/<id>/users ------------------------------------------ #
+# --------------------------------------------------------------------- #
+async def api_gestionar_usuario(peticion: Peticion, tarea_id: int) -> Respuesta:
+    d = peticion.get_json()
+    return _json(
+        await dha.gestionar_usuario_en_tarea(tarea_id, d["usuario"], d["rol"], d["accion"])
+    )
+
+
+# --------------------------------------------------------------------- #
+# 22. POST /tasks/<id>/dependencies · 22a. POST /tasks/dependencies ---- #
+# --------------------------------------------------------------------- #
+async def api_gestionar_dependencia(peticion: Peticion, tarea_id: int) -> Respuesta:
+    d = peticion.get_json()
+    return _json(
+        await dha.gestionar_dependencia(tarea_id, d["dependencytaskid"], d["accion"])
+    )
+
+
+async def api_gestionar_dependencias(peticion: Peticion) -> Respuesta:
+    operaciones = peticion.get_json()
+    if not isinstance(operaciones, list):
+        return _json_error("Se esperaba una lista de operaciones", 422)
+    return _json(await dha.gestionar_dependencias(operaciones))
+
+
+# --------------------------------------------------------------------- #
+# GET /tasks/<id> · GET /tasks?ids= · 22b. ready · 22c. upstream/downstream - #
+# --------------------------------------------------------------------- #
+async def api_get_tarea(peticion: Peticion, tarea_id: int) -> Respuesta:
+    opciones = _opciones_detalle(peticion)
+    if not detalle_cacheable(opciones["incluir"], opciones["campos"]):
+        return _json(await dha.detalle_tarea(tarea_id, **opciones))
+    version = partial(dha.version_tarea, tarea_id)
+    if any(v is not None for v in opciones.values()):
+        return await _respuesta_cacheada(
+            peticion, clave_tarea(tarea_id),
+            lambda: dha.detalle_tarea(tarea_id, **opciones), version,
+        )
+    return await _respuesta_cacheada(
+        peticion, clave_tarea(tarea_id), lambda: dha.obtener_tarea(tarea_id), version
+    )
+
+
+async def api_detalle_tareas(peticion: Peticion) -> Respuesta:
+    ids = peticion.args.get("ids")
+    return _json(await dha.detalle_tareas(ids, **_opciones_detalle(peticion)))
+
+
+def _opciones_detalle(peticion: Peticion) -> Dict[str, Any]:
+    return {
+        "incluir": peticion.args.get("include"),
+        "campos": peticion.args.get("fields"),
+        "profundidad": peticion.arg_int("depth"),
+    }
+
+
+async def api_tareas_listas(peticion: Peticion) -> Respuesta:
+    return _json({"tareas": await dha.tareas_listas(peticion.arg_int("limit"))})
+
+
+async def api_clausura(peticion: Peticion, tarea_id: int, direccion: str) -> Respuesta:
+    tareas = await dha.clausura(tarea_id, direccion, peticion.arg_int("depth"))
+    return _json({"tarea_id": tarea_id, direccion: tareas})
+
+
+# --------------------------------------------------------------------- #
+# 22d. GET /cache/stats · 22e. GET /metrics --------------------------- #
+# --------------------------------------------------------------------- #
+async def api_cache_stats(peticion: Peticion) -> Respuesta:
+    return _json(cache_respuestas().estadisticas())
+
+
+async def api_metrics(peticion: Peticion) -> Respuesta:
+    if "metricas" not in current_app.extensions:
+        return _json_error("Métricas desactivadas", 404)
+    return Respuesta(metricas().exportar().encode(), tipo="text/plain; version=0.0.4")
+
+
+# --------------------------------------------------------------------- #
+# 22f. GET /changes · 22g. GET /changes/stream (SSE) ------------------- #
+# --------------------------------------------------------------------- #
+async def api_cambios(peticion: Peticion) -> Respuesta:
+    desde = peticion.arg_int("since")
+    return _json(await dha.cambios(0 if desde is None else desde, peticion.arg_int("limit")))
+
+
+async def api_cambios_stream(peticion: Peticion) -> Respuesta:
+    desde = peticion.cabeceras.get("last-event-id") or peticion.args.get("since")
+    try:
+        eventos = await dha.seguir_cambios(int(desde) if desde is not None else None)
+    except ValueError:
+        return _json_error("since / Last-Event-ID debe ser un seq >= 0", 422)
+
+    async def sse():
+        yield b"retry: 1000\n\n"
+        async for e in eventos:
+            if e is None:
+                yield b": latido\n\n"
+            else:
+                yield (
+                    f"id: {e['seq']}\nevent: {e['entidad']}.{e['operacion']}\n"
+                    f"data: {json.dumps(e)}\n\n"
+                ).encode()
+
+    return Respuesta(
+        sse(),
+        tipo="text/event-stream",
+        cabeceras=[("cache-control", "no-cache"), ("x-accel-buffering", "no")],
+    )
+
+
+# --------------------------------------------------------------------- #
+# 22h. GET /tasks/search ---------------------------------------------- #
+# --------------------------------------------------------------------- #
+async def api_buscar_tareas(peticion: Peticion) -> Respuesta:
+    offset = peticion.arg_int("offset")
+    return _json(await dha.buscar_tareas(
+        peticion.args.get("q"),
+        limite=peticion.arg_int("limit"),
+        offset=0 if offset is None else offset,
+        estado=peticion.args.get("estado"),
+        rol=peticion.args.get("rol"),
+    ))
+
+
+# --------------------------------------------------------------------- #
+# 22i. GET /usuarios/<alias>/resumen · GET /usuarios/resumen ---------- #
+# --------------------------------------------------------------------- #
+async def api_resumen_usuario(peticion: Peticion, alias: str) -> Respuesta:
+    return _json(await dha.resumen_usuario(alias))
+
+
+async def api_ranking_usuarios(peticion: Peticion) -> Respuesta:
+    return _json(await dha.ranking_usuarios(
+        peticion.arg_int("limit"),
+        estado=peticion.args.get("estado"),
+        rol=peticion.args.get("rol"),
+    ))
+
+
+# --------------------------------------------------------------------- #
+# 22j. GET /export · POST /import ------------------------------------- #
+# --------------------------------------------------------------------- #
+async def api_exportar(peticion: Peticion) -> Respuesta:
+    if peticion.arg_int("gzip"):
+        cuerpo = await dha.exportar(lambda lineas: comprimir(en_trozos(lineas)))
+        return Respuesta(
+            cuerpo,
+            tipo="application/gzip",
+            cabeceras=[("content-disposition", "attachment; filename=volcado.ndjson.gz")],
+        )
+    return Respuesta(await dha.exportar(en_trozos), tipo="application/x-ndjson")
+
+
+async def api_importar(peticion: Peticion) -> Respuesta:
+    # El cuerpo ya llegó entero (AppASGI lo lee antes de despachar)
+    comprimido = (
+        peticion.cabeceras.get("content-type", "").startswith("application/gzip")
+        or peticion.cabeceras.get("content-encoding") == "gzip"
+    )
+    conteos = await dha.importar(leer_lineas(io.BytesIO(peticion.cuerpo), comprimido))
+    return _json(conteos, 201)
+
+
+# --------------------------------------------------------------------- #
+# 22k. duración · camino crítico · cronograma -------------------------- #
+# --------------------------------------------------------------------- #
+async def api_fijar_duracion(peticion: Peticion, tarea_id: int) -> Respuesta:
+    d = peticion.get_json()
+    return _json(await dha.fijar_duracion(tarea_id, d["duracion"]))
+
+
+async def api_camino_critico(peticion: Peticion, tarea_id: int) -> Respuesta:
+    return _json(await dha.camino_critico(tarea_id))
+
+
+async def api_cronograma(peticion: Peticion) -> Respuesta:
+    return _json(await dha.cronograma(bool(peticion.arg_int("criticas"))))
+
+
+# --------------------------------------------------------------------- #
+# 23. Errores y respuestas cacheadas ---------------------------------- #
+# --------------------------------------------------------------------- #
+def _json_error(msg: str, code: int) -> Respuesta:
+    return _json({"error": msg}, code)
+
+
+def _respuesta_de_error(e: Exception) -> Respuesta:
+    # ValueError → 422 · LookupError → 404 · _ErrorHTTP → su código
+    if isinstance(e, _ErrorHTTP):
+        return _json_error(str(e), e.codigo)
+    return _json_error(str(e), 404 if isinstance(e, LookupError) else 422)
+
+
+async def _respuesta_cacheada(
+    peticion: Peticion,
+    recurso: str,
+    cargar: Callable[[], Awaitable[Any]],
+    version: Optional[Callable[[], Awaitable[int]]] = None,
+) -> Respuesta:
+    """Igual que en src.controller: ETag fuerte (de la versión, si la hay) + caché."""
+    cache = cache_respuestas()
+    variante = peticion.query_string
+    vigente = await version() if version is not None else None
+    entrada = cache.obtener(recurso, variante, vigente)
+    if entrada is not None:
+        etag = entrada.etag
+    elif vigente is not None:
+        etag = etag_version(recurso, vigente, variante)
+    else:
+        etag = None
+
+    if etag is not None and parse_etags(peticion.cabeceras.get("if-none-match")).contains(etag):
+        return Respuesta(b"", 304, tipo=None, cabeceras=[("etag", quote_etag(etag))])
+    if entrada is None:
+        generacion = cache.generacion(recurso)
+        cuerpo = jsonify(await cargar()).get_data()
+        entrada = cache.guardar(recurso, variante, cuerpo, generacion, vigente)
+    return Respuesta(entrada.cuerpo, cabeceras=[("etag", quote_etag(entrada.etag))])
+
+
+# --------------------------------------------------------------------- #
+# Tabla de rutas: mismas reglas que src.controller -------------------- #
+# --------------------------------------------------------------------- #
+_RUTAS = [
+    ("POST", "/usuarios", api_crear_usuario),
+    ("GET", "/usuarios/mialias=<alias>", api_usuario_con_tareas),
+    ("POST", "/tasks", _idempotente(api_crear_tarea)),
+    ("POST", "/tasks/bulk", api_crear_tareas),
+    ("POST", "/tasks/<int:tarea_id>", api_cambiar_estado),
+    ("POST", "/tasks/estado", api_cambiar_estados),
+    ("POST", "/tasks/<int:tarea_id>/users", _idempotente(api_gestionar_usuario)),
+    ("POST", "/tasks/<int:tarea_id>/dependencies", _idempotente(api_gestionar_dependencia)),
+    ("POST", "/tasks/dependencies", api_gestionar_dependencias),
+    ("GET", "/tasks/<int:tarea_id>", api_get_tarea),
+    ("GET", "/tasks", api_detalle_tareas),
+    ("GET", "/tasks/ready", api_tareas_listas),
+    ("GET", "/tasks/<int:tarea_id>/<any(upstream, downstream):direccion>", api_clausura),
+    ("GET", "/cache/stats", api_cache_stats),
+    ("GET", "/metrics", api_metrics),
+    ("GET", "/changes", api_cambios),
+    ("GET", "/changes/stream", api_cambios_stream),
+    ("GET", "/tasks/search", api_buscar_tareas),
+    ("GET", "/usuarios/resumen", api_ranking_usuarios),
+    ("GET", "/usuarios/<alias>/resumen", api_resumen_usuario),
+    ("GET", "/export", api_exportar),
+    ("POST", "/import", api_importar),
+    ("POST", "/tasks/<int:tarea_id>/duration", api_fijar_duracion),
+    ("GET", "/tasks/<int:tarea_id>/critical-path", api_camino_critico),
+    ("GET", "/schedule", api_cronograma),
+]
+
+
+def _compilar(regla: str) -> "re.Pattern[str]":
+    """Regla estilo Flask → regex con grupos nombrados (int, any y texto)."""
+    def variable(m: "re.Match[str]") -> str:
+        conversor, nombre = m.group(1), m.group(2)
+        if conversor == "int":
+            return rf"(?P<{nombre}>\d+)"
+        if conversor and conversor.startswith("any("):
+            opciones = [o.strip() for o in conversor[4:-1].split(",")]
+            return rf"(?P<{nombre}>{'|'.join(map(re.escape, opciones))})"
+        return rf"(?P<{nombre}>[^/]+)"
+
+    partes = re.split(r"(<[^>]+>)", regla)
+    patron = "".join(
+        re.sub(r"<(?:([^:>]+):)?([^>]+)>", variable, p) if p.startswith("<") else re.escape(p)
+        for p in partes
+    )
+    return re.compile(patron + r"\Z")
+
+
+_RUTAS_COMPILADAS = [(m, _compilar(regla), regla, fn) for m, regla, fn in _RUTAS]
+
+
+async def _enviar_stream(cuerpo: AsyncIterator[bytes], receive, send) -> None:
+    """
+    Envía `cuerpo` trozo a trozo; si el cliente se desconecta deja de
+    iterarlo en el acto (un stream SSE no termina por sí solo).
+    """
+    async def desconectado() -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    vigia = asyncio.ensure_future(desconectado())
+    try:
+        while True:
+            siguiente = asyncio.ensure_future(cuerpo.__anext__())
+            await asyncio.wait({siguiente, vigia}, return_when=asyncio.FIRST_COMPLETED)
+            if not siguiente.done():
+                siguiente.cancel()
+                await asyncio.wait({siguiente})  # que el generador quede detenido
+                return
+            try:
+                trozo = siguiente.result()
+            except StopAsyncIteration:
+                break
+            await send({"type": "http.response.body", "body": trozo, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        vigia.cancel()
+        await cuerpo.aclose()
+
+
+class AppASGI:
+    """Aplicación ASGI sobre una app Flask (config, caché, métricas)."""
+
+    def __init__(self, flask_app: Flask) -> None:
+        self.flask_app = flask_app
+        dha.preparar(flask_app)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._ciclo_de_vida(receive, send)
+        elif scope["type"] == "http":
+            cuerpo = b""
+            while True:
+                mensaje = await receive()
+                cuerpo += mensaje.get("body", b"")
+                if not mensaje.get("more_body"):
+                    break
+            await self._atender(Peticion(scope, cuerpo), receive, send)
+
+    async def _ciclo_de_vida(self, receive, send) -> None:
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                await dha.cerrar(self.flask_app)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _atender(self, peticion: Peticion, receive, send) -> None:
+        inicio = time.perf_counter()
+        # Contexto de app por petición (cada petición ASGI es su propia tarea)
+        with self.flask_app.app_context():
+            respuesta, regla = await self._despachar(peticion)
+            await send({
+                "type": "http.response.start",
+                "status": respuesta.status,
+                "headers": [(k.encode("latin-1"), v.encode("latin-1"))
+                            for k, v in respuesta.cabeceras],
+            })
+            if isinstance(respuesta.cuerpo, bytes):
+                await send({"type": "http.response.body", "body": respuesta.cuerpo})
+            else:
+                await _enviar_stream(respuesta.cuerpo, receive, send)
+        self._observar(peticion.metodo, regla, time.perf_counter() - inicio)
+
+    async def _despachar(self, peticion: Peticion) -> Tuple[Respuesta, str]:
+        encontrada = False
+        for metodo, patron, regla, fn in _RUTAS_COMPILADAS:
+            m = patron.match(peticion.ruta)
+            if m is None:
+                continue
+            encontrada = True
+            if metodo != peticion.metodo:
+                continue
+            params = {k: int(v) if k == "tarea_id" else v for k, v in m.groupdict().items()}
+            try:
+                return await fn(peticion, **params), regla
+            except (_ErrorHTTP, LookupError, ValueError) as e:
+                return _respuesta_de_error(e), regla
+        if encontrada:
+            return _json_error("Method not allowed", 405), "sin_ruta"
+        return _json_error("Not found", 404), "sin_ruta"
+
+    def _observar(self, metodo: str, regla: str, segundos: float) -> None:
+        metricas = self.flask_app.extensions.get("metricas")
+        if metricas is not None:
+            with metricas._lock:
+                metricas.duracion.observar((("method", metodo), ("route", regla)), segundos)
+
+
+app = AppASGI(create_app())  # instancia creada por la factory --------------------------------
@@ -0,0 +1,127 @@
+"""
+Perfiles de configuración para create_app().
+
+    create_app("produccion")   ó   APP_PERFIL=produccion flask run
+"""
+
+from sqlalchemy.pool import QueuePool
+
+
+class Config:
+    """Valores comunes (y perfil de desarrollo)."""
+
+    SQLALCHEMY_DATABASE_URI = "sqlite:///dev.db"
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS: dict = {}
+
+    # PRAGMA que se ejecutan en cada conexión SQLite nueva (evento "connect")
+    SQLITE_PRAGMAS: dict = {}
+
+    # Backend de src.repositorios: "sql" (SQLite) o "memoria" (sin durabilidad)
+    REPOSITORIO = "sql"
+
+    CICLOS_EN_BD = False  # True → detección de ciclos con CTE recursiva
+
+    # Group commit de cambiar_estado / crear_usuario / gestionar_usuario_en_tarea:
+    # un escritor único confirma lotes de hasta GRUPO_COMMIT_LOTE mutaciones o
+    # las que lleguen en GRUPO_COMMIT_ESPERA s (sólo con REPOSITORIO="sql")
+    GRUPO_COMMIT = False
+    GRUPO_COMMIT_LOTE = 64
+    GRUPO_COMMIT_ESPERA = 0.002
+
+    # Lecturas GET por un motor de sólo lectura con pool propio y escrituras
+    # de a una por proceso (src.utils.conexiones); cuánto espera una
+    # escritura su turno antes de contar como bloqueo
+    CONEXIONES_SEPARADAS = False
+    LECTURAS_POOL = 8
+    ESCRITURA_ESPERA = 2.0  # s
+
+    # Mutaciones de data_handler que chocan con el lock de SQLite ("database
+    # is locked") se repiten enteras, con pausas exponenciales al azar
+    # (jitter) de REINTENTO_PAUSA hasta REINTENTO_PAUSA_MAX, mientras no
+    # pasen REINTENTO_PLAZO s; después, 503. 0 = sin reintentos
+    REINTENTO_PLAZO = 5.0  # s
+    REINTENTO_PAUSA = 0.005  # s
+    REINTENTO_PAUSA_MAX = 0.25  # s
+
+    # GET /changes/stream: re-consulta del feed aunque no haya aviso local
+    # (eventos de otros procesos) y comentario de latido para proxies
+    CAMBIOS_SONDEO = 1.0  # s
+    CAMBIOS_LATIDO = 15.0  # s
+
+    # Caché de respuestas GET (0 entradas = desactivada)
+    CACHE_RESPUESTAS_MAX = 1024
+    CACHE_RESPUESTAS_TTL = 30.0  # s; acota lo desfasado entre procesos
+
+    # Idempotency-Key en POST /tasks, /tasks/<id>/users y /tasks/<id>/dependencies:
+    # respuestas guardadas (0 entradas = desactivado), opcionalmente también en
+    # la tabla `idempotencia` (compartida entre procesos), y cuánto espera un
+    # duplicado a que termine la petición en curso antes de responder 409
+    IDEMPOTENCIA_MAX = 10_000
+    IDEMPOTENCIA_TTL = 24 * 3600.0  # s
+    IDEMPOTENCIA_SQL = False
+    IDEMPOTENCIA_ESPERA = 10.0  # s
+
+    # `flask archivar`: FINALIZADAS hace más de ARCHIVO_ANTIGUEDAD s pasan
+    # al archivo, de a ARCHIVO_LOTE tareas por transacción
+    ARCHIVO_ANTIGUEDAD = 30 * 24 * 3600.0
+    ARCHIVO_LOTE = 500
+
+    # Control de admisión (src.utils.admision): peticiones concurrentes por
+    # carril (None = sin límite; ambos None = no se instala), lugares en la
+    # cola de espera y plazo en ella; al rechazar, 503 con Retry-After
+    ADMISION_LECTURAS = None
+    ADMISION_ESCRITURAS = None
+    ADMISION_COLA_LECTURAS = 64
+    ADMISION_COLA_ESCRITURAS = 32
+    ADMISION_ESPERA_LECTURAS = 1.0  # s
+    ADMISION_ESPERA_ESCRITURAS = 2.0  # s
+    ADMISION_REINTENTO = 1  # s, cabecera Retry-After
+    ADMISION_EXENTAS = ("/metrics", "/cache/stats", "/changes/stream")
+
+    # Conteo/tiempo de SQL por petición, Server-Timing y GET /metrics
+    METRICAS_ACTIVAS = True
+
+    # cProfile por petición (src.utils.perfilado). None = desactivado, sin hooks
+    PERFILADO_DIRECTORIO = None
+    PERFILADO_CABECERA = "X-Perfilar"
+    PERFILADO_SECRETO = None        # valor de la cabecera que pide el perfil
+    PERFILADO_MUESTREO = 0.0        # fracción de peticiones perfiladas al azar
+    PERFILADO_LENTAS = None         # s; una petición más lenta arma su ruta
+    PERFILADO_PAUSA = 60.0          # s entre capturas automáticas de una ruta
+
+
+class DesarrolloConfig(Config):
+    pass
+
+
+class ProduccionConfig(Config):
+    # Las conexiones se reutilizan: las cachés de página y el mmap sobreviven
+    # entre peticiones (con el NullPool por defecto se pierden en cada una).
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "poolclass": QueuePool,
+        "pool_size": 8,
+        "max_overflow": 8,
+        "connect_args": {"check_same_thread": False},
+    }
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",          # lectores no bloquean al escritor
+        "synchronous": "NORMAL",        # fsync sólo en checkpoints (seguro con WAL)
+        "mmap_size": 256 * 1024 * 1024,  # 256 MiB mapeados en memoria
+        "cache_size": -64 * 1024,       # 64 MiB de caché de páginas (KiB si < 0)
+        "busy_timeout": 5000,           # ms esperando el lock antes de fallar
+    }
+    CONEXIONES_SEPARADAS = True
+
+
+class MemoriaConfig(Config):
+    # Sesiones de planificación efímeras / pruebas de carga: todo en el
+    # proceso, se pierde al reiniciar. Cada worker tiene su propio estado.
+    REPOSITORIO = "memoria"
+
+
+PERFILES = {
+    "desarrollo": DesarrolloConfig,
+    "produccion": ProduccionConfig,
+    "memoria": MemoriaConfig,
+}
@@ -4,20 +4,96 @@ Cada ruta llama a la capa de negocio (src.data_handler) y traduce
 ValueError → 422 · LookupError → 404
 """
 
-from flask import request, jsonify
+import json
+from functools import partial, wraps
+
+from flask import Response, request, jsonify, stream_with_context
 from werkzeug.exceptions import HTTPException
 
 from src import create_app
 from src.data_handler import (
     crear_usuario,
     crear_tarea,
+    crear_tareas,
     cambiar_estado,
+    cambiar_estados,
     gestionar_usuario_en_tarea,
     gestionar_dependencia,
+    gestionar_dependencias,
+    tareas_listas,
+    clausura,
+    tareas_de_usuario,
+    iterar_tareas_de_usuario,
+    obtener_tarea,
+    version_tarea,
+    detalle_cacheable,
+    detalle_tarea,
+    detalle_tareas,
+    cambios,
+    seguir_cambios,
+    buscar_tareas,
+    resumen_usuario,
+    ranking_usuarios,
+    exportar,
+    importar,
+    fijar_duracion,
+    camino_critico,
+    cronograma,
+)
+from src.repositorios import BaseOcupada
+from src.utils.cache import cache_respuestas, clave_tarea, clave_usuario, etag_version
+from src.utils.idempotencia import (
+    PeticionEnCurso,
+    almacen_idempotencia,
+    clave_peticion,
+    huella,
 )
+from src.utils.metricas import metricas
+from src.utils.volcado import comprimir, en_trozos, leer_lineas
 
 app = create_app()  # instancia creada por la factory --------------------------------
 
+
+# --------------------------------------------------------------------- #
+# Idempotency-Key: los reintentos reciben la respuesta ya dada ---------- #
+# --------------------------------------------------------------------- #
+def _idempotente(vista):
+    """
+    Con cabecera Idempotency-Key, la primera respuesta (< 500) de la vista
+    queda guardada y los reintentos con la misma clave y el mismo cuerpo
+    la reciben sin llamar a la vista (Idempotent-Replayed: true). Un
+    duplicado concurrente espera a que termine la petición en curso.
+    """
+    @wraps(vista)
+    def envoltura(*args, **kwargs):
+        clave = request.headers.get("Idempotency-Key")
+        almacen = almacen_idempotencia()
+        if clave is None or almacen is None:
+            return vista(*args, **kwargs)
+        firma = huella(request.get_data())
+        try:
+            clave = clave_peticion(request.method, request.path, clave)
+            guardada = almacen.tomar(clave, firma, app.config["IDEMPOTENCIA_ESPERA"])
+        except ValueError as e:
+            return _json_error(str(e), 422)
+        except PeticionEnCurso as e:
+            return _json_error(str(e), 409)
+
+        if guardada is not None:
+            resp = app.response_class(guardada.cuerpo, guardada.status, mimetype=guardada.tipo)
+            resp.headers["Idempotent-Replayed"] = "true"
+            return resp
+        try:
+            resp = app.make_response(vista(*args, **kwargs))
+        except BaseException:
+            almacen.soltar(clave)
+            raise
+        almacen.completar(clave, firma, resp.status_code, resp.get_data(), resp.mimetype)
+        return resp
+
+    return envoltura
+
+
 # --------------------------------------------------------------------- #
 # 17. POST /usuarios --------------------------------------------------- #
 # --------------------------------------------------------------------- #
@@ -36,36 +112,33 @@ def api_crear_usuario():
 # --------------------------------------------------------------------- #
 @app.route("/usuarios/mialias=<alias>", methods=["GET"])
 def api_usuario_con_tareas(alias):
-    from src.models.usuario import Usuario
-    from src.models.asignacion import Asignacion
-    from src.models.tarea import Tarea
-
-    usuario = Usuario.query.get(alias)
-    if not usuario:
-        return _json_error("Usuario no encontrado", 404)
-
-    tareas = (
-        Tarea.query.join(Asignacion)
-        .filter(Asignacion.usuario_alias == alias)
-        .all()
-    )
+    filtros = {"estado": request.args.get("estado"), "rol": request.args.get("rol")}
+    try:
+        if request.accept_mimetypes.best == "application/x-ndjson":
+            filas = iterar_tareas_de_usuario(alias, **filtros)
+            lineas = (json.dumps(f) + "\n" for f in filas)
+            return Response(stream_with_context(lineas), mimetype="application/x-ndjson")
 
-    return jsonify(
-        {
-            "alias": usuario.alias,
-            "nombre": usuario.nombre,
-            "tareas": [
-                {"id": t.id, "nombre": t.nombre, "estado": t.estado.value}
-                for t in tareas
-            ],
-        }
-    ), 200
+        return _respuesta_cacheada(
+            clave_usuario(alias),
+            lambda: tareas_de_usuario(
+                alias,
+                cursor=request.args.get("cursor", type=int),
+                limite=request.args.get("limit", type=int),
+                **filtros,
+            ),
+        )
+    except LookupError as e:
+        return _json_error(str(e), 404)
+    except ValueError as e:
+        return _json_error(str(e), 422)
 
 
 # --------------------------------------------------------------------- #
 # 19. POST /tasks ------------------------------------------------------ #
 # --------------------------------------------------------------------- #
 @app.route("/tasks", methods=["POST"])
+@_idempotente
 def api_crear_tarea():
     datos = request.get_json(force=True)
     try:
@@ -74,6 +147,7 @@ def api_crear_tarea():
             datos["descripcion"],
             datos["usuario"],
             datos["rol"],
+            datos.get("duracion"),
         )
         return jsonify(nueva), 201
     except LookupError as e:
@@ -82,6 +156,20 @@ def api_crear_tarea():
         return _json_error(str(e), 422)
 
 
+# --------------------------------------------------------------------- #
+# 19b. POST /tasks/bulk  (importación masiva) --------------------------- #
+# --------------------------------------------------------------------- #
+@app.route("/tasks/bulk", methods=["POST"])
+def api_crear_tareas():
+    items = request.get_json(force=True)
+    if not isinstance(items, list):
+        return _json_error("Se esperaba una lista de tareas", 422)
+
+    resultados = crear_tareas(items)
+    todas_ok = all("id" in r for r in resultados)
+    return jsonify({"resultados": resultados}), (201 if todas_ok else 207)
+
+
 # --------------------------------------------------------------------- #
 # 20. POST /tasks/<id>  (cambio de estado) ----------------------------- #
 # --------------------------------------------------------------------- #
@@ -97,10 +185,25 @@ def api_cambiar_estado(tarea_id):
         return _json_error(str(e), 422)
 
 
+# --------------------------------------------------------------------- #
+# 20b. POST /tasks/estado  (cambios de estado por lote) ---------------- #
+# --------------------------------------------------------------------- #
+@app.route("/tasks/estado", methods=["POST"])
+def api_cambiar_estados():
+    cambios = request.get_json(force=True)
+    if not isinstance(cambios, list):
+        return _json_error("Se esperaba una lista de cambios (id, estado)", 422)
+
+    resultados = cambiar_estados(cambios)
+    todos_ok = all("estado" in r for r in resultados)
+    return jsonify({"resultados": resultados}), (200 if todos_ok else 207)
+
+
 # --------------------------------------------------------------------- #
 # 21. POST /tasks/<id>/users ------------------------------------------ #
 # --------------------------------------------------------------------- #
 @app.route("/tasks/<int:tarea_id>/users", methods=["POST"])
+@_idempotente
 def api_gestionar_usuario(tarea_id):
     d = request.get_json(force=True)
     try:
@@ -118,6 +221,7 @@ def api_gestionar_usuario(tarea_id):
 # 22. POST /tasks/<id>/dependencies ----------------------------------- #
 # --------------------------------------------------------------------- #
 @app.route("/tasks/<int:tarea_id>/dependencies", methods=["POST"])
+@_idempotente
 def api_gestionar_dependencia(tarea_id):
     d = request.get_json(force=True)
     try:
@@ -129,18 +233,244 @@ def api_gestionar_dependencia(tarea_id):
         return _json_error(str(e), 422)
     
 
+# --------------------------------------------------------------------- #
+# 22a. POST /tasks/dependencies  (lote atómico de aristas) ------------- #
+# --------------------------------------------------------------------- #
+@app.route("/tasks/dependencies", methods=["POST"])
+def api_gestionar_dependencias():
+    operaciones = request.get_json(force=True)
+    if not isinstance(operaciones, list):
+        return _json_error("Se esperaba una lista de operaciones", 422)
+    try:
+        return jsonify(gestionar_dependencias(operaciones)), 200
+    except LookupError as e:
+        return _json_error(str(e), 404)
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
     # en src/controller.py, al final
 @app.route("/tasks/<int:tarea_id>", methods=["GET"])
 def api_get_tarea(tarea_id):
-    from src.models.tarea import Tarea
-    tarea = Tarea.query.get(tarea_id)
-    if not tarea:
-        return _json_error("Tarea no encontrada", 404)
-    return jsonify({
-        "id": tarea.id,
-        "nombre": tarea.nombre,
-        "estado": tarea.estado.value,
-    })
+    opciones = _opciones_detalle()
+    try:
+        if not detalle_cacheable(opciones["incluir"], opciones["campos"]):
+            return jsonify(detalle_tarea(tarea_id, **opciones)), 200
+        version = partial(version_tarea, tarea_id)
+        if any(v is not None for v in opciones.values()):
+            return _respuesta_cacheada(
+                clave_tarea(tarea_id), lambda: detalle_tarea(tarea_id, **opciones), version
+            )
+        return _respuesta_cacheada(
+            clave_tarea(tarea_id), lambda: obtener_tarea(tarea_id), version
+        )
+    except LookupError as e:
+        return _json_error(str(e), 404)
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
+# --------------------------------------------------------------------- #
+# 22b. GET /tasks/ready  (tareas desbloqueadas) ------------------------ #
+# --------------------------------------------------------------------- #
+@app.route("/tasks/ready", methods=["GET"])
+def api_tareas_listas():
+    try:
+        return jsonify({"tareas": tareas_listas(request.args.get("limit", type=int))}), 200
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
+# --------------------------------------------------------------------- #
+# 22c. GET /tasks/<id>/upstream · /downstream  (clausura transitiva) ---- #
+# --------------------------------------------------------------------- #
+@app.route("/tasks/<int:tarea_id>/<any(upstream, downstream):direccion>", methods=["GET"])
+def api_clausura(tarea_id, direccion):
+    profundidad = request.args.get("depth", type=int)
+    try:
+        tareas = clausura(tarea_id, direccion, profundidad)
+        return jsonify({"tarea_id": tarea_id, direccion: tareas}), 200
+    except LookupError as e:
+        return _json_error(str(e), 404)
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
+# --------------------------------------------------------------------- #
+# 22d. GET /cache/stats  (aciertos / fallos de la caché) --------------- #
+# --------------------------------------------------------------------- #
+@app.route("/cache/stats", methods=["GET"])
+def api_cache_stats():
+    return jsonify(cache_respuestas().estadisticas()), 200
+
+
+# --------------------------------------------------------------------- #
+# 22e. GET /metrics  (formato de texto de Prometheus) ------------------ #
+# --------------------------------------------------------------------- #
+@app.route("/metrics", methods=["GET"])
+def api_metrics():
+    if "metricas" not in app.extensions:
+        return _json_error("Métricas desactivadas", 404)
+    return Response(metricas().exportar(), mimetype="text/plain; version=0.0.4")
+
+
+# --------------------------------------------------------------------- #
+# 22f. GET /changes  (feed de cambios paginado por seq) ---------------- #
+# --------------------------------------------------------------------- #
+@app.route("/changes", methods=["GET"])
+def api_cambios():
+    try:
+        return jsonify(cambios(
+            request.args.get("since", 0, type=int),
+            request.args.get("limit", type=int),
+        )), 200
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
+# --------------------------------------------------------------------- #
+# 22g. GET /changes/stream  (Server-Sent Events, reanuda con Last-Event-ID)
+# --------------------------------------------------------------------- #
+@app.route("/changes/stream", methods=["GET"])
+def api_cambios_stream():
+    desde = request.headers.get("Last-Event-ID") or request.args.get("since")
+    try:
+        eventos = seguir_cambios(int(desde) if desde is not None else None)
+    except ValueError:
+        return _json_error("since / Last-Event-ID debe ser un seq >= 0", 422)
+
+    return Response(
+        stream_with_context(_sse(eventos)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(eventos):
+    # Primer trozo inmediato: el servidor envía las cabeceras sin esperar
+    # al primer evento, y el cliente reintenta al segundo si se corta.
+    yield "retry: 1000\n\n"
+    for e in eventos:
+        if e is None:
+            yield ": latido\n\n"  # mantiene viva la conexión en proxies
+        else:
+            yield (
+                f"id: {e['seq']}\nevent: {e['entidad']}.{e['operacion']}\n"
+                f"data: {json.dumps(e)}\n\n"
+            )
+
+
+# --------------------------------------------------------------------- #
+# 22h. GET /tasks/search  (texto completo, por relevancia) ------------- #
+# --------------------------------------------------------------------- #
+@app.route("/tasks/search", methods=["GET"])
+def api_buscar_tareas():
+    try:
+        return jsonify(buscar_tareas(
+            request.args.get("q"),
+            limite=request.args.get("limit", type=int),
+            offset=request.args.get("offset", 0, type=int),
+            estado=request.args.get("estado"),
+            rol=request.args.get("rol"),
+        )), 200
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
+# --------------------------------------------------------------------- #
+# 22i. GET /usuarios/<alias>/resumen · GET /usuarios/resumen (ranking) - #
+# --------------------------------------------------------------------- #
+@app.route("/usuarios/<alias>/resumen", methods=["GET"])
+def api_resumen_usuario(alias):
+    try:
+        return jsonify(resumen_usuario(alias)), 200
+    except LookupError as e:
+        return _json_error(str(e), 404)
+
+
+@app.route("/usuarios/resumen", methods=["GET"])
+def api_ranking_usuarios():
+    try:
+        return jsonify(ranking_usuarios(
+            request.args.get("limit", type=int),
+            estado=request.args.get("estado"),
+            rol=request.args.get("rol"),
+        )), 200
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
+# --------------------------------------------------------------------- #
+# 22j. GET /export · POST /import  (volcado NDJSON, gzip opcional) ----- #
+# --------------------------------------------------------------------- #
+@app.route("/export", methods=["GET"])
+def api_exportar():
+    trozos = en_trozos(exportar())
+    if request.args.get("gzip", type=int):
+        return Response(
+            stream_with_context(comprimir(trozos)),
+            mimetype="application/gzip",
+            headers={"Content-Disposition": "attachment; filename=volcado.ndjson.gz"},
+        )
+    return Response(stream_with_context(trozos), mimetype="application/x-ndjson")
+
+
+@app.route("/import", methods=["POST"])
+def api_importar():
+    comprimido = (
+        request.mimetype == "application/gzip"
+        or request.headers.get("Content-Encoding") == "gzip"
+    )
+    try:
+        return jsonify(importar(leer_lineas(request.stream, comprimido))), 201
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
+# --------------------------------------------------------------------- #
+# 22k. duración · camino crítico · cronograma (planificación) --------- #
+# --------------------------------------------------------------------- #
+@app.route("/tasks/<int:tarea_id>/duration", methods=["POST"])
+def api_fijar_duracion(tarea_id):
+    d = request.get_json(force=True)
+    try:
+        return jsonify(fijar_duracion(tarea_id, d["duracion"])), 200
+    except LookupError as e:
+        return _json_error(str(e), 404)
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
+@app.route("/tasks/<int:tarea_id>/critical-path", methods=["GET"])
+def api_camino_critico(tarea_id):
+    try:
+        return jsonify(camino_critico(tarea_id)), 200
+    except LookupError as e:
+        return _json_error(str(e), 404)
+
+
+@app.route("/schedule", methods=["GET"])
+def api_cronograma():
+    return jsonify(cronograma(bool(request.args.get("criticas", type=int)))), 200
+
+
+# --------------------------------------------------------------------- #
+# 22l. GET /tasks?ids=1,2,3  (varias tareas en una petición) ----------- #
+# --------------------------------------------------------------------- #
+@app.route("/tasks", methods=["GET"])
+def api_detalle_tareas():
+    try:
+        return jsonify(detalle_tareas(request.args.get("ids"), **_opciones_detalle())), 200
+    except ValueError as e:
+        return _json_error(str(e), 422)
+
+
+def _opciones_detalle():
+    return {
+        "incluir": request.args.get("include"),
+        "campos": request.args.get("fields"),
+        "profundidad": request.args.get("depth", type=int),
+    }
 
 
 # --------------------------------------------------------------------- #
@@ -150,8 +480,51 @@ def _json_error(msg: str, code: int):
     return jsonify({"error": msg}), code
 
 
+def _respuesta_cacheada(recurso: str, cargar, version=None):
+    """
+    GET con ETag fuerte + caché de la respuesta serializada. Los errores de
+    `cargar` (LookupError/ValueError) se propagan sin cachearse.
+
+    Con `version` (una consulta indexada, p. ej. version_tarea) el ETag sale
+    de la versión: If-None-Match se responde 304 sin cargar el recurso aunque
+    no esté en la caché (TTL vencido, otro worker), y una entrada de otra
+    versión no se sirve. Sin ella, el ETag es el hash del cuerpo y el 304
+    sale sólo de una entrada en caché, sin tocar la BD.
+    """
+    cache = cache_respuestas()
+    variante = request.query_string
+    vigente = version() if version is not None else None
+    entrada = cache.obtener(recurso, variante, vigente)
+    if entrada is not None:
+        etag = entrada.etag
+    elif vigente is not None:
+        etag = etag_version(recurso, vigente, variante)
+    else:
+        etag = None
+
+    if etag is not None and request.if_none_match.contains(etag):
+        resp = app.response_class(status=304)
+    else:
+        if entrada is None:
+            generacion = cache.generacion(recurso)
+            cuerpo = jsonify(cargar()).get_data()
+            entrada = cache.guardar(recurso, variante, cuerpo, generacion, vigente)
+        resp = app.response_class(entrada.cuerpo, mimetype="application/json")
+        etag = entrada.etag
+    resp.set_etag(etag)
+    return resp
+
+
 @app.errorhandler(404)
 @app.errorhandler(422)
 def handler_http_error(err: HTTPException):
     # err.description viene de abort(), err.code del decorador
-    return _json_error(err.description if err.description else "Not found", err.code)
\ No newline at end of file
+    return _json_error(err.description if err.description else "Not found", err.code)
+
+
+@app.errorhandler(BaseOcupada)
+def handler_base_ocupada(err: BaseOcupada):
+    # Se agotó REINTENTO_PLAZO contra el lock de SQLite: nada quedó aplicado
+    resp, code = _json_error(str(err), 503)
+    resp.headers["Retry-After"] = "1"
+    return resp, code
@@ -1,68 +1,379 @@
 """
 Capa de servicio / lógica de negocio para la Pregunta 1.
 Separa las reglas de Flask para facilitar los tests unitarios.
+La persistencia va por src.repositorios (SQL o memoria, según REPOSITORIO).
 """
 
-from typing import Dict, Any, List
+import json
+import random
+import re
+import time
+from functools import wraps
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 
-from src import db
-from src.models.usuario import Usuario
-from src.models.tarea import Tarea
-from src.models.asignacion import Asignacion
+from flask import current_app
+
+from src.grafo import Plan, planificar, tiene_ciclos
 from src.models.enums import EstadoEnum, RolEnum
-from src.models.dependencia import dependencia
+from src.repositorios import (
+    BaseOcupada,
+    Evento,
+    Repositorio,
+    hay_repositorio_fijado,
+    repositorio,
+)
+from src.utils.cache import clave_tarea, clave_usuario
+
+
+def _invalidar_cache(tareas: Iterable[int] = (), usuarios: Iterable[str] = ()) -> None:
+    """Invalida las respuestas GET cacheadas de estas tareas/usuarios."""
+    cache = current_app.extensions.get("cache_respuestas")
+    if cache is not None:
+        claves = [clave_tarea(t) for t in tareas] + [clave_usuario(a) for a in usuarios]
+        # En un group commit, no antes de que el lote se confirme
+        repositorio().tras_confirmar(lambda: cache.invalidar(claves))
+
+
+def _registrar_eventos(repo: Repositorio, eventos: List[Evento]) -> None:
+    """Agrega al feed de cambios en la transacción en curso; avisa al confirmar."""
+    repo.registrar_eventos(eventos)
+    aviso = current_app.extensions.get("aviso_eventos")
+    if aviso is not None:
+        repo.tras_confirmar(aviso.avisar)
+
+
+def _evento_tarea_creada(
+    tarea_id: int,
+    tarea: Dict[str, Any],
+    dependencias: List[int],
+) -> Evento:
+    return ("tarea", str(tarea_id), "crear", {
+        "id": tarea_id,
+        "nombre": tarea["nombre"],
+        "descripcion": tarea["descripcion"],
+        "duracion": tarea.get("duracion"),
+        "estado": EstadoEnum.NUEVA.value,
+        "usuarios": [{"usuario": a, "rol": r.value} for a, r in tarea["asignaciones"]],
+        "dependencias": sorted(dependencias),
+    })
+
+
+def _agrupable(fn):
+    """
+    Con GRUPO_COMMIT, la llamada se encola en src.utils.cola_escritura y la
+    aplica el escritor único junto con otras (un commit por lote). Si ya
+    hay un repositorio fijado (el propio escritor, la app ASGI) va directa.
+    """
+    @wraps(fn)
+    def envoltura(*args, **kwargs):
+        cola = current_app.extensions.get("cola_escritura")
+        if cola is None or hay_repositorio_fijado():
+            return fn(*args, **kwargs)
+        return cola.ejecutar(fn, *args, **kwargs)
+
+    return envoltura
+
+
+def _reintentable(fn):
+    """
+    Repite `fn` entera si falló por un bloqueo pasajero de la BD (su
+    transacción ya se revirtió), con pausas exponenciales al azar ("full
+    jitter") hasta REINTENTO_PLAZO s; vencido el plazo lanza BaseOcupada.
+    Sólo para mutaciones que pueden repetirse desde cero: todo lo que leen
+    va dentro de su transacción, nada después del commit. Dentro de un
+    repositorio fijado la transacción es de otro y no se reintenta aquí.
+    """
+    @wraps(fn)
+    def envoltura(*args, **kwargs):
+        if hay_repositorio_fijado():
+            return fn(*args, **kwargs)
+        config = current_app.config
+        limite = time.monotonic() + config["REINTENTO_PLAZO"]
+        pausa = config["REINTENTO_PAUSA"]
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not repositorio().es_bloqueo_transitorio(e):
+                    raise
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise BaseOcupada("Base de datos ocupada, reintente más tarde") from e
+                time.sleep(min(random.uniform(0, pausa), restante))
+                pausa = min(pausa * 2, config["REINTENTO_PAUSA_MAX"])
+
+    return envoltura
 
 
 # -------------------------------------------------
 # 12. crear_usuario
 # -------------------------------------------------
+@_reintentable
+@_agrupable
 def crear_usuario(alias: str, nombre: str) -> Dict[str, Any]:
-    if Usuario.query.get(alias):
-        raise ValueError("Alias ya registrado")
+    repo = repositorio()
+    with repo.transaccion():
+        if repo.obtener_usuario(alias):
+            raise ValueError("Alias ya registrado")
+        repo.agregar_usuario(alias, nombre)
+        _registrar_eventos(repo, [("usuario", alias, "crear", {"alias": alias, "nombre": nombre})])
 
-    nuevo = Usuario(alias=alias, nombre=nombre)
-    db.session.add(nuevo)
-    db.session.commit()
-    return {"alias": nuevo.alias, "nombre": nuevo.nombre}
+    _invalidar_cache(usuarios=[alias])
+    return {"alias": alias, "nombre": nombre}
 
 
 # -------------------------------------------------
 # 13. crear_tarea
 # -------------------------------------------------
+@_reintentable
 def crear_tarea(
     nombre: str,
     descripcion: str,
     usuario_alias: str,
     rol: str,
+    duracion: Optional[int] = None,
 ) -> Dict[str, Any]:
-    # Usuario debe existir
-    usuario = Usuario.query.get(usuario_alias)
-    if not usuario:
-        raise LookupError("Usuario no encontrado")
+    repo = repositorio()
+    with repo.transaccion():
+        # Usuario debe existir
+        if not repo.obtener_usuario(usuario_alias):
+            raise LookupError("Usuario no encontrado")
+
+        # Rol válido
+        try:
+            rol_enum = RolEnum(rol)
+        except ValueError:
+            raise ValueError("Rol inválido")
+
+        nueva = {
+            "nombre": nombre,
+            "descripcion": descripcion,
+            "duracion": _validar_duracion(duracion),
+            "asignaciones": [(usuario_alias, rol_enum)],
+            "dependencias": [],
+        }
+        (tarea_id,) = repo.insertar_tareas([nueva])
+        _registrar_eventos(repo, [_evento_tarea_creada(tarea_id, nueva, [])])
+
+    _invalidar_cache(usuarios=[usuario_alias])
+    return {"id": tarea_id}
+
+
+# -------------------------------------------------
+# 13b. crear_tareas (importación masiva)
+# -------------------------------------------------
+@_reintentable
+def crear_tareas(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Crea muchas tareas en UNA transacción con inserciones por lotes.
+
+    Cada item: {"nombre", "descripcion", "asignaciones": [{"usuario", "rol"}],
+    "ref" (opcional), "duracion" (opcional), "dependencias": [refs de otros
+    items del lote]}.
+    Se acepta también la forma corta {"usuario", "rol"} de POST /tasks.
+
+    Devuelve un resultado por item, en el mismo orden:
+    {"indice": i, "id": ...} o {"indice": i, "error": ..., "codigo": 404|422}.
+    Los items inválidos (o que dependen de uno inválido) no se insertan;
+    el resto sí.
+    """
+    repo = repositorio()
+    errores: Dict[int, Tuple[str, int]] = {}
+    validos: Dict[int, Dict[str, Any]] = {}
+
+    # ---------- 1. validación local (forma, roles, refs) ---------- #
+    refs: Dict[Any, int] = {}
+    for i, item in enumerate(items):
+        try:
+            validos[i] = _normalizar_item(item)
+        except ValueError as e:
+            errores[i] = (str(e), 422)
+            continue
+        ref = validos[i]["ref"]
+        if ref is not None:
+            if ref in refs:
+                errores[i] = ("Referencia duplicada en el lote", 422)
+                del validos[i]
+            else:
+                refs[ref] = i
+
+    # ---------- 2. usuarios: una consulta por conjunto ------------- #
+    aliases = {a for it in validos.values() for a, _ in it["asignaciones"]}
+    existentes = repo.aliases_existentes(aliases)
+    for i, it in list(validos.items()):
+        faltantes = [a for a, _ in it["asignaciones"] if a not in existentes]
+        if faltantes:
+            errores[i] = (f"Usuario no encontrado: {faltantes[0]}", 404)
+            del validos[i]
+
+    # ---------- 3. dependencias internas: orden topológico --------- #
+    deps: Dict[int, List[int]] = {}
+    for i, it in list(validos.items()):
+        try:
+            deps[i] = [refs[r] for r in it["dependencias"]]
+        except KeyError:
+            errores[i] = ("Dependencia con referencia desconocida", 422)
+            del validos[i]
+    orden = _orden_topologico(validos, deps, errores)
+
+    # ---------- 4. inserción por lotes en una transacción ---------- #
+    ids: Dict[int, int] = {}
+    if orden:
+        posicion = {i: k for k, i in enumerate(orden)}
+        with repo.transaccion():
+            nuevos = repo.insertar_tareas([
+                {
+                    "nombre": validos[i]["nombre"],
+                    "descripcion": validos[i]["descripcion"],
+                    "duracion": validos[i]["duracion"],
+                    "asignaciones": validos[i]["asignaciones"],
+                    "dependencias": [posicion[d] for d in deps[i]],
+                }
+                for i in orden
+            ])
+            _registrar_eventos(repo, [
+                _evento_tarea_creada(
+                    nuevos[k], validos[i], [nuevos[posicion[d]] for d in deps[i]]
+                )
+                for k, i in enumerate(orden)
+            ])
+        ids = dict(zip(orden, nuevos))
+        _invalidar_cache(
+            usuarios={alias for i in orden for alias, _ in validos[i]["asignaciones"]}
+        )
+
+    return [
+        {"indice": i, "id": ids[i]}
+        if i in ids
+        else {"indice": i, "error": errores[i][0], "codigo": errores[i][1]}
+        for i in range(len(items))
+    ]
 
-    # Rol válido
+
+def _normalizar_item(item: Any) -> Dict[str, Any]:
+    if not isinstance(item, dict):
+        raise ValueError("Item inválido")
     try:
-        rol_enum = RolEnum(rol)
-    except ValueError:
-        raise ValueError("Rol inválido")
+        nombre, descripcion = item["nombre"], item["descripcion"]
+    except KeyError as e:
+        raise ValueError(f"Falta el campo {e.args[0]}")
+    if not isinstance(nombre, str) or not isinstance(descripcion, str):
+        raise ValueError("nombre y descripcion deben ser texto")
+
+    ref = item.get("ref")
+    if ref is not None and not _es_ref(ref):
+        raise ValueError("ref debe ser texto o entero")
+    dependencias = item.get("dependencias") or []
+    if not isinstance(dependencias, list) or not all(_es_ref(r) for r in dependencias):
+        raise ValueError("dependencias debe ser una lista de referencias")
+
+    crudas = item.get("asignaciones")
+    if crudas is None and "usuario" in item:
+        crudas = [{"usuario": item["usuario"], "rol": item.get("rol")}]
+    if not crudas:
+        raise ValueError("La tarea debe tener al menos un usuario asignado")
+
+    asignaciones = []
+    if not isinstance(crudas, list):
+        raise ValueError("asignaciones debe ser una lista")
+    for a in crudas:
+        try:
+            par = (a["usuario"], RolEnum(a["rol"]))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Rol inválido")
+        if not isinstance(par[0], str):
+            raise ValueError("usuario debe ser texto")
+        if par in asignaciones:
+            raise ValueError("Asignación ya existe")
+        asignaciones.append(par)
+
+    return {
+        "nombre": nombre,
+        "descripcion": descripcion,
+        "duracion": _validar_duracion(item.get("duracion")),
+        "asignaciones": asignaciones,
+        "ref": ref,
+        "dependencias": dependencias,
+    }
+
+
+def _es_ref(valor: Any) -> bool:
+    # bool es subclase de int, pero true/false no son referencias
+    return isinstance(valor, (str, int)) and not isinstance(valor, bool)
+
+
+def _orden_topologico(
+    validos: Dict[int, Dict[str, Any]],
+    deps: Dict[int, List[int]],
+    errores: Dict[int, Tuple[str, int]],
+) -> List[int]:
+    """Kahn sobre el lote; descarta ciclos y dependientes de items inválidos."""
+    pendientes = {i: len(deps[i]) for i in validos}
+    dependientes: Dict[int, List[int]] = {i: [] for i in validos}
+    listos = []
+    for i in validos:
+        for d in deps[i]:
+            if d in dependientes:
+                dependientes[d].append(i)
+            else:
+                pendientes[i] = -1  # depende de un item inválido
+        if pendientes[i] == 0:
+            listos.append(i)
+
+    orden = []
+    while listos:
+        i = listos.pop()
+        orden.append(i)
+        for j in dependientes[i]:
+            if pendientes[j] > 0:
+                pendientes[j] -= 1
+                if pendientes[j] == 0:
+                    listos.append(j)
+
+    en_orden = set(orden)
+    restantes = [i for i in validos if i not in en_orden]
+
+    # Dependientes (transitivos) de items inválidos vs. ciclos reales
+    frontera = [i for i in restantes if pendientes[i] == -1]
+    bloqueados = set(frontera)
+    while frontera:
+        for j in dependientes[frontera.pop()]:
+            if j not in bloqueados:
+                bloqueados.add(j)
+                frontera.append(j)
+
+    for i in restantes:
+        if i in bloqueados:
+            errores[i] = ("Depende de un item inválido del lote", 422)
+        else:
+            errores[i] = ("La dependencia crearía un ciclo", 422)
+    for i in list(validos):
+        if i in errores:
+            del validos[i]
+    return sorted(orden)
 
-    tarea = Tarea(
-        nombre=nombre,
-        descripcion=descripcion,
-        estado=EstadoEnum.NUEVA,
-    )
-    db.session.add(tarea)
-    db.session.flush()  # para obtener tarea.id
 
-    asignacion = Asignacion(
-        usuario_alias=usuario.alias,
-        tarea_id=tarea.id,
-        rol=rol_enum,
-    )
-    db.session.add(asignacion)
-    db.session.commit()
+def obtener_tarea(tarea_id: int) -> Dict[str, Any]:
+    repo = repositorio()
+    # Las activas primero; el archivo sólo si no está (id inexistente o archivada)
+    tarea = repo.obtener_tarea(tarea_id) or repo.obtener_tarea_archivada(tarea_id)
+    if not tarea:
+        raise LookupError("Tarea no encontrada")
+    return {
+        "id": tarea.id,
+        "nombre": tarea.nombre,
+        "estado": tarea.estado.value,
+        "duracion": tarea.duracion,
+    }
+
 
-    return {"id": tarea.id}
+def version_tarea(tarea_id: int) -> int:
+    """
+    Versión de lo que devuelve GET /tasks/<id> (sin include ni pendientes):
+    el seq del último evento del feed que cambió la tarea, o de la última
+    importación. Una consulta indexada, sin cargar la fila.
+    """
+    return repositorio().version_tarea(tarea_id)
 
 
 # -------------------------------------------------
@@ -75,91 +386,183 @@ _TRANSICIONES_VALIDAS = {
 }
 
 
+@_reintentable
+@_agrupable
 def cambiar_estado(tarea_id: int, nuevo_estado: str) -> Dict[str, Any]:
-    tarea = Tarea.query.get(tarea_id)
-    if not tarea:
-        raise LookupError("Tarea no encontrada")
+    repo = repositorio()
+    with repo.transaccion():
+        tarea = repo.obtener_tarea(tarea_id)
+        if not tarea:
+            raise LookupError("Tarea no encontrada")
 
-    try:
-        nuevo_enum = EstadoEnum(nuevo_estado)
-    except ValueError:
-        raise ValueError("Estado inválido")
+        try:
+            nuevo_enum = EstadoEnum(nuevo_estado)
+        except ValueError:
+            raise ValueError("Estado inválido")
 
-    if (tarea.estado, nuevo_enum) not in _TRANSICIONES_VALIDAS:
-        raise ValueError("Transición de estado no permitida")
+        if (tarea.estado, nuevo_enum) not in _TRANSICIONES_VALIDAS:
+            raise ValueError("Transición de estado no permitida")
 
-    # Si quiere finalizar, todas las dependencias deben estar finalizadas
-    if nuevo_enum == EstadoEnum.FINALIZADA:
-        pendientes = [
-            dep.id for dep in tarea.dependencias if dep.estado != EstadoEnum.FINALIZADA
-        ]
-        if pendientes:
+        # Si quiere finalizar, todas las dependencias deben estar finalizadas
+        if nuevo_enum == EstadoEnum.FINALIZADA and tarea.dependencias_pendientes:
+            pendientes = sorted(repo.dependencias_pendientes([tarea_id]).get(tarea_id, ()))
             raise ValueError(
                 f"Dependencias no finalizadas: {pendientes}"
             )
 
-    tarea.estado = nuevo_enum
-    db.session.commit()
-    return {"id": tarea.id, "estado": tarea.estado.value}
+        # Ajusta también `dependencias_pendientes` de quienes dependen de ella
+        repo.actualizar_estados({tarea_id: (tarea.estado, nuevo_enum)})
+        _registrar_eventos(
+            repo, [("tarea", str(tarea_id), "estado", {"estado": nuevo_enum.value})]
+        )
+        usuarios = repo.usuarios_asignados([tarea_id])
+
+    _invalidar_cache(tareas=[tarea_id], usuarios=usuarios)
+    return {"id": tarea_id, "estado": nuevo_enum.value}
+
+
+# -------------------------------------------------
+# 14b. cambiar_estados (transiciones por lote)
+# -------------------------------------------------
+@_reintentable
+def cambiar_estados(cambios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aplica muchas transiciones (id, estado) en UNA transacción.
+
+    El orden del lote se respeta: cada cambio se valida contra el estado
+    que dejaron los anteriores, y una dependencia finalizada antes en el
+    lote cuenta como finalizada para los cambios siguientes.
+
+    Devuelve un resultado por cambio: {"indice", "id", "estado"} o
+    {"indice", "error", "codigo": 404|422}. Los cambios inválidos no se
+    aplican; el resto sí.
+    """
+    resultados: Dict[int, Dict[str, Any]] = {}
+    pedidos: List[Tuple[int, int, EstadoEnum]] = []
+    for i, cambio in enumerate(cambios):
+        try:
+            tid = int(cambio["id"])
+        except (KeyError, TypeError, ValueError):
+            resultados[i] = _error_lote(i, "Cambio inválido (use id/estado)", 422)
+            continue
+        try:
+            pedidos.append((i, tid, EstadoEnum(cambio.get("estado"))))
+        except ValueError:
+            resultados[i] = _error_lote(i, "Estado inválido", 422)
+
+    repo = repositorio()
+    finales: Dict[int, EstadoEnum] = {}
+    usuarios: Set[str] = set()
+    with repo.transaccion():
+        # Estado y contador de todas las tareas del lote de una vez
+        leidos = repo.estados({tid for _, tid, _ in pedidos})
+        estados = {tid: e for tid, (e, _) in leidos.items()}
+
+        # Qué dependencias faltan, sólo para las que quieren finalizar con contador > 0
+        pendientes = repo.dependencias_pendientes(
+            tid for _, tid, e in pedidos
+            if e == EstadoEnum.FINALIZADA and leidos.get(tid, (None, 0))[1]
+        )
+
+        for i, tid, nuevo_enum in pedidos:
+            if tid not in estados:
+                resultados[i] = _error_lote(i, "Tarea no encontrada", 404)
+                continue
+            if (estados[tid], nuevo_enum) not in _TRANSICIONES_VALIDAS:
+                resultados[i] = _error_lote(i, "Transición de estado no permitida", 422)
+                continue
+            if nuevo_enum == EstadoEnum.FINALIZADA:
+                # Cuentan como finalizadas las que ya se finalizaron en este lote
+                faltan = sorted(
+                    d for d in pendientes.get(tid, ())
+                    if estados.get(d) != EstadoEnum.FINALIZADA
+                )
+                if faltan:
+                    resultados[i] = _error_lote(
+                        i, f"Dependencias no finalizadas: {faltan}", 422
+                    )
+                    continue
+
+            estados[tid] = finales[tid] = nuevo_enum
+            resultados[i] = {"indice": i, "id": tid, "estado": nuevo_enum.value}
+
+        if finales:
+            repo.actualizar_estados(
+                {tid: (leidos[tid][0], e) for tid, e in finales.items()}
+            )
+            _registrar_eventos(repo, [
+                ("tarea", str(tid), "estado", {"estado": e.value})
+                for tid, e in finales.items()
+            ])
+            usuarios = repo.usuarios_asignados(finales)
+
+    if finales:
+        _invalidar_cache(tareas=finales, usuarios=usuarios)
+    return [resultados[i] for i in range(len(cambios))]
+
+
+def _error_lote(indice: int, msg: str, codigo: int) -> Dict[str, Any]:
+    return {"indice": indice, "error": msg, "codigo": codigo}
 
 
 # -------------------------------------------------
 # 15. gestionar_usuario_en_tarea
 # -------------------------------------------------
+@_reintentable
+@_agrupable
 def gestionar_usuario_en_tarea(
     tarea_id: int,
     usuario_alias: str,
     rol: str,
     accion: str,
 ) -> Dict[str, Any]:
-    tarea = Tarea.query.get(tarea_id)
-    if not tarea:
-        raise LookupError("Tarea no encontrada")
+    repo = repositorio()
+    with repo.transaccion():
+        if not repo.obtener_tarea(tarea_id):
+            raise LookupError("Tarea no encontrada")
 
-    usuario = Usuario.query.get(usuario_alias)
-    if not usuario:
-        raise LookupError("Usuario no encontrado")
+        if not repo.obtener_usuario(usuario_alias):
+            raise LookupError("Usuario no encontrado")
 
-    try:
-        rol_enum = RolEnum(rol)
-    except ValueError:
-        raise ValueError("Rol inválido")
+        try:
+            rol_enum = RolEnum(rol)
+        except ValueError:
+            raise ValueError("Rol inválido")
 
-    existe = Asignacion.query.get((usuario_alias, tarea_id, rol_enum))
+        existe = repo.existe_asignacion(usuario_alias, tarea_id, rol_enum)
 
-    if accion == "adicionar":
-        if existe:
-            raise ValueError("Asignación ya existe")
-        db.session.add(
-            Asignacion(
-                usuario_alias=usuario_alias,
-                tarea_id=tarea_id,
-                rol=rol_enum,
-            )
-        )
-    elif accion == "remover":
-        if not existe:
-            raise ValueError("Asignación no encontrada")
-        # Evitar dejar la tarea sin usuarios
-        if len(tarea.asignaciones) == 1:
-            raise ValueError("La tarea debe tener al menos un usuario asignado")
-        db.session.delete(existe)
-    else:
-        raise ValueError("Acción inválida (use adicionar/remover)")
+        if accion == "adicionar":
+            if existe:
+                raise ValueError("Asignación ya existe")
+            repo.agregar_asignacion(usuario_alias, tarea_id, rol_enum)
+        elif accion == "remover":
+            if not existe:
+                raise ValueError("Asignación no encontrada")
+            # Evitar dejar la tarea sin usuarios
+            if repo.contar_asignaciones(tarea_id) == 1:
+                raise ValueError("La tarea debe tener al menos un usuario asignado")
+            repo.quitar_asignacion(usuario_alias, tarea_id, rol_enum)
+        else:
+            raise ValueError("Acción inválida (use adicionar/remover)")
 
-    db.session.commit()
-    return {"tarea_id": tarea_id, "usuarios": _usuarios_de_tarea(tarea)}
+        usuarios = _usuarios_de_tarea(tarea_id)
+        _registrar_eventos(repo, [("tarea", str(tarea_id), "usuarios", {"usuarios": usuarios})])
 
+    _invalidar_cache(usuarios=[usuario_alias])
+    return {"tarea_id": tarea_id, "usuarios": usuarios}
 
-def _usuarios_de_tarea(t: Tarea) -> List[Dict[str, str]]:
+
+def _usuarios_de_tarea(tarea_id: int) -> List[Dict[str, str]]:
     return [
-        {"alias": a.usuario_alias, "rol": a.rol.value} for a in t.asignaciones
+        {"alias": alias, "rol": rol.value}
+        for alias, rol in repositorio().asignaciones_de_tarea(tarea_id)
     ]
 
 
 # -------------------------------------------------
 # 16. gestionar_dependencia
 # -------------------------------------------------
+@_reintentable
 def gestionar_dependencia(
     tarea_id: int,
     depende_de_id: int,
@@ -168,67 +571,855 @@ def gestionar_dependencia(
     if tarea_id == depende_de_id:
         raise ValueError("Una tarea no puede depender de sí misma")
 
-    tarea = Tarea.query.get(tarea_id)
-    depende_de = Tarea.query.get(depende_de_id)
-    if not tarea or not depende_de:
+    repo = repositorio()
+    removibles = {depende_de_id} if accion == "remover" else set()
+    if _tareas_faltantes(repo, {tarea_id, depende_de_id}, removibles):
         raise LookupError("Alguna de las tareas no existe")
 
-    # Detectar ciclos simples: depende_de ya depende (directa o indirectamente) de tarea
-    if _hay_ciclo(tarea, depende_de):
-        raise ValueError("La dependencia crearía un ciclo")
+    arista = (tarea_id, depende_de_id)
+    resultantes: Dict[int, List[int]] = {}
 
-    conn = db.engine.connect()
-    trans = conn.begin()
+    def validar(grafo):
+        # Detectar ciclos: depende_de ya depende (directa o indirectamente) de tarea
+        if grafo.hay_ciclo(tarea_id, depende_de_id):
+            raise ValueError("La dependencia crearía un ciclo")
 
-    try:
         if accion == "adicionar":
-            # ¿ya existe?
-            existe = conn.execute(
-                dependencia.select().where(
-                    (dependencia.c.tarea_id == tarea_id)
-                    & (dependencia.c.depende_de_id == depende_de_id)
-                )
-            ).fetchone()
-            if existe:
+            if grafo.existe(*arista):
                 raise ValueError("La dependencia ya existe")
-
-            conn.execute(
-                dependencia.insert().values(
-                    tarea_id=tarea_id, depende_de_id=depende_de_id
-                )
-            )
+            cambio = {arista}, set()
         elif accion == "remover":
-            res = conn.execute(
-                dependencia.delete().where(
-                    (dependencia.c.tarea_id == tarea_id)
-                    & (dependencia.c.depende_de_id == depende_de_id)
-                )
-            )
-            if res.rowcount == 0:
+            if not grafo.existe(*arista):
                 raise ValueError("La dependencia no existe")
+            cambio = set(), {arista}
         else:
             raise ValueError("Acción inválida (use adicionar/remover)")
+        resultantes.update(_dependencias_resultantes(repo, *cambio))
+        _registrar_eventos(repo, _eventos_aristas(resultantes))
+        return cambio
+
+    repo.modificar_aristas(validar)
+    _invalidar_cache(tareas=[tarea_id])
+    return {"tarea_id": tarea_id, "dependencias": resultantes[tarea_id]}
+
+
+# -------------------------------------------------
+# 16b. gestionar_dependencias (lote atómico)
+# -------------------------------------------------
+@_reintentable
+def gestionar_dependencias(operaciones: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Agrega/quita muchas aristas de forma ATÓMICA: se aplican todas o
+    ninguna. Cada operación es {"tarea_id", "dependencytaskid", "accion"}
+    y se interpreta en orden sobre el grafo que dejan las anteriores; el
+    resultado se valida con UNA sola pasada de detección de ciclos.
+    """
+    pares: List[Tuple[int, Tuple[int, int], str]] = []
+    for k, op in enumerate(operaciones):
+        try:
+            arista = (int(op["tarea_id"]), int(op["dependencytaskid"]))
+            accion = op["accion"]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Operación {k}: use tarea_id/dependencytaskid/accion")
+        if accion not in ("adicionar", "remover"):
+            raise ValueError(f"Operación {k}: Acción inválida (use adicionar/remover)")
+        if arista[0] == arista[1]:
+            raise ValueError(f"Operación {k}: Una tarea no puede depender de sí misma")
+        pares.append((k, arista, accion))
+
+    repo = repositorio()
+    ids = {t for _, arista, _ in pares for t in arista}
+    # Tienen que estar activas: las tareas de origen y los destinos que se agregan
+    activas = {t for _, (t, _), _ in pares}
+    activas |= {d for _, (_, d), accion in pares if accion == "adicionar"}
+    removibles = ids - activas
+    faltan = _tareas_faltantes(repo, ids, removibles)
+    if faltan:
+        raise LookupError(f"Tareas inexistentes: {sorted(faltan)}")
+    resultantes: Dict[int, List[int]] = {}
+
+    def validar(grafo):
+        presentes: Dict[Tuple[int, int], bool] = {}
+        for k, arista, accion in pares:
+            presente = presentes.get(arista, grafo.existe(*arista))
+            if accion == "adicionar" and presente:
+                raise ValueError(f"Operación {k}: La dependencia ya existe")
+            if accion == "remover" and not presente:
+                raise ValueError(f"Operación {k}: La dependencia no existe")
+            presentes[arista] = accion == "adicionar"
+
+        agregadas = {a for a, p in presentes.items() if p and not grafo.existe(*a)}
+        quitadas = {a for a, p in presentes.items() if not p and grafo.existe(*a)}
+        if grafo.hay_ciclo_lote(agregadas, quitadas):
+            raise ValueError("El lote de dependencias crearía un ciclo")
+        # Si se vuelve a validar (índice obsoleto) vale sólo la última pasada
+        resultantes.clear()
+        resultantes.update(_dependencias_resultantes(repo, agregadas, quitadas))
+        _registrar_eventos(repo, _eventos_aristas(resultantes))
+        return agregadas, quitadas
+
+    repo.modificar_aristas(validar)
+    afectadas = sorted(resultantes)
+    _invalidar_cache(tareas=afectadas)
+    return {
+        "operaciones": len(pares),
+        "tareas": [{"tarea_id": t, "dependencias": resultantes[t]} for t in afectadas],
+    }
+
+
+def _tareas_faltantes(repo: Repositorio, ids: Set[int], removibles: Set[int]) -> Set[int]:
+    """
+    Ids de `ids` que no son tareas activas. Las de `removibles` (sólo
+    destino de aristas a quitar) también valen archivadas: una arista
+    activa hacia una tarea archivada se tiene que poder quitar.
+    """
+    faltan = ids - repo.tareas_existentes(ids)
+    return {
+        t for t in faltan
+        if t not in removibles or repo.obtener_tarea_archivada(t) is None
+    }
+
+
+def _dependencias_resultantes(
+    repo: Repositorio, agregadas: Set[Tuple[int, int]], quitadas: Set[Tuple[int, int]]
+) -> Dict[int, List[int]]:
+    """
+    Dependencias directas de cada tarea afectada una vez aplicado el cambio.
+    Se lee dentro de `validar`, antes del commit: lo que devuelve la mutación
+    no vuelve a tocar la base ya confirmada.
+    """
+    afectadas = {t for t, _ in agregadas | quitadas}
+    directas = {t: set(ds) for t, ds in repo.dependencias_directas(afectadas).items()}
+    for t, d in agregadas:
+        directas[t].add(d)
+    for t, d in quitadas:
+        directas[t].discard(d)
+    return {t: sorted(directas[t]) for t in sorted(afectadas)}
+
+
+def _eventos_aristas(directas: Dict[int, List[int]]) -> List[Evento]:
+    """Un evento por tarea afectada con sus dependencias directas resultantes."""
+    return [
+        ("tarea", str(t), "dependencias", {"dependencias": ds})
+        for t, ds in directas.items()
+    ]
+
+
+# -------------------------------------------------
+# 17. tareas_listas (cola de tareas desbloqueadas)
+# -------------------------------------------------
+def tareas_listas(limite: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    NUEVA/EN_PROGRESO sin dependencias pendientes, ordenadas por id; las
+    primeras `limite` (LIMITE_PAGINA por defecto).
+    """
+    limite = LIMITE_PAGINA if limite is None else limite
+    if not 1 <= limite <= LIMITE_PAGINA_MAX:
+        raise ValueError(f"limit debe estar entre 1 y {LIMITE_PAGINA_MAX}")
+    return [_fila_tarea(f) for f in repositorio().tareas_listas(limite)]
 
-        trans.commit()
-    except Exception:
-        trans.rollback()
-        raise
-    finally:
-        conn.close()
-
-    return {"tarea_id": tarea_id, "dependencias": [d.id for d in tarea.dependencias]}
-
-
-def _hay_ciclo(tarea: Tarea, depende_de: Tarea) -> bool:
-    """DFS simple para detectar ciclo tarea ← … ← depende_de ← tarea"""
-    stack = [depende_de]
-    visitados = set()
-    while stack:
-        actual = stack.pop()
-        if actual.id == tarea.id:
-            return True
-        visitados.add(actual.id)
-        stack.extend(
-            d for d in actual.dependencias if d.id not in visitados
+
+@_reintentable
+def recalcular_dependencias_pendientes() -> int:
+    """
+    Recalcula desde cero `dependencias_pendientes`. Devuelve cuántas
+    tareas tenían el contador desfasado.
+    """
+    repo = repositorio()
+    with repo.transaccion():
+        return repo.recalcular_pendientes()
+
+
+# -------------------------------------------------
+# 18. clausura (upstream / downstream)
+# -------------------------------------------------
+_DIRECCIONES = ("upstream", "downstream")
+
+
+def clausura(
+    tarea_id: int,
+    direccion: str,
+    profundidad: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Tareas alcanzables desde `tarea_id` con su distancia mínima.
+      upstream   → de las que depende (transitivamente)
+      downstream → las que dependen de ella (transitivamente)
+    En SQL se resuelve con UNA consulta (CTE recursiva sobre `dependencia`).
+    """
+    if direccion not in _DIRECCIONES:
+        raise ValueError("Dirección inválida (use upstream/downstream)")
+    if profundidad is not None and profundidad < 1:
+        raise ValueError("La profundidad debe ser >= 1")
+    repo = repositorio()
+    if not repo.tareas_existentes([tarea_id]):
+        raise LookupError("Tarea no encontrada")
+
+    return [
+        {"id": i, "nombre": n, "estado": e.value, "distancia": d}
+        for i, n, e, d in repo.clausura(tarea_id, direccion, profundidad)
+    ]
+
+
+# -------------------------------------------------
+# 19. tareas_de_usuario (paginación por cursor / streaming)
+# -------------------------------------------------
+LIMITE_PAGINA = 100
+LIMITE_PAGINA_MAX = 1000
+
+
+def tareas_de_usuario(
+    alias: str,
+    cursor: Optional[int] = None,
+    limite: Optional[int] = None,
+    estado: Optional[str] = None,
+    rol: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Tareas asignadas a `alias`, ordenadas por id. Si llega `cursor` o
+    `limite` se pagina por keyset (tarea.id > cursor) y se devuelve
+    "siguiente" para pedir la próxima página; si no, se devuelven todas.
+    """
+    repo = repositorio()
+    usuario = repo.obtener_usuario(alias)
+    if not usuario:
+        raise LookupError("Usuario no encontrado")
+
+    filtros = _filtros_tareas_de_usuario(estado, rol)
+    paginado = cursor is not None or limite is not None
+    if paginado:
+        limite = LIMITE_PAGINA if limite is None else limite
+        if not 1 <= limite <= LIMITE_PAGINA_MAX:
+            raise ValueError(f"limit debe estar entre 1 y {LIMITE_PAGINA_MAX}")
+        # +1 para saber si hay otra página
+        filas = repo.tareas_de_usuario(alias, *filtros, cursor=cursor, limite=limite + 1)
+    else:
+        filas = repo.tareas_de_usuario(alias, *filtros)
+
+    respuesta = {
+        "alias": usuario.alias,
+        "nombre": usuario.nombre,
+        "tareas": [_fila_tarea(f) for f in filas[:limite]],
+    }
+    if paginado:
+        respuesta["siguiente"] = filas[limite - 1].id if len(filas) > limite else None
+    return respuesta
+
+
+def iterar_tareas_de_usuario(
+    alias: str,
+    estado: Optional[str] = None,
+    rol: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Igual que tareas_de_usuario pero como iterador con memoria constante
+    (en SQL, cursor del lado del servidor). Valida antes de devolverlo.
+    """
+    repo = repositorio()
+    if not repo.obtener_usuario(alias):
+        raise LookupError("Usuario no encontrado")
+
+    filtros = _filtros_tareas_de_usuario(estado, rol)
+    return (_fila_tarea(f) for f in repo.iterar_tareas_de_usuario(alias, *filtros))
+
+
+def _filtros_tareas_de_usuario(
+    estado: Optional[str], rol: Optional[str]
+) -> Tuple[Optional[EstadoEnum], Optional[RolEnum]]:
+    try:
+        estado_enum = EstadoEnum(estado) if estado is not None else None
+    except ValueError:
+        raise ValueError("Estado inválido")
+    try:
+        rol_enum = RolEnum(rol) if rol is not None else None
+    except ValueError:
+        raise ValueError("Rol inválido")
+    return estado_enum, rol_enum
+
+
+def _fila_tarea(fila) -> Dict[str, Any]:
+    return {"id": fila.id, "nombre": fila.nombre, "estado": fila.estado.value}
+
+
+# -------------------------------------------------
+# 20. feed de cambios (GET /changes, /changes/stream)
+# -------------------------------------------------
+def cambios(desde: int = 0, limite: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Página de eventos con seq > `desde`, en orden. "siguiente" es el seq a
+    pasar como `since` en la próxima llamada (igual a `desde` si no hubo).
+    """
+    if desde < 0:
+        raise ValueError("since debe ser >= 0")
+    limite = LIMITE_PAGINA if limite is None else limite
+    if not 1 <= limite <= LIMITE_PAGINA_MAX:
+        raise ValueError(f"limit debe estar entre 1 y {LIMITE_PAGINA_MAX}")
+
+    eventos = [_fila_evento(e) for e in repositorio().eventos_desde(desde, limite)]
+    return {"eventos": eventos, "siguiente": eventos[-1]["seq"] if eventos else desde}
+
+
+def seguir_cambios(desde: Optional[int] = None) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Eventos con seq > `desde` (por defecto, sólo los que lleguen de ahora en
+    más) a medida que se confirman. Produce None tras CAMBIOS_LATIDO s sin
+    novedades. No termina solo: lo corta el cliente al desconectarse.
+    """
+    if desde is not None and desde < 0:
+        raise ValueError("since debe ser >= 0")
+    repo = repositorio()
+    aviso = current_app.extensions["aviso_eventos"]
+    sondeo = current_app.config["CAMBIOS_SONDEO"]
+    latido = current_app.config["CAMBIOS_LATIDO"]
+    if desde is None:
+        desde = ultimo_cambio()
+
+    def generar(desde: int) -> Iterator[Optional[Dict[str, Any]]]:
+        silencio = time.monotonic()
+        while True:
+            generacion = aviso.generacion  # antes de consultar: no perder avisos
+            eventos = repo.eventos_desde(desde, LIMITE_PAGINA_MAX)
+            repo.liberar()  # no retener una conexión durante la espera
+            if eventos:
+                for e in eventos:
+                    yield _fila_evento(e)
+                desde = eventos[-1][0]
+                silencio = time.monotonic()
+                continue
+            if time.monotonic() - silencio >= latido:
+                yield None
+                silencio = time.monotonic()
+            aviso.esperar(generacion, sondeo)
+
+    return generar(desde)
+
+
+def ultimo_cambio() -> int:
+    """seq del último evento confirmado (0 si el feed está vacío)."""
+    return repositorio().ultima_secuencia()
+
+
+def _fila_evento(fila) -> Dict[str, Any]:
+    seq, creado, entidad, clave, operacion, datos = fila
+    return {
+        "seq": seq,
+        "ts": creado,
+        "entidad": entidad,
+        "id": int(clave) if entidad == "tarea" else clave,
+        "operacion": operacion,
+        "datos": datos,
+    }
+
+
+# -------------------------------------------------
+# 21. buscar_tareas (texto completo sobre nombre/descripcion)
+# -------------------------------------------------
+def buscar_tareas(
+    q: Optional[str],
+    limite: Optional[int] = None,
+    offset: int = 0,
+    estado: Optional[str] = None,
+    rol: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Tareas cuyo nombre o descripción contiene todas las palabras de `q`
+    (por prefijo, sin distinguir mayúsculas ni acentos), de más a menos
+    relevante. Se pagina por offset: el orden es por relevancia, no por id.
+    """
+    terminos = re.findall(r"[^\W_]+", (q or "").lower())
+    if not terminos:
+        raise ValueError("q debe contener al menos una palabra")
+    limite = LIMITE_PAGINA if limite is None else limite
+    if not 1 <= limite <= LIMITE_PAGINA_MAX:
+        raise ValueError(f"limit debe estar entre 1 y {LIMITE_PAGINA_MAX}")
+    if offset < 0:
+        raise ValueError("offset debe ser >= 0")
+
+    filtros = _filtros_tareas_de_usuario(estado, rol)
+    # +1 para saber si hay otra página
+    filas = repositorio().buscar_tareas(terminos, *filtros, offset=offset, limite=limite + 1)
+    return {
+        "q": q,
+        "tareas": [_fila_tarea(f) for f in filas[:limite]],
+        "siguiente": offset + limite if len(filas) > limite else None,
+    }
+
+
+# -------------------------------------------------
+# 22. resumen por usuario (carga de trabajo materializada)
+# -------------------------------------------------
+def resumen_usuario(alias: str) -> Dict[str, Any]:
+    """
+    Asignaciones de `alias` por rol y estado de la tarea, leídas del resumen
+    materializado (sin join). Una tarea con dos roles cuenta dos veces.
+    """
+    repo = repositorio()
+    usuario = repo.obtener_usuario(alias)
+    if not usuario:
+        raise LookupError("Usuario no encontrado")
+
+    por_rol = {r.value: {e.value: 0 for e in EstadoEnum} for r in RolEnum}
+    for rol, estado, n in repo.resumen_usuario(alias):
+        por_rol[rol.value][estado.value] = n
+    por_estado = {e.value: sum(c[e.value] for c in por_rol.values()) for e in EstadoEnum}
+    return {
+        "alias": usuario.alias,
+        "nombre": usuario.nombre,
+        "total": sum(por_estado.values()),
+        "por_estado": por_estado,
+        "por_rol": por_rol,
+    }
+
+
+def ranking_usuarios(
+    limite: Optional[int] = None,
+    estado: Optional[str] = None,
+    rol: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Usuarios con más asignaciones, de mayor a menor. `estado` admite varios
+    separados por coma (p. ej. "NUEVA,EN_PROGRESO" = carga abierta).
+    """
+    limite = LIMITE_PAGINA if limite is None else limite
+    if not 1 <= limite <= LIMITE_PAGINA_MAX:
+        raise ValueError(f"limit debe estar entre 1 y {LIMITE_PAGINA_MAX}")
+    estados = None
+    if estado is not None:
+        estados = [_filtros_tareas_de_usuario(e, None)[0] for e in estado.split(",")]
+    rol_enum = _filtros_tareas_de_usuario(None, rol)[1]
+
+    filas = repositorio().ranking_usuarios(estados, rol_enum, limite)
+    return {"usuarios": [{"alias": a, "total": n} for a, n in filas]}
+
+
+@_reintentable
+def reconstruir_resumen() -> int:
+    """Rehace el resumen desde asignacion ⨝ tarea (bases previas o corregir)."""
+    repo = repositorio()
+    with repo.transaccion():
+        return repo.reconstruir_resumen()
+
+
+def verificar_resumen() -> List[Dict[str, Any]]:
+    """Diferencias entre el resumen y lo que dicen las asignaciones ([] = coherente)."""
+    return [
+        {"alias": a, "rol": r.value, "estado": e.value, "guardado": g, "real": n}
+        for a, r, e, g, n in repositorio().verificar_resumen()
+    ]
+
+
+# -------------------------------------------------
+# 23. volcado completo (export / import NDJSON)
+# -------------------------------------------------
+VERSION_VOLCADO = 1
+LOTE_CARGA = 10_000  # filas por executemany al importar
+
+# Campos de cada registro NDJSON, en el orden de las filas del repositorio
+_CAMPOS_VOLCADO = {
+    "usuario": ("alias", "nombre"),
+    "tarea": ("id", "nombre", "descripcion", "estado", "duracion", "finalizada_en"),
+    "asignacion": ("usuario", "tarea_id", "rol"),
+    "dependencia": ("tarea_id", "depende_de_id"),
+}
+_ENTEROS_VOLCADO = {"id", "tarea_id", "depende_de_id"}
+_OPCIONALES_VOLCADO = {"duracion", "finalizada_en"}  # ausentes en volcados anteriores: null
+_CODIFICADOR_VOLCADO = json.JSONEncoder(ensure_ascii=False)  # uno solo, no uno por fila
+
+
+def exportar() -> Iterator[str]:
+    """
+    Líneas NDJSON: una cabecera {"tipo": "volcado", "version"} y después
+    usuarios, tareas, asignaciones y dependencias ({"tipo": <tabla>, …}),
+    leídos de una misma instantánea fila a fila.
+    """
+    yield json.dumps({"tipo": "volcado", "version": VERSION_VOLCADO, "creado": time.time()}) + "\n"
+    for tabla, fila in repositorio().volcar():
+        registro = {"tipo": tabla}
+        for campo, valor in zip(_CAMPOS_VOLCADO[tabla], fila):
+            registro[campo] = valor.value if isinstance(valor, (EstadoEnum, RolEnum)) else valor
+        yield _CODIFICADOR_VOLCADO.encode(registro) + "\n"
+
+
+def importar(lineas: Iterable[Any]) -> Dict[str, int]:
+    """
+    Restaura un volcado de `exportar` en una base vacía, en UNA transacción:
+    filas por lotes de LOTE_CARGA (executemany) y, al final, una sola
+    validación de referencias y de ciclos. Si algo falla no queda nada.
+    Los contadores derivados (pendientes, resumen) se recalculan.
+
+    En el feed de cambios queda UN evento ("volcado", "importar") con los
+    conteos, no uno por fila: quien siga /changes tiene que descartar lo
+    que tenga y resincronizar con GET /export.
+    """
+    repo = repositorio()
+    conteos = {tabla: 0 for tabla in _CAMPOS_VOLCADO}
+    with repo.carga_masiva():
+        if not repo.esta_vacio():
+            raise ValueError("La importación requiere una base sin usuarios ni tareas")
+
+        tabla_lote, lote = None, []
+        for n, linea in enumerate(lineas, 1):
+            if not linea.strip():
+                continue
+            tabla, fila = _fila_volcado(linea, n)
+            if tabla is None:
+                continue  # cabecera
+            if lote and (tabla != tabla_lote or len(lote) >= LOTE_CARGA):
+                repo.cargar(tabla_lote, lote)
+                lote = []
+            tabla_lote = tabla
+            lote.append(fila)
+            conteos[tabla] += 1
+        if lote:
+            repo.cargar(tabla_lote, lote)
+
+        rotas = {t: n for t, n in repo.referencias_rotas().items() if n}
+        if rotas:
+            raise ValueError(f"Referencias a usuarios o tareas inexistentes: {rotas}")
+        if tiene_ciclos(fila for _, fila in repo.volcar(["dependencia"])):
+            raise ValueError("Las dependencias importadas forman un ciclo")
+        repo.recalcular_pendientes()
+        repo.reconstruir_resumen()
+        _registrar_eventos(repo, [("volcado", str(VERSION_VOLCADO), "importar", dict(conteos))])
+
+    cache = current_app.extensions.get("cache_respuestas")
+    if cache is not None:
+        cache.limpiar()
+    return conteos
+
+
+def _fila_volcado(linea: Any, n: int) -> Tuple[Optional[str], Tuple]:
+    """(tabla, fila) de una línea NDJSON; (None, ()) para la cabecera."""
+    try:
+        registro = json.loads(linea)
+        tabla = registro["tipo"]
+        if tabla == "volcado":
+            if registro.get("version") != VERSION_VOLCADO:
+                raise ValueError(f"versión no soportada: {registro.get('version')}")
+            return None, ()
+        fila = []
+        for campo in _CAMPOS_VOLCADO[tabla]:
+            valor = registro.get(campo) if campo in _OPCIONALES_VOLCADO else registro[campo]
+            if campo == "duracion":
+                valor = _validar_duracion(valor)
+            elif campo == "finalizada_en":
+                if valor is not None and type(valor) not in (int, float):
+                    raise ValueError("finalizada_en con tipo inválido")
+            elif campo == "estado":
+                valor = EstadoEnum(valor)
+            elif campo == "rol":
+                valor = RolEnum(valor)
+            elif type(valor) is not (int if campo in _ENTEROS_VOLCADO else str):
+                raise ValueError(f"{campo} con tipo inválido")
+            fila.append(valor)
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Línea {n}: registro inválido ({e})")
+    return tabla, tuple(fila)
+
+
+# -------------------------------------------------
+# 24. planificación (duración, camino crítico, cronograma)
+# -------------------------------------------------
+def _validar_duracion(duracion: Any) -> Optional[int]:
+    """Entero >= 0 o None (sin estimar)."""
+    if duracion is not None and (type(duracion) is not int or duracion < 0):
+        raise ValueError("Duración inválida")
+    return duracion
+
+
+@_reintentable
+@_agrupable
+def fijar_duracion(tarea_id: int, duracion: Any) -> Dict[str, Any]:
+    duracion = _validar_duracion(duracion)
+    repo = repositorio()
+    with repo.transaccion():
+        if not repo.obtener_tarea(tarea_id):
+            raise LookupError("Tarea no encontrada")
+        repo.actualizar_duracion(tarea_id, duracion)
+        _registrar_eventos(
+            repo, [("tarea", str(tarea_id), "duracion", {"duracion": duracion})]
         )
-    return False
\ No newline at end of file
+
+    _invalidar_cache(tareas=[tarea_id])
+    return {"id": tarea_id, "duracion": duracion}
+
+
+def _plan(filas: Iterable[Tuple]) -> Tuple[Plan, Dict[int, int], int]:
+    """
+    Plan de las filas de Repositorio.grafo_planificacion. Lo que falta
+    hacer: una tarea FINALIZADA dura 0, y una sin estimar también (se
+    cuentan aparte en "sin_estimar").
+    """
+    duraciones: Dict[int, int] = {}
+    aristas: List[Tuple[int, int]] = []
+    sin_estimar = 0
+    for tarea_id, estado, duracion, depende_de_id in filas:
+        if tarea_id not in duraciones:
+            if duracion is None:
+                sin_estimar += 1
+            restante = duracion is not None and estado != EstadoEnum.FINALIZADA
+            duraciones[tarea_id] = duracion if restante else 0
+        if depende_de_id is not None:
+            aristas.append((tarea_id, depende_de_id))
+    # Aristas hacia tareas archivadas (fuera de las filas): finalizadas, no suman
+    aristas = [(t, d) for t, d in aristas if d in duraciones]
+    return planificar(duraciones, aristas), duraciones, sin_estimar
+
+
+def _tareas_plan(
+    plan: Plan, duraciones: Dict[int, int], solo_criticas: bool = False
+) -> List[Dict[str, Any]]:
+    tareas = [
+        {
+            "id": t,
+            "duracion": duraciones[t],
+            "inicio_temprano": plan.temprano[t],
+            "inicio_tardio": plan.tardio[t],
+            "holgura": plan.tardio[t] - plan.temprano[t],
+        }
+        for t in plan.orden
+        if not solo_criticas or plan.tardio[t] == plan.temprano[t]
+    ]
+    tareas.sort(key=lambda d: (d["inicio_temprano"], d["id"]))
+    return tareas
+
+
+def camino_critico(tarea_id: int) -> Dict[str, Any]:
+    """
+    Camino más largo (en duración) que termina en `tarea_id`, y la holgura
+    de cada tarea que la precede: cuánto puede atrasarse sin atrasarla.
+    """
+    filas = repositorio().grafo_planificacion(tarea_id)
+    if not filas:
+        raise LookupError("Tarea no encontrada")
+    plan, duraciones, sin_estimar = _plan(filas)
+
+    camino = [tarea_id]
+    while camino[-1] in plan.determinante:
+        camino.append(plan.determinante[camino[-1]])
+    camino.reverse()
+    return {
+        "id": tarea_id,
+        "duracion_total": plan.fin,
+        "camino": camino,
+        "sin_estimar": sin_estimar,
+        "tareas": _tareas_plan(plan, duraciones),
+    }
+
+
+def cronograma(solo_criticas: bool = False) -> Dict[str, Any]:
+    """Inicio más temprano / más tardío y holgura de todas las tareas."""
+    plan, duraciones, sin_estimar = _plan(repositorio().grafo_planificacion())
+    return {
+        "duracion_total": plan.fin,
+        "sin_estimar": sin_estimar,
+        "tareas": _tareas_plan(plan, duraciones, solo_criticas),
+    }
+
+
+# -------------------------------------------------
+# 25. archivo (FINALIZADAS antiguas fuera de las tablas activas)
+# -------------------------------------------------
+@_reintentable
+def archivar(antiguedad: Optional[float] = None) -> Dict[str, int]:
+    """
+    Mueve al archivo las tareas FINALIZADAS hace más de `antiguedad` s
+    (ARCHIVO_ANTIGUEDAD por defecto), con sus asignaciones y aristas, en
+    transacciones de ARCHIVO_LOTE tareas.
+
+    Una tarea se archiva sólo junto con (o después de) todas sus
+    dependencias: el archivo nunca apunta a tareas activas, y las aristas
+    activas hacia el archivo se leen como dependencias finalizadas. Las que
+    dependen de una tarea aún activa quedan para otra pasada ("bloqueadas").
+    Sin eventos ni invalidación de caché: ninguna lectura cambia.
+    """
+    if antiguedad is None:
+        antiguedad = current_app.config["ARCHIVO_ANTIGUEDAD"]
+    if type(antiguedad) not in (int, float) or antiguedad < 0:
+        raise ValueError("Antigüedad inválida")
+    tam_lote = current_app.config["ARCHIVO_LOTE"]
+
+    repo = repositorio()
+    ahora = time.time()
+    ids, aristas = repo.candidatas_archivo(ahora - antiguedad)
+    candidatas = set(ids)
+
+    # Bloqueadas: dependen de una tarea activa que no se archiva, directa o
+    # transitivamente a través de otras candidatas
+    dependientes: Dict[int, List[int]] = {}
+    bloqueadas: Set[int] = set()
+    for tarea_id, depende_de_id in aristas:
+        if depende_de_id in candidatas:
+            dependientes.setdefault(depende_de_id, []).append(tarea_id)
+        else:
+            bloqueadas.add(tarea_id)
+    frontera = list(bloqueadas)
+    while frontera:
+        for t in dependientes.get(frontera.pop(), ()):
+            if t not in bloqueadas:
+                bloqueadas.add(t)
+                frontera.append(t)
+
+    # Orden topológico: cada lote confirmado deja el archivo cerrado
+    orden = planificar(
+        {i: 0 for i in ids if i not in bloqueadas},
+        [(t, d) for t, d in aristas if d in candidatas and t not in bloqueadas],
+    ).orden
+    movidas = {"tareas": 0, "asignaciones": 0, "dependencias": 0}
+    for k in range(0, len(orden), tam_lote):
+        with repo.transaccion():
+            for clave, n in repo.archivar(orden[k:k + tam_lote], ahora).items():
+                movidas[clave] += n
+    movidas["bloqueadas"] = len(bloqueadas)
+    return movidas
+
+
+# -------------------------------------------------
+# 26. detalle de tareas (include / fields / depth, por lotes)
+# -------------------------------------------------
+CAMPOS_TAREA = ("id", "nombre", "descripcion", "estado", "duracion", "dependencias_pendientes")
+CAMPOS_TAREA_DEFECTO = ("id", "nombre", "estado", "duracion")  # los de obtener_tarea
+RELACIONES_TAREA = ("asignaciones", "dependencias", "referenciada_por")
+PROFUNDIDAD_DETALLE_MAX = 5
+DETALLE_MAX_IDS = 100
+
+
+def _separar(valor: Optional[Any]) -> List[str]:
+    """'a,b' o ['a', 'b'] → ['a', 'b'] (sin vacíos ni repetidos, en orden)."""
+    if valor is None:
+        return []
+    partes = valor.split(",") if isinstance(valor, str) else list(valor)
+    return list(dict.fromkeys(str(p).strip() for p in partes if str(p).strip()))
+
+
+def _opciones_detalle(
+    incluir: Optional[Any], campos: Optional[Any], profundidad: Optional[int]
+) -> Tuple[List[str], List[str], int]:
+    relaciones = _separar(incluir)
+    desconocidas = [r for r in relaciones if r not in RELACIONES_TAREA]
+    if desconocidas:
+        raise ValueError(
+            f"include inválido: {', '.join(desconocidas)} (use {', '.join(RELACIONES_TAREA)})"
+        )
+    columnas = _separar(campos) or list(CAMPOS_TAREA_DEFECTO)
+    if "id" not in columnas:  # siempre: identifica a las tareas anidadas
+        columnas.insert(0, "id")
+    desconocidos = [c for c in columnas if c not in CAMPOS_TAREA]
+    if desconocidos:
+        raise ValueError(
+            f"fields inválido: {', '.join(desconocidos)} (use {', '.join(CAMPOS_TAREA)})"
+        )
+    if profundidad is None:
+        profundidad = 1
+    if not 1 <= profundidad <= PROFUNDIDAD_DETALLE_MAX:
+        raise ValueError(f"La profundidad debe estar entre 1 y {PROFUNDIDAD_DETALLE_MAX}")
+    return relaciones, columnas, profundidad
+
+
+def detalle_cacheable(incluir: Optional[Any], campos: Optional[Any]) -> bool:
+    """
+    Si GET /tasks/<id> con estas opciones puede ir a la caché de la tarea.
+    No con relaciones ni con `dependencias_pendientes`: dependen de las
+    vecinas, y sus cambios sólo invalidan la entrada de cada vecina.
+    """
+    return not _separar(incluir) and "dependencias_pendientes" not in _separar(campos)
+
+
+def _proyectar(fila: Any, columnas: List[str]) -> Dict[str, Any]:
+    datos = {}
+    for campo in columnas:
+        # Las filas del archivo no traen todas las columnas
+        valor = getattr(fila, campo, None)
+        datos[campo] = valor.value if isinstance(valor, EstadoEnum) else valor
+    return datos
+
+
+def detalle_tareas(
+    ids: Any,
+    incluir: Optional[Any] = None,
+    campos: Optional[Any] = None,
+    profundidad: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Varias tareas en una sola petición, con las relaciones de `incluir`
+    (asignaciones, dependencias, referenciada_por) anidadas hasta
+    `profundidad` niveles y sólo las columnas de `campos` (más "id").
+
+    Se carga por niveles: en cada uno, UNA consulta por lote de ids para las
+    columnas y otra por relación pedida, sin importar cuántas tareas haya
+    (como selectinload, pero sin objetos ORM). Las tareas del último nivel
+    van sin relaciones. Las archivadas pedidas se devuelven con sus columnas
+    y sin relaciones (como vecinas no aparecen); las inexistentes, en
+    "no_encontradas".
+    """
+    try:
+        ids = [int(i) for i in _separar(ids)]
+    except ValueError:
+        raise ValueError("ids debe ser una lista de enteros separados por comas")
+    if not ids:
+        raise ValueError("Falta ids")
+    if len(ids) > DETALLE_MAX_IDS:
+        raise ValueError(f"A lo sumo {DETALLE_MAX_IDS} ids por petición")
+    relaciones, columnas, profundidad = _opciones_detalle(incluir, campos, profundidad)
+
+    repo = repositorio()
+    filas = repo.proyectar_tareas(ids, columnas)
+    vecinos: Dict[str, Dict[int, List[int]]] = {r: {} for r in relaciones}
+    cargar = {
+        "asignaciones": repo.asignaciones_de_tareas,
+        "dependencias": repo.dependencias_directas,
+        "referenciada_por": repo.dependientes_directos,
+    }
+    nivel = [i for i in ids if i in filas]
+    for _ in range(profundidad if relaciones else 0):
+        siguiente: Set[int] = set()
+        for relacion in relaciones:
+            pendientes = [i for i in nivel if i not in vecinos[relacion]]
+            vecinos[relacion].update(cargar[relacion](pendientes) if pendientes else {})
+            if relacion != "asignaciones":
+                siguiente.update(v for i in nivel for v in vecinos[relacion][i])
+        nuevas = [i for i in siguiente if i not in filas]
+        if nuevas:
+            filas.update(repo.proyectar_tareas(nuevas, columnas))
+        nivel = [i for i in siguiente if i in filas]
+
+    def armar(tarea_id: int, restantes: int) -> Dict[str, Any]:
+        datos = _proyectar(filas[tarea_id], columnas)
+        if restantes == 0:
+            return datos
+        for relacion in relaciones:
+            if relacion == "asignaciones":
+                datos[relacion] = [
+                    {"alias": alias, "rol": rol.value}
+                    for alias, rol in vecinos[relacion][tarea_id]
+                ]
+            else:
+                datos[relacion] = [
+                    armar(v, restantes - 1) for v in vecinos[relacion][tarea_id] if v in filas
+                ]
+        return datos
+
+    tareas, no_encontradas = [], []
+    for i in dict.fromkeys(ids):
+        if i in filas:
+            tareas.append(armar(i, profundidad if relaciones else 0))
+            continue
+        archivada = repo.obtener_tarea_archivada(i)
+        if archivada is None:
+            no_encontradas.append(i)
+        else:
+            tareas.append(_proyectar(archivada, columnas))
+    return {"tareas": tareas, "no_encontradas": no_encontradas}
+
+
+def detalle_tarea(
+    tarea_id: int,
+    incluir: Optional[Any] = None,
+    campos: Optional[Any] = None,
+    profundidad: Optional[int] = None,
+) -> Dict[str, Any]:
+    """detalle_tareas de una sola tarea (GET /tasks/<id>?include=…)."""
+    detalle = detalle_tareas([tarea_id], incluir, campos, profundidad)
+    if not detalle["tareas"]:
+        raise LookupError("Tarea no encontrada")
+    return detalle["tareas"][0]
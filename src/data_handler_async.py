@@ -0,0 +1,320 @@
+"""
+Equivalentes asíncronos de src.data_handler para la app ASGI (src.asgi).
+
+Cada operación abre una AsyncSession sobre el motor aiosqlite de la app y
+ejecuta la función síncrona de data_handler con `run_sync`: mismas reglas
+de negocio y mismo RepositorioSQL, pero la E/S la hace aiosqlite sin
+bloquear el event loop (SQLAlchemy alterna greenlet ↔ corrutina).
+
+Las escrituras se serializan con un asyncio.Lock: SQLite admite un solo
+escritor y, dentro del event loop, el RLock del índice de dependencias no
+excluye entre greenlets del mismo hilo. Con REPOSITORIO="memoria" no hay
+E/S y se llama directamente.
+
+Requieren un contexto de app de Flask activo (lo abre src.asgi por petición).
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+
+from flask import Flask, current_app
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import data_handler as dh
+from src import db
+from src.repositorios import usar_repositorio
+from src.repositorios.sql import RepositorioSQL
+
+
+def preparar(app: Flask) -> None:
+    """Crea el motor asíncrono y el lock de escritores de `app`."""
+    if app.config["REPOSITORIO"] == "sql":
+        app.extensions["motor_async"] = db.crear_motor_async(app)
+    app.extensions["escritura_async"] = asyncio.Lock()
+
+
+async def cerrar(app: Flask) -> None:
+    motor = app.extensions.pop("motor_async", None)
+    if motor is not None:
+        await motor.dispose()
+
+
+async def _ejecutar(fn: Callable, *args, escritura: bool = False, **kwargs) -> Any:
+    motor = current_app.extensions.get("motor_async")
+    if motor is None:  # repositorio en memoria
+        return fn(*args, **kwargs)
+    if escritura:
+        async with current_app.extensions["escritura_async"]:
+            return await _en_sesion(motor, fn, args, kwargs)
+    return await _en_sesion(motor, fn, args, kwargs)
+
+
+async def _en_sesion(motor, fn: Callable, args, kwargs) -> Any:
+    async with AsyncSession(motor) as sesion:
+        return await sesion.run_sync(_llamar, fn, args, kwargs)
+
+
+def _llamar(sesion_sync, fn: Callable, args, kwargs) -> Any:
+    # Corre en el greenlet de run_sync: data_handler ve un repositorio
+    # ligado a esta sesión en lugar del de Flask-SQLAlchemy.
+    with usar_repositorio(RepositorioSQL(sesion_sync)):
+        return fn(*args, **kwargs)
+
+
+# -------------------------------------------------
+# Escrituras
+# -------------------------------------------------
+async def crear_usuario(alias: str, nombre: str) -> Dict[str, Any]:
+    return await _ejecutar(dh.crear_usuario, alias, nombre, escritura=True)
+
+
+async def crear_tarea(
+    nombre: str, descripcion: str, usuario_alias: str, rol: str, duracion: Optional[int] = None
+) -> Dict[str, Any]:
+    return await _ejecutar(
+        dh.crear_tarea, nombre, descripcion, usuario_alias, rol, duracion, escritura=True
+    )
+
+
+async def crear_tareas(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return await _ejecutar(dh.crear_tareas, items, escritura=True)
+
+
+async def cambiar_estado(tarea_id: int, nuevo_estado: str) -> Dict[str, Any]:
+    return await _ejecutar(dh.cambiar_estado, tarea_id, nuevo_estado, escritura=True)
+
+
+async def cambiar_estados(cambios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return await _ejecutar(dh.cambiar_estados, cambios, escritura=True)
+
+
+async def fijar_duracion(tarea_id: int, duracion: Any) -> Dict[str, Any]:
+    return await _ejecutar(dh.fijar_duracion, tarea_id, duracion, escritura=True)
+
+
+async def gestionar_usuario_en_tarea(
+    tarea_id: int, usuario_alias: str, rol: str, accion: str
+) -> Dict[str, Any]:
+    return await _ejecutar(
+        dh.gestionar_usuario_en_tarea, tarea_id, usuario_alias, rol, accion,
+        escritura=True,
+    )
+
+
+async def gestionar_dependencia(
+    tarea_id: int, depende_de_id: int, accion: str
+) -> Dict[str, Any]:
+    return await _ejecutar(
+        dh.gestionar_dependencia, tarea_id, depende_de_id, accion, escritura=True
+    )
+
+
+async def gestionar_dependencias(operaciones: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return await _ejecutar(dh.gestionar_dependencias, operaciones, escritura=True)
+
+
+async def recalcular_dependencias_pendientes() -> int:
+    return await _ejecutar(dh.recalcular_dependencias_pendientes, escritura=True)
+
+
+# -------------------------------------------------
+# Lecturas
+# -------------------------------------------------
+async def obtener_tarea(tarea_id: int) -> Dict[str, Any]:
+    return await _ejecutar(dh.obtener_tarea, tarea_id)
+
+
+async def version_tarea(tarea_id: int) -> int:
+    return await _ejecutar(dh.version_tarea, tarea_id)
+
+
+async def detalle_tarea(
+    tarea_id: int,
+    incluir: Optional[str] = None,
+    campos: Optional[str] = None,
+    profundidad: Optional[int] = None,
+) -> Dict[str, Any]:
+    return await _ejecutar(dh.detalle_tarea, tarea_id, incluir, campos, profundidad)
+
+
+async def detalle_tareas(
+    ids: Optional[str],
+    incluir: Optional[str] = None,
+    campos: Optional[str] = None,
+    profundidad: Optional[int] = None,
+) -> Dict[str, Any]:
+    return await _ejecutar(dh.detalle_tareas, ids, incluir, campos, profundidad)
+
+
+async def tareas_listas(limite: Optional[int] = None) -> List[Dict[str, Any]]:
+    return await _ejecutar(dh.tareas_listas, limite)
+
+
+async def clausura(
+    tarea_id: int, direccion: str, profundidad: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    return await _ejecutar(dh.clausura, tarea_id, direccion, profundidad)
+
+
+async def tareas_de_usuario(
+    alias: str,
+    cursor: Optional[int] = None,
+    limite: Optional[int] = None,
+    estado: Optional[str] = None,
+    rol: Optional[str] = None,
+) -> Dict[str, Any]:
+    return await _ejecutar(
+        dh.tareas_de_usuario, alias, cursor=cursor, limite=limite, estado=estado, rol=rol
+    )
+
+
+async def iterar_tareas_de_usuario(
+    alias: str,
+    estado: Optional[str] = None,
+    rol: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Como data_handler.iterar_tareas_de_usuario, pero por páginas keyset de
+    LIMITE_PAGINA_MAX (una sesión corta por página en lugar de un cursor
+    abierto). La primera página se lee aquí, así los errores (404/422)
+    salen antes de empezar a responder.
+    """
+    filtros = {"estado": estado, "rol": rol}
+    pagina = await tareas_de_usuario(alias, limite=dh.LIMITE_PAGINA_MAX, **filtros)
+
+    async def filas():
+        actual = pagina
+        while True:
+            for fila in actual["tareas"]:
+                yield fila
+            if actual["siguiente"] is None:
+                return
+            actual = await tareas_de_usuario(
+                alias, cursor=actual["siguiente"], limite=dh.LIMITE_PAGINA_MAX, **filtros
+            )
+
+    return filas()
+
+
+async def buscar_tareas(
+    q: Optional[str],
+    limite: Optional[int] = None,
+    offset: int = 0,
+    estado: Optional[str] = None,
+    rol: Optional[str] = None,
+) -> Dict[str, Any]:
+    return await _ejecutar(
+        dh.buscar_tareas, q, limite=limite, offset=offset, estado=estado, rol=rol
+    )
+
+
+async def resumen_usuario(alias: str) -> Dict[str, Any]:
+    return await _ejecutar(dh.resumen_usuario, alias)
+
+
+async def ranking_usuarios(
+    limite: Optional[int] = None,
+    estado: Optional[str] = None,
+    rol: Optional[str] = None,
+) -> Dict[str, Any]:
+    return await _ejecutar(dh.ranking_usuarios, limite, estado=estado, rol=rol)
+
+
+async def camino_critico(tarea_id: int) -> Dict[str, Any]:
+    return await _ejecutar(dh.camino_critico, tarea_id)
+
+
+async def cronograma(solo_criticas: bool = False) -> Dict[str, Any]:
+    return await _ejecutar(dh.cronograma, solo_criticas)
+
+
+async def importar(lineas: Iterable[bytes]) -> Dict[str, int]:
+    return await _ejecutar(dh.importar, lineas, escritura=True)
+
+
+async def exportar(trozos: Callable[[Iterator[str]], Iterator[bytes]]) -> AsyncIterator[bytes]:
+    """
+    Como data_handler.exportar, ya pasado por `trozos` (agrupar / gzip).
+    El volcado es un cursor síncrono de principio a fin, así que corre en
+    un hilo con la sesión de Flask-SQLAlchemy; una cola acotada entre el
+    hilo y el event loop mantiene la memoria constante si el cliente lee
+    despacio.
+    """
+    app = current_app._get_current_object()
+    loop = asyncio.get_running_loop()
+    cola: asyncio.Queue = asyncio.Queue(maxsize=8)
+    detener = threading.Event()
+    FIN = object()
+
+    def poner(item) -> None:
+        asyncio.run_coroutine_threadsafe(cola.put(item), loop).result()
+
+    def producir() -> None:
+        try:
+            with app.app_context():
+                try:
+                    for trozo in trozos(dh.exportar()):
+                        if detener.is_set():
+                            return
+                        poner(trozo)
+                finally:
+                    db.session.remove()
+        except Exception as e:
+            poner(e)
+        finally:
+            poner(FIN)
+
+    async def leer() -> AsyncIterator[bytes]:
+        threading.Thread(target=producir, name="exportar", daemon=True).start()
+        terminado = False
+        try:
+            while True:
+                item = await cola.get()
+                if item is FIN:
+                    terminado = True
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Cliente desconectado: el hilo sale tras a lo sumo un trozo más;
+            # se vacía la cola hasta FIN para que no quede bloqueado en put
+            detener.set()
+            while not terminado:
+                terminado = await cola.get() is FIN
+
+    return leer()
+
+
+async def cambios(desde: int = 0, limite: Optional[int] = None) -> Dict[str, Any]:
+    return await _ejecutar(dh.cambios, desde, limite)
+
+
+async def seguir_cambios(desde: Optional[int] = None) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Como data_handler.seguir_cambios, pero sondeando cada CAMBIOS_SONDEO s
+    con asyncio.sleep (el aviso en proceso es un Condition de hilos).
+    """
+    if desde is None:
+        desde = await _ejecutar(dh.ultimo_cambio)
+    pagina = await cambios(desde, dh.LIMITE_PAGINA_MAX)  # valida `desde`
+    sondeo = current_app.config["CAMBIOS_SONDEO"]
+    latido = current_app.config["CAMBIOS_LATIDO"]
+
+    async def eventos():
+        actual, silencio = pagina, time.monotonic()
+        while True:
+            for e in actual["eventos"]:
+                yield e
+            if actual["eventos"]:
+                silencio = time.monotonic()
+            else:
+                if time.monotonic() - silencio >= latido:
+                    yield None
+                    silencio = time.monotonic()
+                await asyncio.sleep(sondeo)
+            actual = await cambios(actual["siguiente"], dh.LIMITE_PAGINA_MAX)
+
+    return eventos()
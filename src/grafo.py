@@ -0,0 +1,283 @@
+"""
+Índice en memoria del grafo de dependencias.
+
+Mantiene, por proceso, las aristas directas (tarea → tareas de las que
+depende) y las inversas (tarea → tareas que dependen de ella), construidas
+una sola vez desde la tabla `dependencia`. La detección de ciclos se
+resuelve contra este índice sin emitir SQL.
+
+Vigencia entre workers: la tabla `grafo_version` guarda (epoca, numero).
+Quien escriba aristas incrementa `numero` con un UPDATE condicional dentro
+de su misma transacción; si otro proceso escribió antes, el UPDATE no
+afecta filas, el índice se reconstruye y la operación se reintenta.
+"""
+
+from collections import defaultdict
+from threading import RLock
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from src.models.dependencia import dependencia
+from src.models.grafo_version import grafo_version
+
+Version = Tuple[str, int]
+
+
+class IndiceObsoleto(Exception):
+    """Otro proceso modificó `dependencia` después de la última lectura."""
+
+
+class IndiceDependencias:
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self.directas: Dict[int, Set[int]] = defaultdict(set)
+        self.inversas: Dict[int, Set[int]] = defaultdict(set)
+        self.version: Optional[Version] = None
+        self.reconstrucciones = 0
+
+    # ---------- carga / vigencia ---------------------------------- #
+    def reconstruir(self, conn) -> None:
+        """Carga todas las aristas y la versión con la conexión dada."""
+        with self._lock:
+            self.directas.clear()
+            self.inversas.clear()
+            for tarea_id, depende_de_id in conn.execute(
+                select(dependencia.c.tarea_id, dependencia.c.depende_de_id)
+            ):
+                self.directas[tarea_id].add(depende_de_id)
+                self.inversas[depende_de_id].add(tarea_id)
+            self.version = leer_version(conn)
+            self.reconstrucciones += 1
+
+    def sincronizar(self, conn) -> None:
+        """Reconstruye el índice si la versión en BD no coincide."""
+        with self._lock:
+            if self.version is None or leer_version(conn) != self.version:
+                self.reconstruir(conn)
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self.version = None
+
+    # ---------- escrituras ---------------------------------------- #
+    def registrar_escritura(self, conn) -> Version:
+        """
+        Incrementa la versión en BD (dentro de la transacción de `conn`)
+        condicionado a que nadie más la haya cambiado. Devuelve la versión
+        sobre la que se escribió; lanza IndiceObsoleto si la condición falla.
+        """
+        with self._lock:
+            base = self.version
+            if base is None:
+                raise IndiceObsoleto()
+            epoca, numero = base
+            res = conn.execute(
+                grafo_version.update()
+                .where(
+                    (grafo_version.c.id == 1)
+                    & (grafo_version.c.epoca == epoca)
+                    & (grafo_version.c.numero == numero)
+                )
+                .values(numero=numero + 1)
+            )
+            if res.rowcount == 0:
+                self.version = None
+                raise IndiceObsoleto()
+            return base
+
+    def confirmar(
+        self,
+        base: Version,
+        agregadas: Iterable[Tuple[int, int]] = (),
+        quitadas: Iterable[Tuple[int, int]] = (),
+    ) -> None:
+        """
+        Aplica al índice las aristas ya confirmadas en BD. Si entretanto el
+        índice cambió de versión (otro hilo lo reconstruyó), se invalida y
+        la próxima sincronización lo recarga.
+        """
+        with self._lock:
+            if self.version != base:
+                self.version = None
+                return
+            self.aplicar(agregadas, quitadas)
+            epoca, numero = base
+            self.version = (epoca, numero + 1)
+
+    def aplicar(
+        self,
+        agregadas: Iterable[Tuple[int, int]] = (),
+        quitadas: Iterable[Tuple[int, int]] = (),
+    ) -> None:
+        """Modifica las aristas en memoria, sin tocar la versión."""
+        with self._lock:
+            for tarea_id, depende_de_id in quitadas:
+                self.directas[tarea_id].discard(depende_de_id)
+                self.inversas[depende_de_id].discard(tarea_id)
+            for tarea_id, depende_de_id in agregadas:
+                self.directas[tarea_id].add(depende_de_id)
+                self.inversas[depende_de_id].add(tarea_id)
+
+    # ---------- consultas ----------------------------------------- #
+    def alcanza(self, origen: int, destino: int) -> bool:
+        """¿Existe un camino origen → … → destino siguiendo las dependencias?"""
+        with self._lock:
+            stack = [origen]
+            visitados = {origen}
+            while stack:
+                actual = stack.pop()
+                if actual == destino:
+                    return True
+                for siguiente in self.directas.get(actual, ()):
+                    if siguiente not in visitados:
+                        visitados.add(siguiente)
+                        stack.append(siguiente)
+            return False
+
+    def hay_ciclo(self, tarea_id: int, depende_de_id: int) -> bool:
+        """¿Agregar tarea → depende_de cerraría un ciclo?"""
+        return self.alcanza(depende_de_id, tarea_id)
+
+    def hay_ciclo_lote(
+        self,
+        agregadas: Iterable[Tuple[int, int]],
+        quitadas: Iterable[Tuple[int, int]] = (),
+    ) -> bool:
+        """
+        ¿El grafo con el lote aplicado tiene algún ciclo? Como el grafo
+        actual es acíclico, todo ciclo nuevo pasa por el origen de alguna
+        arista agregada: basta UNA DFS (colores) desde esos orígenes, y
+        cada nodo se visita a lo sumo una vez.
+        """
+        mas: Dict[int, Set[int]] = defaultdict(set)
+        menos: Dict[int, Set[int]] = defaultdict(set)
+        for t, d in agregadas:
+            mas[t].add(d)
+        for t, d in quitadas:
+            menos[t].add(d)
+
+        with self._lock:
+            def vecinos(nodo: int):
+                actuales = self.directas.get(nodo, set())
+                return iter((actuales - menos.get(nodo, set())) | mas.get(nodo, set()))
+
+            EN_CURSO, TERMINADO = 1, 2
+            color: Dict[int, int] = {}
+            for raiz in mas:
+                if raiz in color:
+                    continue
+                color[raiz] = EN_CURSO
+                pila = [(raiz, vecinos(raiz))]
+                while pila:
+                    nodo, pendientes = pila[-1]
+                    for siguiente in pendientes:
+                        estado = color.get(siguiente)
+                        if estado == EN_CURSO:
+                            return True
+                        if estado is None:
+                            color[siguiente] = EN_CURSO
+                            pila.append((siguiente, vecinos(siguiente)))
+                            break
+                    else:
+                        color[nodo] = TERMINADO
+                        pila.pop()
+            return False
+
+    def existe(self, tarea_id: int, depende_de_id: int) -> bool:
+        with self._lock:
+            return depende_de_id in self.directas.get(tarea_id, ())
+
+
+def tiene_ciclos(aristas: Iterable[Tuple[int, int]]) -> bool:
+    """
+    ¿El grafo completo tiene algún ciclo? (Kahn: se retiran nodos sin
+    dependencias pendientes; si quedan aristas, hay ciclo). Para validar
+    una importación de una vez, no arista por arista.
+    """
+    salientes: Dict[int, Set[int]] = defaultdict(set)  # depende_de → dependientes
+    pendientes: Dict[int, int] = defaultdict(int)
+    for tarea_id, depende_de_id in aristas:
+        if tarea_id not in salientes[depende_de_id]:
+            salientes[depende_de_id].add(tarea_id)
+            pendientes[tarea_id] += 1
+    libres = [n for n in salientes if not pendientes[n]]
+    retiradas = 0
+    while libres:
+        nodo = libres.pop()
+        for dependiente in salientes.get(nodo, ()):
+            retiradas += 1
+            pendientes[dependiente] -= 1
+            if not pendientes[dependiente]:
+                libres.append(dependiente)
+    return retiradas != sum(len(v) for v in salientes.values())
+
+
+class Plan(NamedTuple):
+    orden: List[int]               # topológico: cada tarea después de sus dependencias
+    temprano: Dict[int, int]       # inicio más temprano
+    tardio: Dict[int, int]         # inicio más tardío sin atrasar el fin
+    fin: int                       # fin del plan (máximo fin temprano)
+    determinante: Dict[int, int]   # dependencia que fija el inicio temprano
+
+
+def planificar(duraciones: Dict[int, int], aristas: Iterable[Tuple[int, int]]) -> Plan:
+    """
+    Método del camino crítico en O(V + E): orden de Kahn, pasada hacia
+    adelante (inicio temprano = máximo fin temprano de las dependencias) y
+    hacia atrás (fin tardío = mínimo inicio tardío de los dependientes).
+    Holgura = tardio - temprano; las tareas con holgura 0 son críticas.
+    `aristas` (tarea_id, depende_de_id) sólo entre claves de `duraciones`.
+    """
+    dependientes: Dict[int, List[int]] = {n: [] for n in duraciones}
+    pendientes = dict.fromkeys(duraciones, 0)
+    for tarea_id, depende_de_id in aristas:
+        dependientes[depende_de_id].append(tarea_id)
+        pendientes[tarea_id] += 1
+
+    orden = [n for n in duraciones if not pendientes[n]]
+    temprano = dict.fromkeys(duraciones, 0)
+    determinante: Dict[int, int] = {}
+    # Bucles explícitos en vez de max()/min() con generadores: con 10^5
+    # nodos es la mitad del tiempo
+    fin = 0
+    for nodo in orden:  # `orden` crece mientras se recorre
+        fin_nodo = temprano[nodo] + duraciones[nodo]
+        if fin_nodo > fin:
+            fin = fin_nodo
+        for dependiente in dependientes[nodo]:
+            # Sin determinante aún, su inicio temprano es 0 <= fin_nodo
+            if fin_nodo > temprano[dependiente] or dependiente not in determinante:
+                temprano[dependiente] = fin_nodo
+                determinante[dependiente] = nodo
+            pendientes[dependiente] -= 1
+            if not pendientes[dependiente]:
+                orden.append(dependiente)
+    if len(orden) != len(duraciones):
+        raise ValueError("El grafo de dependencias tiene un ciclo")
+
+    tardio: Dict[int, int] = {}
+    for nodo in reversed(orden):
+        limite = fin
+        for dependiente in dependientes[nodo]:
+            if tardio[dependiente] < limite:
+                limite = tardio[dependiente]
+        tardio[nodo] = limite - duraciones[nodo]
+    return Plan(orden, temprano, tardio, fin, determinante)
+
+
+def leer_version(conn) -> Version:
+    fila = conn.execute(
+        select(grafo_version.c.epoca, grafo_version.c.numero).where(
+            grafo_version.c.id == 1
+        )
+    ).fetchone()
+    if fila is None:
+        raise RuntimeError("Falta la fila de grafo_version (ejecute create_all)")
+    return fila.epoca, fila.numero
+
+
+def indice_dependencias() -> IndiceDependencias:
+    """Índice asociado a la app actual (uno por proceso)."""
+    return current_app.extensions["indice_dependencias"]
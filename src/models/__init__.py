@@ -2,4 +2,10 @@
 from .usuario import Usuario          # noqa: F401
 from .tarea import Tarea              # noqa: F401
 from .asignacion import Asignacion    # noqa: F401
-from .dependencia import dependencia  # noqa: F401  (tabla puente)
\ No newline at end of file
+from .dependencia import dependencia  # noqa: F401  (tabla puente)
+from .grafo_version import grafo_version  # noqa: F401  (versión del índice)
+from .evento import evento            # noqa: F401  (feed de cambios)
+from .resumen_usuario import resumen_usuario  # noqa: F401  (carga por usuario)
+from .archivo import tarea_archivada  # noqa: F401  (archivo de finalizadas)
+from .idempotencia import idempotencia  # noqa: F401  (Idempotency-Key)
+from .tarea_fts import crear_indice_busqueda  # noqa: F401  (índice FTS5)
@@ -0,0 +1,35 @@
+# src/models/archivo.py
+from src import db
+from .enums import RolEnum
+
+# Archivo frío: tareas FINALIZADAS antiguas, con sus asignaciones y sus
+# aristas, fuera de las tablas que recorren las consultas calientes
+# (`flask archivar`). El estado es siempre FINALIZADA, no se guarda.
+#
+# Las aristas de tareas vivas hacia una archivada se quedan en
+# `dependencia`: la tarea ya no está en `tarea`, así que los joins con
+# estado != FINALIZADA (contadores, dependencias pendientes) la tratan como
+# finalizada sin consultar el archivo.
+tarea_archivada = db.Table(
+    "tarea_archivada",
+    db.Column("id", db.Integer, primary_key=True, autoincrement=False),
+    db.Column("nombre", db.String, nullable=False),
+    db.Column("descripcion", db.String, nullable=False),
+    db.Column("duracion", db.Integer, nullable=True),
+    db.Column("finalizada_en", db.Float, nullable=True),
+    db.Column("archivada_en", db.Float, nullable=False),
+)
+
+asignacion_archivada = db.Table(
+    "asignacion_archivada",
+    db.Column("usuario_alias", db.String, db.ForeignKey("usuario.alias"), primary_key=True),
+    db.Column("tarea_id", db.Integer, primary_key=True),
+    db.Column("rol", db.Enum(RolEnum, name="rol_enum"), primary_key=True),
+    db.Index("ix_asignacion_archivada_tarea_id", "tarea_id"),
+)
+
+dependencia_archivada = db.Table(
+    "dependencia_archivada",
+    db.Column("tarea_id", db.Integer, primary_key=True),
+    db.Column("depende_de_id", db.Integer, primary_key=True),
+)
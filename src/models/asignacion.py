@@ -22,6 +22,9 @@ class Asignacion(db.Model):
         primary_key=True,
     )
 
+    # Las búsquedas por alias usan la PK; por tarea hace falta un índice propio
+    __table_args__ = (db.Index("ix_asignacion_tarea_id", "tarea_id"),)
+
     # relaciones inversas
     usuario = db.relationship("Usuario", back_populates="asignaciones")
     tarea = db.relationship("Tarea", back_populates="asignaciones")
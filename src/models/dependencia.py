@@ -10,4 +10,7 @@ dependencia = db.Table(
         db.ForeignKey("tarea.id"),
         primary_key=True,
     ),
+    # La PK (tarea_id, depende_de_id) sirve para las aristas directas;
+    # las inversas ("quién depende de X") necesitan su propio índice.
+    db.Index("ix_dependencia_depende_de_id", "depende_de_id"),
 )
\ No newline at end of file
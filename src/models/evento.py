@@ -0,0 +1,18 @@
+# src/models/evento.py
+from src import db
+
+# Feed de cambios append-only: cada mutación de data_handler agrega sus
+# eventos en la misma transacción. `seq` es monótono y nunca se reutiliza
+# (AUTOINCREMENT de SQLite, aun si se borran filas viejas).
+evento = db.Table(
+    "evento",
+    db.Column("seq", db.Integer, primary_key=True, autoincrement=True),
+    db.Column("entidad", db.String, nullable=False),    # "tarea" | "usuario"
+    db.Column("clave", db.String, nullable=False),      # id de la tarea / alias
+    db.Column("operacion", db.String, nullable=False),
+    db.Column("datos", db.JSON, nullable=False),        # valores nuevos
+    db.Column("creado", db.Float, nullable=False),      # epoch (s)
+    # Último evento de una tarea (su versión para el ETag de GET /tasks/<id>)
+    db.Index("ix_evento_entidad_clave", "entidad", "clave"),
+    sqlite_autoincrement=True,
+)
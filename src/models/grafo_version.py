@@ -0,0 +1,23 @@
+# src/models/grafo_version.py
+import uuid
+
+from sqlalchemy import event
+
+from src import db
+
+# Fila única (id = 1) que versiona la tabla `dependencia`.
+#   epoca  → cambia si la BD se recrea (create_all)
+#   numero → se incrementa en la misma transacción que cada escritura de aristas
+grafo_version = db.Table(
+    "grafo_version",
+    db.Column("id", db.Integer, primary_key=True),
+    db.Column("epoca", db.String, nullable=False),
+    db.Column("numero", db.Integer, nullable=False, default=0),
+)
+
+
+@event.listens_for(grafo_version, "after_create")
+def _insertar_fila_inicial(target, connection, **kw):
+    connection.execute(
+        target.insert().values(id=1, epoca=uuid.uuid4().hex, numero=0)
+    )
@@ -0,0 +1,16 @@
+# src/models/idempotencia.py
+from src import db
+
+# Respuestas ya dadas a peticiones con Idempotency-Key (src.utils.idempotencia),
+# compartidas entre procesos si IDEMPOTENCIA_SQL. `clave` incluye método y
+# ruta; `huella` es el sha256 del cuerpo de la petición original. Las filas
+# con `creado` anterior al TTL se ignoran y se purgan de a poco.
+idempotencia = db.Table(
+    "idempotencia",
+    db.Column("clave", db.String, primary_key=True),
+    db.Column("huella", db.String, nullable=False),
+    db.Column("status", db.Integer, nullable=False),
+    db.Column("cuerpo", db.LargeBinary, nullable=False),
+    db.Column("tipo", db.String, nullable=True),       # mimetype de la respuesta
+    db.Column("creado", db.Float, nullable=False, index=True),  # epoch (s)
+)
@@ -0,0 +1,16 @@
+# src/models/resumen_usuario.py
+from src import db
+from .enums import EstadoEnum, RolEnum
+
+# Carga de trabajo por usuario, materializada: cuántas asignaciones tiene
+# `usuario_alias` con `rol` en tareas que están en `estado`. La mantiene el
+# repositorio en la misma transacción que cada alta de tarea, cambio de
+# estado y alta/baja de asignación; `flask reconstruir-resumen` la rehace
+# desde asignacion ⨝ tarea. Las filas pueden quedar en 0.
+resumen_usuario = db.Table(
+    "resumen_usuario",
+    db.Column("usuario_alias", db.String, db.ForeignKey("usuario.alias"), primary_key=True),
+    db.Column("rol", db.Enum(RolEnum, name="rol_enum"), primary_key=True),
+    db.Column("estado", db.Enum(EstadoEnum, name="estado_enum"), primary_key=True),
+    db.Column("total", db.Integer, nullable=False, default=0),
+)
@@ -15,6 +15,30 @@ class Tarea(db.Model):
         default=EstadoEnum.NUEVA,
         nullable=False,
     )
+    # Duración estimada (unidades de planificación, p. ej. días); NULL =
+    # sin estimar. La usan GET /schedule y GET /tasks/<id>/critical-path
+    duracion = db.Column(db.Integer, nullable=True)
+    # Epoch (s) del paso a FINALIZADA; el archivo mueve las más antiguas a
+    # src.models.archivo
+    finalizada_en = db.Column(db.Float, nullable=True)
+    # Nº de dependencias aún no FINALIZADAS (desnormalizado, lo mantiene
+    # data_handler; `flask recalcular-pendientes` lo reconstruye)
+    dependencias_pendientes = db.Column(
+        db.Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # Consultas por estado (filtros, conteos)
+        db.Index("ix_tarea_estado", "estado"),
+        # Cola de tareas listas: WHERE dependencias_pendientes = 0 AND estado IN (…)
+        db.Index("ix_tarea_pendientes_estado", "dependencias_pendientes", "estado"),
+        # AUTOINCREMENT: los ids de tareas archivadas (borradas de esta
+        # tabla) no se reutilizan
+        {"sqlite_autoincrement": True},
+    )
 
     # MANY-TO-MANY con sí misma
     dependencias = db.relationship(
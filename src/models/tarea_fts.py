@@ -0,0 +1,53 @@
+# src/models/tarea_fts.py
+from sqlalchemy import event
+
+from .tarea import Tarea
+
+# Índice de texto completo (FTS5) sobre tarea.nombre / tarea.descripcion.
+# Tabla de contenido externo: no duplica el texto, sólo guarda el índice;
+# los triggers la mantienen al día con cualquier INSERT/UPDATE/DELETE sobre
+# `tarea`, incluidos los executemany de Core del repositorio SQL.
+# unicode61 + remove_diacritics: "busqueda" encuentra "búsqueda".
+DDL_BUSQUEDA = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tarea_fts USING fts5(
+        nombre, descripcion,
+        content='tarea', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS tarea_fts_ai AFTER INSERT ON tarea BEGIN
+        INSERT INTO tarea_fts(rowid, nombre, descripcion)
+        VALUES (new.id, new.nombre, new.descripcion);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tarea_fts_ad AFTER DELETE ON tarea BEGIN
+        INSERT INTO tarea_fts(tarea_fts, rowid, nombre, descripcion)
+        VALUES ('delete', old.id, old.nombre, old.descripcion);
+    END""",
+    # Sólo cuando cambia el texto: los cambios de estado no tocan el índice
+    """CREATE TRIGGER IF NOT EXISTS tarea_fts_au AFTER UPDATE OF nombre, descripcion ON tarea
+    BEGIN
+        INSERT INTO tarea_fts(tarea_fts, rowid, nombre, descripcion)
+        VALUES ('delete', old.id, old.nombre, old.descripcion);
+        INSERT INTO tarea_fts(rowid, nombre, descripcion)
+        VALUES (new.id, new.nombre, new.descripcion);
+    END""",
+)
+
+
+def crear_indice_busqueda(connection, reconstruir: bool = False) -> None:
+    """Crea tabla y triggers si faltan; `reconstruir` re-indexa las tareas existentes."""
+    for sentencia in DDL_BUSQUEDA:
+        connection.exec_driver_sql(sentencia)
+    if reconstruir:
+        connection.exec_driver_sql("INSERT INTO tarea_fts(tarea_fts) VALUES ('rebuild')")
+
+
+@event.listens_for(Tarea.__table__, "after_create")
+def _crear_tarea_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        crear_indice_busqueda(connection)
+
+
+@event.listens_for(Tarea.__table__, "before_drop")
+def _borrar_tarea_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS tarea_fts")
@@ -0,0 +1,363 @@
+"""
+Repositorios: persistencia detrás de la capa de servicio (src.data_handler).
+
+data_handler conserva las reglas de negocio (validaciones, transiciones,
+mensajes de error) y delega en un `Repositorio` las lecturas/escrituras.
+Hay dos implementaciones, elegidas con la clave de configuración
+REPOSITORIO:
+
+    "sql"     → RepositorioSQL (SQLAlchemy/SQLite, el de siempre)
+    "memoria" → RepositorioMemoria (dicts en proceso, sin durabilidad)
+
+Contrato común:
+- Las escrituras van dentro de `with repo.transaccion():`; si el bloque
+  lanza, no queda nada aplicado (data_handler valida antes de escribir).
+- `modificar_aristas(validar)` es la excepción: maneja su propia
+  transacción porque el backend SQL puede tener que reintentarla;
+  `validar` corre dentro de ella y puede registrar eventos.
+- Las escrituras de tareas/asignaciones mantienen también el resumen por
+  usuario (ClaveResumen → total) en la misma transacción.
+- Las tareas archivadas (FINALIZADAS antiguas, src.models.archivo) sólo
+  se ven en obtener_tarea_archivada, tareas_de_usuario, el volcado y los
+  totales recalculados del resumen; para el resto no existen, y una arista
+  hacia una de ellas cuenta como dependencia finalizada.
+- Los registros devueltos exponen atributos (`.id`, `.nombre`, `.estado`,
+  `.alias`, `.dependencias_pendientes`…); los estados/roles son enums.
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Set, Tuple,
+)
+
+from flask import current_app
+
+from src.models.enums import EstadoEnum, RolEnum
+
+Arista = Tuple[int, int]  # (tarea_id, depende_de_id)
+# (entidad, clave, operacion, datos) al registrar; al leer, con seq y creado delante:
+# (seq, creado, entidad, clave, operacion, datos)
+Evento = Tuple[str, str, str, Dict[str, Any]]
+# Cada nueva tarea: {"nombre", "descripcion", "duracion" (opcional),
+# "asignaciones": [(alias, RolEnum)],
+# "dependencias": [posiciones de otras tareas de la misma lista]}
+NuevaTarea = Dict[str, Any]
+# (usuario_alias, rol, estado) → nº de asignaciones en tareas con ese estado
+ClaveResumen = Tuple[str, RolEnum, EstadoEnum]
+# Tablas del volcado, en orden de carga. Filas: usuario (alias, nombre);
+# tarea (id, nombre, descripcion, EstadoEnum, duracion, finalizada_en); asignacion
+# (alias, tarea_id, RolEnum); dependencia (tarea_id, depende_de_id). Incluye el archivo
+# (al importar, todo vuelve a las tablas activas)
+TABLAS_VOLCADO = ("usuario", "tarea", "asignacion", "dependencia")
+# (tarea_id, estado, duracion, depende_de_id): una fila por arista, o una
+# con depende_de_id None si la tarea no tiene dependencias
+FilaPlan = Tuple[int, EstadoEnum, Optional[int], Optional[int]]
+
+
+class BaseOcupada(RuntimeError):
+    """La BD siguió bloqueada por otros escritores durante todo el plazo de reintento."""
+
+
+class Repositorio(ABC):
+    # ---------- transacciones ------------------------------------- #
+    @abstractmethod
+    def transaccion(self) -> ContextManager[None]:
+        """Confirma al salir del bloque; si el bloque lanza, revierte."""
+
+    def es_bloqueo_transitorio(self, error: Exception) -> bool:
+        """
+        True si `error` fue un bloqueo pasajero de la BD (otro escritor): la
+        transacción se revirtió entera y la operación puede repetirse.
+        """
+        return False
+
+    def liberar(self) -> None:
+        """Suelta lo retenido entre operaciones (p. ej. la conexión) antes de esperar."""
+
+    def tras_confirmar(self, accion: Callable[[], None]) -> None:
+        """
+        Ejecuta `accion` cuando lo ya escrito sea durable: enseguida, salvo
+        que la transacción forme parte de un grupo aún sin confirmar.
+        """
+        accion()
+
+    # ---------- usuarios ------------------------------------------ #
+    @abstractmethod
+    def obtener_usuario(self, alias: str) -> Optional[Any]: ...
+
+    @abstractmethod
+    def agregar_usuario(self, alias: str, nombre: str) -> None: ...
+
+    @abstractmethod
+    def aliases_existentes(self, aliases: Iterable[str]) -> Set[str]: ...
+
+    # ---------- tareas -------------------------------------------- #
+    @abstractmethod
+    def obtener_tarea(self, tarea_id: int) -> Optional[Any]: ...
+
+    @abstractmethod
+    def tareas_existentes(self, ids: Iterable[int]) -> Set[int]: ...
+
+    @abstractmethod
+    def proyectar_tareas(self, ids: Iterable[int], campos: Iterable[str]) -> Dict[int, Any]:
+        """Tareas activas de `ids` por id; en SQL sólo se leen las columnas de `campos`."""
+
+    @abstractmethod
+    def estados(self, ids: Iterable[int]) -> Dict[int, Tuple[EstadoEnum, int]]:
+        """tarea_id → (estado, dependencias_pendientes) de las que existen."""
+
+    @abstractmethod
+    def insertar_tareas(self, tareas: List[NuevaTarea]) -> List[int]:
+        """Inserta en estado NUEVA con sus asignaciones y aristas; devuelve los ids."""
+
+    @abstractmethod
+    def actualizar_estados(
+        self, cambios: Dict[int, Tuple[EstadoEnum, EstadoEnum]]
+    ) -> None:
+        """
+        Aplica tarea_id → (anterior, nuevo), fija `finalizada_en` y ajusta
+        los contadores de sus dependientes.
+        """
+
+    @abstractmethod
+    def actualizar_duracion(self, tarea_id: int, duracion: Optional[int]) -> None: ...
+
+    @abstractmethod
+    def dependencias_pendientes(self, ids: Iterable[int]) -> Dict[int, Set[int]]:
+        """tarea_id → ids de sus dependencias NO finalizadas (sólo las no vacías)."""
+
+    @abstractmethod
+    def recalcular_pendientes(self) -> int:
+        """Recalcula los contadores; devuelve cuántos estaban desfasados."""
+
+    # ---------- asignaciones -------------------------------------- #
+    @abstractmethod
+    def existe_asignacion(self, alias: str, tarea_id: int, rol: RolEnum) -> bool: ...
+
+    @abstractmethod
+    def contar_asignaciones(self, tarea_id: int) -> int: ...
+
+    @abstractmethod
+    def agregar_asignacion(self, alias: str, tarea_id: int, rol: RolEnum) -> None: ...
+
+    @abstractmethod
+    def quitar_asignacion(self, alias: str, tarea_id: int, rol: RolEnum) -> None: ...
+
+    @abstractmethod
+    def asignaciones_de_tarea(self, tarea_id: int) -> List[Tuple[str, RolEnum]]: ...
+
+    @abstractmethod
+    def usuarios_asignados(self, ids: Iterable[int]) -> Set[str]: ...
+
+    @abstractmethod
+    def asignaciones_de_tareas(self, ids: Iterable[int]) -> Dict[int, List[Tuple[str, RolEnum]]]:
+        """(alias, rol) de cada tarea de `ids`, ordenadas por alias y rol."""
+
+    # ---------- dependencias -------------------------------------- #
+    @abstractmethod
+    def modificar_aristas(
+        self, validar: Callable[[Any], Tuple[Set[Arista], Set[Arista]]]
+    ) -> Tuple[Set[Arista], Set[Arista]]:
+        """
+        Unidad de trabajo atómica sobre `dependencia`: `validar(grafo)`
+        recibe una vista con existe/hay_ciclo/hay_ciclo_lote y devuelve
+        (agregadas, quitadas) o lanza; se escriben aristas y contadores.
+        """
+
+    @abstractmethod
+    def dependencias_directas(self, ids: Iterable[int]) -> Dict[int, List[int]]: ...
+
+    @abstractmethod
+    def dependientes_directos(self, ids: Iterable[int]) -> Dict[int, List[int]]:
+        """Inversa de dependencias_directas: las tareas que dependen de cada una."""
+
+    @abstractmethod
+    def clausura(
+        self, tarea_id: int, direccion: str, profundidad: Optional[int]
+    ) -> List[Tuple[int, str, EstadoEnum, int]]:
+        """(id, nombre, estado, distancia mínima) ordenado por distancia e id."""
+
+    # ---------- feed de cambios ----------------------------------- #
+    @abstractmethod
+    def registrar_eventos(self, eventos: List[Evento]) -> None:
+        """Agrega al feed, dentro de la transacción en curso (o de `validar`)."""
+
+    @abstractmethod
+    def eventos_desde(self, seq: int, limite: int) -> List[Tuple]:
+        """Hasta `limite` eventos con seq > `seq`, en orden de seq."""
+
+    @abstractmethod
+    def ultima_secuencia(self) -> int: ...
+
+    @abstractmethod
+    def version_tarea(self, tarea_id: int) -> int:
+        """
+        seq del último evento de la tarea o de la última importación
+        ("volcado"), el mayor; 0 si no hay ninguno. Sin leer la tarea.
+        """
+
+    # ---------- resumen por usuario ------------------------------- #
+    @abstractmethod
+    def resumen_usuario(self, alias: str) -> List[Tuple[RolEnum, EstadoEnum, int]]:
+        """(rol, estado, total) de `alias`, sólo los totales distintos de 0."""
+
+    @abstractmethod
+    def ranking_usuarios(
+        self,
+        estados: Optional[Iterable[EstadoEnum]],
+        rol: Optional[RolEnum],
+        limite: int,
+    ) -> List[Tuple[str, int]]:
+        """(alias, total) de mayor a menor total (empate: por alias)."""
+
+    @abstractmethod
+    def reconstruir_resumen(self) -> int:
+        """Rehace el resumen desde las asignaciones; devuelve cuántas claves quedan."""
+
+    @abstractmethod
+    def totales_resumen(self, recalcular: bool = False) -> Dict[ClaveResumen, int]:
+        """Totales guardados o, con `recalcular`, contados desde las asignaciones."""
+
+    def verificar_resumen(self) -> List[Tuple[str, RolEnum, EstadoEnum, int, int]]:
+        """Claves donde el resumen no coincide: (alias, rol, estado, guardado, real)."""
+        with self.transaccion():  # ambas lecturas sobre la misma instantánea
+            guardado = self.totales_resumen()
+            real = self.totales_resumen(recalcular=True)
+        return sorted(
+            (
+                (a, r, e, guardado.get((a, r, e), 0), real.get((a, r, e), 0))
+                for a, r, e in set(guardado) | set(real)
+                if guardado.get((a, r, e), 0) != real.get((a, r, e), 0)
+            ),
+            key=lambda d: (d[0], d[1].value, d[2].value),
+        )
+
+    # ---------- volcado (export / import) ------------------------- #
+    @abstractmethod
+    def volcar(self, tablas: Iterable[str] = TABLAS_VOLCADO) -> Iterator[Tuple[str, Tuple]]:
+        """(tabla, fila) de `tablas`, en ese orden y por clave, de una misma instantánea."""
+
+    @abstractmethod
+    def esta_vacio(self) -> bool: ...
+
+    def carga_masiva(self) -> ContextManager[None]:
+        """Transacción de una importación (sobre una base vacía)."""
+        return self.transaccion()
+
+    @abstractmethod
+    def cargar(self, tabla: str, filas: List[Tuple]) -> None:
+        """
+        Inserta filas con el formato de `volcar`, sin mantener contadores ni
+        resumen (después: recalcular_pendientes y reconstruir_resumen).
+        Claves duplicadas → ValueError.
+        """
+
+    @abstractmethod
+    def referencias_rotas(self) -> Dict[str, int]:
+        """Filas de asignacion / dependencia que apuntan a usuarios o tareas inexistentes."""
+
+    # ---------- archivo ------------------------------------------ #
+    @abstractmethod
+    def candidatas_archivo(self, hasta: float) -> Tuple[List[int], List[Arista]]:
+        """
+        Ids (ordenados) de las FINALIZADAS antes de `hasta` (o sin fecha) y
+        las aristas de esas tareas hacia tareas activas.
+        """
+
+    @abstractmethod
+    def archivar(self, ids: List[int], ahora: float) -> Dict[str, int]:
+        """
+        Mueve las tareas `ids`, sus asignaciones y sus aristas salientes al
+        archivo, sin tocar el resumen (siguen contando como FINALIZADAS).
+        Devuelve cuántas tareas, asignaciones y dependencias movió.
+        """
+
+    @abstractmethod
+    def obtener_tarea_archivada(self, tarea_id: int) -> Optional[Any]:
+        """(id, nombre, estado, duracion) de una tarea archivada."""
+
+    # ---------- planificación ------------------------------------ #
+    @abstractmethod
+    def grafo_planificacion(self, tarea_id: Optional[int] = None) -> List[FilaPlan]:
+        """
+        Tareas con su duración y aristas, en UNA lectura: todas o, con
+        `tarea_id`, esa tarea y las que la preceden (upstream). Vacío si
+        `tarea_id` no existe.
+        """
+
+    # ---------- consultas ----------------------------------------- #
+    @abstractmethod
+    def tareas_listas(self, limite: Optional[int]) -> List[Any]: ...
+
+    @abstractmethod
+    def tareas_de_usuario(
+        self,
+        alias: str,
+        estado: Optional[EstadoEnum],
+        rol: Optional[RolEnum],
+        cursor: Optional[int] = None,
+        limite: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Tareas (id, nombre, estado) de `alias` con id > cursor, ordenadas por
+        id, incluidas las archivadas.
+        """
+
+    @abstractmethod
+    def iterar_tareas_de_usuario(
+        self, alias: str, estado: Optional[EstadoEnum], rol: Optional[RolEnum]
+    ) -> Iterator[Any]: ...
+
+    @abstractmethod
+    def buscar_tareas(
+        self,
+        terminos: List[str],
+        estado: Optional[EstadoEnum],
+        rol: Optional[RolEnum],
+        offset: int,
+        limite: int,
+    ) -> List[Any]:
+        """
+        Tareas (id, nombre, estado) cuyo nombre/descripcion contiene todos los
+        `terminos` como prefijo de alguna palabra (sin distinguir acentos),
+        de más a menos relevante; un acierto en el nombre pesa más.
+        """
+
+
+def crear_repositorio(nombre: str) -> Repositorio:
+    if nombre == "sql":
+        from src.repositorios.sql import RepositorioSQL
+
+        return RepositorioSQL()
+    if nombre == "memoria":
+        from src.repositorios.memoria import RepositorioMemoria
+
+        return RepositorioMemoria()
+    raise ValueError(f"Repositorio desconocido: {nombre}")
+
+
+_repositorio_actual: ContextVar[Optional[Repositorio]] = ContextVar(
+    "repositorio_actual", default=None
+)
+
+
+@contextmanager
+def usar_repositorio(repo: Repositorio) -> Iterator[Repositorio]:
+    """Fija `repo` para el contexto actual (p. ej. uno ligado a otra sesión)."""
+    token = _repositorio_actual.set(repo)
+    try:
+        yield repo
+    finally:
+        _repositorio_actual.reset(token)
+
+
+def hay_repositorio_fijado() -> bool:
+    return _repositorio_actual.get() is not None
+
+
+def repositorio() -> Repositorio:
+    """Repositorio fijado con usar_repositorio o, si no, el de la app actual."""
+    repo = _repositorio_actual.get()
+    return repo if repo is not None else current_app.extensions["repositorio"]
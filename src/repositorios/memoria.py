@@ -0,0 +1,575 @@
+"""
+Repositorio en memoria del proceso, sin durabilidad: para sesiones de
+planificación efímeras y pruebas de carga, donde el ida y vuelta a SQLite
+domina el costo de cada operación.
+
+- Registros compactos con __slots__ (UsuarioMem, TareaMem, AsignacionMem).
+- Índices dict: usuarios por alias, tareas por id, asignaciones por
+  (alias, tarea_id, rol) más dos índices secundarios (por tarea y por
+  usuario).
+- Aristas de `dependencia` en conjuntos de adyacencia (un
+  IndiceDependencias de src.grafo, sin versión: no hay otros procesos).
+- El archivo (tareas FINALIZADAS antiguas) en dicts aparte: las tareas,
+  sus asignaciones (con índice por usuario) y sus aristas salientes.
+- El resumen por usuario es un dict ClaveResumen → total, ajustado en
+  las mismas operaciones que tocan asignaciones o estados.
+- Un RLock serializa las transacciones; data_handler valida antes de
+  escribir, así que un bloque que lanza no deja cambios a medias.
+"""
+
+import re
+import time
+import unicodedata
+from collections import Counter
+from contextlib import contextmanager
+from threading import RLock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.grafo import IndiceDependencias
+from src.models.enums import EstadoEnum, RolEnum
+from src.repositorios import (
+    TABLAS_VOLCADO, Arista, ClaveResumen, Evento, FilaPlan, NuevaTarea, Repositorio,
+)
+
+ClaveAsignacion = Tuple[str, int, RolEnum]
+
+
+def _palabras(texto: str) -> List[str]:
+    """Como el tokenizador unicode61 de SQLite: minúsculas, sin acentos."""
+    plano = unicodedata.normalize("NFKD", texto.lower())
+    plano = "".join(c for c in plano if not unicodedata.combining(c))
+    return re.findall(r"[^\W_]+", plano)
+
+
+class UsuarioMem:
+    __slots__ = ("alias", "nombre")
+
+    def __init__(self, alias: str, nombre: str) -> None:
+        self.alias = alias
+        self.nombre = nombre
+
+
+class TareaMem:
+    __slots__ = (
+        "id", "nombre", "descripcion", "estado", "dependencias_pendientes", "duracion",
+        "finalizada_en",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        nombre: str,
+        descripcion: str,
+        estado: EstadoEnum = EstadoEnum.NUEVA,
+        dependencias_pendientes: int = 0,
+        duracion: Optional[int] = None,
+        finalizada_en: Optional[float] = None,
+    ) -> None:
+        self.id = id
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.estado = estado
+        self.dependencias_pendientes = dependencias_pendientes
+        self.duracion = duracion
+        self.finalizada_en = finalizada_en
+
+
+class AsignacionMem:
+    __slots__ = ("usuario_alias", "tarea_id", "rol")
+
+    def __init__(self, usuario_alias: str, tarea_id: int, rol: RolEnum) -> None:
+        self.usuario_alias = usuario_alias
+        self.tarea_id = tarea_id
+        self.rol = rol
+
+
+class RepositorioMemoria(Repositorio):
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._vaciar()
+
+    def _vaciar(self) -> None:
+        self._usuarios: Dict[str, UsuarioMem] = {}
+        self._tareas: Dict[int, TareaMem] = {}
+        self._asignaciones: Dict[ClaveAsignacion, AsignacionMem] = {}
+        self._por_tarea: Dict[int, Dict[ClaveAsignacion, AsignacionMem]] = {}
+        self._por_usuario: Dict[str, Dict[ClaveAsignacion, AsignacionMem]] = {}
+        self._grafo = IndiceDependencias()
+        self._listas: Set[int] = set()  # NUEVA/EN_PROGRESO con contador 0
+        self._siguiente_id = 1
+        self._eventos: List[Tuple] = []  # el evento con seq n está en [n - 1]
+        self._ultimo_evento: Dict[Tuple[str, str], int] = {}  # (entidad, clave) → seq
+        self._ultimo_volcado = 0
+        self._resumen: Dict[ClaveResumen, int] = {}
+        self._archivadas: Dict[int, TareaMem] = {}
+        self._asignaciones_archivadas: Dict[ClaveAsignacion, AsignacionMem] = {}
+        self._archivo_por_usuario: Dict[str, Dict[ClaveAsignacion, AsignacionMem]] = {}
+        self._aristas_archivadas: Set[Arista] = set()
+
+    # ---------- transacciones ------------------------------------- #
+    @contextmanager
+    def transaccion(self):
+        with self._lock:
+            yield
+
+    # ---------- usuarios ------------------------------------------ #
+    def obtener_usuario(self, alias: str) -> Optional[UsuarioMem]:
+        return self._usuarios.get(alias)
+
+    def agregar_usuario(self, alias: str, nombre: str) -> None:
+        with self._lock:
+            self._usuarios[alias] = UsuarioMem(alias, nombre)
+            self._por_usuario.setdefault(alias, {})
+
+    def aliases_existentes(self, aliases: Iterable[str]) -> Set[str]:
+        return {a for a in aliases if a in self._usuarios}
+
+    # ---------- tareas -------------------------------------------- #
+    def obtener_tarea(self, tarea_id: int) -> Optional[TareaMem]:
+        return self._tareas.get(tarea_id)
+
+    def tareas_existentes(self, ids: Iterable[int]) -> Set[int]:
+        return {i for i in ids if i in self._tareas}
+
+    def proyectar_tareas(self, ids: Iterable[int], campos: Iterable[str]) -> Dict[int, TareaMem]:
+        with self._lock:
+            return {i: self._tareas[i] for i in ids if i in self._tareas}
+
+    def estados(self, ids: Iterable[int]) -> Dict[int, Tuple[EstadoEnum, int]]:
+        with self._lock:
+            return {
+                i: (t.estado, t.dependencias_pendientes)
+                for i, t in ((i, self._tareas.get(i)) for i in ids)
+                if t is not None
+            }
+
+    def insertar_tareas(self, tareas: List[NuevaTarea]) -> List[int]:
+        with self._lock:
+            base_id = self._siguiente_id
+            self._siguiente_id += len(tareas)
+            ids = [base_id + k for k in range(len(tareas))]
+            for k, nueva in enumerate(tareas):
+                tarea = TareaMem(
+                    ids[k], nueva["nombre"], nueva["descripcion"],
+                    dependencias_pendientes=len(nueva["dependencias"]),
+                    duracion=nueva.get("duracion"),
+                )
+                self._tareas[tarea.id] = tarea
+                self._por_tarea[tarea.id] = {}
+                self._reclasificar(tarea)
+                for alias, rol in nueva["asignaciones"]:
+                    self.agregar_asignacion(alias, tarea.id, rol)
+            self._grafo.aplicar(
+                agregadas=[(ids[k], ids[p]) for k, t in enumerate(tareas) for p in t["dependencias"]]
+            )
+            return ids
+
+    def actualizar_estados(
+        self, cambios: Dict[int, Tuple[EstadoEnum, EstadoEnum]]
+    ) -> None:
+        ahora = time.time()
+        with self._lock:
+            for tid, (anterior, nuevo) in cambios.items():
+                tarea = self._tareas[tid]
+                tarea.estado = nuevo
+                tarea.finalizada_en = ahora if nuevo == EstadoEnum.FINALIZADA else None
+                self._reclasificar(tarea)
+                for alias, _, rol in self._por_tarea[tid]:
+                    self._sumar_resumen((alias, rol, anterior), -1)
+                    self._sumar_resumen((alias, rol, nuevo), 1)
+                if (anterior == EstadoEnum.FINALIZADA) != (nuevo == EstadoEnum.FINALIZADA):
+                    delta = -1 if nuevo == EstadoEnum.FINALIZADA else 1
+                    for dependiente in self._grafo.inversas.get(tid, ()):
+                        self._sumar_pendientes(dependiente, delta)
+
+    def actualizar_duracion(self, tarea_id: int, duracion: Optional[int]) -> None:
+        with self._lock:
+            self._tareas[tarea_id].duracion = duracion
+
+    def dependencias_pendientes(self, ids: Iterable[int]) -> Dict[int, Set[int]]:
+        with self._lock:
+            resultado: Dict[int, Set[int]] = {}
+            for tid in ids:
+                # Una dependencia que ya no está en _tareas está archivada: finalizada
+                faltan = {
+                    d for d in self._grafo.directas.get(tid, ())
+                    if d in self._tareas and self._tareas[d].estado != EstadoEnum.FINALIZADA
+                }
+                if faltan:
+                    resultado[tid] = faltan
+            return resultado
+
+    def recalcular_pendientes(self) -> int:
+        with self._lock:
+            corregidas = 0
+            for tid, tarea in self._tareas.items():
+                n = len(self.dependencias_pendientes([tid]).get(tid, ()))
+                if tarea.dependencias_pendientes != n:
+                    tarea.dependencias_pendientes = n
+                    self._reclasificar(tarea)
+                    corregidas += 1
+            return corregidas
+
+    def _sumar_pendientes(self, tarea_id: int, delta: int) -> None:
+        tarea = self._tareas[tarea_id]
+        tarea.dependencias_pendientes += delta
+        self._reclasificar(tarea)
+
+    def _reclasificar(self, tarea: TareaMem) -> None:
+        if tarea.dependencias_pendientes == 0 and tarea.estado != EstadoEnum.FINALIZADA:
+            self._listas.add(tarea.id)
+        else:
+            self._listas.discard(tarea.id)
+
+    # ---------- asignaciones -------------------------------------- #
+    def existe_asignacion(self, alias: str, tarea_id: int, rol: RolEnum) -> bool:
+        return (alias, tarea_id, rol) in self._asignaciones
+
+    def contar_asignaciones(self, tarea_id: int) -> int:
+        return len(self._por_tarea.get(tarea_id, ()))
+
+    def agregar_asignacion(self, alias: str, tarea_id: int, rol: RolEnum) -> None:
+        with self._lock:
+            clave = (alias, tarea_id, rol)
+            asignacion = AsignacionMem(alias, tarea_id, rol)
+            self._asignaciones[clave] = asignacion
+            self._por_tarea[tarea_id][clave] = asignacion
+            self._por_usuario[alias][clave] = asignacion
+            self._sumar_resumen((alias, rol, self._tareas[tarea_id].estado), 1)
+
+    def quitar_asignacion(self, alias: str, tarea_id: int, rol: RolEnum) -> None:
+        with self._lock:
+            clave = (alias, tarea_id, rol)
+            del self._asignaciones[clave]
+            del self._por_tarea[tarea_id][clave]
+            del self._por_usuario[alias][clave]
+            self._sumar_resumen((alias, rol, self._tareas[tarea_id].estado), -1)
+
+    def asignaciones_de_tarea(self, tarea_id: int) -> List[Tuple[str, RolEnum]]:
+        with self._lock:
+            return [(a.usuario_alias, a.rol) for a in self._por_tarea.get(tarea_id, {}).values()]
+
+    def asignaciones_de_tareas(self, ids: Iterable[int]) -> Dict[int, List[Tuple[str, RolEnum]]]:
+        with self._lock:
+            return {
+                t: sorted((a.usuario_alias, a.rol) for a in self._por_tarea.get(t, {}).values())
+                for t in ids
+            }
+
+    def usuarios_asignados(self, ids: Iterable[int]) -> Set[str]:
+        with self._lock:
+            return {
+                alias
+                for tid in ids
+                for alias, _, _ in self._por_tarea.get(tid, {})
+            }
+
+    # ---------- dependencias -------------------------------------- #
+    def modificar_aristas(self, validar) -> Tuple[Set[Arista], Set[Arista]]:
+        with self._lock:
+            agregadas, quitadas = validar(self._grafo)
+            for t, d in quitadas:
+                if d in self._tareas and self._tareas[d].estado != EstadoEnum.FINALIZADA:
+                    self._sumar_pendientes(t, -1)
+            for t, d in agregadas:
+                if self._tareas[d].estado != EstadoEnum.FINALIZADA:
+                    self._sumar_pendientes(t, +1)
+            self._grafo.aplicar(agregadas, quitadas)
+            return agregadas, quitadas
+
+    def dependencias_directas(self, ids: Iterable[int]) -> Dict[int, List[int]]:
+        with self._lock:
+            return {t: sorted(self._grafo.directas.get(t, ())) for t in ids}
+
+    def dependientes_directos(self, ids: Iterable[int]) -> Dict[int, List[int]]:
+        with self._lock:
+            return {d: sorted(self._grafo.inversas.get(d, ())) for d in ids}
+
+    def clausura(
+        self, tarea_id: int, direccion: str, profundidad: Optional[int]
+    ) -> List[Tuple[int, str, EstadoEnum, int]]:
+        """BFS por niveles: la primera vez que se alcanza un nodo es a distancia mínima."""
+        with self._lock:
+            vecinos = self._grafo.directas if direccion == "upstream" else self._grafo.inversas
+            distancias: Dict[int, int] = {}
+            frontera, nivel = [tarea_id], 0
+            while frontera and (profundidad is None or nivel < profundidad):
+                nivel += 1
+                siguiente = []
+                for nodo in frontera:
+                    for v in vecinos.get(nodo, ()):
+                        if v not in distancias:
+                            distancias[v] = nivel
+                            siguiente.append(v)
+                frontera = siguiente
+            return [
+                (i, self._tareas[i].nombre, self._tareas[i].estado, d)
+                for i, d in sorted(distancias.items(), key=lambda par: (par[1], par[0]))
+                if i in self._tareas  # no las archivadas
+            ]
+
+    # ---------- feed de cambios ----------------------------------- #
+    def registrar_eventos(self, eventos: List[Evento]) -> None:
+        creado = time.time()
+        with self._lock:
+            for entidad, clave, operacion, datos in eventos:
+                seq = len(self._eventos) + 1
+                self._eventos.append((seq, creado, entidad, clave, operacion, datos))
+                self._ultimo_evento[entidad, clave] = seq
+                if entidad == "volcado":
+                    self._ultimo_volcado = seq
+
+    def eventos_desde(self, seq: int, limite: int) -> List[Tuple]:
+        with self._lock:
+            return self._eventos[max(seq, 0):max(seq, 0) + limite]
+
+    def ultima_secuencia(self) -> int:
+        return len(self._eventos)
+
+    def version_tarea(self, tarea_id: int) -> int:
+        with self._lock:
+            return max(self._ultimo_evento.get(("tarea", str(tarea_id)), 0), self._ultimo_volcado)
+
+    # ---------- resumen por usuario ------------------------------- #
+    def resumen_usuario(self, alias: str) -> List[Tuple[RolEnum, EstadoEnum, int]]:
+        with self._lock:
+            totales = ((r, e, self._resumen.get((alias, r, e), 0)) for r in RolEnum for e in EstadoEnum)
+            return [(r, e, n) for r, e, n in totales if n]
+
+    def ranking_usuarios(
+        self,
+        estados: Optional[Iterable[EstadoEnum]],
+        rol: Optional[RolEnum],
+        limite: int,
+    ) -> List[Tuple[str, int]]:
+        estados = set(estados) if estados is not None else None
+        totales: Counter = Counter()
+        with self._lock:
+            for (a, r, e), n in self._resumen.items():
+                if (rol is None or r == rol) and (estados is None or e in estados):
+                    totales[a] += n
+        ranking = sorted((-n, a) for a, n in totales.items() if n)
+        return [(a, -n) for n, a in ranking[:limite]]
+
+    def reconstruir_resumen(self) -> int:
+        with self._lock:
+            self._resumen = self.totales_resumen(recalcular=True)
+            return len(self._resumen)
+
+    def totales_resumen(self, recalcular: bool = False) -> Dict[ClaveResumen, int]:
+        with self._lock:
+            if not recalcular:
+                return {c: n for c, n in self._resumen.items() if n}
+            totales = Counter(
+                (a.usuario_alias, a.rol, self._tareas[a.tarea_id].estado)
+                for a in self._asignaciones.values()
+            )
+            totales.update(
+                (alias, rol, EstadoEnum.FINALIZADA)
+                for alias, _, rol in self._asignaciones_archivadas
+            )
+            return dict(totales)
+
+    def _sumar_resumen(self, clave: ClaveResumen, delta: int) -> None:
+        self._resumen[clave] = self._resumen.get(clave, 0) + delta
+
+    # ---------- volcado (export / import) ------------------------- #
+    def volcar(self, tablas: Iterable[str] = TABLAS_VOLCADO) -> Iterator[Tuple[str, Tuple]]:
+        # Copia bajo el lock (la instantánea) y se entrega fuera de él
+        with self._lock:
+            copias = {
+                "usuario": lambda: [(u.alias, u.nombre) for _, u in sorted(self._usuarios.items())],
+                "tarea": lambda: [
+                    (t.id, t.nombre, t.descripcion, t.estado, t.duracion, t.finalizada_en)
+                    for _, t in sorted({**self._tareas, **self._archivadas}.items())
+                ],
+                "asignacion": lambda: sorted(
+                    [*self._asignaciones, *self._asignaciones_archivadas],
+                    key=lambda c: (c[0], c[1], c[2].value),
+                ),
+                "dependencia": lambda: sorted(
+                    [(t, d) for t, ds in self._grafo.directas.items() for d in ds]
+                    + list(self._aristas_archivadas)
+                ),
+            }
+            filas = [(tabla, copias[tabla]()) for tabla in tablas]
+        for tabla, lista in filas:
+            for fila in lista:
+                yield tabla, fila
+
+    def esta_vacio(self) -> bool:
+        return not self._usuarios and not self._tareas and not self._archivadas
+
+    @contextmanager
+    def carga_masiva(self):
+        # Sin rollback en memoria: si la importación falla, se vuelve al
+        # estado vacío del que partió
+        with self._lock:
+            try:
+                yield
+            except BaseException:
+                self._vaciar()
+                raise
+
+    def cargar(self, tabla: str, filas: List[Tuple]) -> None:
+        """Las referencias se comprueban aquí: los índices las necesitan válidas."""
+        with self._lock:
+            for fila in filas:
+                if tabla == "usuario":
+                    if fila[0] in self._usuarios:
+                        raise ValueError("Filas duplicadas en usuario")
+                    self.agregar_usuario(*fila)
+                elif tabla == "tarea":
+                    if fila[0] in self._tareas:
+                        raise ValueError("Filas duplicadas en tarea")
+                    id_, nombre, descripcion, estado, duracion, finalizada_en = fila
+                    tarea = TareaMem(
+                        id_, nombre, descripcion, estado,
+                        duracion=duracion, finalizada_en=finalizada_en,
+                    )
+                    self._tareas[tarea.id] = tarea
+                    self._por_tarea[tarea.id] = {}
+                    self._reclasificar(tarea)
+                    self._siguiente_id = max(self._siguiente_id, tarea.id + 1)
+                elif tabla == "asignacion":
+                    alias, tarea_id, rol = fila
+                    if alias not in self._usuarios or tarea_id not in self._tareas:
+                        raise ValueError("Asignación a un usuario o tarea inexistente")
+                    if fila in self._asignaciones:
+                        raise ValueError("Filas duplicadas en asignacion")
+                    self.agregar_asignacion(alias, tarea_id, rol)
+                else:
+                    tarea_id, depende_de_id = fila
+                    if tarea_id not in self._tareas or depende_de_id not in self._tareas:
+                        raise ValueError("Dependencia entre tareas inexistentes")
+                    if self._grafo.existe(tarea_id, depende_de_id):
+                        raise ValueError("Filas duplicadas en dependencia")
+                    self._grafo.aplicar(agregadas=[fila])
+
+    def referencias_rotas(self) -> Dict[str, int]:
+        return {"asignacion": 0, "dependencia": 0}  # `cargar` no las admite
+
+    # ---------- archivo ------------------------------------------ #
+    def candidatas_archivo(self, hasta: float) -> Tuple[List[int], List[Arista]]:
+        with self._lock:
+            ids = sorted(
+                t.id for t in self._tareas.values()
+                if t.estado == EstadoEnum.FINALIZADA
+                and (t.finalizada_en is None or t.finalizada_en < hasta)
+            )
+            aristas = [
+                (t, d) for t in ids for d in self._grafo.directas.get(t, ()) if d in self._tareas
+            ]
+            return ids, aristas
+
+    def archivar(self, ids: List[int], ahora: float) -> Dict[str, int]:
+        with self._lock:
+            movidas = {"tareas": 0, "asignaciones": 0, "dependencias": 0}
+            for tid in ids:
+                tarea = self._tareas.pop(tid)
+                self._archivadas[tid] = tarea
+                self._listas.discard(tid)
+                for clave, asignacion in self._por_tarea.pop(tid).items():
+                    del self._asignaciones[clave]
+                    del self._por_usuario[clave[0]][clave]
+                    self._asignaciones_archivadas[clave] = asignacion
+                    self._archivo_por_usuario.setdefault(clave[0], {})[clave] = asignacion
+                    movidas["asignaciones"] += 1
+                # Las aristas de otras tareas hacia ésta quedan en el grafo
+                salientes = [(tid, d) for d in self._grafo.directas.pop(tid, ())]
+                for _, d in salientes:
+                    self._grafo.inversas[d].discard(tid)
+                self._aristas_archivadas.update(salientes)
+                movidas["dependencias"] += len(salientes)
+                movidas["tareas"] += 1
+            return movidas
+
+    def obtener_tarea_archivada(self, tarea_id: int) -> Optional[TareaMem]:
+        return self._archivadas.get(tarea_id)
+
+    # ---------- planificación ------------------------------------ #
+    def grafo_planificacion(self, tarea_id: Optional[int] = None) -> List[FilaPlan]:
+        with self._lock:
+            if tarea_id is None:
+                ids: Iterable[int] = sorted(self._tareas)
+            elif tarea_id not in self._tareas:
+                return []
+            else:
+                alcanzadas, pila = {tarea_id}, [tarea_id]
+                while pila:
+                    for d in self._grafo.directas.get(pila.pop(), ()):
+                        if d not in alcanzadas and d in self._tareas:
+                            alcanzadas.add(d)
+                            pila.append(d)
+                ids = sorted(alcanzadas)
+            filas: List[FilaPlan] = []
+            for tid in ids:
+                t = self._tareas[tid]
+                deps = sorted(self._grafo.directas.get(tid, ())) or [None]
+                filas.extend((tid, t.estado, t.duracion, d) for d in deps)
+            return filas
+
+    # ---------- consultas ----------------------------------------- #
+    def tareas_listas(self, limite: Optional[int]) -> List[Any]:
+        with self._lock:
+            ids = sorted(self._listas)[:limite]
+            return [self._tareas[i] for i in ids]
+
+    def tareas_de_usuario(
+        self,
+        alias: str,
+        estado: Optional[EstadoEnum],
+        rol: Optional[RolEnum],
+        cursor: Optional[int] = None,
+        limite: Optional[int] = None,
+    ) -> List[Any]:
+        with self._lock:
+            claves = [*self._por_usuario.get(alias, {}), *self._archivo_por_usuario.get(alias, {})]
+            ids = sorted({
+                tid
+                for _, tid, r in claves
+                if (rol is None or r == rol) and (cursor is None or tid > cursor)
+            })
+            tareas = (self._tareas.get(tid) or self._archivadas[tid] for tid in ids)
+            if estado is not None:
+                tareas = (t for t in tareas if t.estado == estado)
+            return list(tareas)[:limite]
+
+    def iterar_tareas_de_usuario(
+        self, alias: str, estado: Optional[EstadoEnum], rol: Optional[RolEnum]
+    ) -> Iterator[Any]:
+        # Instantánea bajo el lock: el streaming no ve escrituras posteriores
+        return iter(self.tareas_de_usuario(alias, estado, rol))
+
+    def buscar_tareas(
+        self,
+        terminos: List[str],
+        estado: Optional[EstadoEnum],
+        rol: Optional[RolEnum],
+        offset: int,
+        limite: int,
+    ) -> List[Any]:
+        # Recorrido completo: sin índice invertido, que no compensa en un
+        # backend pensado para sesiones cortas
+        terminos = [p for t in terminos for p in _palabras(t)]
+        puntuadas = []
+        with self._lock:
+            for tarea in self._tareas.values():
+                if estado is not None and tarea.estado != estado:
+                    continue
+                if rol is not None and not any(r == rol for _, _, r in self._por_tarea[tarea.id]):
+                    continue
+                en_nombre = _palabras(tarea.nombre)
+                en_descripcion = _palabras(tarea.descripcion)
+                puntos = 0
+                for termino in terminos:
+                    n = sum(p.startswith(termino) for p in en_nombre)
+                    d = sum(p.startswith(termino) for p in en_descripcion)
+                    if not n and not d:
+                        break
+                    puntos += 10 * n + d
+                else:
+                    puntuadas.append((-puntos, tarea.id, tarea))
+            puntuadas.sort(key=lambda p: p[:2])
+            return [t for _, _, t in puntuadas[offset:offset + limite]]
+
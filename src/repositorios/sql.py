@@ -0,0 +1,956 @@
+"""
+Repositorio sobre SQLAlchemy (SQLite): tablas de src.models, inserciones y
+actualizaciones por lotes con Core, e índice en memoria del grafo
+(src.grafo) para detectar ciclos sin SQL.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from flask import current_app
+from sqlalchemy import (
+    bindparam, column, exists, func, literal, literal_column, select, table, union_all,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src import db
+from src.grafo import IndiceDependencias, IndiceObsoleto, indice_dependencias
+from src.models.archivo import asignacion_archivada, dependencia_archivada, tarea_archivada
+from src.models.asignacion import Asignacion
+from src.models.dependencia import dependencia
+from src.models.evento import evento
+from src.models.grafo_version import grafo_version
+from src.models.resumen_usuario import resumen_usuario
+from src.models.enums import EstadoEnum, RolEnum
+from src.models.tarea import Tarea
+from src.models.usuario import Usuario
+from src.repositorios import (
+    TABLAS_VOLCADO, Arista, ClaveResumen, Evento, FilaPlan, NuevaTarea, Repositorio,
+)
+
+_LOTE_IN = 500  # máximo de parámetros por IN (límite de variables de SQLite)
+_REINTENTOS_INDICE = 3
+LOTE_STREAMING = 1000  # filas por lote al iterar con cursor del servidor
+# Códigos primarios de SQLite para "database is locked" (otra conexión) y
+# "database table is locked" (la misma); los extendidos llevan el primario
+# en el byte bajo (SQLITE_BUSY_SNAPSHOT = 517)
+_SQLITE_BUSY, _SQLITE_LOCKED = 5, 6
+
+# Índice FTS5 de src.models.tarea_fts; bm25 con el nombre 10 veces más
+# pesado que la descripción (menor = más relevante)
+_tarea_fts = table("tarea_fts", column("rowid"))
+_MATCH_FTS = literal_column("tarea_fts")
+_RANGO_FTS = func.bm25(_MATCH_FTS, 10.0, 1.0)
+
+
+class EscritorOcupado(Exception):
+    """El turno del escritor único (src.utils.conexiones) no llegó a tiempo."""
+
+
+def _finalizada():
+    """Literal FINALIZADA con el tipo de tarea.estado: las tareas archivadas no lo guardan."""
+    return literal(EstadoEnum.FINALIZADA, type_=Tarea.__table__.c.estado.type)
+
+
+def _lotes(valores: Iterable[Any]) -> Iterator[List[Any]]:
+    """Parte `valores` en listas de a lo sumo _LOTE_IN elementos."""
+    valores = list(valores)
+    for k in range(0, len(valores), _LOTE_IN):
+        yield valores[k:k + _LOTE_IN]
+
+
+@contextmanager
+def _turno_de_escritura():
+    """
+    Con CONEXIONES_SEPARADAS, a lo sumo una transacción de escritura por
+    proceso: las demás esperan aquí en vez de chocar con el lock de SQLite.
+    """
+    conexiones = current_app.extensions.get("conexiones")
+    if conexiones is None:
+        yield
+        return
+    if not conexiones.escritor.acquire(timeout=conexiones.espera):
+        raise EscritorOcupado()
+    try:
+        yield
+    finally:
+        conexiones.escritor.release()
+
+
+class RepositorioSQL(Repositorio):
+    def __init__(self, sesion=None, agrupada: bool = False) -> None:
+        # Por defecto la sesión con ámbito de Flask-SQLAlchemy
+        self.sesion = sesion if sesion is not None else db.session
+        # agrupada=True: cada transacción es un SAVEPOINT dentro de la que
+        # abrió el escritor de src.utils.cola_escritura, que confirma el grupo.
+        self.agrupada = agrupada
+
+    # ---------- transacciones ------------------------------------- #
+    @contextmanager
+    def transaccion(self):
+        if self.agrupada:
+            with self._punto_de_guardado():
+                yield
+            return
+        with _turno_de_escritura():
+            self.sesion.info["en_transaccion"] = True
+            try:
+                yield
+                self.sesion.commit()
+            except Exception:
+                self.sesion.rollback()
+                self.sesion.info.pop("al_confirmar", None)
+                raise
+            finally:
+                self.sesion.info.pop("en_transaccion", None)
+        for accion in self.sesion.info.pop("al_confirmar", ()):
+            accion()
+
+    def es_bloqueo_transitorio(self, error: Exception) -> bool:
+        if isinstance(error, EscritorOcupado):
+            return True
+        if not isinstance(error, OperationalError):
+            return False
+        codigo = getattr(error.orig, "sqlite_errorcode", None)  # Python ≥ 3.11
+        if codigo is not None:
+            return codigo & 0xFF in (_SQLITE_BUSY, _SQLITE_LOCKED)
+        return "is locked" in str(error.orig)
+
+    def _al_confirmar(self, accion) -> None:
+        """Ejecuta `accion` sólo si la transacción en curso se confirma."""
+        self.sesion.info.setdefault("al_confirmar", []).append(accion)
+
+    def tras_confirmar(self, accion) -> None:
+        if self.agrupada or self.sesion.info.get("en_transaccion"):
+            self._al_confirmar(accion)
+        else:
+            accion()
+
+    def liberar(self) -> None:
+        if not self.sesion.info.get("en_transaccion"):
+            self.sesion.close()
+
+    @contextmanager
+    def _punto_de_guardado(self):
+        acciones = self.sesion.info.setdefault("al_confirmar", [])
+        previas = len(acciones)
+        punto = self.sesion.begin_nested()
+        try:
+            yield
+            punto.commit()
+        except Exception:
+            punto.rollback()
+            del acciones[previas:]  # lo encolado por este bloque ya no aplica
+            raise
+
+    # ---------- usuarios ------------------------------------------ #
+    def obtener_usuario(self, alias: str) -> Optional[Usuario]:
+        return self.sesion.get(Usuario, alias)
+
+    def agregar_usuario(self, alias: str, nombre: str) -> None:
+        self.sesion.add(Usuario(alias=alias, nombre=nombre))
+
+    def aliases_existentes(self, aliases: Iterable[str]) -> Set[str]:
+        encontrados: Set[str] = set()
+        for lote in _lotes(aliases):
+            encontrados.update(
+                a for (a,) in self.sesion.query(Usuario.alias).filter(Usuario.alias.in_(lote))
+            )
+        return encontrados
+
+    # ---------- tareas -------------------------------------------- #
+    def obtener_tarea(self, tarea_id: int) -> Optional[Tarea]:
+        return self.sesion.get(Tarea, tarea_id)
+
+    def tareas_existentes(self, ids: Iterable[int]) -> Set[int]:
+        existentes: Set[int] = set()
+        for lote in _lotes(ids):
+            existentes.update(
+                i for (i,) in self.sesion.query(Tarea.id).filter(Tarea.id.in_(lote))
+            )
+        return existentes
+
+    def proyectar_tareas(self, ids: Iterable[int], campos: Iterable[str]) -> Dict[int, Any]:
+        """Por Core y sólo con las columnas pedidas (más `id`): filas, no objetos ORM."""
+        c = Tarea.__table__.c
+        columnas = [c.id] + [c[campo] for campo in campos if campo != "id"]
+        resultado: Dict[int, Any] = {}
+        for lote in _lotes(set(ids)):
+            for fila in self.sesion.execute(select(*columnas).where(c.id.in_(lote))):
+                resultado[fila.id] = fila
+        return resultado
+
+    def estados(self, ids: Iterable[int]) -> Dict[int, Tuple[EstadoEnum, int]]:
+        resultado: Dict[int, Tuple[EstadoEnum, int]] = {}
+        for lote in _lotes(set(ids)):
+            for tid, estado, n in self.sesion.query(
+                Tarea.id, Tarea.estado, Tarea.dependencias_pendientes
+            ).filter(Tarea.id.in_(lote)):
+                resultado[tid] = (estado, n)
+        return resultado
+
+    def insertar_tareas(self, tareas: List[NuevaTarea]) -> List[int]:
+        tabla = Tarea.__table__
+        conn = self.sesion.connection()
+
+        # La primera fila toma el lock de escritura de SQLite y fija la base
+        # de ids; el resto se inserta con ids explícitos vía executemany.
+        primera = tareas[0]
+        res = conn.execute(
+            tabla.insert().values(
+                nombre=primera["nombre"],
+                descripcion=primera["descripcion"],
+                duracion=primera.get("duracion"),
+                estado=EstadoEnum.NUEVA,
+                dependencias_pendientes=len(primera["dependencias"]),
+            )
+        )
+        base_id = res.inserted_primary_key[0]
+        ids = [base_id + k for k in range(len(tareas))]
+        if len(tareas) > 1:
+            conn.execute(
+                tabla.insert(),
+                [
+                    {
+                        "id": ids[k],
+                        "nombre": t["nombre"],
+                        "descripcion": t["descripcion"],
+                        "duracion": t.get("duracion"),
+                        "estado": EstadoEnum.NUEVA,
+                        "dependencias_pendientes": len(t["dependencias"]),
+                    }
+                    for k, t in enumerate(tareas) if k > 0
+                ],
+            )
+
+        conn.execute(
+            Asignacion.__table__.insert(),
+            [
+                {"usuario_alias": alias, "tarea_id": ids[k], "rol": rol}
+                for k, t in enumerate(tareas)
+                for alias, rol in t["asignaciones"]
+            ],
+        )
+        self._sumar_resumen(Counter(
+            (alias, rol, EstadoEnum.NUEVA) for t in tareas for alias, rol in t["asignaciones"]
+        ))
+
+        aristas = [(ids[k], ids[p]) for k, t in enumerate(tareas) for p in t["dependencias"]]
+        if aristas:
+            indice = indice_dependencias()
+            indice.sincronizar(conn)
+            base = indice.registrar_escritura(conn)
+            conn.execute(
+                dependencia.insert(),
+                [{"tarea_id": t, "depende_de_id": d} for t, d in aristas],
+            )
+            self._al_confirmar(lambda: indice.confirmar(base, agregadas=aristas))
+        return ids
+
+    def actualizar_estados(
+        self, cambios: Dict[int, Tuple[EstadoEnum, EstadoEnum]]
+    ) -> None:
+        tabla = Tarea.__table__
+        conn = self.sesion.connection()
+        ahora = time.time()
+        conn.execute(
+            tabla.update()
+            .where(tabla.c.id == bindparam("b_id"))
+            .values(estado=bindparam("b_estado"), finalizada_en=bindparam("b_fin")),
+            [
+                {
+                    "b_id": tid,
+                    "b_estado": nuevo,
+                    "b_fin": ahora if nuevo == EstadoEnum.FINALIZADA else None,
+                }
+                for tid, (_, nuevo) in cambios.items()
+            ],
+        )
+
+        # Cada asignación de la tarea pasa de (…, anterior) a (…, nuevo)
+        resumen: Counter = Counter()
+        for lote in _lotes(cambios):
+            for alias, tid, rol in self.sesion.query(
+                Asignacion.usuario_alias, Asignacion.tarea_id, Asignacion.rol
+            ).filter(Asignacion.tarea_id.in_(lote)):
+                anterior, nuevo = cambios[tid]
+                resumen[(alias, rol, anterior)] -= 1
+                resumen[(alias, rol, nuevo)] += 1
+        self._sumar_resumen(resumen)
+
+        # Quien depende de una tarea que entra (-1) o sale (+1) de FINALIZADA
+        deltas = [
+            {"b_dep": tid, "b_delta": -1 if nuevo == EstadoEnum.FINALIZADA else 1}
+            for tid, (anterior, nuevo) in cambios.items()
+            if (anterior == EstadoEnum.FINALIZADA) != (nuevo == EstadoEnum.FINALIZADA)
+        ]
+        if deltas:
+            conn.execute(
+                tabla.update()
+                .where(
+                    tabla.c.id.in_(
+                        select(dependencia.c.tarea_id).where(
+                            dependencia.c.depende_de_id == bindparam("b_dep")
+                        )
+                    )
+                )
+                .values(
+                    dependencias_pendientes=tabla.c.dependencias_pendientes
+                    + bindparam("b_delta")
+                ),
+                deltas,
+            )
+
+    def actualizar_duracion(self, tarea_id: int, duracion: Optional[int]) -> None:
+        tabla = Tarea.__table__
+        self.sesion.connection().execute(
+            tabla.update().where(tabla.c.id == tarea_id).values(duracion=duracion)
+        )
+
+    def dependencias_pendientes(self, ids: Iterable[int]) -> Dict[int, Set[int]]:
+        """Una consulta agregada (dependencia ⨝ tarea, GROUP BY) por lote de ids."""
+        resultado: Dict[int, Set[int]] = {}
+        for lote in _lotes(set(ids)):
+            filas = (
+                self.sesion.query(dependencia.c.tarea_id, func.group_concat(Tarea.id))
+                .select_from(dependencia)
+                .join(Tarea, Tarea.id == dependencia.c.depende_de_id)
+                .filter(
+                    dependencia.c.tarea_id.in_(lote),
+                    Tarea.estado != EstadoEnum.FINALIZADA,
+                )
+                .group_by(dependencia.c.tarea_id)
+            )
+            for tarea_id, pendientes in filas:
+                resultado[tarea_id] = {int(x) for x in pendientes.split(",")}
+        return resultado
+
+    def recalcular_pendientes(self) -> int:
+        """Un único UPDATE correlacionado."""
+        tabla = Tarea.__table__
+        dep = tabla.alias("dep")
+        conteo = (
+            select(func.count())
+            .select_from(dependencia.join(dep, dep.c.id == dependencia.c.depende_de_id))
+            .where(
+                (dependencia.c.tarea_id == tabla.c.id)
+                & (dep.c.estado != EstadoEnum.FINALIZADA)
+            )
+            .scalar_subquery()
+        )
+        res = self.sesion.connection().execute(
+            tabla.update()
+            .where(tabla.c.dependencias_pendientes != conteo)
+            .values(dependencias_pendientes=conteo)
+        )
+        return res.rowcount
+
+    # ---------- asignaciones -------------------------------------- #
+    def existe_asignacion(self, alias: str, tarea_id: int, rol: RolEnum) -> bool:
+        return self.sesion.get(Asignacion, (alias, tarea_id, rol)) is not None
+
+    def contar_asignaciones(self, tarea_id: int) -> int:
+        return (
+            self.sesion.query(func.count())
+            .select_from(Asignacion)
+            .filter(Asignacion.tarea_id == tarea_id)
+            .scalar()
+        )
+
+    def agregar_asignacion(self, alias: str, tarea_id: int, rol: RolEnum) -> None:
+        self.sesion.add(Asignacion(usuario_alias=alias, tarea_id=tarea_id, rol=rol))
+        self._sumar_resumen({(alias, rol, self.obtener_tarea(tarea_id).estado): 1})
+
+    def quitar_asignacion(self, alias: str, tarea_id: int, rol: RolEnum) -> None:
+        self.sesion.delete(self.sesion.get(Asignacion, (alias, tarea_id, rol)))
+        self._sumar_resumen({(alias, rol, self.obtener_tarea(tarea_id).estado): -1})
+
+    def asignaciones_de_tarea(self, tarea_id: int) -> List[Tuple[str, RolEnum]]:
+        return [
+            (a, r) for a, r in self.sesion.query(Asignacion.usuario_alias, Asignacion.rol)
+            .filter(Asignacion.tarea_id == tarea_id)
+        ]
+
+    def asignaciones_de_tareas(self, ids: Iterable[int]) -> Dict[int, List[Tuple[str, RolEnum]]]:
+        resultado: Dict[int, List[Tuple[str, RolEnum]]] = {t: [] for t in ids}
+        for lote in _lotes(resultado):
+            filas = (
+                self.sesion.query(Asignacion.tarea_id, Asignacion.usuario_alias, Asignacion.rol)
+                .filter(Asignacion.tarea_id.in_(lote))
+                .order_by(Asignacion.tarea_id, Asignacion.usuario_alias, Asignacion.rol)
+            )
+            for t, alias, rol in filas:
+                resultado[t].append((alias, rol))
+        return resultado
+
+    def usuarios_asignados(self, ids: Iterable[int]) -> Set[str]:
+        aliases: Set[str] = set()
+        for lote in _lotes(ids):
+            aliases.update(
+                a for (a,) in self.sesion.query(Asignacion.usuario_alias)
+                .filter(Asignacion.tarea_id.in_(lote))
+                .distinct()
+            )
+        return aliases
+
+    # ---------- dependencias -------------------------------------- #
+    def modificar_aristas(self, validar) -> Tuple[Set[Arista], Set[Arista]]:
+        """
+        Dentro de la transacción de la sesión:
+          1. sincroniza el índice y reserva la versión (primer DML → lock de
+             escritura; si otro worker escribió antes, IndiceObsoleto → reintento),
+          2. `validar(grafo)` devuelve (agregadas, quitadas) o lanza,
+          3. escribe aristas y contadores, confirma y actualiza el índice.
+        """
+        indice = indice_dependencias()
+        for _ in range(_REINTENTOS_INDICE):
+            try:
+                with self.transaccion():
+                    conn = self.sesion.connection()
+                    indice.sincronizar(conn)
+                    base = indice.registrar_escritura(conn)
+                    agregadas, quitadas = validar(_GrafoSQL(conn, indice))
+                    self._escribir_aristas(conn, agregadas, quitadas)
+                    self._al_confirmar(
+                        partial(indice.confirmar, base, agregadas=agregadas, quitadas=quitadas)
+                    )
+            except IndiceObsoleto:
+                # Otro worker escribió aristas: recargar y volver a validar
+                continue
+            return agregadas, quitadas
+        raise RuntimeError("Conflicto concurrente al modificar dependencias")
+
+    def _escribir_aristas(
+        self, conn, agregadas: Set[Arista], quitadas: Set[Arista]
+    ) -> None:
+        if quitadas:
+            conn.execute(
+                dependencia.delete().where(
+                    (dependencia.c.tarea_id == bindparam("b_t"))
+                    & (dependencia.c.depende_de_id == bindparam("b_d"))
+                ),
+                [{"b_t": t, "b_d": d} for t, d in quitadas],
+            )
+            _ajustar_pendientes(conn, quitadas, -1)
+        if agregadas:
+            conn.execute(
+                dependencia.insert(),
+                [{"tarea_id": t, "depende_de_id": d} for t, d in agregadas],
+            )
+            _ajustar_pendientes(conn, agregadas, +1)
+
+    def dependencias_directas(self, ids: Iterable[int]) -> Dict[int, List[int]]:
+        directas: Dict[int, List[int]] = {t: [] for t in ids}
+        for lote in _lotes(directas):
+            filas = (
+                self.sesion.query(dependencia.c.tarea_id, dependencia.c.depende_de_id)
+                .filter(dependencia.c.tarea_id.in_(lote))
+                .order_by(dependencia.c.tarea_id, dependencia.c.depende_de_id)
+            )
+            for t, d in filas:
+                directas[t].append(d)
+        return directas
+
+    def dependientes_directos(self, ids: Iterable[int]) -> Dict[int, List[int]]:
+        dependientes: Dict[int, List[int]] = {d: [] for d in ids}
+        for lote in _lotes(dependientes):
+            filas = (
+                self.sesion.query(dependencia.c.depende_de_id, dependencia.c.tarea_id)
+                .filter(dependencia.c.depende_de_id.in_(lote))
+                .order_by(dependencia.c.depende_de_id, dependencia.c.tarea_id)
+            )
+            for d, t in filas:
+                dependientes[d].append(t)
+        return dependientes
+
+    def clausura(
+        self, tarea_id: int, direccion: str, profundidad: Optional[int]
+    ) -> List[Tuple[int, str, EstadoEnum, int]]:
+        """UNA consulta: CTE recursiva sobre `dependencia`."""
+        alcanzadas = _clausura_cte(tarea_id, direccion, profundidad)
+        distancia = func.min(alcanzadas.c.distancia).label("distancia")
+        return (
+            self.sesion.query(Tarea.id, Tarea.nombre, Tarea.estado, distancia)
+            .join(alcanzadas, alcanzadas.c.id == Tarea.id)
+            .group_by(Tarea.id)
+            .order_by(distancia, Tarea.id)
+            .all()
+        )
+
+    # ---------- feed de cambios ----------------------------------- #
+    def registrar_eventos(self, eventos: List[Evento]) -> None:
+        if eventos:
+            creado = time.time()
+            self.sesion.connection().execute(evento.insert(), [
+                {"entidad": e, "clave": c, "operacion": o, "datos": d, "creado": creado}
+                for e, c, o, d in eventos
+            ])
+
+    def eventos_desde(self, seq: int, limite: int) -> List[Tuple]:
+        c = evento.c
+        return [
+            tuple(f) for f in self.sesion.execute(
+                select(c.seq, c.creado, c.entidad, c.clave, c.operacion, c.datos)
+                .where(c.seq > seq)
+                .order_by(c.seq)
+                .limit(limite)
+            )
+        ]
+
+    def ultima_secuencia(self) -> int:
+        return self.sesion.execute(select(func.max(evento.c.seq))).scalar() or 0
+
+    def version_tarea(self, tarea_id: int) -> int:
+        c = evento.c
+
+        def ultimo(condicion):
+            # Búsqueda en ix_evento_entidad_clave (cubre seq: es el rowid)
+            return func.coalesce(select(func.max(c.seq)).where(condicion).scalar_subquery(), 0)
+
+        return self.sesion.execute(select(func.max(
+            ultimo((c.entidad == "tarea") & (c.clave == str(tarea_id))),
+            ultimo(c.entidad == "volcado"),
+        ))).scalar()
+
+    # ---------- resumen por usuario ------------------------------- #
+    def resumen_usuario(self, alias: str) -> List[Tuple[RolEnum, EstadoEnum, int]]:
+        c = resumen_usuario.c
+        return [
+            tuple(f) for f in self.sesion.execute(
+                select(c.rol, c.estado, c.total)
+                .where(c.usuario_alias == alias, c.total != 0)
+            )
+        ]
+
+    def ranking_usuarios(
+        self,
+        estados: Optional[Iterable[EstadoEnum]],
+        rol: Optional[RolEnum],
+        limite: int,
+    ) -> List[Tuple[str, int]]:
+        c = resumen_usuario.c
+        total = func.sum(c.total).label("total")
+        q = select(c.usuario_alias, total).group_by(c.usuario_alias).having(total != 0)
+        if estados is not None:
+            q = q.where(c.estado.in_(list(estados)))
+        if rol is not None:
+            q = q.where(c.rol == rol)
+        q = q.order_by(total.desc(), c.usuario_alias).limit(limite)
+        return [tuple(f) for f in self.sesion.execute(q)]
+
+    def reconstruir_resumen(self) -> int:
+        """DELETE + INSERT … SELECT agregado, en la transacción en curso."""
+        conn = self.sesion.connection()
+        conn.execute(resumen_usuario.delete())
+        res = conn.execute(
+            resumen_usuario.insert().from_select(
+                ["usuario_alias", "rol", "estado", "total"],
+                self._query_resumen_real(),
+            )
+        )
+        return res.rowcount
+
+    def totales_resumen(self, recalcular: bool = False) -> Dict[ClaveResumen, int]:
+        if recalcular:
+            q = self._query_resumen_real()
+        else:
+            c = resumen_usuario.c
+            q = select(c.usuario_alias, c.rol, c.estado, c.total).where(c.total != 0)
+        return {(a, r, e): n for a, r, e, n in self.sesion.execute(q)}
+
+    def _query_resumen_real(self):
+        """asignacion ⨝ tarea más las asignaciones archivadas (FINALIZADA)."""
+        archivo = asignacion_archivada.c
+        partes = union_all(
+            select(Asignacion.usuario_alias, Asignacion.rol, Tarea.estado,
+                   func.count().label("total"))
+            .join(Tarea, Tarea.id == Asignacion.tarea_id)
+            .group_by(Asignacion.usuario_alias, Asignacion.rol, Tarea.estado),
+            select(archivo.usuario_alias, archivo.rol, _finalizada().label("estado"),
+                   func.count().label("total"))
+            .group_by(archivo.usuario_alias, archivo.rol),
+        ).subquery()
+        return (
+            select(partes.c.usuario_alias, partes.c.rol, partes.c.estado, func.sum(partes.c.total))
+            .group_by(partes.c.usuario_alias, partes.c.rol, partes.c.estado)
+        )
+
+    def _sumar_resumen(self, deltas: Dict[ClaveResumen, int]) -> None:
+        """UPSERT total = total + delta por clave (executemany)."""
+        filas = [
+            {"usuario_alias": a, "rol": r, "estado": e, "total": n}
+            for (a, r, e), n in deltas.items() if n
+        ]
+        if filas:
+            ins = sqlite_insert(resumen_usuario)
+            self.sesion.connection().execute(
+                ins.on_conflict_do_update(
+                    index_elements=["usuario_alias", "rol", "estado"],
+                    set_={"total": resumen_usuario.c.total + ins.excluded.total},
+                ),
+                filas,
+            )
+
+    # ---------- volcado (export / import) ------------------------- #
+    def volcar(self, tablas: Iterable[str] = TABLAS_VOLCADO) -> Iterator[Tuple[str, Tuple]]:
+        """Cursor por tabla (SQLite entrega las filas a medida que se leen)."""
+        archivo = tarea_archivada.c
+        consultas = {
+            "usuario": select(Usuario.alias, Usuario.nombre).order_by(Usuario.alias),
+            "tarea": _ordenada(union_all(
+                select(Tarea.id, Tarea.nombre, Tarea.descripcion, Tarea.estado,
+                       Tarea.duracion, Tarea.finalizada_en),
+                select(archivo.id, archivo.nombre, archivo.descripcion, _finalizada(),
+                       archivo.duracion, archivo.finalizada_en),
+            )),
+            "asignacion": _ordenada(union_all(
+                select(Asignacion.usuario_alias, Asignacion.tarea_id, Asignacion.rol),
+                select(asignacion_archivada),
+            )),
+            "dependencia": _ordenada(union_all(
+                select(dependencia.c.tarea_id, dependencia.c.depende_de_id),
+                select(dependencia_archivada),
+            )),
+        }
+        conn = self.sesion.connection()
+        # pysqlite no abre transacción para un SELECT: sin este BEGIN cada
+        # tabla se leería de una instantánea distinta (dentro de `transaccion`
+        # ya hay una, con las escrituras propias)
+        propia = not (self.agrupada or self.sesion.info.get("en_transaccion"))
+        if propia:
+            conn.exec_driver_sql("BEGIN")
+        try:
+            for tabla in tablas:
+                for fila in conn.execute(consultas[tabla]):
+                    yield tabla, tuple(fila)
+        finally:
+            if propia:
+                self.sesion.rollback()
+
+    def esta_vacio(self) -> bool:
+        return (
+            self.sesion.query(Usuario.alias).first() is None
+            and self.sesion.query(Tarea.id).first() is None
+            and self.sesion.execute(select(tarea_archivada.c.id).limit(1)).first() is None
+        )
+
+    def cargar(self, tabla: str, filas: List[Tuple]) -> None:
+        destino, campos = {
+            "usuario": (Usuario.__table__, ("alias", "nombre")),
+            "tarea": (
+                Tarea.__table__,
+                ("id", "nombre", "descripcion", "estado", "duracion", "finalizada_en"),
+            ),
+            "asignacion": (Asignacion.__table__, ("usuario_alias", "tarea_id", "rol")),
+            "dependencia": (dependencia, ("tarea_id", "depende_de_id")),
+        }[tabla]
+        conn = self.sesion.connection()
+        try:
+            conn.execute(destino.insert(), [dict(zip(campos, f)) for f in filas])
+        except IntegrityError:
+            raise ValueError(f"Filas duplicadas en {tabla}")
+        if tabla == "dependencia":
+            # Los demás workers recargan su índice; el de este proceso, al confirmar
+            conn.execute(grafo_version.update().values(numero=grafo_version.c.numero + 1))
+            self._al_confirmar(indice_dependencias().invalidar)
+
+    def referencias_rotas(self) -> Dict[str, int]:
+        asignacion = Asignacion.__table__
+
+        def huerfanas(tabla, referencia_a, referencia_b) -> int:
+            return self.sesion.execute(
+                select(func.count()).select_from(tabla).where(
+                    ~exists().where(referencia_a) | ~exists().where(referencia_b)
+                )
+            ).scalar()
+
+        return {
+            "asignacion": huerfanas(
+                asignacion,
+                Usuario.alias == asignacion.c.usuario_alias,
+                Tarea.id == asignacion.c.tarea_id,
+            ),
+            "dependencia": huerfanas(
+                dependencia,
+                Tarea.id == dependencia.c.tarea_id,
+                Tarea.id == dependencia.c.depende_de_id,
+            ),
+        }
+
+    # ---------- archivo ------------------------------------------ #
+    def candidatas_archivo(self, hasta: float) -> Tuple[List[int], List[Arista]]:
+        tareas = Tarea.__table__
+        destino = tareas.alias("destino")
+        candidata = (tareas.c.estado == EstadoEnum.FINALIZADA) & (
+            tareas.c.finalizada_en.is_(None) | (tareas.c.finalizada_en < hasta)
+        )
+        conn = self.sesion.connection()
+        ids = [i for (i,) in conn.execute(
+            select(tareas.c.id).where(candidata).order_by(tareas.c.id)
+        )]
+        # Sólo hacia tareas activas: las que ya están en el archivo no cuentan
+        aristas = [tuple(f) for f in conn.execute(
+            select(dependencia.c.tarea_id, dependencia.c.depende_de_id)
+            .select_from(
+                dependencia
+                .join(tareas, tareas.c.id == dependencia.c.tarea_id)
+                .join(destino, destino.c.id == dependencia.c.depende_de_id)
+            )
+            .where(candidata)
+        )]
+        return ids, aristas
+
+    def archivar(self, ids: List[int], ahora: float) -> Dict[str, int]:
+        """INSERT … SELECT al archivo y DELETE de las tablas activas, por lotes de ids."""
+        tareas, asignaciones = Tarea.__table__, Asignacion.__table__
+        conn = self.sesion.connection()
+        movidas = {"tareas": 0, "asignaciones": 0, "dependencias": 0}
+        quitadas: List[Arista] = []
+        for lote in _lotes(ids):
+            quitadas.extend(tuple(f) for f in conn.execute(
+                select(dependencia.c.tarea_id, dependencia.c.depende_de_id)
+                .where(dependencia.c.tarea_id.in_(lote))
+            ))
+            conn.execute(tarea_archivada.insert().from_select(
+                ["id", "nombre", "descripcion", "duracion", "finalizada_en", "archivada_en"],
+                select(tareas.c.id, tareas.c.nombre, tareas.c.descripcion, tareas.c.duracion,
+                       tareas.c.finalizada_en, literal(ahora))
+                .where(tareas.c.id.in_(lote)),
+            ))
+            conn.execute(asignacion_archivada.insert().from_select(
+                ["usuario_alias", "tarea_id", "rol"],
+                select(asignaciones.c.usuario_alias, asignaciones.c.tarea_id, asignaciones.c.rol)
+                .where(asignaciones.c.tarea_id.in_(lote)),
+            ))
+            conn.execute(dependencia_archivada.insert().from_select(
+                ["tarea_id", "depende_de_id"],
+                select(dependencia.c.tarea_id, dependencia.c.depende_de_id)
+                .where(dependencia.c.tarea_id.in_(lote)),
+            ))
+            # Las aristas de otras tareas hacia éstas quedan en `dependencia`
+            conn.execute(dependencia.delete().where(dependencia.c.tarea_id.in_(lote)))
+            movidas["asignaciones"] += conn.execute(
+                asignaciones.delete().where(asignaciones.c.tarea_id.in_(lote))
+            ).rowcount
+            movidas["tareas"] += conn.execute(
+                tareas.delete().where(tareas.c.id.in_(lote))
+            ).rowcount
+        movidas["dependencias"] = len(quitadas)
+
+        if quitadas:
+            indice = indice_dependencias()
+            indice.sincronizar(conn)
+            base = indice.registrar_escritura(conn)
+            self._al_confirmar(lambda: indice.confirmar(base, quitadas=quitadas))
+        return movidas
+
+    def obtener_tarea_archivada(self, tarea_id: int) -> Optional[Any]:
+        c = tarea_archivada.c
+        return self.sesion.execute(
+            select(c.id, c.nombre, _finalizada().label("estado"), c.duracion)
+            .where(c.id == tarea_id)
+        ).first()
+
+    # ---------- planificación ------------------------------------ #
+    def grafo_planificacion(self, tarea_id: Optional[int] = None) -> List[FilaPlan]:
+        """
+        UNA consulta: tarea ⟕ dependencia (con `tarea_id`, sobre la CTE
+        recursiva de sus ancestros). Por Core: sin objetos ORM por fila.
+        """
+        tareas = Tarea.__table__
+        origen = tareas
+        if tarea_id is not None:
+            ancestros = _ancestros_cte(tarea_id)
+            origen = tareas.join(ancestros, ancestros.c.id == tareas.c.id)
+        q = (
+            select(tareas.c.id, tareas.c.estado, tareas.c.duracion, dependencia.c.depende_de_id)
+            .select_from(origen.outerjoin(dependencia, dependencia.c.tarea_id == tareas.c.id))
+            .order_by(tareas.c.id, dependencia.c.depende_de_id)
+        )
+        return [tuple(f) for f in self.sesion.connection().execute(q)]
+
+    # ---------- consultas ----------------------------------------- #
+    def tareas_listas(self, limite: Optional[int]) -> List[Any]:
+        """NUEVA/EN_PROGRESO sin dependencias pendientes (usa ix_tarea_pendientes_estado)."""
+        q = (
+            self.sesion.query(Tarea.id, Tarea.nombre, Tarea.estado)
+            .filter(
+                Tarea.dependencias_pendientes == 0,
+                Tarea.estado.in_([EstadoEnum.NUEVA, EstadoEnum.EN_PROGRESO]),
+            )
+            .order_by(Tarea.id)
+        )
+        if limite is not None:
+            q = q.limit(limite)
+        return q.all()
+
+    def tareas_de_usuario(
+        self,
+        alias: str,
+        estado: Optional[EstadoEnum],
+        rol: Optional[RolEnum],
+        cursor: Optional[int] = None,
+        limite: Optional[int] = None,
+    ) -> List[Any]:
+        q = self._query_tareas_de_usuario(alias, estado, rol, cursor)
+        if limite is not None:
+            q = q.limit(limite)
+        return self.sesion.execute(q).all()
+
+    def iterar_tareas_de_usuario(
+        self, alias: str, estado: Optional[EstadoEnum], rol: Optional[RolEnum]
+    ) -> Iterator[Any]:
+        """Cursor del lado del servidor con buffer acotado: memoria constante."""
+        return iter(self.sesion.execute(
+            self._query_tareas_de_usuario(alias, estado, rol),
+            execution_options={"stream_results": True, "max_row_buffer": LOTE_STREAMING},
+        ))
+
+    def buscar_tareas(
+        self,
+        terminos: List[str],
+        estado: Optional[EstadoEnum],
+        rol: Optional[RolEnum],
+        offset: int,
+        limite: int,
+    ) -> List[Any]:
+        # Cada término entre comillas (sin sintaxis FTS del usuario) y con *
+        # para buscar por prefijo; términos separados = AND implícito
+        consulta = " ".join('"{}"*'.format(t.replace('"', '""')) for t in terminos)
+        q = (
+            select(Tarea.id, Tarea.nombre, Tarea.estado)
+            .select_from(_tarea_fts.join(Tarea, Tarea.id == _tarea_fts.c.rowid))
+            .where(_MATCH_FTS.op("MATCH")(consulta))
+        )
+        if estado is not None:
+            q = q.where(Tarea.estado == estado)
+        if rol is not None:
+            q = q.where(
+                exists().where(Asignacion.tarea_id == Tarea.id).where(Asignacion.rol == rol)
+            )
+        q = q.order_by(_RANGO_FTS, Tarea.id).offset(offset).limit(limite)
+        return self.sesion.execute(q).all()
+
+    def _query_tareas_de_usuario(
+        self,
+        alias: str,
+        estado: Optional[EstadoEnum],
+        rol: Optional[RolEnum],
+        cursor: Optional[int] = None,
+    ):
+        """
+        Tareas activas UNION ALL archivadas (ids disjuntos), con los filtros
+        dentro de cada rama para que usen los índices por tarea_id. DISTINCT:
+        un usuario puede tener varios roles en la misma tarea.
+        """
+        activas = (
+            select(Tarea.id, Tarea.nombre, Tarea.estado)
+            .join(Asignacion)
+            .where(Asignacion.usuario_alias == alias)
+        )
+        if estado is not None:
+            activas = activas.where(Tarea.estado == estado)
+        if rol is not None:
+            activas = activas.where(Asignacion.rol == rol)
+        if cursor is not None:
+            activas = activas.where(Tarea.id > cursor)
+        if estado not in (None, EstadoEnum.FINALIZADA):
+            return activas.distinct().order_by(Tarea.id)
+
+        t, a = tarea_archivada.c, asignacion_archivada.c
+        archivadas = (
+            select(t.id, t.nombre, _finalizada().label("estado"))
+            .join(asignacion_archivada, a.tarea_id == t.id)
+            .where(a.usuario_alias == alias)
+        )
+        if rol is not None:
+            archivadas = archivadas.where(a.rol == rol)
+        if cursor is not None:
+            archivadas = archivadas.where(t.id > cursor)
+        return _ordenada(union_all(activas.distinct(), archivadas.distinct()))
+
+
+class _GrafoSQL:
+    """Vista del grafo que recibe `validar`: el índice en memoria o, con
+    CICLOS_EN_BD=True, la CTE recursiva para detectar ciclos."""
+
+    def __init__(self, conn, indice: IndiceDependencias) -> None:
+        self._conn = conn
+        self._indice = indice
+
+    def existe(self, tarea_id: int, depende_de_id: int) -> bool:
+        return self._indice.existe(tarea_id, depende_de_id)
+
+    def hay_ciclo(self, tarea_id: int, depende_de_id: int) -> bool:
+        """¿Existe ya el camino depende_de ← … ← tarea?"""
+        if current_app.config.get("CICLOS_EN_BD"):
+            aguas_arriba = _clausura_cte(depende_de_id, "upstream")
+            fila = self._conn.execute(
+                select(aguas_arriba.c.id).where(aguas_arriba.c.id == tarea_id).limit(1)
+            ).first()
+            return fila is not None
+        return self._indice.hay_ciclo(tarea_id, depende_de_id)
+
+    def hay_ciclo_lote(self, agregadas: Iterable[Arista], quitadas: Iterable[Arista] = ()) -> bool:
+        return self._indice.hay_ciclo_lote(agregadas, quitadas)
+
+
+def _ordenada(compuesta):
+    """UNION ALL ordenado por todas sus columnas, en orden."""
+    return compuesta.order_by(*compuesta.selected_columns)
+
+
+def _ajustar_pendientes(conn, aristas: Iterable[Arista], delta: int) -> None:
+    """
+    Suma `delta` al contador de cada tarea de (tarea, depende_de) cuando
+    depende_de no está FINALIZADA. Un único executemany.
+    """
+    tabla = Tarea.__table__
+    dep = tabla.alias("dep")
+    no_finalizada = (
+        select(dep.c.id)
+        .where((dep.c.id == bindparam("b_d")) & (dep.c.estado != EstadoEnum.FINALIZADA))
+        .exists()
+    )
+    conn.execute(
+        tabla.update()
+        .where((tabla.c.id == bindparam("b_t")) & no_finalizada)
+        .values(dependencias_pendientes=tabla.c.dependencias_pendientes + delta),
+        [{"b_t": t, "b_d": d} for t, d in aristas],
+    )
+
+
+def _ancestros_cte(tarea_id: int):
+    """CTE recursiva (id) de tarea_id y todas las tareas de las que depende."""
+    ancestros = select(literal(tarea_id).label("id")).cte("ancestros", recursive=True)
+    # UNION (no ALL): cada tarea una vez aunque se llegue por varios caminos
+    return ancestros.union(
+        select(dependencia.c.depende_de_id).where(dependencia.c.tarea_id == ancestros.c.id)
+    )
+
+
+def _clausura_cte(
+    tarea_id: int,
+    direccion: str,
+    profundidad: Optional[int] = None,
+):
+    """CTE recursiva (id, distancia) de las tareas alcanzables desde tarea_id."""
+    if direccion == "upstream":
+        desde, hacia = dependencia.c.tarea_id, dependencia.c.depende_de_id
+    else:
+        desde, hacia = dependencia.c.depende_de_id, dependencia.c.tarea_id
+
+    alcanzadas = (
+        select(hacia.label("id"), literal(1).label("distancia"))
+        .where(desde == tarea_id)
+        .cte("alcanzadas", recursive=True)
+    )
+    paso = select(hacia, alcanzadas.c.distancia + 1).where(desde == alcanzadas.c.id)
+    if profundidad is not None:
+        paso = paso.where(alcanzadas.c.distancia < profundidad)
+    # UNION (no ALL): descarta pares (id, distancia) repetidos por caminos paralelos
+    return alcanzadas.union(paso)
@@ -0,0 +1,157 @@
+"""
+Control de admisión: límite de peticiones concurrentes por carril, con
+cola de espera acotada, y descarte rápido cuando no hay lugar.
+
+Hay dos carriles: lecturas (GET/HEAD/OPTIONS) y escrituras (el resto, que
+en SQLite terminan serializadas por el lock de escritura). Cada uno admite
+hasta ADMISION_<CARRIL> peticiones a la vez; las siguientes esperan en una
+cola de hasta ADMISION_COLA_<CARRIL> lugares durante a lo sumo
+ADMISION_ESPERA_<CARRIL> s. Con la cola llena o vencido el plazo, la
+petición se rechaza sin llegar a la vista: 503 {"error": ...} con
+Retry-After (ADMISION_REINTENTO s).
+
+create_app lo instala sólo si algún límite no es None. Las rutas de
+ADMISION_EXENTAS (monitoreo y el stream SSE, que dura lo que la conexión)
+no pasan por ningún carril. Profundidad de cola, tiempo de espera y
+rechazos salen en GET /metrics.
+"""
+
+import time
+from threading import Condition, Lock
+from typing import Dict, List, Optional
+
+from flask import Flask, g, jsonify, request
+
+from src.utils.metricas import BUCKETS_SEGUNDOS, Histograma
+
+LECTURA = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class Carril:
+    def __init__(self, nombre: str, limite: Optional[int], cola: int, espera: float) -> None:
+        self.nombre = nombre
+        self.limite = limite  # None = sin límite
+        self.cola = cola
+        self.espera = espera
+        self._cond = Condition(Lock())
+        self.activas = 0
+        self.en_cola = 0
+        self.admitidas = 0
+        self.rechazadas = {"cola_llena": 0, "plazo_vencido": 0}
+
+    def entrar(self) -> Optional[str]:
+        """None si la petición entra (ocupa un lugar); si no, el motivo del rechazo."""
+        with self._cond:
+            if self.limite is None or (self.activas < self.limite and not self.en_cola):
+                self.activas += 1
+                self.admitidas += 1
+                return None
+            if self.en_cola >= self.cola:
+                self.rechazadas["cola_llena"] += 1
+                return "cola_llena"
+            fin = time.monotonic() + self.espera
+            self.en_cola += 1
+            try:
+                while self.activas >= self.limite:
+                    restante = fin - time.monotonic()
+                    if restante <= 0:
+                        self.rechazadas["plazo_vencido"] += 1
+                        return "plazo_vencido"
+                    self._cond.wait(restante)
+            finally:
+                self.en_cola -= 1
+            self.activas += 1
+            self.admitidas += 1
+            return None
+
+    def salir(self) -> None:
+        with self._cond:
+            self.activas -= 1
+            self._cond.notify()
+
+
+class ControlAdmision:
+    def __init__(self, app: Flask = None) -> None:
+        self._lock = Lock()
+        self.espera = Histograma(
+            "admision_espera_seconds",
+            "Tiempo en la cola de admisión por petición admitida.",
+            BUCKETS_SEGUNDOS,
+        )
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["admision"] = self
+        config = app.config
+        self.carriles = {
+            "lectura": Carril("lectura", config["ADMISION_LECTURAS"],
+                              config["ADMISION_COLA_LECTURAS"],
+                              config["ADMISION_ESPERA_LECTURAS"]),
+            "escritura": Carril("escritura", config["ADMISION_ESCRITURAS"],
+                                config["ADMISION_COLA_ESCRITURAS"],
+                                config["ADMISION_ESPERA_ESCRITURAS"]),
+        }
+        self.exentas = frozenset(config["ADMISION_EXENTAS"])
+        self.reintento = config["ADMISION_REINTENTO"]
+        app.before_request(self._admitir)
+        app.teardown_request(_liberar)
+
+    # ---------- hooks de Flask ------------------------------------ #
+    def _admitir(self):
+        if request.path in self.exentas:
+            return None
+        carril = self.carriles["lectura" if request.method in LECTURA else "escritura"]
+        inicio = time.perf_counter()
+        motivo = carril.entrar()
+        if motivo is not None:
+            resp = jsonify({"error": f"Servicio saturado ({carril.nombre}: {motivo})"})
+            resp.status_code = 503
+            resp.headers["Retry-After"] = str(self.reintento)
+            return resp
+        g.admision = carril
+        with self._lock:
+            self.espera.observar((("carril", carril.nombre),), time.perf_counter() - inicio)
+        return None
+
+    # ---------- métricas ------------------------------------------ #
+    def estadisticas(self) -> Dict[str, Dict[str, int]]:
+        resultado = {}
+        for nombre, carril in self.carriles.items():
+            with carril._cond:
+                resultado[nombre] = {
+                    "activas": carril.activas,
+                    "en_cola": carril.en_cola,
+                    "admitidas": carril.admitidas,
+                    **{f"rechazadas_{m}": n for m, n in carril.rechazadas.items()},
+                }
+        return resultado
+
+    def exportar(self) -> List[str]:
+        """Líneas en formato de texto de Prometheus (las agrega GET /metrics)."""
+        stats = self.estadisticas()
+        lineas = []
+        for metrica, tipo, campo in (
+            ("admision_activas", "gauge", "activas"),
+            ("admision_en_cola", "gauge", "en_cola"),
+            ("admision_admitidas_total", "counter", "admitidas"),
+        ):
+            lineas.append(f"# TYPE {metrica} {tipo}")
+            lineas += [f'{metrica}{{carril="{c}"}} {s[campo]}' for c, s in stats.items()]
+        lineas.append("# TYPE admision_rechazadas_total counter")
+        for c, carril in self.carriles.items():
+            lineas += [
+                f'admision_rechazadas_total{{carril="{c}",motivo="{m}"}} '
+                f'{stats[c]["rechazadas_" + m]}'
+                for m in carril.rechazadas
+            ]
+        with self._lock:
+            lineas += self.espera.exportar()
+        return lineas
+
+
+def _liberar(_exc=None) -> None:
+    """Devuelve el lugar del carril (teardown: corre aun si la vista falló)."""
+    carril = g.pop("admision", None)
+    if carril is not None:
+        carril.salir()
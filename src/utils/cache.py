@@ -0,0 +1,151 @@
+"""
+Caché en proceso de respuestas GET ya serializadas (LRU acotada + TTL).
+
+Cada entrada pertenece a un *recurso* ("tarea:5", "usuario:eva") y a una
+*variante* (la query string). La capa de servicio invalida por recurso
+tras cada commit. Los recursos con versión (las tareas: seq de su último
+evento) guardan la versión con la que se leyeron y una entrada de otra
+versión no se sirve, aunque la mutación haya sido en otro proceso; para
+el resto, el TTL acota cuánto puede durar una entrada que otro proceso
+dejó vieja.
+
+Para no guardar datos leídos antes de una invalidación concurrente, quien
+carga toma la `generacion` del recurso antes de leer la BD y `guardar`
+descarta el valor si la generación cambió entretanto.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from flask import current_app
+
+
+class Entrada(NamedTuple):
+    cuerpo: bytes
+    etag: str
+    expira: float
+    version: Optional[int] = None
+
+
+def clave_tarea(tarea_id: int) -> str:
+    return f"tarea:{tarea_id}"
+
+
+def clave_usuario(alias: str) -> str:
+    return f"usuario:{alias}"
+
+
+def etag_version(recurso: str, version: int, variante: bytes = b"") -> str:
+    """ETag fuerte de (recurso, versión, variante): el mismo en todos los procesos."""
+    return hashlib.sha1(f"{recurso}@{version}?".encode() + variante).hexdigest()
+
+
+class CacheRespuestas:
+    def __init__(self, max_entradas: int = 1024, ttl: float = 30.0) -> None:
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._lock = Lock()
+        self._entradas: "OrderedDict[Tuple[str, bytes], Entrada]" = OrderedDict()
+        self._variantes: Dict[str, Set[bytes]] = {}
+        self._generaciones: Dict[str, int] = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+        self.desalojos = 0
+
+    # ---------- lectura ------------------------------------------- #
+    def obtener(
+        self, recurso: str, variante: bytes = b"", version: Optional[int] = None
+    ) -> Optional[Entrada]:
+        """La entrada vigente; una de otra `version` cuenta como fallo y se descarta."""
+        with self._lock:
+            entrada = self._entradas.get((recurso, variante))
+            if (
+                entrada is None
+                or entrada.expira < time.monotonic()
+                or entrada.version != version
+            ):
+                if entrada is not None:
+                    self._quitar((recurso, variante))
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end((recurso, variante))
+            self.aciertos += 1
+            return entrada
+
+    def generacion(self, recurso: str) -> int:
+        with self._lock:
+            return self._generaciones.get(recurso, 0)
+
+    # ---------- escritura ----------------------------------------- #
+    def guardar(
+        self,
+        recurso: str,
+        variante: bytes,
+        cuerpo: bytes,
+        generacion: int,
+        version: Optional[int] = None,
+    ) -> Entrada:
+        """
+        Guarda (si la generación sigue vigente) y devuelve la entrada. El
+        ETag sale de `version` si la hay; si no, del hash del cuerpo.
+        """
+        if version is None:
+            etag = hashlib.sha1(cuerpo).hexdigest()
+        else:
+            etag = etag_version(recurso, version, variante)
+        entrada = Entrada(cuerpo, etag, time.monotonic() + self.ttl, version)
+        with self._lock:
+            if self.max_entradas <= 0 or self._generaciones.get(recurso, 0) != generacion:
+                return entrada
+            clave = (recurso, variante)
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            self._variantes.setdefault(recurso, set()).add(variante)
+            while len(self._entradas) > self.max_entradas:
+                self._quitar(next(iter(self._entradas)))
+                self.desalojos += 1
+        return entrada
+
+    def invalidar(self, recursos: Iterable[str]) -> None:
+        with self._lock:
+            for recurso in recursos:
+                self._generaciones[recurso] = self._generaciones.get(recurso, 0) + 1
+                for variante in self._variantes.pop(recurso, ()):
+                    self._entradas.pop((recurso, variante), None)
+                self.invalidaciones += 1
+
+    def limpiar(self) -> None:
+        """Vacía la caché y pone a cero las estadísticas."""
+        with self._lock:
+            self._entradas.clear()
+            self._variantes.clear()
+            self._generaciones.clear()
+            self.aciertos = self.fallos = self.invalidaciones = self.desalojos = 0
+
+    def _quitar(self, clave: Tuple[str, bytes]) -> None:
+        self._entradas.pop(clave, None)
+        variantes = self._variantes.get(clave[0])
+        if variantes is not None:
+            variantes.discard(clave[1])
+            if not variantes:
+                del self._variantes[clave[0]]
+
+    # ---------- métricas ------------------------------------------ #
+    def estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "invalidaciones": self.invalidaciones,
+                "desalojos": self.desalojos,
+            }
+
+
+def cache_respuestas() -> CacheRespuestas:
+    """Caché asociada a la app actual."""
+    return current_app.extensions["cache_respuestas"]
@@ -0,0 +1,170 @@
+"""
+Group commit: un único hilo escritor aplica las mutaciones encoladas por
+peticiones concurrentes en lotes cortos, con UN commit (un fsync) por lote.
+
+- El lote se cierra al llegar a `max_lote` pedidos o a `espera` segundos
+  desde el primero; mientras el escritor confirma un lote, el siguiente
+  se va llenando solo.
+- El lote abre la transacción con BEGIN IMMEDIATE (toma el lock de
+  escritura de SQLite de entrada) y cada mutación corre en su SAVEPOINT:
+  si lanza, sólo se revierte la suya y su llamador recibe la excepción.
+- Quien encola se bloquea hasta que su lote se confirmó: una respuesta
+  nunca sale antes de que sus cambios sean durables. Si el commit falla,
+  todos los del lote reciben el error.
+- Si el escritor no toma el pedido en REINTENTO_PLAZO s, el pedido se
+  retira de la cola y el llamador recibe BaseOcupada (503). Si el hilo
+  escritor cae, sus pedidos sin respuesta fallan igual y el próximo
+  `ejecutar` arranca otro.
+
+Lo activa GRUPO_COMMIT (sólo con REPOSITORIO="sql"); data_handler encola
+las funciones marcadas con `_agrupable`.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as PlazoVencido
+from typing import Any, Callable, List, Optional
+
+from flask import Flask
+
+from src import db
+from src.repositorios import BaseOcupada, usar_repositorio
+from src.repositorios.sql import RepositorioSQL
+
+
+class _Pedido:
+    __slots__ = ("fn", "args", "kwargs", "futuro")
+
+    def __init__(self, fn: Callable, args, kwargs) -> None:
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.futuro: Future = Future()
+
+
+class ColaEscritura:
+    def __init__(self, app: Flask = None, max_lote: int = 64, espera: float = 0.002) -> None:
+        self.max_lote = max_lote
+        self.espera = espera
+        self._cola: "queue.Queue[Optional[_Pedido]]" = queue.Queue()
+        self._hilo: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.lotes = 0
+        self.operaciones = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        self.app = app
+        app.extensions["cola_escritura"] = self
+
+    # ---------- llamadores ---------------------------------------- #
+    def ejecutar(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Encola `fn(*args, **kwargs)` y espera a que su lote se confirme, a
+        lo sumo REINTENTO_PLAZO s (0 = sin plazo) para que el escritor lo tome.
+        """
+        self._arrancar()
+        pedido = _Pedido(fn, args, kwargs)
+        self._cola.put(pedido)
+        try:
+            return pedido.futuro.result(timeout=self.app.config["REINTENTO_PLAZO"] or None)
+        except PlazoVencido:
+            if not pedido.futuro.cancel():
+                # Ya está en un lote: su resultado (o el error) llega seguro
+                return pedido.futuro.result()
+            raise BaseOcupada("Escritor ocupado, reintente más tarde")
+
+    def cerrar(self) -> None:
+        """Aplica lo pendiente y detiene el escritor."""
+        with self._lock:
+            hilo, self._hilo = self._hilo, None
+        if hilo is not None:
+            self._cola.put(None)
+            hilo.join()
+
+    def _arrancar(self) -> None:
+        with self._lock:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(
+                    target=self._bucle, name="cola-escritura", daemon=True
+                )
+                self._hilo.start()
+
+    # ---------- escritor ------------------------------------------ #
+    def _bucle(self) -> None:
+        lote: List[Optional[_Pedido]] = []
+        try:
+            with self.app.app_context():
+                while True:
+                    lote = self._juntar()
+                    if lote:
+                        self._aplicar(lote)
+                        db.session.remove()  # sin objetos de un lote a otro
+                    if len(lote) == 0 or lote[-1] is None:
+                        return
+        except BaseException as e:
+            self._caido(lote, e)
+            raise
+
+    def _caido(self, lote: List[Optional[_Pedido]], error: BaseException) -> None:
+        """
+        El escritor muere por un error fuera de las mutaciones: falla los
+        pedidos del lote que quedaron sin respuesta y suelta el hilo. Si ya
+        hay otros en la cola, arranca el reemplazo en el acto.
+        """
+        with self._lock:
+            if self._hilo is threading.current_thread():
+                self._hilo = None
+        for p in lote:
+            if p is not None and not p.futuro.done():
+                falla = BaseOcupada("Escritor caído, reintente más tarde")
+                falla.__cause__ = error
+                p.futuro.set_exception(falla)
+        if not self._cola.empty():
+            self._arrancar()
+
+    def _juntar(self) -> List[Optional[_Pedido]]:
+        """Hasta max_lote pedidos o `espera` s desde el primero; None = cerrar."""
+        primero = self._cola.get()
+        if primero is None:
+            return []
+        lote: List[Optional[_Pedido]] = [primero]
+        limite = time.monotonic() + self.espera
+        while len(lote) < self.max_lote:
+            try:
+                pedido = self._cola.get(timeout=max(limite - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            lote.append(pedido)
+            if pedido is None:
+                break
+        return lote
+
+    def _aplicar(self, lote: List[Optional[_Pedido]]) -> None:
+        # Los que su llamador retiró por plazo vencido no se aplican
+        pedidos = [p for p in lote if p is not None and p.futuro.set_running_or_notify_cancel()]
+        if not pedidos:
+            return
+        resultados: List[Any] = [None] * len(pedidos)
+        errores: List[Optional[BaseException]] = [None] * len(pedidos)
+        try:
+            with RepositorioSQL(db.session).transaccion():
+                db.session.connection().exec_driver_sql("BEGIN IMMEDIATE")
+                with usar_repositorio(RepositorioSQL(db.session, agrupada=True)):
+                    for i, p in enumerate(pedidos):
+                        try:
+                            resultados[i] = p.fn(*p.args, **p.kwargs)
+                        except Exception as e:
+                            errores[i] = e
+        except Exception as e:  # el commit del lote falló: nada quedó aplicado
+            errores = [e] * len(pedidos)
+
+        self.lotes += 1
+        self.operaciones += len(pedidos)
+        for p, resultado, error in zip(pedidos, resultados, errores):
+            if error is not None:
+                p.futuro.set_exception(error)
+            else:
+                p.futuro.set_result(resultado)
@@ -0,0 +1,81 @@
+"""
+Conexiones separadas para lecturas y escrituras (CONEXIONES_SEPARADAS).
+
+- Lecturas: cada petición GET/HEAD usa una sesión propia sobre un motor de
+  sólo lectura (PRAGMA query_only) con su pool de LECTURAS_POOL conexiones,
+  fijada con usar_repositorio. Una lectura larga no retiene conexiones del
+  motor principal ni compite con las escrituras por ellas.
+- Escrituras: siguen en `db` (motor principal), pero pasan de a una por
+  proceso: RepositorioSQL.transaccion toma `escritor` (espera hasta
+  ESCRITURA_ESPERA s) antes de empezar, así los hilos de un mismo worker
+  hacen cola aquí en vez de fallar contra el lock de SQLite.
+
+Sólo aplica con el repositorio SQL y una base en archivo; con el de memoria
+o una :memory: las peticiones siguen como siempre.
+"""
+
+from threading import Lock, RLock
+from typing import Dict, Optional
+
+from flask import Flask, current_app, g, request
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src import db
+from src.repositorios import usar_repositorio
+from src.repositorios.sql import RepositorioSQL
+
+LECTURA = frozenset(("GET", "HEAD"))
+
+
+class ConexionesSeparadas:
+    def __init__(self, app: Flask = None) -> None:
+        self.escritor = RLock()
+        self._lock = Lock()
+        self._motores: Dict[str, Optional[Engine]] = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["conexiones"] = self
+        self.espera = app.config["ESCRITURA_ESPERA"]
+        app.before_request(self._abrir_lectura)
+        app.teardown_request(_cerrar_lectura)
+
+    def motor_lectura(self) -> Optional[Engine]:
+        """Motor de sólo lectura de la base actual (uno por URI, creado al usarlo)."""
+        uri = current_app.config["SQLALCHEMY_DATABASE_URI"]
+        with self._lock:
+            if uri not in self._motores:
+                self._motores[uri] = db.crear_motor_lectura(current_app)
+            return self._motores[uri]
+
+    def cerrar(self) -> None:
+        """Cierra las conexiones de los motores de lectura."""
+        with self._lock:
+            motores, self._motores = self._motores, {}
+        for motor in motores.values():
+            if motor is not None:
+                motor.dispose()
+
+    # ---------- hooks de Flask ------------------------------------ #
+    def _abrir_lectura(self) -> None:
+        if request.method not in LECTURA:
+            return
+        if not isinstance(current_app.extensions["repositorio"], RepositorioSQL):
+            return
+        motor = self.motor_lectura()
+        if motor is None:
+            return
+        sesion = Session(bind=motor)
+        fijado = usar_repositorio(RepositorioSQL(sesion))
+        fijado.__enter__()
+        g.lectura = (fijado, sesion)
+
+
+def _cerrar_lectura(_exc=None) -> None:
+    estado = g.pop("lectura", None)
+    if estado is not None:
+        fijado, sesion = estado
+        sesion.close()
+        fijado.__exit__(None, None, None)
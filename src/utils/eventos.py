@@ -0,0 +1,32 @@
+"""
+Aviso de eventos nuevos del feed de cambios a los streams SSE del proceso.
+
+data_handler llama a `avisar()` tras confirmar una transacción con eventos;
+GET /changes/stream espera con `esperar()` en lugar de consultar la BD sin
+pausa. Los eventos escritos por otros procesos no avisan: el stream vuelve
+a consultar igual cada CAMBIOS_SONDEO segundos.
+"""
+
+from threading import Condition
+
+from flask import current_app
+
+
+class AvisoEventos:
+    def __init__(self) -> None:
+        self._cond = Condition()
+        self.generacion = 0  # cuántos avisos van; se lee ANTES de consultar
+
+    def avisar(self) -> None:
+        with self._cond:
+            self.generacion += 1
+            self._cond.notify_all()
+
+    def esperar(self, generacion: int, timeout: float) -> bool:
+        """Hasta que haya un aviso posterior a `generacion` o pase `timeout`."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.generacion != generacion, timeout)
+
+
+def aviso_eventos() -> AvisoEventos:
+    return current_app.extensions["aviso_eventos"]
@@ -0,0 +1,214 @@
+"""
+Respuestas de peticiones con cabecera Idempotency-Key (LRU acotada + TTL).
+
+Un cliente que reintenta un POST tras un timeout manda la misma clave; si
+la primera petición ya terminó, el reintento recibe la respuesta guardada
+sin pasar por la capa de servicio. La clave se guarda junto con método y
+ruta, y con la huella (sha256) del cuerpo: la misma clave con otro cuerpo
+es un error del cliente (ValueError → 422).
+
+Mientras una petición con cierta clave está en curso, un duplicado
+concurrente espera a que termine (hasta `espera` s; si no, PeticionEnCurso
+→ 409) y devuelve su respuesta. Si la primera falló sin guardar nada
+(status ≥ 500 o excepción), el que esperaba la ejecuta él mismo.
+
+Con `persistir` (IDEMPOTENCIA_SQL) las respuestas también se escriben en la
+tabla `idempotencia`, para que un reintento que cae en otro proceso las
+encuentre. La espera de duplicados en curso es sólo dentro del proceso, y
+la fila se escribe después del commit de la mutación: una caída entre ambos
+deja sin proteger ese reintento.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Event, Lock
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from src import db
+from src.models.idempotencia import idempotencia as tabla
+
+MAX_CLAVE = 255
+PURGA_CADA = 256  # escrituras en la tabla entre purgas de filas vencidas
+
+
+class Guardada(NamedTuple):
+    huella: str
+    status: int
+    cuerpo: bytes
+    tipo: Optional[str]
+    expira: float
+
+
+class PeticionEnCurso(Exception):
+    """Otra petición con la misma clave no terminó dentro de la espera."""
+
+
+def huella(cuerpo: bytes) -> str:
+    return hashlib.sha256(cuerpo).hexdigest()
+
+
+def clave_peticion(metodo: str, ruta: str, clave: str) -> str:
+    if not clave or len(clave) > MAX_CLAVE:
+        raise ValueError(f"Idempotency-Key debe tener entre 1 y {MAX_CLAVE} caracteres")
+    return f"{metodo} {ruta} {clave}"
+
+
+class AlmacenIdempotencia:
+    def __init__(
+        self, max_entradas: int = 10_000, ttl: float = 24 * 3600.0, persistir: bool = False
+    ) -> None:
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.persistir = persistir
+        self._lock = Lock()
+        self._entradas: "OrderedDict[str, Guardada]" = OrderedDict()
+        self._en_curso: Dict[str, Event] = {}
+        self._escrituras = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.esperas = 0
+        self.desalojos = 0
+
+    # ---------- reserva ------------------------------------------- #
+    def intentar(self, clave: str, huella_: str) -> Tuple[Optional[Guardada], Optional[Event]]:
+        """
+        (guardada, None): ya hay respuesta. (None, evento): otra petición con
+        la clave está en curso; esperar el evento y volver a intentar.
+        (None, None): la clave queda reservada para quien llama, que debe
+        terminar con `completar` o `soltar`.
+        """
+        with self._lock:
+            guardada = self._local(clave)
+            if guardada is None:
+                evento = self._en_curso.get(clave)
+                if evento is not None:
+                    self.esperas += 1
+                    return None, evento
+                self._en_curso[clave] = Event()
+        if guardada is None and self.persistir:
+            try:
+                guardada = self._leer_sql(clave)
+            except BaseException:
+                self.soltar(clave)  # si no, los reintentos esperarían para siempre
+                raise
+            if guardada is not None:
+                with self._lock:
+                    self._recordar(clave, guardada)
+                self.soltar(clave)
+        with self._lock:
+            if guardada is None:
+                self.fallos += 1
+                return None, None
+            self.aciertos += 1
+        if guardada.huella != huella_:
+            raise ValueError("Idempotency-Key ya usada con otro cuerpo de petición")
+        return guardada, None
+
+    def tomar(self, clave: str, huella_: str, espera: float) -> Optional[Guardada]:
+        """`intentar` que bloquea el hilo mientras haya un duplicado en curso."""
+        limite = time.monotonic() + espera
+        while True:
+            guardada, evento = self.intentar(clave, huella_)
+            if evento is None:
+                return guardada
+            if not evento.wait(max(0.0, limite - time.monotonic())):
+                raise PeticionEnCurso("Hay una petición con la misma Idempotency-Key en curso")
+
+    # ---------- cierre -------------------------------------------- #
+    def completar(
+        self, clave: str, huella_: str, status: int, cuerpo: bytes, tipo: Optional[str]
+    ) -> None:
+        """Guarda la respuesta (salvo status ≥ 500) y libera la reserva."""
+        try:
+            if status < 500:
+                guardada = Guardada(huella_, status, cuerpo, tipo, time.monotonic() + self.ttl)
+                if self.persistir:
+                    self._escribir_sql(clave, guardada)
+                with self._lock:
+                    self._recordar(clave, guardada)
+        finally:
+            self.soltar(clave)
+
+    def soltar(self, clave: str) -> None:
+        """Libera la reserva sin guardar nada y despierta a los que esperan."""
+        with self._lock:
+            evento = self._en_curso.pop(clave, None)
+        if evento is not None:
+            evento.set()
+
+    def limpiar(self) -> None:
+        """Vacía el almacén en proceso y pone a cero las estadísticas."""
+        with self._lock:
+            self._entradas.clear()
+            self.aciertos = self.fallos = self.esperas = self.desalojos = 0
+
+    # ---------- en proceso (con el lock tomado) ------------------- #
+    def _local(self, clave: str) -> Optional[Guardada]:
+        guardada = self._entradas.get(clave)
+        if guardada is None:
+            return None
+        if guardada.expira < time.monotonic():
+            del self._entradas[clave]
+            return None
+        self._entradas.move_to_end(clave)
+        return guardada
+
+    def _recordar(self, clave: str, guardada: Guardada) -> None:
+        if self.max_entradas <= 0:
+            return
+        self._entradas[clave] = guardada
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+            self.desalojos += 1
+
+    # ---------- tabla `idempotencia` ------------------------------ #
+    # Conexión propia (no la sesión de la petición): la mutación ya se
+    # confirmó y la respuesta tiene que quedar aunque la sesión se descarte
+    def _leer_sql(self, clave: str) -> Optional[Guardada]:
+        ahora = time.time()
+        with db.engine.connect() as conn:
+            c = tabla.c
+            fila = conn.execute(
+                select(c.huella, c.status, c.cuerpo, c.tipo, c.creado)
+                .where(c.clave == clave, c.creado >= ahora - self.ttl)
+            ).first()
+        if fila is None:
+            return None
+        restante = fila.creado + self.ttl - ahora
+        return Guardada(fila.huella, fila.status, fila.cuerpo, fila.tipo,
+                        time.monotonic() + restante)
+
+    def _escribir_sql(self, clave: str, guardada: Guardada) -> None:
+        ahora = time.time()
+        with db.engine.begin() as conn:
+            conn.execute(tabla.insert().prefix_with("OR REPLACE"), {
+                "clave": clave, "huella": guardada.huella, "status": guardada.status,
+                "cuerpo": guardada.cuerpo, "tipo": guardada.tipo, "creado": ahora,
+            })
+            with self._lock:
+                self._escrituras += 1
+                purgar = self._escrituras % PURGA_CADA == 0
+            if purgar:
+                conn.execute(tabla.delete().where(tabla.c.creado < ahora - self.ttl))
+
+    # ---------- métricas ------------------------------------------ #
+    def estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "en_curso": len(self._en_curso),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "esperas": self.esperas,
+                "desalojos": self.desalojos,
+            }
+
+
+def almacen_idempotencia() -> Optional[AlmacenIdempotencia]:
+    """Almacén asociado a la app actual (None si IDEMPOTENCIA_MAX es 0)."""
+    return current_app.extensions.get("idempotencia")
@@ -0,0 +1,143 @@
+"""
+Instrumentación por petición: nº de sentencias SQL, tiempo en BD y tiempo
+total del handler.
+
+- Eventos `before/after_cursor_execute` de SQLAlchemy acumulan en `flask.g`.
+- Hooks de Flask añaden la cabecera `Server-Timing` y alimentan histogramas
+  por ruta, que GET /metrics expone en formato de texto de Prometheus.
+"""
+
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Sequence, Tuple
+
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+BUCKETS_SEGUNDOS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BUCKETS_SENTENCIAS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+Etiquetas = Tuple[Tuple[str, str], ...]
+
+
+class Histograma:
+    def __init__(self, nombre: str, ayuda: str, buckets: Sequence[float]) -> None:
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.buckets = tuple(buckets)
+        self._series: Dict[Etiquetas, List[float]] = {}
+
+    def observar(self, etiquetas: Etiquetas, valor: float) -> None:
+        # serie = [conteo por bucket…, +Inf, suma]
+        serie = self._series.get(etiquetas)
+        if serie is None:
+            serie = self._series[etiquetas] = [0] * (len(self.buckets) + 1) + [0.0]
+        serie[bisect_left(self.buckets, valor)] += 1
+        serie[-1] += valor
+
+    def exportar(self) -> List[str]:
+        lineas = [
+            f"# HELP {self.nombre} {self.ayuda}",
+            f"# TYPE {self.nombre} histogram",
+        ]
+        for etiquetas, serie in sorted(self._series.items()):
+            base = ",".join(f'{k}="{v}"' for k, v in etiquetas)
+            acumulado = 0
+            for limite, n in zip(self.buckets + ("+Inf",), serie):
+                acumulado += n
+                lineas.append(f'{self.nombre}_bucket{{{base},le="{limite}"}} {acumulado}')
+            lineas.append(f"{self.nombre}_sum{{{base}}} {serie[-1]}")
+            lineas.append(f"{self.nombre}_count{{{base}}} {acumulado}")
+        return lineas
+
+
+class Metricas:
+    def __init__(self, app: Flask = None) -> None:
+        self._lock = Lock()
+        self.duracion = Histograma(
+            "http_request_duration_seconds",
+            "Tiempo total del handler por ruta.",
+            BUCKETS_SEGUNDOS,
+        )
+        self.tiempo_bd = Histograma(
+            "db_time_seconds",
+            "Tiempo en la BD por petición.",
+            BUCKETS_SEGUNDOS,
+        )
+        self.sentencias = Histograma(
+            "db_statements_per_request",
+            "Sentencias SQL emitidas por petición.",
+            BUCKETS_SENTENCIAS,
+        )
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["metricas"] = self
+        if not event.contains(Engine, "before_cursor_execute", _antes_de_sql):
+            event.listen(Engine, "before_cursor_execute", _antes_de_sql)
+            event.listen(Engine, "after_cursor_execute", _despues_de_sql)
+        app.before_request(_iniciar_peticion)
+        app.after_request(self._cerrar_peticion)
+
+    # ---------- hooks de Flask ------------------------------------ #
+    def _cerrar_peticion(self, response):
+        if "metricas_inicio" not in g:
+            return response
+        total = time.perf_counter() - g.metricas_inicio
+        regla = request.url_rule.rule if request.url_rule else "sin_ruta"
+        etiquetas = (("method", request.method), ("route", regla))
+        with self._lock:
+            self.duracion.observar(etiquetas, total)
+            self.tiempo_bd.observar(etiquetas, g.sql_tiempo)
+            self.sentencias.observar(etiquetas, g.sql_sentencias)
+
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={g.sql_tiempo * 1000:.2f};desc="{g.sql_sentencias} queries", '
+            f"app;dur={total * 1000:.2f}",
+        )
+        return response
+
+    # ---------- exportación --------------------------------------- #
+    def exportar(self) -> str:
+        with self._lock:
+            lineas = (
+                self.duracion.exportar()
+                + self.tiempo_bd.exportar()
+                + self.sentencias.exportar()
+            )
+        cache = current_app.extensions.get("cache_respuestas")
+        if cache is not None:
+            for clave, valor in cache.estadisticas().items():
+                tipo = "gauge" if clave == "entradas" else "counter"
+                nombre = f"cache_respuestas_{clave}" + ("_total" if tipo == "counter" else "")
+                lineas += [f"# TYPE {nombre} {tipo}", f"{nombre} {valor}"]
+        admision = current_app.extensions.get("admision")
+        if admision is not None:
+            lineas += admision.exportar()
+        return "\n".join(lineas) + "\n"
+
+
+def _iniciar_peticion() -> None:
+    g.metricas_inicio = time.perf_counter()
+    g.sql_sentencias = 0
+    g.sql_tiempo = 0.0
+
+
+def _antes_de_sql(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metricas_inicio = time.perf_counter()
+
+
+def _despues_de_sql(conn, cursor, statement, parameters, context, executemany):
+    inicio = getattr(context, "_metricas_inicio", None)
+    if inicio is not None and has_request_context() and "sql_sentencias" in g:
+        g.sql_sentencias += 1
+        g.sql_tiempo += time.perf_counter() - inicio
+
+
+def metricas() -> Metricas:
+    return current_app.extensions["metricas"]
@@ -0,0 +1,120 @@
+"""
+Perfilado bajo demanda de peticiones (cProfile), sin redesplegar.
+
+Se activa con PERFILADO_DIRECTORIO; sin él create_app no instala ningún
+hook (costo cero). Una petición corre bajo cProfile si:
+
+- trae la cabecera PERFILADO_CABECERA con el secreto PERFILADO_SECRETO,
+- cae en el muestreo PERFILADO_MUESTREO (fracción de 0 a 1), o
+- su ruta quedó "armada": una petición anterior a esa ruta tardó más de
+  PERFILADO_LENTAS s. Lo lento se detecta al terminar, así que se perfila
+  la siguiente; a lo sumo una captura automática por ruta cada
+  PERFILADO_PAUSA s.
+
+Cada captura se vuelca (formato pstats) en el directorio como
+<epoch_ms>_<método>_<ruta>_<status>_<ms>ms.prof y su nombre vuelve en la
+cabecera X-Perfil. Para leerla: python -m pstats <archivo>.
+"""
+
+import cProfile
+import hmac
+import os
+import random
+import re
+import time
+from threading import Lock
+from typing import Dict
+
+from flask import Flask, g, request
+
+
+class Perfilador:
+    def __init__(self, app: Flask = None) -> None:
+        self._lock = Lock()
+        self._armadas: Dict[str, float] = {}  # ruta → 0 (armada) o fin de la pausa
+        self.capturas = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["perfilador"] = self
+        # El mismo dict durante toda la vida de la app (se lee en cada
+        # petición, así los cambios en caliente aplican sin current_app)
+        self._config = app.config
+        os.makedirs(app.config["PERFILADO_DIRECTORIO"], exist_ok=True)
+        app.before_request(self._iniciar_peticion)
+        app.after_request(self._cerrar_peticion)
+        app.teardown_request(_detener)
+
+    # ---------- hooks de Flask ------------------------------------ #
+    # Sin perfil, el costo es un acceso a `g` por hook: cada acceso a un
+    # proxy de Flask (g, request, current_app) cuenta
+    def _iniciar_peticion(self) -> None:
+        perfil = None
+        if self._perfilar(self._config):
+            perfil = cProfile.Profile()
+            perfil.enable()
+        g.perfilado = (time.perf_counter(), perfil)
+
+    def _cerrar_peticion(self, response):
+        estado = g.pop("perfilado", None)
+        if estado is None:
+            return response
+        inicio, perfil = estado
+        if perfil is not None:
+            perfil.disable()
+        total = time.perf_counter() - inicio
+        config = self._config
+
+        if perfil is not None:
+            response.headers["X-Perfil"] = self._volcar(
+                perfil, config["PERFILADO_DIRECTORIO"], _regla(), response.status_code, total
+            )
+        elif config["PERFILADO_LENTAS"] is not None and total > config["PERFILADO_LENTAS"]:
+            regla = _regla()
+            with self._lock:
+                if self._armadas.get(regla, -1.0) < time.monotonic():
+                    self._armadas[regla] = 0.0
+        return response
+
+    # ---------- decisión y volcado -------------------------------- #
+    def _perfilar(self, config) -> bool:
+        secreto = config["PERFILADO_SECRETO"]
+        if secreto:
+            recibido = request.headers.get(config["PERFILADO_CABECERA"])
+            if recibido is not None and hmac.compare_digest(recibido, secreto):
+                return True
+        muestreo = config["PERFILADO_MUESTREO"]
+        if muestreo and random.random() < muestreo:
+            return True
+        if self._armadas and request.url_rule is not None:
+            regla = request.url_rule.rule
+            with self._lock:
+                if self._armadas.get(regla) == 0.0:
+                    # Desarmada: la próxima captura automática, tras la pausa
+                    self._armadas[regla] = time.monotonic() + config["PERFILADO_PAUSA"]
+                    return True
+        return False
+
+    def _volcar(self, perfil: cProfile.Profile, directorio: str, regla: str,
+                status: int, total: float) -> str:
+        ruta = re.sub(r"[^A-Za-z0-9]+", "_", regla).strip("_") or "raiz"
+        nombre = (
+            f"{int(time.time() * 1000)}_{request.method}_{ruta}_{status}_"
+            f"{total * 1000:.0f}ms.prof"
+        )
+        perfil.dump_stats(os.path.join(directorio, nombre))
+        with self._lock:
+            self.capturas += 1
+        return nombre
+
+
+def _regla() -> str:
+    return request.url_rule.rule if request.url_rule else "sin_ruta"
+
+
+def _detener(_exc=None) -> None:
+    """Detiene el perfil si la petición terminó sin pasar por after_request."""
+    estado = g.pop("perfilado", None)
+    if estado is not None and estado[1] is not None:
+        estado[1].disable()
@@ -0,0 +1,52 @@
+"""
+Transporte del volcado NDJSON (GET /export, POST /import, `flask exportar`
+/ `flask importar`): agrupar líneas en trozos, gzip en streaming y lectura
+por líneas. Memoria acotada: nunca se arma el volcado completo.
+
+El contenido (qué registros, en qué orden, cómo se validan) lo decide
+data_handler.exportar / data_handler.importar.
+"""
+
+import gzip
+import zlib
+from typing import BinaryIO, Iterable, Iterator
+
+TAM_TROZO = 64 * 1024  # bytes por escritura al socket / archivo
+
+
+def en_trozos(lineas: Iterable[str], tam: int = TAM_TROZO) -> Iterator[bytes]:
+    """Junta líneas hasta ~`tam` bytes: menos escrituras que una por línea."""
+    buffer, largo = [], 0
+    for linea in lineas:
+        dato = linea.encode()
+        buffer.append(dato)
+        largo += len(dato)
+        if largo >= tam:
+            yield b"".join(buffer)
+            buffer, largo = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def comprimir(trozos: Iterable[bytes]) -> Iterator[bytes]:
+    """gzip incremental (wbits=31 → cabecera gzip), trozo a trozo."""
+    compresor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for trozo in trozos:
+        salida = compresor.compress(trozo)
+        if salida:
+            yield salida
+    yield compresor.flush()
+
+
+def leer_lineas(flujo: BinaryIO, comprimido: bool = False) -> Iterator[bytes]:
+    """
+    Líneas de `flujo`, descomprimiendo gzip al vuelo si corresponde (un
+    gzip corrupto o truncado → ValueError, como cualquier entrada inválida).
+    """
+    if not comprimido:
+        yield from flujo
+        return
+    try:
+        yield from gzip.GzipFile(fileobj=flujo, mode="rb")
+    except (OSError, EOFError, zlib.error) as e:
+        raise ValueError(f"gzip inválido: {e}")
@@ -18,24 +18,40 @@ if str(ROOT_DIR) not in sys.path:
 # ------------------------------------------------------------------ #
 import pytest
 from src import db
+from src.repositorios import crear_repositorio
 import src.controller as ctrl           # ← aquí viven todos los @app.route
 
 app = ctrl.app                           # atajo legible
 
 # ------------------------------------------------------------------ #
-# 3. Fixture `client` para cada test
+# 3. Fixture `client` para cada test, con cada backend de repositorio
 # ------------------------------------------------------------------ #
-@pytest.fixture(scope="function")
-def client(tmp_path):
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "solo_sql: la prueba inspecciona SQL/SQLite; no aplica al repositorio en memoria"
+    )
+
+
+@pytest.fixture(scope="function", params=["sql", "memoria"])
+def client(request, tmp_path):
     """
     Crea una base de datos temporal por test y expone un test_client().
+    Con el parámetro "memoria" la capa de servicio usa RepositorioMemoria.
     """
+    if request.param == "memoria" and request.node.get_closest_marker("solo_sql"):
+        pytest.skip("sólo aplica al repositorio SQL")
+
     app.config.update(
         TESTING=True,
         SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path}/test.db",
     )
     with app.app_context():
         db.create_all()
+        app.extensions["cache_respuestas"].limpiar()  # la caché es por proceso
+        app.extensions["idempotencia"].limpiar()
+        original = app.extensions["repositorio"]
+        app.extensions["repositorio"] = crear_repositorio(request.param)
         yield app.test_client()
+        app.extensions["repositorio"] = original
         db.session.remove()
-        db.drop_all()
\ No newline at end of file
+        db.drop_all()
@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+
+import pytest
+
+from src import create_app
+from src.config import Config
+from src.utils.admision import Carril
+
+
+@pytest.fixture
+def app_limitada(monkeypatch):
+    """1 escritura a la vez con 1 lugar en cola; lecturas sin límite."""
+    monkeypatch.setattr(Config, "ADMISION_ESCRITURAS", 1)
+    monkeypatch.setattr(Config, "ADMISION_COLA_ESCRITURAS", 1)
+    monkeypatch.setattr(Config, "ADMISION_ESPERA_ESCRITURAS", 0.05)
+    app = create_app("desarrollo")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    bloqueo = threading.Event()
+    app.add_url_rule("/lenta", "lenta", lambda: (bloqueo.wait(5), "ok")[1], methods=["POST"])
+    app.bloqueo = bloqueo
+    app.add_url_rule("/leer", "leer", lambda: "ok")
+    app.add_url_rule("/metrics", "metrics", lambda: app.extensions["metricas"].exportar())
+    return app
+
+
+def _en_hilo(app, metodo, url):
+    resultado = []
+    hilo = threading.Thread(
+        target=lambda: resultado.append(app.test_client().open(url, method=metodo))
+    )
+    hilo.start()
+    return hilo, resultado
+
+
+def _esperar(condicion):
+    limite = time.monotonic() + 5
+    while not condicion():
+        assert time.monotonic() < limite
+        time.sleep(0.001)
+
+
+# ---------- CASOS --------------------------------------------------- #
+def test_desactivado_sin_hooks():
+    assert "admision" not in create_app("desarrollo").extensions
+
+
+def test_escrituras_se_descartan(app_limitada):
+    carril = app_limitada.extensions["admision"].carriles["escritura"]
+    client = app_limitada.test_client()
+
+    ocupada, primera = _en_hilo(app_limitada, "POST", "/lenta")
+    _esperar(lambda: carril.activas == 1)
+
+    # Lugar en la cola pero vence el plazo
+    resp = client.post("/lenta")
+    assert resp.status_code == 503 and resp.headers["Retry-After"] == "1"
+    assert resp.get_json() == {"error": "Servicio saturado (escritura: plazo_vencido)"}
+
+    # Cola llena: rechazo inmediato, sin esperar el plazo
+    carril.espera = 5.0
+    en_cola, segunda = _en_hilo(app_limitada, "POST", "/lenta")
+    _esperar(lambda: carril.en_cola == 1)
+    inicio = time.perf_counter()
+    resp = client.post("/lenta")
+    assert resp.status_code == 503 and time.perf_counter() - inicio < 0.5
+    assert resp.get_json()["error"].endswith("cola_llena)")
+
+    # Las lecturas no comparten el carril
+    assert client.get("/leer").status_code == 200
+
+    app_limitada.bloqueo.set()
+    ocupada.join(), en_cola.join()
+    assert primera[0].status_code == 200 and segunda[0].status_code == 200
+    assert carril.activas == 0 and carril.en_cola == 0
+
+    texto = client.get("/metrics").get_data(as_text=True)
+    assert 'admision_rechazadas_total{carril="escritura",motivo="cola_llena"} 1' in texto
+    assert 'admision_rechazadas_total{carril="escritura",motivo="plazo_vencido"} 1' in texto
+    assert 'admision_admitidas_total{carril="escritura"} 2' in texto
+    assert 'admision_en_cola{carril="escritura"} 0' in texto
+    assert 'admision_espera_seconds_count{carril="escritura"} 2' in texto
+
+
+def test_error_en_la_vista_libera_el_lugar(app_limitada):
+    app_limitada.add_url_rule("/falla", "falla", lambda: 1 / 0, methods=["POST"])
+    client = app_limitada.test_client()
+    for _ in range(3):
+        assert client.post("/falla").status_code == 500
+    assert app_limitada.extensions["admision"].carriles["escritura"].activas == 0
+
+
+def test_carril_atiende_la_cola():
+    carril = Carril("escritura", 1, cola=4, espera=5.0)
+    assert carril.entrar() is None
+    orden = []
+
+    def pedir(n):
+        assert carril.entrar() is None
+        orden.append(n)
+        carril.salir()
+
+    hilos = [threading.Thread(target=pedir, args=(n,)) for n in range(3)]
+    for hilo in hilos:
+        hilo.start()
+    _esperar(lambda: carril.en_cola == 3)
+    carril.salir()
+    for hilo in hilos:
+        hilo.join()
+    assert sorted(orden) == [0, 1, 2] and carril.activas == 0
@@ -0,0 +1,160 @@
+import json
+
+import pytest
+
+from src import data_handler as dh
+from tests.conftest import app, client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _get(client, url, code=200):
+    resp = client.get(url)
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _tarea(client, nombre, **extra):
+    return _post(client, "/tasks", {"nombre": nombre, "descripcion": ".", "usuario": "eva",
+                                    "rol": "infra", **extra}, 201)["id"]
+
+
+def _finalizar(client, *ids):
+    for i in ids:
+        _post(client, f"/tasks/{i}", {"estado": "EN_PROGRESO"}, 200)
+        _post(client, f"/tasks/{i}", {"estado": "FINALIZADA"}, 200)
+
+
+def _archivar(*args):
+    resultado = app.test_cli_runner().invoke(args=["archivar", *args])
+    assert resultado.exit_code == 0, resultado.output
+    return resultado.output.strip()
+
+
+@pytest.fixture
+def proyecto(client):
+    """
+    a ← b ← c (a, b finalizadas; c nueva), e nueva y d finalizada que pasa
+    a depender de e después de finalizar: d no puede archivarse mientras e
+    siga activa.
+    """
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    a = _tarea(client, "A", duracion=3)
+    b = _tarea(client, "B")
+    c = _tarea(client, "C", duracion=2)
+    d, e = _tarea(client, "D"), _tarea(client, "E")
+    _post(client, "/tasks/dependencies", [
+        {"tarea_id": b, "dependencytaskid": a, "accion": "adicionar"},
+        {"tarea_id": c, "dependencytaskid": b, "accion": "adicionar"},
+    ], 200)
+    _finalizar(client, a, b, d)
+    _post(client, f"/tasks/{d}/dependencies", {"dependencytaskid": e, "accion": "adicionar"}, 200)
+    return a, b, c, d, e
+
+
+# ---------- CASOS --------------------------------------------------- #
+def test_lecturas_transparentes(client, proyecto):
+    a, b, c, d, e = proyecto
+    antes = {
+        "a": _get(client, f"/tasks/{a}"),
+        "eva": _get(client, "/usuarios/mialias=eva"),
+        "pagina": _get(client, f"/usuarios/mialias=eva?cursor={a}&limit=2"),
+        "finalizadas": _get(client, "/usuarios/mialias=eva?estado=FINALIZADA&rol=infra"),
+        "resumen": _get(client, "/usuarios/eva/resumen"),
+    }
+
+    assert _archivar("--dias", "0") == (
+        "tareas: 2, asignaciones: 2, dependencias: 1, bloqueadas: 1"
+    )
+    assert _get(client, f"/tasks/{a}") == antes["a"]
+    assert _get(client, "/usuarios/mialias=eva") == antes["eva"]
+    assert _get(client, f"/usuarios/mialias=eva?cursor={a}&limit=2") == antes["pagina"]
+    assert _get(client, "/usuarios/mialias=eva?estado=FINALIZADA&rol=infra") == antes["finalizadas"]
+    assert [t["id"] for t in _get(client, "/usuarios/mialias=eva?estado=NUEVA")["tareas"]] == [c, e]
+    assert _get(client, "/usuarios/eva/resumen") == antes["resumen"]
+    assert app.test_cli_runner().invoke(args=["verificar-resumen"]).exit_code == 0
+
+    # El volcado incluye el archivo
+    tipos = [json.loads(linea)["tipo"] for linea in dh.exportar()][1:]
+    assert tipos.count("tarea") == 5 and tipos.count("dependencia") == 3
+
+
+def test_dependencia_archivada_cuenta_como_finalizada(client, proyecto):
+    a, b, c, d, e = proyecto
+    _archivar("--dias", "0")
+
+    assert [t["id"] for t in _get(client, "/tasks/ready")["tareas"]] == [c, e]
+    _finalizar(client, c)
+    assert _get(client, f"/tasks/{c}")["estado"] == "FINALIZADA"
+    assert _get(client, f"/tasks/{c}/upstream")["upstream"] == []
+    assert _get(client, "/schedule")["duracion_total"] == 0
+
+    # Las tareas archivadas ya no admiten cambios
+    _post(client, f"/tasks/{a}", {"estado": "NUEVA"}, 404)
+    _post(client, f"/tasks/{a}/duration", {"duracion": 1}, 404)
+    _post(client, f"/tasks/{c}/dependencies", {"dependencytaskid": a, "accion": "adicionar"}, 404)
+
+
+@pytest.mark.parametrize("en_lote", [False, True])
+def test_quitar_arista_hacia_archivada(client, proyecto, en_lote):
+    a, b, c, d, e = proyecto
+    _archivar("--dias", "0")
+
+    # c → b (archivada) sigue activa y se puede quitar; agregarla, no
+    _post(client, f"/tasks/{c}/dependencies", {"dependencytaskid": a, "accion": "remover"}, 422)
+    if en_lote:
+        quitada = _post(client, "/tasks/dependencies", [
+            {"tarea_id": c, "dependencytaskid": e, "accion": "adicionar"},
+            {"tarea_id": c, "dependencytaskid": b, "accion": "remover"},
+        ], 200)["tareas"][0]
+        assert quitada == {"tarea_id": c, "dependencias": [e]}
+    else:
+        assert _post(client, f"/tasks/{c}/dependencies",
+                     {"dependencytaskid": b, "accion": "remover"}, 200)["dependencias"] == []
+    _post(client, "/tasks/dependencies", [
+        {"tarea_id": c, "dependencytaskid": b, "accion": "adicionar"},
+    ], 404)
+    _post(client, "/tasks/dependencies", [
+        {"tarea_id": b, "dependencytaskid": c, "accion": "remover"},
+    ], 404)
+    pendientes = _get(client, f"/tasks/{c}?fields=dependencias_pendientes")
+    assert pendientes["dependencias_pendientes"] == (1 if en_lote else 0)
+
+
+def test_bloqueadas_se_archivan_despues(client, proyecto):
+    a, b, c, d, e = proyecto
+    _archivar("--dias", "0")
+    _finalizar(client, e)
+    # Orden topológico con lotes de 1: e se archiva antes que d
+    app.config["ARCHIVO_LOTE"] = 1
+    try:
+        assert dh.archivar(0) == {"tareas": 2, "asignaciones": 2, "dependencias": 1, "bloqueadas": 0}
+    finally:
+        app.config["ARCHIVO_LOTE"] = 500
+    assert dh.archivar(0)["tareas"] == 0
+    assert [t["estado"] for t in _get(client, "/usuarios/mialias=eva")["tareas"]] == [
+        "FINALIZADA", "FINALIZADA", "NUEVA", "FINALIZADA", "FINALIZADA",
+    ]
+
+
+def test_antiguedad_e_ids_no_reutilizados(client, proyecto):
+    a, b, c, d, e = proyecto
+    assert _archivar() == "tareas: 0, asignaciones: 0, dependencias: 0, bloqueadas: 0"
+    assert app.test_cli_runner().invoke(args=["archivar", "--dias", "-1"]).exit_code == 1
+
+    ultima = _tarea(client, "Última")
+    _finalizar(client, ultima)
+    _archivar("--dias", "0")
+    nueva = _tarea(client, "Nueva")
+    assert nueva > ultima
+    assert _get(client, f"/tasks/{ultima}")["nombre"] == "Última"
+    _get(client, "/tasks/999", 404)
@@ -0,0 +1,257 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from src import create_app, db
+from src import data_handler_async as dha
+from src.asgi import AppASGI
+from src.repositorios.memoria import RepositorioMemoria
+
+
+# ---------- helpers ------------------------------------------------- #
+@pytest.fixture(params=["desarrollo", "memoria"])
+def asgi(request, tmp_path):
+    """App ASGI sobre una app Flask nueva con BD temporal."""
+    flask_app = create_app(request.param)
+    flask_app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/asgi.db"
+    with flask_app.app_context():
+        db.create_all()
+        app = AppASGI(flask_app)
+        yield app
+        asyncio.run(dha.cerrar(flask_app))
+        db.session.remove()
+        db.drop_all()
+
+
+def _scope(metodo, ruta, cabeceras):
+    ruta, _, query = ruta.partition("?")
+    return {
+        "type": "http", "method": metodo, "path": ruta,
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in cabeceras],
+    }
+
+
+async def _llamar(app, metodo, ruta, cuerpo=b"", cabeceras=()):
+    scope = _scope(metodo, ruta, cabeceras)
+    recibidos = [{"type": "http.request", "body": cuerpo}]
+    enviados = []
+
+    async def receive():
+        if recibidos:
+            return recibidos.pop(0)
+        await asyncio.Event().wait()  # el cliente sigue conectado
+
+    async def send(mensaje):
+        enviados.append(mensaje)
+
+    await app(scope, receive, send)
+    inicio = enviados[0]
+    headers = {k.decode(): v.decode() for k, v in inicio["headers"]}
+    return inicio["status"], headers, b"".join(m.get("body", b"") for m in enviados[1:])
+
+
+async def _leer_sse(app, ruta, n, cabeceras=()):
+    """Lee `n` eventos de un stream SSE y se desconecta; devuelve sus `data`."""
+    suficiente = asyncio.Event()
+    recibidos = [{"type": "http.request", "body": b""}]
+    cuerpo = []
+
+    async def receive():
+        if recibidos:
+            return recibidos.pop(0)
+        await suficiente.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(mensaje):
+        cuerpo.append(mensaje.get("body", b""))
+        if b"".join(cuerpo).count(b"data: ") >= n:
+            suficiente.set()
+
+    await asyncio.wait_for(app(_scope("GET", ruta, cabeceras), receive, send), 10)
+    # La desconexión pudo cancelar una consulta en curso: que aiosqlite la
+    # entregue antes de que asyncio.run cierre este loop
+    await asyncio.sleep(0.1)
+    lineas = b"".join(cuerpo).decode().splitlines()
+    return [json.loads(linea[6:]) for linea in lineas if linea.startswith("data: ")]
+
+
+def _pedir(app, metodo, ruta, payload=None, cabeceras=()):
+    cuerpo = json.dumps(payload).encode() if payload is not None else b""
+    return asyncio.run(_llamar(app, metodo, ruta, cuerpo, cabeceras))
+
+
+def _post(app, ruta, payload, code):
+    status, _, cuerpo = _pedir(app, "POST", ruta, payload)
+    assert status == code, cuerpo
+    return json.loads(cuerpo)
+
+
+def _tarea(app, alias="eva"):
+    return _post(
+        app, "/tasks",
+        {"nombre": "T", "descripcion": ".", "usuario": alias, "rol": "infra"}, 201,
+    )["id"]
+
+
+# ---------- CASOS: MISMAS RUTAS Y ERRORES ------------------------- #
+def test_flujo_basico_y_errores(asgi):
+    _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    assert _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 422) == {
+        "error": "Alias ya registrado"
+    }
+    assert _post(asgi, "/tasks", {"nombre": "T", "descripcion": ".",
+                                  "usuario": "nadie", "rol": "infra"}, 404) == {
+        "error": "Usuario no encontrado"
+    }
+    t1, t2 = _tarea(asgi), _tarea(asgi)
+
+    _post(asgi, f"/tasks/{t2}/dependencies", {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+    ciclo = _post(asgi, f"/tasks/{t1}/dependencies",
+                  {"dependencytaskid": t2, "accion": "adicionar"}, 422)
+    assert ciclo == {"error": "La dependencia crearía un ciclo"}
+
+    _post(asgi, f"/tasks/{t2}", {"estado": "EN_PROGRESO"}, 200)
+    err = _post(asgi, f"/tasks/{t2}", {"estado": "FINALIZADA"}, 422)
+    assert err == {"error": f"Dependencias no finalizadas: [{t1}]"}
+
+    status, _, cuerpo = _pedir(asgi, "GET", f"/tasks/{t2}/upstream")
+    assert status == 200 and json.loads(cuerpo)["upstream"][0]["id"] == t1
+    assert _pedir(asgi, "GET", "/tasks/999")[0] == 404
+    assert _pedir(asgi, "GET", "/no/existe")[0] == 404
+    assert _pedir(asgi, "DELETE", "/tasks/ready")[0] == 405
+
+
+def test_etag_y_ndjson(asgi):
+    _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    ids = [_tarea(asgi) for _ in range(3)]
+
+    status, headers, _ = _pedir(asgi, "GET", f"/tasks/{ids[0]}")
+    assert status == 200
+    status, _, cuerpo = _pedir(asgi, "GET", f"/tasks/{ids[0]}",
+                               cabeceras=[("If-None-Match", headers["etag"])])
+    assert status == 304 and cuerpo == b""
+    # El ETag sale de la versión de la tarea: vale también sin la entrada en caché
+    asgi.flask_app.extensions["cache_respuestas"].limpiar()
+    status, _, _ = _pedir(asgi, "GET", f"/tasks/{ids[0]}",
+                          cabeceras=[("If-None-Match", headers["etag"])])
+    assert status == 304
+
+    status, headers, cuerpo = _pedir(asgi, "GET", "/usuarios/mialias=eva",
+                                     cabeceras=[("Accept", "application/x-ndjson")])
+    assert headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(linea)["id"] for linea in cuerpo.splitlines()] == ids
+    assert _pedir(asgi, "GET", "/usuarios/mialias=eva?rol=jefe")[0] == 422
+
+
+def test_bulk_parcial_207(asgi):
+    _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    res = _post(asgi, "/tasks/bulk", [
+        {"nombre": "A", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+        {"nombre": "B", "descripcion": ".", "usuario": "nadie", "rol": "infra"},
+    ], 207)["resultados"]
+    assert "id" in res[0] and res[1]["codigo"] == 404
+
+
+def test_feed_de_cambios_y_stream(asgi):
+    _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    t = _tarea(asgi)
+    _post(asgi, f"/tasks/{t}", {"estado": "EN_PROGRESO"}, 200)
+
+    status, _, cuerpo = _pedir(asgi, "GET", "/changes?since=1")
+    eventos = json.loads(cuerpo)["eventos"]
+    assert status == 200
+    assert [(e["seq"], e["operacion"]) for e in eventos] == [(2, "crear"), (3, "estado")]
+
+    sse = asyncio.run(_leer_sse(asgi, "/changes/stream", 2, [("Last-Event-ID", "1")]))
+    assert [e["seq"] for e in sse] == [2, 3]
+    assert _pedir(asgi, "GET", "/changes/stream?since=-1")[0] == 422
+
+
+def test_export_import(asgi):
+    _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    t1, t2 = _tarea(asgi), _tarea(asgi)
+    _post(asgi, f"/tasks/{t2}/dependencies", {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+
+    status, headers, plano = _pedir(asgi, "GET", "/export")
+    assert status == 200 and headers["content-type"] == "application/x-ndjson"
+    assert len(plano.splitlines()) == 1 + 1 + 2 + 2 + 1
+    status, _, comprimido = _pedir(asgi, "GET", "/export?gzip=1")
+    assert gzip.decompress(comprimido).splitlines()[1:] == plano.splitlines()[1:]
+    assert asyncio.run(_llamar(asgi, "POST", "/import", plano))[0] == 422  # base no vacía
+
+    repo = asgi.flask_app.extensions["repositorio"]
+    if isinstance(repo, RepositorioMemoria):
+        asgi.flask_app.extensions["repositorio"] = RepositorioMemoria()
+    else:
+        db.drop_all()
+        db.create_all()
+    status, _, cuerpo = asyncio.run(_llamar(asgi, "POST", "/import", comprimido,
+                                            [("Content-Type", "application/gzip")]))
+    assert status == 201, cuerpo
+    assert _pedir(asgi, "GET", "/export")[2].splitlines()[1:] == plano.splitlines()[1:]
+
+
+def test_duracion_y_camino_critico(asgi):
+    _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    t1, t2 = _tarea(asgi), _tarea(asgi)
+    _post(asgi, f"/tasks/{t2}/dependencies", {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+    _post(asgi, f"/tasks/{t1}/duration", {"duracion": 3}, 200)
+    _post(asgi, f"/tasks/{t2}/duration", {"duracion": -1}, 422)
+
+    status, _, cuerpo = _pedir(asgi, "GET", f"/tasks/{t2}/critical-path")
+    camino = json.loads(cuerpo)
+    assert status == 200
+    assert (camino["camino"], camino["duracion_total"], camino["sin_estimar"]) == ([t1, t2], 3, 1)
+    status, _, cuerpo = _pedir(asgi, "GET", "/schedule?criticas=1")
+    assert [t["id"] for t in json.loads(cuerpo)["tareas"]] == [t1, t2]
+    assert _pedir(asgi, "GET", "/tasks/999/critical-path")[0] == 404
+
+
+def test_idempotency_key(asgi):
+    _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    cuerpo = json.dumps({"nombre": "T", "descripcion": ".", "usuario": "eva", "rol": "infra"})
+    clave = [("Idempotency-Key", "k1")]
+
+    async def duplicados():
+        return await asyncio.gather(*[
+            _llamar(asgi, "POST", "/tasks", cuerpo.encode(), clave) for _ in range(3)
+        ])
+
+    respuestas = asyncio.run(duplicados())
+    assert {(status, c) for status, _, c in respuestas} == {(201, respuestas[0][2])}
+    assert sum("idempotent-replayed" in h for _, h, _ in respuestas) == 2
+    status, _, tareas = _pedir(asgi, "GET", "/usuarios/mialias=eva")
+    assert len(json.loads(tareas)["tareas"]) == 1
+
+    otro = cuerpo.replace('"T"', '"U"').encode()
+    assert asyncio.run(_llamar(asgi, "POST", "/tasks", otro, clave))[0] == 422
+
+
+def test_detalle_con_include(asgi):
+    _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    t1, t2 = _tarea(asgi), _tarea(asgi)
+    _post(asgi, f"/tasks/{t2}/dependencies", {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+
+    status, _, cuerpo = _pedir(asgi, "GET", f"/tasks/{t2}?include=dependencias&fields=nombre")
+    assert status == 200
+    assert json.loads(cuerpo) == {
+        "id": t2, "nombre": "T", "dependencias": [{"id": t1, "nombre": "T"}],
+    }
+    status, _, cuerpo = _pedir(asgi, "GET", f"/tasks?ids={t1},999&fields=id")
+    assert json.loads(cuerpo) == {"tareas": [{"id": t1}], "no_encontradas": [999]}
+    assert _pedir(asgi, "GET", f"/tasks/{t2}?include=otra")[0] == 422
+
+
+def test_detalle_con_pendientes_sin_cache(asgi):
+    _post(asgi, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    t1, t2 = _tarea(asgi), _tarea(asgi)
+    _post(asgi, f"/tasks/{t2}/dependencies", {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+    url = f"/tasks/{t2}?fields=dependencias_pendientes"
+    assert json.loads(_pedir(asgi, "GET", url)[2])["dependencias_pendientes"] == 1
+
+    _post(asgi, f"/tasks/{t1}", {"estado": "EN_PROGRESO"}, 200)
+    _post(asgi, f"/tasks/{t1}", {"estado": "FINALIZADA"}, 200)
+    assert json.loads(_pedir(asgi, "GET", url)[2])["dependencias_pendientes"] == 0
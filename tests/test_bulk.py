@@ -0,0 +1,95 @@
+import json
+
+from src.repositorios import repositorio
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _usuarios(client, *aliases):
+    for alias in aliases:
+        _post(client, "/usuarios", {"contacto": alias, "nombre": alias}, 201)
+
+
+# ---------- CASOS: IMPORTACIÓN MASIVA ------------------------------ #
+def test_bulk_todas_validas_con_dependencias(client):
+    _usuarios(client, "eva", "max")
+    lote = [
+        {"ref": "a", "nombre": "A", "descripcion": ".",
+         "asignaciones": [{"usuario": "eva", "rol": "programador"},
+                          {"usuario": "max", "rol": "pruebas"}]},
+        {"ref": "b", "nombre": "B", "descripcion": ".",
+         "usuario": "max", "rol": "infra", "dependencias": ["a"]},
+    ]
+    res = _post(client, "/tasks/bulk", lote, 201)["resultados"]
+    a, b = res[0]["id"], res[1]["id"]
+
+    assert repositorio().dependencias_directas([b]) == {b: [a]}
+    assert len(repositorio().asignaciones_de_tarea(a)) == 2
+    assert repositorio().obtener_tarea(b).dependencias_pendientes == 1
+
+    # las tareas siguen funcionando con la API unitaria
+    _post(client, f"/tasks/{a}/dependencies",
+          {"dependencytaskid": b, "accion": "adicionar"}, 422)  # ciclo
+
+
+def test_bulk_errores_por_item(client):
+    _usuarios(client, "eva")
+    lote = [
+        {"nombre": "ok", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+        {"nombre": "ghost", "descripcion": ".", "usuario": "ghost", "rol": "infra"},
+        {"nombre": "rol", "descripcion": ".", "usuario": "eva", "rol": "chef"},
+        {"descripcion": "sin nombre", "usuario": "eva", "rol": "infra"},
+        {"ref": "x", "nombre": "x", "descripcion": ".", "usuario": "ghost",
+         "rol": "infra"},
+        {"nombre": "hijo", "descripcion": ".", "usuario": "eva", "rol": "infra",
+         "dependencias": ["x"]},
+        {"ref": "c1", "nombre": "c1", "descripcion": ".", "usuario": "eva",
+         "rol": "infra", "dependencias": ["c2"]},
+        {"ref": "c2", "nombre": "c2", "descripcion": ".", "usuario": "eva",
+         "rol": "infra", "dependencias": ["c1"]},
+    ]
+    res = _post(client, "/tasks/bulk", lote, 207)["resultados"]
+
+    assert "id" in res[0]
+    assert [r.get("codigo") for r in res[1:]] == [404, 422, 422, 404, 422, 422, 422]
+    assert res[5]["error"] == "Depende de un item inválido del lote"
+    assert res[6]["error"] == "La dependencia crearía un ciclo"
+    assert repositorio().tareas_existentes(range(1, 10)) == {res[0]["id"]}
+
+
+def test_bulk_tipos_invalidos_por_item(client):
+    _usuarios(client, "eva")
+    base = {"descripcion": ".", "usuario": "eva", "rol": "infra"}
+    lote = [
+        {**base, "nombre": "ok", "ref": 1},
+        {**base, "nombre": None},
+        {**base, "nombre": "d", "descripcion": 7},
+        {**base, "nombre": "r", "ref": [1]},
+        {"nombre": "u", "descripcion": ".",
+         "asignaciones": [{"usuario": ["eva"], "rol": "infra"}]},
+        {**base, "nombre": "s", "dependencias": "ab"},
+        {**base, "nombre": "l", "dependencias": [[1]]},
+    ]
+    res = _post(client, "/tasks/bulk", lote, 207)["resultados"]
+
+    assert "id" in res[0]
+    assert [r.get("codigo") for r in res[1:]] == [422] * 6
+    assert res[1]["error"] == res[2]["error"] == "nombre y descripcion deben ser texto"
+    assert res[3]["error"] == "ref debe ser texto o entero"
+    assert res[4]["error"] == "usuario debe ser texto"
+    assert res[5]["error"] == res[6]["error"] == "dependencias debe ser una lista de referencias"
+    assert repositorio().tareas_existentes(range(1, 10)) == {res[0]["id"]}
+
+
+def test_bulk_requiere_lista(client):
+    _post(client, "/tasks/bulk", {"nombre": "A"}, 422)
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from src import db
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _tarea(client, nombre, descripcion, rol="infra"):
+    return _post(
+        client, "/tasks",
+        {"nombre": nombre, "descripcion": descripcion, "usuario": "eva", "rol": rol}, 201,
+    )["id"]
+
+
+def _buscar(client, query):
+    resp = client.get(f"/tasks/search?{query}")
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+
+def _ids(client, query):
+    return [t["id"] for t in _buscar(client, query)["tareas"]]
+
+
+# ---------- CASOS --------------------------------------------------- #
+def test_nombre_pesa_mas_que_descripcion(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    en_desc = _tarea(client, "Revisar logs", "Configurar el servidor de correo")
+    en_nombre = _tarea(client, "Servidor de correo", "Instalar paquetes")
+    _tarea(client, "Otra cosa", "Nada que ver")
+
+    assert _ids(client, "q=servidor") == [en_nombre, en_desc]
+    # Todas las palabras deben aparecer (en cualquiera de los dos campos)
+    assert _ids(client, "q=servidor+logs") == [en_desc]
+    assert _ids(client, "q=servidor+inexistente") == []
+
+
+def test_prefijos_mayusculas_y_acentos(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    tid = _tarea(client, "Migración de índices", "Búsqueda más rápida")
+
+    for q in ("migracion", "MIGRA", "indice", "busq", "Búsqueda", "rapida"):
+        assert _ids(client, f"q={q}") == [tid], q
+    # Los operadores de FTS5 se tratan como palabras, no como sintaxis
+    assert _ids(client, "q=NOT+migracion") == []
+    assert _ids(client, 'q="de"*') == [tid]
+
+
+def test_filtros_estado_y_rol(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    a = _tarea(client, "Deploy A", ".", rol="infra")
+    b = _tarea(client, "Deploy B", ".", rol="pruebas")
+    _post(client, f"/tasks/{b}", {"estado": "EN_PROGRESO"}, 200)
+
+    assert _ids(client, "q=deploy") == [a, b]
+    assert _ids(client, "q=deploy&estado=EN_PROGRESO") == [b]
+    assert _ids(client, "q=deploy&rol=infra") == [a]
+    assert _ids(client, "q=deploy&rol=infra&estado=EN_PROGRESO") == []
+
+
+def test_paginacion_por_offset(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    ids = [_tarea(client, f"Informe {i}", ".") for i in range(5)]
+
+    vistos, offset = [], 0
+    while offset is not None:
+        pagina = _buscar(client, f"q=informe&limit=2&offset={offset}")
+        assert pagina["q"] == "informe"
+        vistos += [t["id"] for t in pagina["tareas"]]
+        offset = pagina["siguiente"]
+    assert vistos == ids  # mismo puntaje: desempata por id
+
+
+@pytest.mark.parametrize("query", [
+    "", "q=", "q=+-*", "q=a&limit=0", "q=a&limit=1001", "q=a&offset=-1",
+    "q=a&estado=X", "q=a&rol=jefe",
+])
+def test_parametros_invalidos(client, query):
+    assert client.get(f"/tasks/search?{query}").status_code == 422
+
+
+@pytest.mark.solo_sql
+def test_triggers_mantienen_el_indice(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    tid = _tarea(client, "Alfa", "Primera versión")
+
+    db.session.execute(
+        db.text("UPDATE tarea SET nombre = 'Beta', descripcion = '.' WHERE id = :id"),
+        {"id": tid},
+    )
+    db.session.commit()
+    assert _ids(client, "q=alfa") == []
+    assert _ids(client, "q=beta") == [tid]
+
+    db.session.execute(db.text("DELETE FROM asignacion"))
+    db.session.execute(db.text("DELETE FROM tarea"))
+    db.session.commit()
+    assert _ids(client, "q=beta") == []
@@ -0,0 +1,132 @@
+import json
+
+from sqlalchemy import event
+
+from src import db
+from src.controller import app
+from src.utils.cache import CacheRespuestas
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _tarea(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    return _post(
+        client,
+        "/tasks",
+        {"nombre": "A", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+        201,
+    )["id"]
+
+
+def _sentencias(pedir):
+    """SQL que ejecuta `pedir()` (ninguna con el repositorio en memoria)."""
+    sentencias = []
+
+    def contar(*args):
+        sentencias.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", contar)
+    try:
+        return pedir(), sentencias
+    finally:
+        event.remove(db.engine, "before_cursor_execute", contar)
+
+
+# ---------- CASOS: ETAG Y CACHÉ ------------------------------------ #
+def test_etag_304_con_una_consulta_indexada(client):
+    tid = _tarea(client)
+    primera = client.get(f"/tasks/{tid}")
+    etag = primera.headers["ETag"]
+    assert primera.get_json()["estado"] == "NUEVA"
+
+    resp, sentencias = _sentencias(
+        lambda: client.get(f"/tasks/{tid}", headers={"If-None-Match": etag})
+    )
+    assert resp.status_code == 304 and resp.headers["ETag"] == etag
+    assert len(sentencias) <= 1 and all("FROM evento" in q for q in sentencias)
+
+    stats = client.get("/cache/stats").get_json()
+    assert stats["aciertos"] == 1 and stats["fallos"] == 1
+
+
+def test_etag_304_sin_la_entrada_en_cache(client):
+    """Otro worker (o la entrada vencida): el 304 sale de la versión, sin leer la tarea."""
+    tid = _tarea(client)
+    etag = client.get(f"/tasks/{tid}?fields=nombre").headers["ETag"]
+    app.extensions["cache_respuestas"].limpiar()
+
+    resp, sentencias = _sentencias(
+        lambda: client.get(f"/tasks/{tid}?fields=nombre", headers={"If-None-Match": etag})
+    )
+    assert resp.status_code == 304 and resp.headers["ETag"] == etag
+    assert all("FROM tarea" not in q for q in sentencias)
+    # Cada variante tiene su propio ETag
+    assert client.get(f"/tasks/{tid}").headers["ETag"] != etag
+
+
+def test_mutacion_en_otro_proceso_no_sirve_la_entrada_vieja(client, monkeypatch):
+    tid = _tarea(client)
+    etag = client.get(f"/tasks/{tid}").headers["ETag"]
+
+    # Con la caché de otro proceso: la de este no se entera de la invalidación
+    with monkeypatch.context() as m:
+        m.setitem(app.extensions, "cache_respuestas", CacheRespuestas())
+        _post(client, f"/tasks/{tid}", {"estado": "EN_PROGRESO"}, 200)
+
+    resp = client.get(f"/tasks/{tid}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200 and resp.get_json()["estado"] == "EN_PROGRESO"
+    assert resp.headers["ETag"] != etag
+
+
+def test_mutaciones_invalidan(client):
+    tid = _tarea(client)
+    etag = client.get(f"/tasks/{tid}").headers["ETag"]
+    lista = client.get("/usuarios/mialias=eva").headers["ETag"]
+
+    _post(client, f"/tasks/{tid}", {"estado": "EN_PROGRESO"}, 200)
+    resp = client.get(f"/tasks/{tid}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200 and resp.get_json()["estado"] == "EN_PROGRESO"
+    resp = client.get("/usuarios/mialias=eva", headers={"If-None-Match": lista})
+    assert resp.status_code == 200
+    assert resp.get_json()["tareas"][0]["estado"] == "EN_PROGRESO"
+
+    _post(client, "/usuarios", {"contacto": "max", "nombre": "Max"}, 201)
+    assert client.get("/usuarios/mialias=max").get_json()["tareas"] == []
+    _post(client, f"/tasks/{tid}/users",
+          {"usuario": "max", "rol": "pruebas", "accion": "adicionar"}, 200)
+    assert [t["id"] for t in client.get("/usuarios/mialias=max").get_json()["tareas"]] == [tid]
+
+
+def test_404_no_se_cachea(client):
+    assert client.get("/tasks/1").status_code == 404
+    tid = _tarea(client)
+    assert client.get(f"/tasks/{tid}").status_code == 200
+
+
+# ---------- CASOS: CacheRespuestas --------------------------------- #
+def test_lru_ttl_y_generacion():
+    cache = CacheRespuestas(max_entradas=2, ttl=60)
+    for r in ("a", "b", "c"):
+        cache.guardar(r, b"", r.encode(), cache.generacion(r))
+    assert cache.obtener("a") is None and cache.obtener("c").cuerpo == b"c"
+    assert cache.estadisticas()["desalojos"] == 1
+
+    gen = cache.generacion("d")
+    cache.invalidar(["d"])  # una escritura llegó mientras se cargaba "d"
+    cache.guardar("d", b"", b"viejo", gen)
+    assert cache.obtener("d") is None
+
+    vencida = CacheRespuestas(ttl=-1)
+    vencida.guardar("x", b"", b"x", 0)
+    assert vencida.obtener("x") is None
@@ -0,0 +1,151 @@
+import json
+
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _tarea(client, nombre):
+    return _post(
+        client, "/tasks",
+        {"nombre": nombre, "descripcion": ".", "usuario": "eva", "rol": "infra"}, 201,
+    )["id"]
+
+
+def _eventos(client, since=0):
+    return client.get(f"/changes?since={since}&limit=1000").get_json()["eventos"]
+
+
+def _leer_sse(resp, n):
+    """Los primeros `n` mensajes del stream (sin latidos) como dicts."""
+    mensajes, buffer = [], ""
+    for trozo in resp.response:
+        buffer += trozo.decode() if isinstance(trozo, bytes) else trozo
+        while "\n\n" in buffer:
+            bloque, buffer = buffer.split("\n\n", 1)
+            campos = dict(l.split(": ", 1) for l in bloque.splitlines() if not l.startswith(":"))
+            if "data" in campos:
+                mensajes.append(campos)
+        if len(mensajes) >= n:
+            break
+    resp.close()
+    return mensajes
+
+
+# ---------- CASOS: GET /changes ------------------------------------- #
+def test_cada_mutacion_agrega_eventos_en_orden(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    a = _tarea(client, "A")
+    b, c = [r["id"] for r in _post(client, "/tasks/bulk", [
+        {"ref": "b", "nombre": "B", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+        {"nombre": "C", "descripcion": ".", "usuario": "eva", "rol": "pruebas",
+         "dependencias": ["b"], "duracion": 2},
+    ], 201)["resultados"]]
+    _post(client, f"/tasks/{a}", {"estado": "EN_PROGRESO"}, 200)
+    _post(client, f"/tasks/{a}/users", {"usuario": "eva", "rol": "pruebas", "accion": "adicionar"}, 200)
+    _post(client, f"/tasks/{a}/dependencies", {"dependencytaskid": b, "accion": "adicionar"}, 200)
+    _post(client, "/tasks/dependencies", [
+        {"tarea_id": c, "dependencytaskid": b, "accion": "remover"},
+    ], 200)
+    _post(client, f"/tasks/{c}/duration", {"duracion": None}, 200)
+
+    eventos = _eventos(client)
+    assert [e["seq"] for e in eventos] == sorted({e["seq"] for e in eventos})
+    assert [(e["entidad"], e["id"], e["operacion"]) for e in eventos] == [
+        ("usuario", "eva", "crear"),
+        ("tarea", a, "crear"),
+        ("tarea", b, "crear"),
+        ("tarea", c, "crear"),
+        ("tarea", a, "estado"),
+        ("tarea", a, "usuarios"),
+        ("tarea", a, "dependencias"),
+        ("tarea", c, "dependencias"),
+        ("tarea", c, "duracion"),
+    ]
+    datos = [e["datos"] for e in eventos]
+    assert datos[3] == {
+        "id": c, "nombre": "C", "descripcion": ".", "duracion": 2, "estado": "NUEVA",
+        "usuarios": [{"usuario": "eva", "rol": "pruebas"}], "dependencias": [b],
+    }
+    assert datos[4] == {"estado": "EN_PROGRESO"}
+    assert len(datos[5]["usuarios"]) == 2
+    assert datos[6] == {"dependencias": [b]}
+    assert datos[7] == {"dependencias": []}
+    assert datos[8] == {"duracion": None}
+
+
+def test_mutacion_rechazada_no_deja_evento(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    a, b = _tarea(client, "A"), _tarea(client, "B")
+    _post(client, f"/tasks/{a}/dependencies", {"dependencytaskid": b, "accion": "adicionar"}, 200)
+    antes = _eventos(client)
+
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Otra"}, 422)
+    _post(client, f"/tasks/{a}", {"estado": "FINALIZADA"}, 422)
+    _post(client, f"/tasks/{b}/dependencies", {"dependencytaskid": a, "accion": "adicionar"}, 422)
+
+    assert _eventos(client) == antes
+
+
+def test_paginas_por_since(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    for i in range(4):
+        _tarea(client, f"T{i}")
+
+    vistos, since = [], 0
+    while True:
+        pagina = client.get(f"/changes?since={since}&limit=2").get_json()
+        if not pagina["eventos"]:
+            assert pagina["siguiente"] == since
+            break
+        vistos += pagina["eventos"]
+        since = pagina["siguiente"]
+    assert vistos == _eventos(client)
+    assert len(vistos) == 5
+
+    assert client.get("/changes?since=-1").status_code == 422
+    assert client.get("/changes?limit=0").status_code == 422
+
+
+# ---------- CASOS: GET /changes/stream ------------------------------ #
+def test_stream_reanuda_con_last_event_id(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    a, b = _tarea(client, "A"), _tarea(client, "B")
+    primero = _eventos(client)[0]["seq"]
+
+    resp = client.get(
+        "/changes/stream", headers={"Last-Event-ID": str(primero)}, buffered=False
+    )
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    mensajes = _leer_sse(resp, 2)
+
+    assert [int(m["id"]) for m in mensajes] == [primero + 1, primero + 2]
+    assert [m["event"] for m in mensajes] == ["tarea.crear", "tarea.crear"]
+    assert [json.loads(m["data"])["id"] for m in mensajes] == [a, b]
+
+
+def test_stream_sin_since_sigue_solo_lo_nuevo(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    a = _tarea(client, "A")
+
+    resp = client.get("/changes/stream", buffered=False)
+    _post(client, f"/tasks/{a}", {"estado": "EN_PROGRESO"}, 200)
+
+    (mensaje,) = _leer_sse(resp, 1)
+    assert mensaje["event"] == "tarea.estado"
+    assert json.loads(mensaje["data"])["datos"] == {"estado": "EN_PROGRESO"}
+
+
+def test_stream_last_event_id_invalido(client):
+    resp = client.get("/changes/stream", headers={"Last-Event-ID": "x"})
+    assert resp.status_code == 422
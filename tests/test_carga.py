@@ -0,0 +1,46 @@
+from collections import Counter
+
+from benchmarks.carga.generador import Forma, generar
+from benchmarks.carga.informe import comparar
+from benchmarks.carga.suite import correr
+from src.controller import app
+
+FORMA = Forma(usuarios=5, profundidad=3, ancho=20, fan_in=2, fan_out=3)
+
+
+# ---------- CASOS: GENERADOR, COMPARACIÓN Y CORRIDA ---------------- #
+def test_generador_reproducible_y_con_forma():
+    datos = generar(FORMA, semilla=7)
+    assert datos.tareas == generar(FORMA, semilla=7).tareas
+    assert datos.tareas != generar(FORMA, semilla=8).tareas
+
+    assert len(datos.tareas) == FORMA.tareas and len(datos.capas) == FORMA.profundidad
+    assert all(not t["dependencias"] for t in datos.tareas[:FORMA.ancho])
+    assert all(len(t["dependencias"]) <= FORMA.fan_in for t in datos.tareas)
+    assert max(Counter(d for _, d in datos.aristas).values()) <= FORMA.fan_out
+    assert all(d < t for t, d in datos.aristas)  # sólo hacia capas anteriores: un DAG
+
+
+def test_comparar_marca_regresiones():
+    def corrida(p95, ops, errores=0):
+        medida = {"p95_ms": p95, "p99_ms": p95, "ops_s": ops, "errores": errores}
+        return {"config": {"semilla": 0}, "resultados": {"prueba": {"x": medida}}}
+
+    base = corrida(10.0, 100.0)
+    assert comparar(corrida(11.0, 95.0), base, 0.25)["regresiones"] == []
+    marcadas = comparar(corrida(20.0, 50.0, errores=1), base, 0.25)["regresiones"]
+    assert {r["metrica"] for r in marcadas} == {"p95_ms", "p99_ms", "ops_s", "errores"}
+
+    otra = corrida(20.0, 50.0)
+    otra["config"]["semilla"] = 1
+    assert comparar(otra, base, 0.25)["aviso"]
+
+
+def test_todos_los_escenarios_sin_errores():
+    resultado = correr(app, ["prueba", "servicio"], FORMA, iteraciones=5, calentamiento=0)
+    for transporte, escenarios in resultado["resultados"].items():
+        assert escenarios, transporte
+        fallidos = {n: m["errores"] for n, m in escenarios.items() if m["errores"]}
+        assert fallidos == {}, transporte
+    assert "metrics" in resultado["resultados"]["prueba"]
+    assert "verificar_resumen" in resultado["resultados"]["servicio"]
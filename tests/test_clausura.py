@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from src.controller import app
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _diamante(client):
+    """t4 → (t2, t3) → t1, y t4 → t1 directo."""
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    t1, t2, t3, t4 = (
+        _post(
+            client,
+            "/tasks",
+            {"nombre": f"T{i}", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+            201,
+        )["id"]
+        for i in range(4)
+    )
+    for tarea, dep in ((t2, t1), (t3, t1), (t4, t2), (t4, t3), (t4, t1)):
+        _post(client, f"/tasks/{tarea}/dependencies",
+              {"dependencytaskid": dep, "accion": "adicionar"}, 200)
+    return t1, t2, t3, t4
+
+
+def _distancias(resp, clave):
+    return {t["id"]: t["distancia"] for t in resp.get_json()[clave]}
+
+
+# ---------- CASOS: CLAUSURA TRANSITIVA ----------------------------- #
+def test_upstream_y_downstream_con_distancia_minima(client):
+    t1, t2, t3, t4 = _diamante(client)
+    up = client.get(f"/tasks/{t4}/upstream")
+    assert up.status_code == 200
+    assert _distancias(up, "upstream") == {t1: 1, t2: 1, t3: 1}
+
+    down = client.get(f"/tasks/{t1}/downstream")
+    assert _distancias(down, "downstream") == {t2: 1, t3: 1, t4: 1}
+    assert _distancias(client.get(f"/tasks/{t2}/downstream"), "downstream") == {t4: 1}
+
+
+def test_limite_de_profundidad_y_errores(client):
+    t1, t2, t3, t4 = _diamante(client)
+    _post(client, f"/tasks/{t4}/dependencies",
+          {"dependencytaskid": t1, "accion": "remover"}, 200)
+
+    assert _distancias(client.get(f"/tasks/{t4}/upstream"), "upstream") == {
+        t1: 2, t2: 1, t3: 1,
+    }
+    assert _distancias(client.get(f"/tasks/{t4}/upstream?depth=1"), "upstream") == {
+        t2: 1, t3: 1,
+    }
+    assert client.get(f"/tasks/{t4}/upstream?depth=0").status_code == 422
+    assert client.get("/tasks/999/upstream").status_code == 404
+
+
+@pytest.mark.solo_sql
+def test_deteccion_de_ciclos_en_bd(client):
+    app.config["CICLOS_EN_BD"] = True
+    try:
+        t1, t2, t3, t4 = _diamante(client)
+        _post(client, f"/tasks/{t1}/dependencies",
+              {"dependencytaskid": t4, "accion": "adicionar"}, 422)  # ciclo
+        _post(client, f"/tasks/{t3}/dependencies",
+              {"dependencytaskid": t2, "accion": "adicionar"}, 200)  # no ciclo
+    finally:
+        app.config["CICLOS_EN_BD"] = False
@@ -0,0 +1,145 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src import create_app, db
+from src import data_handler as dh
+from src.config import Config
+from src.repositorios import BaseOcupada, hay_repositorio_fijado, repositorio
+from src.repositorios.sql import EscritorOcupado, RepositorioSQL
+
+
+@pytest.fixture
+def app_separada(tmp_path, monkeypatch):
+    """Lecturas/escritura separadas, WAL; SQLite falla en el acto ante el lock."""
+    monkeypatch.setattr(Config, "CONEXIONES_SEPARADAS", True)
+    app = create_app("desarrollo")
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path}/conexiones.db",
+        SQLALCHEMY_ENGINE_OPTIONS={"connect_args": {"timeout": 0}},
+        SQLITE_PRAGMAS={"journal_mode": "WAL"},
+    )
+    app.ruta_bd = str(tmp_path / "conexiones.db")
+    with app.app_context():
+        db.create_all()
+        dh.crear_usuario("eva", "Eva")
+        yield app
+        app.extensions["conexiones"].cerrar()
+        db.session.remove()
+        db.drop_all()
+
+
+def _bloquear(ruta, segundos):
+    """Toma el lock de escritura desde otra conexión y lo suelta a los `segundos`."""
+    externa = sqlite3.connect(ruta, check_same_thread=False)
+    externa.execute("BEGIN IMMEDIATE")
+    threading.Timer(segundos, externa.rollback).start()
+    return externa
+
+
+# ---------- CASOS --------------------------------------------------- #
+def test_get_usa_el_motor_de_solo_lectura(app_separada):
+    conexiones = app_separada.extensions["conexiones"]
+    with app_separada.test_request_context("/tasks/ready", method="GET"):
+        app_separada.preprocess_request()
+        repo = repositorio()
+        assert repo.sesion.bind is conexiones.motor_lectura()
+        assert repo.obtener_usuario("eva").nombre == "Eva"
+        with pytest.raises(OperationalError, match="readonly"):
+            repo.sesion.execute("INSERT INTO usuario (alias, nombre) VALUES ('x', 'X')")
+        app_separada.do_teardown_request()
+        assert not hay_repositorio_fijado()
+
+    with app_separada.test_request_context("/usuarios", method="POST"):
+        app_separada.preprocess_request()
+        assert repositorio() is app_separada.extensions["repositorio"]
+
+
+def test_bloqueo_pasajero_se_reintenta(app_separada):
+    _bloquear(app_separada.ruta_bd, 0.2)
+    inicio = time.perf_counter()
+    dh.crear_usuario("ana", "Ana")
+    assert time.perf_counter() - inicio >= 0.2
+    assert dh.tareas_de_usuario("ana")["nombre"] == "Ana"
+
+
+def test_plazo_vencido(app_separada):
+    app_separada.config["REINTENTO_PLAZO"] = 0.05
+    externa = _bloquear(app_separada.ruta_bd, 0.5)
+    with pytest.raises(BaseOcupada):
+        dh.crear_usuario("ana", "Ana")
+    externa.rollback()
+    with pytest.raises(LookupError):
+        dh.tareas_de_usuario("ana")
+
+    from src.controller import app as app_rest
+
+    with app_rest.test_request_context("/usuarios", method="POST"):
+        resp = app_rest.make_response(app_rest.handle_user_exception(BaseOcupada("x")))
+    assert resp.status_code == 503 and resp.headers["Retry-After"] == "1"
+    assert resp.get_json() == {"error": "x"}
+
+
+def test_bloqueo_tras_el_commit_no_repite_la_mutacion(app_separada, monkeypatch):
+    """Si una lectura posterior al commit se bloqueara, el reintento fallaría con 422."""
+    a = dh.crear_tarea("A", ".", "eva", "infra")["id"]
+    b = dh.crear_tarea("B", ".", "eva", "infra")["id"]
+
+    def fuera_de_transaccion_falla_una_vez(metodo):
+        original = getattr(RepositorioSQL, metodo)
+        fallas = [EscritorOcupado()]
+
+        def envoltura(self, *args):
+            if not self.sesion.info.get("en_transaccion") and fallas:
+                raise fallas.pop()
+            return original(self, *args)
+
+        monkeypatch.setattr(RepositorioSQL, metodo, envoltura)
+
+    for metodo in ("usuarios_asignados", "dependencias_directas"):
+        fuera_de_transaccion_falla_una_vez(metodo)
+    assert dh.cambiar_estado(a, "EN_PROGRESO")["estado"] == "EN_PROGRESO"
+    assert dh.gestionar_dependencia(b, a, "adicionar")["dependencias"] == [a]
+
+    for metodo in ("usuarios_asignados", "dependencias_directas"):
+        fuera_de_transaccion_falla_una_vez(metodo)
+    assert dh.cambiar_estados([{"id": a, "estado": "NUEVA"}])[0]["estado"] == "NUEVA"
+    lote = dh.gestionar_dependencias(
+        [{"tarea_id": b, "dependencytaskid": a, "accion": "remover"}]
+    )
+    assert lote["tareas"] == [{"tarea_id": b, "dependencias": []}]
+
+    # Un evento por mutación: ninguna se aplicó dos veces
+    assert [e[4] for e in repositorio().eventos_desde(0, 100)][-4:] == [
+        "estado", "dependencias", "estado", "dependencias",
+    ]
+    assert len(repositorio().eventos_desde(0, 100)) == 7
+
+
+def test_escritores_concurrentes_sin_errores(app_separada):
+    errores, hilos = [], []
+
+    def escritor():
+        with app_separada.app_context():
+            for _ in range(20):
+                try:
+                    dh.crear_tarea("T", ".", "eva", "infra")
+                except Exception as e:  # noqa: BLE001
+                    errores.append(e)
+            db.session.remove()
+
+    for _ in range(8):
+        hilos.append(threading.Thread(target=escritor))
+        hilos[-1].start()
+    with app_separada.test_request_context("/usuarios/mialias=eva", method="GET"):
+        app_separada.preprocess_request()
+        while any(h.is_alive() for h in hilos):
+            dh.tareas_de_usuario("eva", limite=10)  # lecturas en paralelo
+        app_separada.do_teardown_request()
+    for h in hilos:
+        h.join()
+    assert errores == []
+    assert dh.resumen_usuario("eva")["total"] == 160
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import inspect
+
+from src import create_app, db
+from src.repositorios import crear_repositorio
+
+
+def _pragma(conn, nombre):
+    return conn.exec_driver_sql(f"PRAGMA {nombre}").scalar()
+
+
+# ---------- CASOS: PERFILES DE CONFIGURACIÓN ----------------------- #
+def test_perfil_produccion_aplica_pragmas(tmp_path):
+    app = create_app("produccion")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/prod.db"
+    with app.app_context():
+        db.create_all()
+        with db.engine.connect() as conn:
+            assert _pragma(conn, "journal_mode") == "wal"
+            assert _pragma(conn, "synchronous") == 1  # NORMAL
+            assert _pragma(conn, "busy_timeout") == 5000
+            assert _pragma(conn, "cache_size") == -64 * 1024
+        db.session.remove()
+        db.drop_all()
+
+
+def test_perfil_desarrollo_sin_pragmas(tmp_path):
+    app = create_app("desarrollo")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/dev.db"
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert _pragma(conn, "journal_mode") == "delete"
+
+
+def test_indices_secundarios(tmp_path):
+    app = create_app()
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/idx.db"
+    with app.app_context():
+        db.create_all()
+        insp = inspect(db.engine)
+
+        def nombres(tabla):
+            return {i["name"] for i in insp.get_indexes(tabla)}
+
+        assert "ix_asignacion_tarea_id" in nombres("asignacion")
+        assert "ix_dependencia_depende_de_id" in nombres("dependencia")
+        assert {"ix_tarea_estado", "ix_tarea_pendientes_estado"} <= nombres("tarea")
+        db.drop_all()
+
+
+def test_perfil_desconocido():
+    with pytest.raises(ValueError):
+        create_app("marte")
+
+
+def test_perfil_memoria_usa_repositorio_en_memoria():
+    from src.repositorios.memoria import RepositorioMemoria
+    from src.repositorios.sql import RepositorioSQL
+
+    assert isinstance(create_app("memoria").extensions["repositorio"], RepositorioMemoria)
+    assert isinstance(create_app("desarrollo").extensions["repositorio"], RepositorioSQL)
+    with pytest.raises(ValueError):
+        crear_repositorio("redis")
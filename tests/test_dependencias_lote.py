@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from sqlalchemy import event
+
+from src import db
+from src.repositorios import repositorio
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _tareas(client, n):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    return [
+        _post(
+            client,
+            "/tasks",
+            {"nombre": f"T{i}", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+            201,
+        )["id"]
+        for i in range(n)
+    ]
+
+
+def _op(tarea, dep, accion="adicionar"):
+    return {"tarea_id": tarea, "dependencytaskid": dep, "accion": accion}
+
+
+# ---------- CASOS: UNA ARISTA, UNA CONEXIÓN ------------------------ #
+@pytest.mark.solo_sql
+def test_una_sola_conexion_y_respuesta_fresca(client):
+    t1, t2, t3 = _tareas(client, 3)
+    _post(client, f"/tasks/{t3}/dependencies",
+          {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+
+    conexiones = []
+
+    def checkout(*args):
+        conexiones.append(args)
+
+    event.listen(db.engine, "checkout", checkout)
+    try:
+        res = _post(client, f"/tasks/{t3}/dependencies",
+                    {"dependencytaskid": t2, "accion": "adicionar"}, 200)
+    finally:
+        event.remove(db.engine, "checkout", checkout)
+    assert len(conexiones) == 1
+    assert res["dependencias"] == [t1, t2]
+
+
+# ---------- CASOS: LOTE ATÓMICO ------------------------------------ #
+def test_lote_agrega_y_quita(client):
+    t1, t2, t3, t4 = _tareas(client, 4)
+    _post(client, f"/tasks/{t4}/dependencies",
+          {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+
+    res = _post(client, "/tasks/dependencies", [
+        _op(t2, t1), _op(t3, t2), _op(t4, t3), _op(t4, t1, "remover"),
+    ], 200)
+    assert res["operaciones"] == 4
+    assert {r["tarea_id"]: r["dependencias"] for r in res["tareas"]} == {
+        t2: [t1], t3: [t2], t4: [t3],
+    }
+    upstream = client.get(f"/tasks/{t4}/upstream").get_json()["upstream"]
+    assert {t["id"]: t["distancia"] for t in upstream} == {t3: 1, t2: 2, t1: 3}
+    assert repositorio().obtener_tarea(t4).dependencias_pendientes == 1
+
+
+def test_lote_con_ciclo_no_aplica_nada(client):
+    t1, t2, t3 = _tareas(client, 3)
+    # cada arista por separado es válida; juntas cierran t1 → t2 → t3 → t1
+    err = _post(client, "/tasks/dependencies", [
+        _op(t1, t2), _op(t2, t3), _op(t3, t1),
+    ], 422)
+    assert err["error"] == "El lote de dependencias crearía un ciclo"
+    assert repositorio().dependencias_directas([t1, t2, t3]) == {t1: [], t2: [], t3: []}
+
+
+def test_lote_errores_por_operacion(client):
+    t1, t2 = _tareas(client, 2)
+    err = _post(client, "/tasks/dependencies", [
+        _op(t2, t1), _op(t2, t1, "remover"), _op(t2, t1, "remover"),
+    ], 422)
+    assert err["error"] == "Operación 2: La dependencia no existe"
+    _post(client, "/tasks/dependencies", [_op(t2, 999)], 404)
+    _post(client, "/tasks/dependencies", [_op(t2, t2)], 422)
+    assert repositorio().dependencias_directas([t2]) == {t2: []}
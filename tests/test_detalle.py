@@ -0,0 +1,141 @@
+import json
+import re
+
+import pytest
+
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _get(client, url, code=200):
+    resp = client.get(url)
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _cadena(client, n):
+    """t[0] ← t[1] ← … ← t[n-1] (cada una depende de la anterior)."""
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    _post(client, "/usuarios", {"contacto": "leo", "nombre": "Leo"}, 201)
+    ids = [
+        _post(
+            client,
+            "/tasks",
+            {"nombre": f"T{i}", "descripcion": f"d{i}", "usuario": "eva", "rol": "infra"},
+            201,
+        )["id"]
+        for i in range(n)
+    ]
+    for anterior, tarea in zip(ids, ids[1:]):
+        _post(client, f"/tasks/{tarea}/dependencies",
+              {"dependencytaskid": anterior, "accion": "adicionar"}, 200)
+    return ids
+
+
+# ---------- CASOS: INCLUDE / DEPTH / FIELDS ------------------------- #
+def test_include_anida_relaciones(client):
+    t1, t2, t3 = _cadena(client, 3)
+    _post(client, f"/tasks/{t2}/users",
+          {"usuario": "leo", "rol": "pruebas", "accion": "adicionar"}, 200)
+
+    tarea = _get(client, f"/tasks/{t2}?include=asignaciones,dependencias,referenciada_por")
+    assert tarea["asignaciones"] == [
+        {"alias": "eva", "rol": "infra"}, {"alias": "leo", "rol": "pruebas"},
+    ]
+    assert tarea["dependencias"] == [
+        {"id": t1, "nombre": "T0", "estado": "NUEVA", "duracion": None},
+    ]
+    assert [t["id"] for t in tarea["referenciada_por"]] == [t3]
+    # Sin include, la respuesta de siempre
+    assert _get(client, f"/tasks/{t2}") == {
+        "id": t2, "nombre": "T1", "estado": "NUEVA", "duracion": None,
+    }
+
+
+def test_depth_y_fields(client):
+    t1, t2, t3, t4 = _cadena(client, 4)
+
+    tarea = _get(client, f"/tasks/{t4}?include=dependencias&depth=2&fields=id,descripcion")
+    assert tarea == {
+        "id": t4, "descripcion": "d3",
+        "dependencias": [{
+            "id": t3, "descripcion": "d2",
+            "dependencias": [{"id": t2, "descripcion": "d1"}],
+        }],
+    }
+    _get(client, f"/tasks/{t4}?include=dependencias&depth=0", 422)
+    _get(client, f"/tasks/{t4}?include=dependencias&depth=6", 422)
+    _get(client, f"/tasks/{t4}?include=hijos", 422)
+    _get(client, f"/tasks/{t4}?fields=finalizada_en", 422)
+    _get(client, "/tasks/999?include=dependencias", 404)
+
+
+def test_fields_con_pendientes_sigue_a_las_dependencias(client):
+    t1, t2 = _cadena(client, 2)
+    url = f"/tasks/{t2}?fields=dependencias_pendientes"
+    assert _get(client, url)["dependencias_pendientes"] == 1
+
+    _post(client, f"/tasks/{t1}", {"estado": "EN_PROGRESO"}, 200)
+    _post(client, "/tasks/estado", [{"id": t1, "estado": "FINALIZADA"}], 200)
+    assert _get(client, url)["dependencias_pendientes"] == 0
+
+    _post(client, f"/tasks/{t1}", {"estado": "NUEVA"}, 422)  # FINALIZADA no vuelve
+    assert _get(client, f"/tasks/{t2}?fields=nombre") == {"id": t2, "nombre": "T1"}
+
+
+def test_lote_por_ids(client):
+    t1, t2 = _cadena(client, 2)
+
+    lote = _get(client, f"/tasks?ids={t2},999,{t1},{t2}&include=dependencias&fields=nombre")
+    assert lote == {
+        "tareas": [
+            {"id": t2, "nombre": "T1", "dependencias": [{"id": t1, "nombre": "T0"}]},
+            {"id": t1, "nombre": "T0", "dependencias": []},
+        ],
+        "no_encontradas": [999],
+    }
+    _get(client, "/tasks", 422)
+    _get(client, "/tasks?ids=1,x", 422)
+    _get(client, "/tasks?ids=" + ",".join(str(i) for i in range(1, 102)), 422)
+
+
+@pytest.mark.solo_sql
+def test_consultas_acotadas_por_nivel(client):
+    """El nº de sentencias depende de depth e include, no de cuántas tareas haya."""
+    def sentencias(url):
+        resp = client.get(url)
+        assert resp.status_code == 200
+        return int(re.search(r'desc="(\d+) queries"', resp.headers["Server-Timing"]).group(1))
+
+    ids = _cadena(client, 3)
+    pocas = sentencias(f"/tasks?ids={','.join(map(str, ids))}&include=asignaciones,dependencias")
+    ids += _cadena_extra(client, 30)
+    muchas = sentencias(f"/tasks?ids={','.join(map(str, ids))}&include=asignaciones,dependencias")
+    assert muchas == pocas
+
+
+def _cadena_extra(client, n):
+    ids = [
+        _post(
+            client,
+            "/tasks",
+            {"nombre": f"X{i}", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+            201,
+        )["id"]
+        for i in range(n)
+    ]
+    _post(client, "/tasks/dependencies", [
+        {"tarea_id": tarea, "dependencytaskid": anterior, "accion": "adicionar"}
+        for anterior, tarea in zip(ids, ids[1:])
+    ], 200)
+    return ids
@@ -0,0 +1,77 @@
+import json
+
+from src.models.enums import EstadoEnum
+from src.repositorios import repositorio
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _tareas(client, n):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    return [
+        _post(
+            client,
+            "/tasks",
+            {"nombre": f"T{i}", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+            201,
+        )["id"]
+        for i in range(n)
+    ]
+
+
+# ---------- CASOS: CAMBIOS DE ESTADO POR LOTE ---------------------- #
+def test_lote_respeta_orden_de_dependencias(client):
+    t1, t2 = _tareas(client, 2)
+    _post(client, f"/tasks/{t2}/dependencies",
+          {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+
+    lote = [
+        {"id": t1, "estado": "EN_PROGRESO"},
+        {"id": t2, "estado": "EN_PROGRESO"},
+        {"id": t1, "estado": "FINALIZADA"},
+        {"id": t2, "estado": "FINALIZADA"},   # t1 ya cuenta como finalizada
+    ]
+    res = _post(client, "/tasks/estado", lote, 200)["resultados"]
+    assert [r["estado"] for r in res] == [
+        "EN_PROGRESO", "EN_PROGRESO", "FINALIZADA", "FINALIZADA",
+    ]
+    assert {e for e, _ in repositorio().estados([t1, t2]).values()} == {EstadoEnum.FINALIZADA}
+
+
+def test_lote_orden_inverso_falla_por_dependencia(client):
+    t1, t2 = _tareas(client, 2)
+    _post(client, f"/tasks/{t2}/dependencies",
+          {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+
+    lote = [
+        {"id": t1, "estado": "EN_PROGRESO"},
+        {"id": t2, "estado": "EN_PROGRESO"},
+        {"id": t2, "estado": "FINALIZADA"},   # t1 todavía no finalizada
+        {"id": t1, "estado": "FINALIZADA"},
+        {"id": 999, "estado": "EN_PROGRESO"},
+        {"id": t1, "estado": "CERRADA"},
+    ]
+    res = _post(client, "/tasks/estado", lote, 207)["resultados"]
+    assert res[2] == {
+        "indice": 2, "error": f"Dependencias no finalizadas: [{t1}]", "codigo": 422,
+    }
+    assert res[3]["estado"] == "FINALIZADA"
+    assert [res[4]["codigo"], res[5]["codigo"]] == [404, 422]
+    assert repositorio().obtener_tarea(t2).estado == EstadoEnum.EN_PROGRESO
+
+
+def test_lote_transicion_invalida(client):
+    (t1,) = _tareas(client, 1)
+    res = _post(client, "/tasks/estado",
+                [{"id": t1, "estado": "FINALIZADA"}], 207)["resultados"]
+    assert res[0]["error"] == "Transición de estado no permitida"
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from sqlalchemy import event
+
+from src import db
+from src.grafo import indice_dependencias
+from src.models.dependencia import dependencia
+from src.models.grafo_version import grafo_version
+from tests.conftest import client  # noqa: F401
+
+pytestmark = pytest.mark.solo_sql  # el índice es del repositorio SQL
+
+
+# ---------- helpers ------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _cadena(client, n):
+    """Crea n tareas encadenadas: t[i+1] depende de t[i]."""
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    ids = [
+        _post(
+            client,
+            "/tasks",
+            {"nombre": f"T{i}", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+            201,
+        )["id"]
+        for i in range(n)
+    ]
+    for previa, siguiente in zip(ids, ids[1:]):
+        _post(client, f"/tasks/{siguiente}/dependencies",
+              {"dependencytaskid": previa, "accion": "adicionar"}, 200)
+    return ids
+
+
+# ---------- CASOS: ÍNDICE EN MEMORIA ------------------------------- #
+def test_ciclo_profundo_sin_sql_por_nodo(client):
+    ids = _cadena(client, 30)
+    indice = indice_dependencias()
+    assert indice.alcanza(ids[-1], ids[0])
+
+    sentencias = []
+    motor = db.engine
+
+    def contar(conn, cursor, statement, *args):
+        sentencias.append(statement)
+
+    event.listen(motor, "before_cursor_execute", contar)
+    try:
+        _post(client, f"/tasks/{ids[0]}/dependencies",
+              {"dependencytaskid": ids[-1], "accion": "adicionar"}, 422)  # ciclo
+    finally:
+        event.remove(motor, "before_cursor_execute", contar)
+
+    # 2 gets de tareas + lectura de versión; nada proporcional a la cadena
+    assert not any("FROM dependencia" in s for s in sentencias)
+    assert len(sentencias) <= 4
+
+
+def test_remover_actualiza_indice(client):
+    t1, t2, t3 = _cadena(client, 3)
+    _post(client, f"/tasks/{t2}/dependencies",
+          {"dependencytaskid": t1, "accion": "remover"}, 200)
+    assert not indice_dependencias().alcanza(t3, t1)
+    _post(client, f"/tasks/{t1}/dependencies",
+          {"dependencytaskid": t3, "accion": "adicionar"}, 200)  # ya no es ciclo
+
+
+def test_indice_obsoleto_se_recarga(client):
+    t1, t2 = _cadena(client, 2)
+    indice = indice_dependencias()
+    reconstrucciones = indice.reconstrucciones
+
+    t3 = _post(
+        client,
+        "/tasks",
+        {"nombre": "T3", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+        201,
+    )["id"]
+    with db.engine.begin() as conn:  # escritura "externa" (t3 depende de t2)
+        conn.execute(dependencia.insert().values(tarea_id=t3, depende_de_id=t2))
+        conn.execute(
+            grafo_version.update().values(numero=grafo_version.c.numero + 1)
+        )
+
+    # t1 → t3 cerraría t1 → t3 → t2 → t1: sólo se detecta con el índice fresco
+    _post(client, f"/tasks/{t1}/dependencies",
+          {"dependencytaskid": t3, "accion": "adicionar"}, 422)
+    assert indice.reconstrucciones == reconstrucciones + 1
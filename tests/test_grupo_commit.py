@@ -0,0 +1,129 @@
+import json
+import threading
+
+import pytest
+
+from src import db
+from src.controller import app
+from src.models.usuario import Usuario
+from src.utils.cola_escritura import ColaEscritura
+from tests.conftest import client  # noqa: F401
+
+pytestmark = pytest.mark.solo_sql
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+@pytest.fixture
+def cola(client):
+    # Ventana amplia para que las peticiones concurrentes caigan en un lote
+    cola = ColaEscritura(app, max_lote=8, espera=0.2)
+    yield cola
+    cola.cerrar()
+    del app.extensions["cola_escritura"]
+
+
+def _en_paralelo(peticiones):
+    """Lanza cada (url, payload) desde su propio hilo; devuelve las respuestas."""
+    respuestas = [None] * len(peticiones)
+
+    def lanzar(i, url, payload):
+        respuestas[i] = app.test_client().post(url, json=payload)
+
+    hilos = [
+        threading.Thread(target=lanzar, args=(i, url, payload))
+        for i, (url, payload) in enumerate(peticiones)
+    ]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return respuestas
+
+
+def test_mutaciones_concurrentes_se_confirman_en_lotes(client, cola):
+    respuestas = _en_paralelo(
+        [("/usuarios", {"contacto": f"u{i}", "nombre": f"U{i}"}) for i in range(8)]
+    )
+
+    assert [r.status_code for r in respuestas] == [201] * 8
+    assert cola.operaciones == 8
+    assert cola.lotes < 8
+    # Al responder, ya es visible desde otra sesión
+    db.session.remove()
+    assert Usuario.query.count() == 8
+
+
+def test_error_de_uno_no_afecta_al_resto_del_lote(client, cola):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    tid = _post(
+        client, "/tasks",
+        {"nombre": "T", "descripcion": ".", "usuario": "eva", "rol": "infra"}, 201,
+    )["id"]
+    lotes = cola.lotes
+
+    respuestas = _en_paralelo([
+        ("/usuarios", {"contacto": "ana", "nombre": "Ana"}),
+        ("/usuarios", {"contacto": "ana", "nombre": "Otra"}),   # duplicado
+        (f"/tasks/{tid}", {"estado": "FINALIZADA"}),             # transición inválida
+        (f"/tasks/{tid}", {"estado": "EN_PROGRESO"}),
+        (f"/tasks/{tid}/users", {"usuario": "nadie", "rol": "infra", "accion": "adicionar"}),
+    ])
+
+    codigos = sorted(r.status_code for r in respuestas)
+    assert codigos == [200, 201, 404, 422, 422]
+    assert cola.lotes - lotes < 5
+    assert client.get(f"/tasks/{tid}").get_json()["estado"] == "EN_PROGRESO"
+    db.session.remove()
+    assert db.session.get(Usuario, "ana").nombre in ("Ana", "Otra")
+
+
+def test_cache_se_invalida_tras_el_commit_del_lote(client, cola):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    tid = _post(
+        client, "/tasks",
+        {"nombre": "T", "descripcion": ".", "usuario": "eva", "rol": "infra"}, 201,
+    )["id"]
+    assert client.get(f"/tasks/{tid}").get_json()["estado"] == "NUEVA"  # queda cacheada
+
+    _post(client, f"/tasks/{tid}", {"estado": "EN_PROGRESO"}, 200)
+
+    assert client.get(f"/tasks/{tid}").get_json()["estado"] == "EN_PROGRESO"
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_escritor_caido_responde_503_y_se_reemplaza(client, cola, monkeypatch):
+    aplicar = cola._aplicar
+    fallas = [RuntimeError("sesión rota")]
+
+    def aplicar_o_caer(lote):
+        if fallas:
+            raise fallas.pop()
+        aplicar(lote)
+
+    monkeypatch.setattr(cola, "_aplicar", aplicar_o_caer)
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 503)
+    _post(client, "/usuarios", {"contacto": "ana", "nombre": "Ana"}, 201)
+    db.session.remove()
+    assert [u.alias for u in Usuario.query.all()] == ["ana"]
+
+
+def test_plazo_vencido_retira_el_pedido(client, cola, monkeypatch):
+    monkeypatch.setitem(app.config, "REINTENTO_PLAZO", 0.05)
+    monkeypatch.setattr(cola, "_arrancar", lambda: None)  # nadie toma los pedidos
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 503)
+    monkeypatch.undo()
+
+    # El escritor encuentra el pedido retirado en la cola y no lo aplica
+    _post(client, "/usuarios", {"contacto": "ana", "nombre": "Ana"}, 201)
+    db.session.remove()
+    assert [u.alias for u in Usuario.query.all()] == ["ana"]
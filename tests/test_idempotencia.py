@@ -0,0 +1,146 @@
+import json
+import threading
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src import data_handler as dh
+from src.utils.idempotencia import AlmacenIdempotencia, PeticionEnCurso, huella
+from tests.conftest import app, client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code, clave=None):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+        headers={"Idempotency-Key": clave} if clave else {},
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp
+
+
+def _get(client, url, code=200):
+    resp = client.get(url)
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+TAREA = {"nombre": "T", "descripcion": ".", "usuario": "eva", "rol": "infra"}
+
+
+@pytest.fixture
+def eva(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    return client
+
+
+# ---------- CASOS: RUTAS ---------------------------------------------- #
+def test_reintento_no_duplica(eva, monkeypatch):
+    primera = _post(eva, "/tasks", TAREA, 201, clave="k1")
+    assert "Idempotent-Replayed" not in primera.headers
+
+    # El reintento no llega a la capa de servicio
+    monkeypatch.setattr(dh, "crear_tarea", lambda *a: pytest.fail("no debía ejecutarse"))
+    repetida = _post(eva, "/tasks", TAREA, 201, clave="k1")
+    assert repetida.headers["Idempotent-Replayed"] == "true"
+    assert repetida.get_json() == primera.get_json()
+    assert repetida.mimetype == "application/json"
+    monkeypatch.undo()
+
+    assert len(_get(eva, "/usuarios/mialias=eva")["tareas"]) == 1
+    # Sin clave u otra clave: petición nueva
+    _post(eva, "/tasks", TAREA, 201)
+    _post(eva, "/tasks", TAREA, 201, clave="k2")
+    assert len(_get(eva, "/usuarios/mialias=eva")["tareas"]) == 3
+
+
+def test_misma_clave_otro_cuerpo_o_ruta(eva):
+    t = _post(eva, "/tasks", TAREA, 201, clave="k").get_json()["id"]
+    err = _post(eva, "/tasks", {**TAREA, "nombre": "Otra"}, 422, clave="k").get_json()
+    assert err == {"error": "Idempotency-Key ya usada con otro cuerpo de petición"}
+    _post(eva, "/tasks", TAREA, 422, clave="x" * 256)
+
+    # La clave va con la ruta: en otra ruta es independiente
+    asignar = {"usuario": "eva", "rol": "pruebas", "accion": "adicionar"}
+    resp = _post(eva, f"/tasks/{t}/users", asignar, 200, clave="k")
+    assert "Idempotent-Replayed" not in resp.headers
+    resp = _post(eva, f"/tasks/{t}/users", asignar, 200, clave="k")
+    assert resp.headers["Idempotent-Replayed"] == "true"
+
+
+def test_errores_se_repiten(eva):
+    cuerpo = {"dependencytaskid": 999, "accion": "adicionar"}
+    _post(eva, "/tasks", TAREA, 201)
+    primera = _post(eva, "/tasks/1/dependencies", cuerpo, 404, clave="d")
+    repetida = _post(eva, "/tasks/1/dependencies", cuerpo, 404, clave="d")
+    assert repetida.headers["Idempotent-Replayed"] == "true"
+    assert repetida.get_json() == primera.get_json()
+
+
+# ---------- CASOS: ALMACÉN -------------------------------------------- #
+def test_duplicado_concurrente_espera():
+    almacen = AlmacenIdempotencia()
+    firma = huella(b"{}")
+    assert almacen.tomar("k", firma, 1.0) is None  # reservada
+
+    resultados = []
+    hilo = threading.Thread(target=lambda: resultados.append(almacen.tomar("k", firma, 5.0)))
+    hilo.start()
+    with pytest.raises(PeticionEnCurso):
+        almacen.tomar("k", firma, 0.01)
+    almacen.completar("k", firma, 201, b'{"id": 1}', "application/json")
+    hilo.join()
+    assert resultados[0].status == 201 and resultados[0].cuerpo == b'{"id": 1}'
+
+    # Si la primera falla sin guardar, el que espera pasa a ejecutarla
+    assert almacen.tomar("j", firma, 1.0) is None
+    hilo = threading.Thread(target=lambda: resultados.append(almacen.tomar("j", firma, 5.0)))
+    hilo.start()
+    almacen.completar("j", firma, 500, b"", None)
+    hilo.join()
+    assert resultados[1] is None
+    assert almacen.estadisticas()["en_curso"] == 1
+
+
+def test_lru_y_ttl():
+    almacen = AlmacenIdempotencia(max_entradas=2)
+    for clave in "abc":
+        almacen.tomar(clave, "h", 0)
+        almacen.completar(clave, "h", 200, clave.encode(), None)
+    assert almacen.estadisticas()["desalojos"] == 1
+    assert almacen.tomar("b", "h", 0).cuerpo == b"b"
+    assert almacen.tomar("a", "h", 0) is None  # desalojada: se vuelve a reservar
+
+    vencida = AlmacenIdempotencia(ttl=0.0)
+    vencida.tomar("a", "h", 0)
+    vencida.completar("a", "h", 200, b"a", None)
+    assert vencida.tomar("a", "h", 0) is None
+
+
+@pytest.mark.solo_sql
+def test_tabla_compartida_entre_procesos(eva):
+    """Dos almacenes con IDEMPOTENCIA_SQL ven las mismas respuestas."""
+    uno, otro = AlmacenIdempotencia(persistir=True), AlmacenIdempotencia(persistir=True)
+    assert uno.tomar("k", "h", 0) is None
+    uno.completar("k", "h", 201, b'{"id": 7}', "application/json")
+    guardada = otro.tomar("k", "h", 0)
+    assert (guardada.status, guardada.cuerpo) == (201, b'{"id": 7}')
+    with pytest.raises(ValueError):
+        otro.tomar("k", "otra", 0)
+
+
+def test_error_al_leer_la_tabla_libera_la_clave(monkeypatch):
+    almacen = AlmacenIdempotencia(persistir=True)
+
+    def ocupada(clave):
+        raise OperationalError("SELECT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(almacen, "_leer_sql", ocupada)
+    with pytest.raises(OperationalError):
+        almacen.tomar("k", "h", 0)
+    assert almacen.estadisticas()["en_curso"] == 0
+
+    monkeypatch.setattr(almacen, "_leer_sql", lambda clave: None)
+    assert almacen.tomar("k", "h", 0) is None  # el reintento reserva sin esperar
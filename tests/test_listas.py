@@ -0,0 +1,108 @@
+import json
+
+from src import db
+from src.controller import app
+from src.repositorios import repositorio
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _tareas(client, n):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    return [
+        _post(
+            client,
+            "/tasks",
+            {"nombre": f"T{i}", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+            201,
+        )["id"]
+        for i in range(n)
+    ]
+
+
+def _listas(client):
+    return [t["id"] for t in client.get("/tasks/ready").get_json()["tareas"]]
+
+
+def _pendientes(tid):
+    db.session.expire_all()
+    return repositorio().obtener_tarea(tid).dependencias_pendientes
+
+
+# ---------- CASOS: CONTADOR Y COLA DE LISTAS ----------------------- #
+def test_contador_sigue_aristas_y_finalizacion(client):
+    t1, t2, t3 = _tareas(client, 3)
+    for dep in (t1, t2):
+        _post(client, f"/tasks/{t3}/dependencies",
+              {"dependencytaskid": dep, "accion": "adicionar"}, 200)
+    assert _pendientes(t3) == 2
+    assert _listas(client) == [t1, t2]
+
+    _post(client, f"/tasks/{t1}", {"estado": "EN_PROGRESO"}, 200)
+    _post(client, f"/tasks/{t1}", {"estado": "FINALIZADA"}, 200)
+    assert _pendientes(t3) == 1
+
+    _post(client, f"/tasks/{t3}/dependencies",
+          {"dependencytaskid": t2, "accion": "remover"}, 200)
+    assert _pendientes(t3) == 0
+    assert _listas(client) == [t2, t3]
+
+    # agregar una dependencia ya finalizada no bloquea
+    _post(client, f"/tasks/{t2}/dependencies",
+          {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+    assert _pendientes(t2) == 0
+
+
+def test_lote_y_bulk_mantienen_contador(client):
+    t1, t2 = _tareas(client, 2)
+    _post(client, f"/tasks/{t2}/dependencies",
+          {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+    _post(client, "/tasks/estado", [
+        {"id": t1, "estado": "EN_PROGRESO"},
+        {"id": t1, "estado": "FINALIZADA"},
+    ], 200)
+    assert _pendientes(t2) == 0
+
+    res = _post(client, "/tasks/bulk", [
+        {"ref": "a", "nombre": "A", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+        {"nombre": "B", "descripcion": ".", "usuario": "eva", "rol": "infra",
+         "dependencias": ["a"]},
+    ], 201)["resultados"]
+    assert _pendientes(res[1]["id"]) == 1
+    assert res[1]["id"] not in _listas(client)
+
+
+def test_recalcular_pendientes(client):
+    t1, t2 = _tareas(client, 2)
+    _post(client, f"/tasks/{t2}/dependencies",
+          {"dependencytaskid": t1, "accion": "adicionar"}, 200)
+    for tid in (t1, t2):  # desfasar los contadores a mano
+        repositorio().obtener_tarea(tid).dependencias_pendientes = 7
+    db.session.commit()
+
+    salida = app.test_cli_runner().invoke(args=["recalcular-pendientes"])
+    assert "Contadores corregidos: 2" in salida.output
+    assert [_pendientes(t1), _pendientes(t2)] == [0, 1]
+
+
+def test_limite_de_listas(client):
+    ids = _tareas(client, 3)
+    resp = client.get("/tasks/ready?limit=2")
+    assert [t["id"] for t in resp.get_json()["tareas"]] == ids[:2]
+    resp = client.get("/tasks/ready?limit=abc")  # como si no viniera: LIMITE_PAGINA
+    assert [t["id"] for t in resp.get_json()["tareas"]] == ids
+
+    for limite in (-1, 0, 1001):
+        resp = client.get(f"/tasks/ready?limit={limite}")
+        assert resp.status_code == 422
+        assert resp.get_json() == {"error": "limit debe estar entre 1 y 1000"}
@@ -0,0 +1,44 @@
+import json
+import re
+
+import pytest
+
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp
+
+
+# ---------- CASOS: SERVER-TIMING Y /metrics ------------------------ #
+@pytest.mark.solo_sql
+def test_server_timing_cuenta_sentencias(client):
+    resp = _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    timing = resp.headers["Server-Timing"]
+    m = re.match(r'db;dur=[\d.]+;desc="(\d+) queries", app;dur=[\d.]+$', timing)
+    assert m and int(m.group(1)) >= 2  # SELECT del alias + INSERT
+
+    sin_bd = client.get("/cache/stats")
+    assert 'desc="0 queries"' in sin_bd.headers["Server-Timing"]
+
+
+def test_metrics_formato_prometheus(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    client.get("/usuarios/mialias=eva")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.mimetype == "text/plain"
+    texto = resp.get_data(as_text=True)
+    assert "# TYPE http_request_duration_seconds histogram" in texto
+    assert re.search(
+        r'db_statements_per_request_count\{method="POST",route="/usuarios"\} \d+', texto
+    )
+    assert 'route="/usuarios/mialias=<alias>",le="+Inf"' in texto
+    assert "cache_respuestas_fallos_total" in texto
@@ -0,0 +1,77 @@
+import json
+
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _preparar(client, n):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    ids = [
+        _post(
+            client,
+            "/tasks",
+            {"nombre": f"T{i}", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+            201,
+        )["id"]
+        for i in range(n)
+    ]
+    # segundo rol en la primera tarea: no debe duplicarla
+    _post(client, f"/tasks/{ids[0]}/users",
+          {"usuario": "eva", "rol": "pruebas", "accion": "adicionar"}, 200)
+    return ids
+
+
+# ---------- CASOS: PAGINACIÓN POR CURSOR --------------------------- #
+def test_paginas_por_cursor(client):
+    ids = _preparar(client, 5)
+    vistos, cursor = [], None
+    while True:
+        url = "/usuarios/mialias=eva?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        pagina = client.get(url).get_json()
+        vistos += [t["id"] for t in pagina["tareas"]]
+        cursor = pagina["siguiente"]
+        if cursor is None:
+            break
+    assert vistos == ids
+
+    # sin limit/cursor se mantiene la respuesta completa de siempre
+    completo = client.get("/usuarios/mialias=eva").get_json()
+    assert [t["id"] for t in completo["tareas"]] == ids and "siguiente" not in completo
+
+
+def test_filtros_estado_y_rol(client):
+    ids = _preparar(client, 3)
+    _post(client, f"/tasks/{ids[1]}", {"estado": "EN_PROGRESO"}, 200)
+
+    en_progreso = client.get("/usuarios/mialias=eva?estado=EN_PROGRESO").get_json()
+    assert [t["id"] for t in en_progreso["tareas"]] == [ids[1]]
+    pruebas = client.get("/usuarios/mialias=eva?rol=pruebas&limit=10").get_json()
+    assert [t["id"] for t in pruebas["tareas"]] == [ids[0]]
+    assert client.get("/usuarios/mialias=eva?rol=chef").status_code == 422
+    assert client.get("/usuarios/mialias=eva?limit=0").status_code == 422
+
+
+def test_streaming_ndjson(client):
+    ids = _preparar(client, 4)
+    resp = client.get(
+        "/usuarios/mialias=eva", headers={"Accept": "application/x-ndjson"}
+    )
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    filas = [json.loads(linea) for linea in resp.data.decode().splitlines()]
+    assert [f["id"] for f in filas] == ids
+
+    fantasma = client.get(
+        "/usuarios/mialias=ghost", headers={"Accept": "application/x-ndjson"}
+    )
+    assert fantasma.status_code == 404
@@ -0,0 +1,71 @@
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from src import create_app
+from src.config import Config
+
+
+def _lenta():
+    time.sleep(0.02)
+    return "ok", 201
+
+
+@pytest.fixture
+def app_perfilada(tmp_path, monkeypatch):
+    """App de create_app con el perfilado activo y una ruta de prueba."""
+    monkeypatch.setattr(Config, "PERFILADO_DIRECTORIO", str(tmp_path / "perfiles"))
+    app = create_app("desarrollo")
+    app.config["PERFILADO_SECRETO"] = "s3creto"
+    app.add_url_rule("/lenta/<int:n>", "lenta", lambda n: _lenta())
+    return app
+
+
+def _capturas(app):
+    return sorted(p.name for p in Path(app.config["PERFILADO_DIRECTORIO"]).iterdir())
+
+
+# ---------- CASOS --------------------------------------------------- #
+def test_desactivado_sin_hooks():
+    app = create_app("desarrollo")
+    assert "perfilador" not in app.extensions
+
+
+def test_cabecera_con_secreto(app_perfilada):
+    client = app_perfilada.test_client()
+    assert "X-Perfil" not in client.get("/lenta/1").headers
+    assert "X-Perfil" not in client.get("/lenta/1", headers={"X-Perfilar": "otro"}).headers
+
+    resp = client.get("/lenta/1", headers={"X-Perfilar": "s3creto"})
+    nombre = resp.headers["X-Perfil"]
+    assert _capturas(app_perfilada) == [nombre]
+    assert "_GET_lenta_int_n_201_" in nombre and nombre.endswith("ms.prof")
+
+    ruta = f"{app_perfilada.config['PERFILADO_DIRECTORIO']}/{nombre}"
+    funciones = {f[2] for f in pstats.Stats(ruta).stats}
+    assert "_lenta" in funciones
+
+
+def test_muestreo(app_perfilada):
+    client = app_perfilada.test_client()
+    app_perfilada.config["PERFILADO_MUESTREO"] = 1.0
+    for n in range(3):
+        client.get(f"/lenta/{n}")
+    client.get("/no-existe")
+    assert len(_capturas(app_perfilada)) == 4
+    assert sum("_sin_ruta_404_" in c for c in _capturas(app_perfilada)) == 1
+
+
+def test_lenta_arma_la_siguiente(app_perfilada):
+    client = app_perfilada.test_client()
+    app_perfilada.config["PERFILADO_LENTAS"] = 0.01
+
+    assert "X-Perfil" not in client.get("/lenta/1").headers  # lenta: arma la ruta
+    assert "X-Perfil" in client.get("/lenta/2").headers       # capturada
+    # En pausa (PERFILADO_PAUSA): no se vuelve a armar enseguida
+    assert "X-Perfil" not in client.get("/lenta/3").headers
+    assert "X-Perfil" not in client.get("/lenta/4").headers
+    assert len(_capturas(app_perfilada)) == 1
+    assert app_perfilada.extensions["perfilador"].capturas == 1
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _get(client, url, code=200):
+    resp = client.get(url)
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+@pytest.fixture
+def proyecto(client):
+    """
+    A(3) → B(2), C(4) → D(1); E (sin estimar) → F(2), aparte.
+    Camino crítico: A, C, D = 8.
+    """
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    a = _post(client, "/tasks", {"nombre": "A", "descripcion": ".", "usuario": "eva",
+                                 "rol": "infra", "duracion": 3}, 201)["id"]
+    b, c = [r["id"] for r in _post(client, "/tasks/bulk", [
+        {"nombre": "B", "descripcion": ".", "usuario": "eva", "rol": "infra", "duracion": 2},
+        {"nombre": "C", "descripcion": ".", "usuario": "eva", "rol": "infra", "duracion": 4},
+    ], 201)["resultados"]]
+    d, e, f = [r["id"] for r in _post(client, "/tasks/bulk", [
+        {"nombre": "D", "descripcion": ".", "usuario": "eva", "rol": "infra", "duracion": 1},
+        {"ref": "e", "nombre": "E", "descripcion": ".", "usuario": "eva", "rol": "infra"},
+        {"nombre": "F", "descripcion": ".", "usuario": "eva", "rol": "infra", "duracion": 2,
+         "dependencias": ["e"]},
+    ], 201)["resultados"]]
+    _post(client, "/tasks/dependencies", [
+        {"tarea_id": b, "dependencytaskid": a, "accion": "adicionar"},
+        {"tarea_id": c, "dependencytaskid": a, "accion": "adicionar"},
+        {"tarea_id": d, "dependencytaskid": b, "accion": "adicionar"},
+        {"tarea_id": d, "dependencytaskid": c, "accion": "adicionar"},
+    ], 200)
+    return a, b, c, d, e, f
+
+
+def _por_id(tareas):
+    return {t["id"]: (t["inicio_temprano"], t["inicio_tardio"], t["holgura"]) for t in tareas}
+
+
+# ---------- CASOS --------------------------------------------------- #
+def test_cronograma_completo(client, proyecto):
+    a, b, c, d, e, f = proyecto
+    plan = _get(client, "/schedule")
+    assert plan["duracion_total"] == 8
+    assert plan["sin_estimar"] == 1
+    assert _por_id(plan["tareas"]) == {
+        a: (0, 0, 0), b: (3, 5, 2), c: (3, 3, 0), d: (7, 7, 0),
+        e: (0, 6, 6), f: (0, 6, 6),
+    }
+    assert [t["id"] for t in plan["tareas"]] == [a, e, f, b, c, d]  # por inicio temprano
+    assert [t["id"] for t in _get(client, "/schedule?criticas=1")["tareas"]] == [a, c, d]
+
+
+def test_camino_critico_de_una_tarea(client, proyecto):
+    a, b, c, d, e, f = proyecto
+    camino = _get(client, f"/tasks/{d}/critical-path")
+    assert camino["camino"] == [a, c, d]
+    assert camino["duracion_total"] == 8
+    assert camino["sin_estimar"] == 0
+    # Sólo las que preceden a D, con la holgura respecto de D
+    assert _por_id(camino["tareas"]) == {a: (0, 0, 0), b: (3, 5, 2), c: (3, 3, 0), d: (7, 7, 0)}
+
+    camino = _get(client, f"/tasks/{b}/critical-path")
+    assert (camino["camino"], camino["duracion_total"]) == ([a, b], 5)
+    assert _get(client, f"/tasks/{e}/critical-path")["sin_estimar"] == 1
+    _get(client, "/tasks/999/critical-path", 404)
+
+
+def test_finalizadas_y_cambios_de_duracion(client, proyecto):
+    a, b, c, d, e, f = proyecto
+    _post(client, f"/tasks/{a}", {"estado": "EN_PROGRESO"}, 200)
+    _post(client, f"/tasks/{a}", {"estado": "FINALIZADA"}, 200)
+    assert _get(client, f"/tasks/{d}/critical-path")["duracion_total"] == 5  # A ya no suma
+
+    assert _post(client, f"/tasks/{b}/duration", {"duracion": 6}, 200) == {"id": b, "duracion": 6}
+    assert _get(client, f"/tasks/{b}")["duracion"] == 6
+    camino = _get(client, f"/tasks/{d}/critical-path")
+    assert (camino["camino"], camino["duracion_total"]) == ([a, b, d], 7)
+
+    _post(client, f"/tasks/{e}/duration", {"duracion": 10}, 200)
+    plan = _get(client, "/schedule")
+    assert (plan["duracion_total"], plan["sin_estimar"]) == (12, 0)
+
+
+def test_duracion_invalida(client, proyecto):
+    a = proyecto[0]
+    for valor in (-1, "3", 2.5, True):
+        _post(client, f"/tasks/{a}/duration", {"duracion": valor}, 422)
+    _post(client, "/tasks/999/duration", {"duracion": 1}, 404)
+    _post(client, "/tasks", {"nombre": "X", "descripcion": ".", "usuario": "eva",
+                             "rol": "infra", "duracion": -2}, 422)
+    resultado = _post(client, "/tasks/bulk", [
+        {"nombre": "X", "descripcion": ".", "usuario": "eva", "rol": "infra", "duracion": "x"},
+    ], 207)["resultados"][0]
+    assert resultado["codigo"] == 422
+    assert _get(client, f"/tasks/{a}")["duracion"] == 3
+
+
+def test_cronograma_vacio(client):
+    assert _get(client, "/schedule") == {"duracion_total": 0, "sin_estimar": 0, "tareas": []}
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from src import db
+from src.data_handler import reconstruir_resumen, verificar_resumen
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _tarea(client, usuario, rol):
+    return _post(
+        client, "/tasks",
+        {"nombre": "T", "descripcion": ".", "usuario": usuario, "rol": rol}, 201,
+    )["id"]
+
+
+def _resumen(client, alias):
+    resp = client.get(f"/usuarios/{alias}/resumen")
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+
+@pytest.fixture
+def escenario(client):
+    """eva: 3 asignaciones (una EN_PROGRESO); ana: 2; leo: 1 FINALIZADA."""
+    for alias in ("eva", "ana", "leo"):
+        _post(client, "/usuarios", {"contacto": alias, "nombre": alias.title()}, 201)
+    a = _tarea(client, "eva", "infra")
+    b = _tarea(client, "eva", "programador")
+    _post(client, "/tasks/bulk", [
+        {"nombre": "C", "descripcion": ".", "usuario": "ana", "rol": "pruebas"},
+        {"nombre": "D", "descripcion": ".", "usuario": "leo", "rol": "infra"},
+    ], 201)
+    _post(client, f"/tasks/{a}/users", {"usuario": "ana", "rol": "pruebas", "accion": "adicionar"}, 200)
+    _post(client, f"/tasks/{b}/users", {"usuario": "eva", "rol": "pruebas", "accion": "adicionar"}, 200)
+    _post(client, f"/tasks/{a}", {"estado": "EN_PROGRESO"}, 200)
+    _post(client, "/tasks/estado", [{"id": 4, "estado": "EN_PROGRESO"}], 200)
+    _post(client, "/tasks/4", {"estado": "FINALIZADA"}, 200)
+    return a, b
+
+
+# ---------- CASOS --------------------------------------------------- #
+def test_resumen_de_usuario_por_rol_y_estado(client, escenario):
+    eva = _resumen(client, "eva")
+    assert eva["total"] == 3
+    assert eva["por_estado"] == {"NUEVA": 2, "EN_PROGRESO": 1, "FINALIZADA": 0}
+    assert eva["por_rol"]["infra"] == {"NUEVA": 0, "EN_PROGRESO": 1, "FINALIZADA": 0}
+    assert eva["por_rol"]["programador"]["NUEVA"] == 1
+    assert eva["por_rol"]["pruebas"]["NUEVA"] == 1
+
+    assert _resumen(client, "leo")["por_estado"]["FINALIZADA"] == 1
+    assert client.get("/usuarios/nadie/resumen").status_code == 404
+
+
+def test_quitar_asignacion_descuenta(client, escenario):
+    _, b = escenario
+    _post(client, f"/tasks/{b}/users", {"usuario": "eva", "rol": "pruebas", "accion": "remover"}, 200)
+    assert _resumen(client, "eva")["por_rol"]["pruebas"]["NUEVA"] == 0
+    assert _resumen(client, "eva")["total"] == 2
+
+
+def test_ranking_global(client, escenario):
+    assert client.get("/usuarios/resumen").get_json()["usuarios"] == [
+        {"alias": "eva", "total": 3},
+        {"alias": "ana", "total": 2},
+        {"alias": "leo", "total": 1},
+    ]
+    abiertas = client.get("/usuarios/resumen?estado=NUEVA,EN_PROGRESO&limit=2").get_json()
+    assert abiertas["usuarios"] == [{"alias": "eva", "total": 3}, {"alias": "ana", "total": 2}]
+    pruebas = client.get("/usuarios/resumen?rol=pruebas").get_json()
+    assert pruebas["usuarios"] == [{"alias": "ana", "total": 2}, {"alias": "eva", "total": 1}]
+
+    for query in ("estado=X", "estado=NUEVA,", "rol=jefe", "limit=0"):
+        assert client.get(f"/usuarios/resumen?{query}").status_code == 422, query
+
+
+def test_mutacion_rechazada_no_toca_el_resumen(client, escenario):
+    a, _ = escenario
+    antes = _resumen(client, "eva")
+    _post(client, f"/tasks/{a}/users", {"usuario": "eva", "rol": "infra", "accion": "adicionar"}, 422)
+    _post(client, f"/tasks/{a}", {"estado": "NUEVA_X"}, 422)
+    assert _resumen(client, "eva") == antes
+
+
+def test_verificar_y_reconstruir(client, escenario):
+    assert verificar_resumen() == []
+    antes = [_resumen(client, a) for a in ("eva", "ana", "leo")]
+    assert reconstruir_resumen() > 0
+    assert [_resumen(client, a) for a in ("eva", "ana", "leo")] == antes
+
+
+@pytest.mark.solo_sql
+def test_verificar_detecta_y_reconstruir_corrige(client, escenario):
+    db.session.execute(db.text(
+        "UPDATE resumen_usuario SET total = total + 5 "
+        "WHERE usuario_alias = 'ana' AND estado = 'NUEVA'"
+    ))
+    db.session.execute(db.text("DELETE FROM resumen_usuario WHERE usuario_alias = 'leo'"))
+    db.session.commit()
+
+    assert verificar_resumen() == [
+        {"alias": "ana", "rol": "pruebas", "estado": "NUEVA", "guardado": 6, "real": 1},
+        {"alias": "leo", "rol": "infra", "estado": "FINALIZADA", "guardado": 0, "real": 1},
+    ]
+    reconstruir_resumen()
+    assert verificar_resumen() == []
+    assert _resumen(client, "ana")["total"] == 2
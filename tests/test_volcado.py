@@ -0,0 +1,191 @@
+import gzip
+import json
+
+from src import db
+from src.controller import app
+from src.repositorios.memoria import RepositorioMemoria
+from tests.conftest import client  # noqa: F401
+
+
+# ---------- helper -------------------------------------------------- #
+def _post(client, url, payload, code):
+    resp = client.post(
+        url,
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+def _poblar(client):
+    _post(client, "/usuarios", {"contacto": "eva", "nombre": "Eva"}, 201)
+    _post(client, "/usuarios", {"contacto": "ana", "nombre": "Ána"}, 201)
+    a, b, c = [r["id"] for r in _post(client, "/tasks/bulk", [
+        {"ref": "a", "nombre": "Base", "descripcion": "Índices", "usuario": "eva", "rol": "infra",
+         "duracion": 3},
+        {"ref": "b", "nombre": "API", "descripcion": ".", "usuario": "ana", "rol": "programador",
+         "dependencias": ["a"]},
+        {"nombre": "QA", "descripcion": ".", "usuario": "ana", "rol": "pruebas",
+         "dependencias": ["a", "b"]},
+    ], 201)["resultados"]]
+    _post(client, f"/tasks/{a}/users", {"usuario": "ana", "rol": "pruebas", "accion": "adicionar"}, 200)
+    _post(client, f"/tasks/{a}", {"estado": "EN_PROGRESO"}, 200)
+    _post(client, f"/tasks/{a}", {"estado": "FINALIZADA"}, 200)
+    return a, b, c
+
+
+def _exportar(client, query=""):
+    resp = client.get(f"/export{query}")
+    assert resp.status_code == 200
+    return resp.get_data()
+
+
+def _registros(ndjson):
+    lineas = [json.loads(l) for l in ndjson.decode().splitlines()]
+    assert lineas[0]["tipo"] == "volcado"
+    return lineas[1:]
+
+
+def _vaciar_base():
+    """Otra base vacía con el mismo backend que el test."""
+    if isinstance(app.extensions["repositorio"], RepositorioMemoria):
+        app.extensions["repositorio"] = RepositorioMemoria()
+    else:
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
+
+
+def _importar(client, cuerpo, code, **kwargs):
+    resp = client.post("/import", data=cuerpo, **kwargs)
+    assert resp.status_code == code, resp.get_json()
+    return resp.get_json()
+
+
+# ---------- CASOS --------------------------------------------------- #
+def test_exportar_registros_en_orden(client):
+    a, b, c = _poblar(client)
+    registros = _registros(_exportar(client))
+
+    assert [r["tipo"] for r in registros] == (
+        ["usuario"] * 2 + ["tarea"] * 3 + ["asignacion"] * 4 + ["dependencia"] * 3
+    )
+    assert registros[0] == {"tipo": "usuario", "alias": "ana", "nombre": "Ána"}
+    fin = registros[2].pop("finalizada_en")
+    assert registros[2] == {
+        "tipo": "tarea", "id": a, "nombre": "Base", "descripcion": "Índices", "estado": "FINALIZADA",
+        "duracion": 3,
+    }
+    assert isinstance(fin, float)
+    assert registros[3]["duracion"] is None
+    assert registros[3]["finalizada_en"] is None
+    assert {"tipo": "asignacion", "usuario": "ana", "tarea_id": a, "rol": "pruebas"} in registros
+    assert [(r["tarea_id"], r["depende_de_id"]) for r in registros[-3:]] == [(b, a), (c, a), (c, b)]
+
+
+def test_ida_y_vuelta_restaura_todo(client):
+    a, b, c = _poblar(client)
+    volcado = _exportar(client)
+    antes = {
+        "ready": client.get("/tasks/ready").get_json(),
+        "eva": client.get("/usuarios/eva/resumen").get_json(),
+        "upstream": client.get(f"/tasks/{c}/upstream").get_json(),
+    }
+
+    _vaciar_base()
+    conteos = _importar(client, volcado, 201)
+    assert conteos == {"usuario": 2, "tarea": 3, "asignacion": 4, "dependencia": 3}
+
+    assert _registros(_exportar(client)) == _registros(volcado)
+    assert client.get("/tasks/ready").get_json() == antes["ready"]
+    assert client.get("/usuarios/eva/resumen").get_json() == antes["eva"]
+    assert client.get(f"/tasks/{c}/upstream").get_json() == antes["upstream"]
+    assert [t["id"] for t in client.get("/tasks/search?q=indices").get_json()["tareas"]] == [a]
+    # Se puede seguir operando: ids nuevos a continuación y ciclos detectados
+    nueva = _post(client, "/tasks", {"nombre": "N", "descripcion": ".", "usuario": "eva",
+                                     "rol": "infra"}, 201)["id"]
+    assert nueva == c + 1
+    _post(client, f"/tasks/{a}/dependencies", {"dependencytaskid": c, "accion": "adicionar"}, 422)
+
+
+def test_importar_deja_un_evento_de_resincronizacion(client):
+    _poblar(client)
+    volcado = _exportar(client)
+    _vaciar_base()
+    _importar(client, volcado, 201)
+
+    (evento,) = client.get("/changes?since=0").get_json()["eventos"]
+    assert evento["entidad"] == "volcado" and evento["operacion"] == "importar"
+    assert evento["datos"] == {"usuario": 2, "tarea": 3, "asignacion": 4, "dependencia": 3}
+
+    # Una importación fallida no deja evento
+    _vaciar_base()
+    _importar(client, volcado + b'{"tipo": "otra"}\n', 422)
+    assert client.get("/changes?since=0").get_json()["eventos"] == []
+
+
+def test_gzip_ida_y_vuelta(client):
+    _poblar(client)
+    plano = _exportar(client)
+    comprimido = _exportar(client, "?gzip=1")
+    assert _registros(gzip.decompress(comprimido)) == _registros(plano)
+
+    _vaciar_base()
+    _importar(client, comprimido, 201, content_type="application/gzip")
+    assert _registros(_exportar(client)) == _registros(plano)
+
+
+def test_importar_exige_base_vacia(client):
+    _poblar(client)
+    error = _importar(client, _exportar(client), 422)["error"]
+    assert "base sin usuarios ni tareas" in error
+
+
+def test_importacion_invalida_no_deja_nada(client):
+    _poblar(client)
+    registros = _registros(_exportar(client))
+    _vaciar_base()
+
+    def ndjson(filas):
+        return "\n".join(json.dumps(r) for r in filas).encode()
+
+    ciclo = registros + [{"tipo": "dependencia", "tarea_id": registros[2]["id"],
+                          "depende_de_id": registros[4]["id"]}]
+    assert "ciclo" in _importar(client, ndjson(ciclo), 422)["error"]
+
+    huerfana = registros + [{"tipo": "asignacion", "usuario": "nadie", "tarea_id": 1,
+                             "rol": "infra"}]
+    _importar(client, ndjson(huerfana), 422)
+
+    duplicada = registros[:3] + registros[2:3]
+    _importar(client, ndjson(duplicada), 422)
+
+    for malo in ({"tipo": "tarea", "id": "1", "nombre": "x", "descripcion": ".", "estado": "NUEVA"},
+                 {"tipo": "tarea", "id": 1, "nombre": "x", "descripcion": ".", "estado": "HECHA"},
+                 {"tipo": "tarea", "id": 1, "nombre": "x", "descripcion": ".", "estado": "NUEVA",
+                  "duracion": -1},
+                 {"tipo": "tarea", "id": 1, "nombre": "x", "descripcion": ".", "estado": "NUEVA",
+                  "finalizada_en": "ayer"},
+                 {"tipo": "otra"}, [1, 2]):
+        assert _importar(client, ndjson(registros[:2] + [malo]), 422)["error"].startswith("Línea 3")
+    assert "Línea 1" in _importar(client, b"{no es json", 422)["error"]
+    _importar(client, b"\x1f\x8bbasura", 422, content_type="application/gzip")
+
+    assert _registros(_exportar(client)) == []
+
+
+def test_comandos_cli(client, tmp_path):
+    _poblar(client)
+    archivo = tmp_path / "volcado.ndjson.gz"
+    runner = app.test_cli_runner()
+
+    resultado = runner.invoke(args=["exportar", str(archivo)])
+    assert resultado.exit_code == 0, resultado.output
+    assert gzip.decompress(archivo.read_bytes()).startswith(b'{"tipo": "volcado"')
+
+    assert runner.invoke(args=["importar", str(archivo)]).exit_code == 1  # base no vacía
+    _vaciar_base()
+    resultado = runner.invoke(args=["importar", str(archivo)])
+    assert resultado.exit_code == 0, resultado.output
+    assert "tarea: 3" in resultado.output